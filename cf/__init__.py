@@ -218,6 +218,7 @@ from .examplefield         import example_field
 
 
 from .read_write import (read,
+                         iread,
                          write,
                          CFImplementation)
 
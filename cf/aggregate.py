@@ -1,9 +1,26 @@
-from numpy import argsort as numpy_argsort
-from numpy import dtype   as numpy_dtype
-from numpy import sort    as numpy_sort
-
+from numpy import argsort    as numpy_argsort
+from numpy import asanyarray as numpy_asanyarray
+from numpy import dtype      as numpy_dtype
+from numpy import finfo      as numpy_finfo
+from numpy import float32    as numpy_float32
+from numpy import isfinite   as numpy_isfinite
+from numpy import load       as numpy_load
+from numpy import save       as numpy_save
+from numpy import sort       as numpy_sort
+
+from numpy.ma import array        as numpy_ma_array
+from numpy.ma import getmaskarray as numpy_ma_getmaskarray
+from numpy.ma import isMA         as numpy_ma_isMA
+
+from bisect      import bisect_left, bisect_right
 from collections import namedtuple
+from io          import BytesIO
+from itertools   import chain
 from operator    import itemgetter
+from os          import stat as os_stat
+from os.path     import join as os_path_join
+from sqlite3     import connect as sqlite3_connect
+from sqlite3     import Error as sqlite3_Error
 
 from .auxiliarycoordinate import AuxiliaryCoordinate
 #from .coordinatereference import CoordinateReference
@@ -12,6 +29,7 @@ from .domainaxis          import DomainAxis
 from .fieldlist           import FieldList
 from .query               import gt
 from .functions           import (flat, RTOL, ATOL,
+                                  AGGREGATE_CACHE_DIR,
                                   hash_array, 
                                   _numpy_allclose)
 from .functions           import inspect as cf_inspect
@@ -22,6 +40,15 @@ from .data.data      import Data
 
 _dtype_float = numpy_dtype(float)
 
+# The relative margin added to the tolerances used to select cached
+# arrays by their first and last values, which allows for rounding
+# errors in values of up to single precision
+_index_margin = 4 * float(numpy_finfo(numpy_float32).eps)
+
+# The name of the persistent aggregation cache file in the
+# AGGREGATE_CACHE_DIR directory
+_aggregate_cache_file = 'cf_aggregate_cache.sqlite'
+
 ## --------------------------------------------------------------------
 ## Global properties, as defined in Appendix A of the CF conventions.
 ## --------------------------------------------------------------------
@@ -61,6 +88,169 @@ _signature_properties = set(('add_offset',
 _no_units = Units()
 
 
+def _index_values(array):
+    '''Return the values used to index an array in a `_HFLCache`.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        array: `numpy.ndarray`
+
+    :Returns:
+
+        `tuple` or `None`
+            The first and last values of the array, or `None` if the
+            array is not indexed by its values because it is masked,
+            is not of floating point data type, is empty, or has
+            non-finite first or last values.
+
+    '''
+    if (numpy_ma_isMA(array) or array.dtype.kind != 'f' or
+        not array.size):
+        return None
+
+    first = array.item(0)
+    last  = array.item(-1)
+    if not (numpy_isfinite(first) and numpy_isfinite(last)):
+        return None
+
+    return first, last
+
+
+def _index_close(value0, value, rtol, atol):
+    '''Whether or not two indexed values could be close.
+
+    The values are close if the absolute difference between them is
+    no greater than ``atol + rtol*max(abs(value0), abs(value))``,
+    widened by a safety margin for rounding errors. This bound is
+    symmetric in the two values and is never tighter than the one
+    used by `numpy.allclose`.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_index_tolerance`
+
+    :Parameters:
+
+        value0, value: `float`
+
+        rtol: `float`
+
+        atol: `float`
+
+    :Returns:
+
+        `bool`
+
+    '''
+    magnitude = max(abs(value0), abs(value))
+    tolerance = (atol + (rtol + _index_margin) * magnitude) * (1 + _index_margin)
+    return abs(value0 - value) <= tolerance
+
+
+def _index_tolerance(value, rtol, atol):
+    '''The largest difference from a value of any value close to it.
+
+    Every value ``value0`` for which ``_index_close(value0, value,
+    rtol, atol)`` is `True` lies within the returned distance of
+    *value*, so it may be used to bracket the sorted indexed values.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_index_close`
+
+    :Parameters:
+
+        value: `float`
+
+        rtol: `float`
+
+        atol: `float`
+
+    :Returns:
+
+        `float`
+
+    '''
+    # |value0 - value| <= (atol + r*max(|value0|, |value|))*(1 + m)
+    # with |value0| <= |value| + |value0 - value|
+    r = (rtol + _index_margin) * (1 + _index_margin)
+    if r >= 1:
+        return float('inf')
+
+    tolerance = (atol * (1 + _index_margin) + r * abs(value)) / (1 - r)
+    return tolerance * (1 + _index_margin)
+
+
+def _array_to_bytes(array):
+    '''Serialise a numpy array without pickling it.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_array_from_bytes`
+
+    :Parameters:
+
+        array: `numpy.ndarray`
+            The array, which may be masked but which must not have an
+            object data type.
+
+    :Returns:
+
+        `bytes`
+            The array in the numpy ``.npy`` format.
+
+    '''
+    buffer = BytesIO()
+    numpy_save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _array_from_bytes(value):
+    '''Deserialise a numpy array without unpickling it.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_array_to_bytes`
+
+    :Parameters:
+
+        value: `bytes`
+            The array in the numpy ``.npy`` format.
+
+    :Returns:
+
+        `numpy.ndarray`
+
+    '''
+    return numpy_load(BytesIO(value), allow_pickle=False)
+
+
+def _sort_indices_to_list(sort_indices):
+    '''Convert sort indices to a form with a complete representation.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        sort_indices: `slice`, `numpy.ndarray` or `tuple`
+            The indices, or a tuple of indices for each axis.
+
+    :Returns:
+
+        `list` or `tuple`
+
+    '''
+    if isinstance(sort_indices, tuple):
+        return tuple(map(_sort_indices_to_list, sort_indices))
+
+    if isinstance(sort_indices, slice):
+        return [sort_indices.start, sort_indices.stop, sort_indices.step]
+
+    return numpy_asanyarray(sort_indices).tolist()
+
+
 class _HFLCache:
     '''
 
@@ -73,6 +263,318 @@ and first and last cell bounds
         self.fl   = {}
         self.flb  = {}
         self.hash_to_array = {}
+
+        # An index of the arrays in hash_to_array, keyed by shape,
+        # which holds floating point arrays sorted by their first
+        # values so that only the arrays which might be numerically
+        # close to a new array need to be compared with it.
+        self.array_index = {}
+
+        # The numbers of numerically tolerant array comparisons which
+        # have been made, and which have been avoided by the index
+        self.statistics = {'comparisons': 0, 'avoided': 0}
+
+        # The persistent store of arrays read from files, and their
+        # hash values, which is shared between sessions. New entries
+        # are written when the cache is closed.
+        self.store         = None
+        self.store_pending = []
+        self.file_stat     = {}
+
+        cache_dir = AGGREGATE_CACHE_DIR()
+        if cache_dir is not None:
+            try:
+                store = sqlite3_connect(
+                    os_path_join(cache_dir, _aggregate_cache_file))
+                store.execute('CREATE TABLE IF NOT EXISTS arrays '
+                              '(filename TEXT, pointer TEXT, params TEXT, '
+                              'stat TEXT, hash INTEGER, data BLOB, '
+                              'mask BLOB, '
+                              'PRIMARY KEY (filename, pointer, params))')
+            except sqlite3_Error:
+                store = None
+
+            self.store = store
+    #--- End: def
+
+    def store_key(self, file_pointer, params):
+        '''The key of an array in the persistent store.
+
+    The key includes the size and modification time of the file, so
+    that arrays stored before the file was changed are never used.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        file_pointer: `tuple`
+            The file name and the position of the array in the file.
+
+        params:
+            Any other parameters which determine the values of the
+            array, such as its units and data type.
+
+    :Returns:
+
+        `tuple` or `None`
+            The key, or `None` if there is no persistent store or the
+            file can not be found.
+
+        '''
+        if self.store is None:
+            return None
+
+        filename, pointer = file_pointer
+
+        stat = self.file_stat.get(filename)
+        if stat is None:
+            try:
+                file_stat = os_stat(filename)
+            except (OSError, TypeError, ValueError):
+                stat = False
+            else:
+                stat = '{0}:{1}'.format(file_stat.st_size,
+                                        file_stat.st_mtime_ns)
+
+            self.file_stat[filename] = stat
+        #--- End: if
+
+        if not stat:
+            return None
+
+        return (filename, repr(pointer), repr(params), stat)
+    #--- End: def
+
+    def load(self, store_key):
+        '''Load an array and its hash value from the persistent store.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        store_key: `tuple`
+            The key returned by `store_key`.
+
+    :Returns:
+
+        `tuple` or `None`
+            The hash value and the array, or `None` if they have not
+            been stored, or if they were stored before the file was
+            last changed.
+
+        '''
+        filename, pointer, params, stat = store_key
+        try:
+            row = self.store.execute(
+                'SELECT stat, hash, data, mask FROM arrays '
+                'WHERE filename=? AND pointer=? AND params=?',
+                (filename, pointer, params)).fetchone()
+        except sqlite3_Error:
+            return None
+
+        if row is None or row[0] != stat:
+            return None
+
+        # The arrays are stored in the numpy .npy format, which is
+        # read without allowing pickled objects so that a tampered
+        # store can't execute code
+        stat, hash_value, data, mask = row
+        try:
+            array = _array_from_bytes(data)
+            if mask is not None:
+                array = numpy_ma_array(array, mask=_array_from_bytes(mask))
+        except (OSError, TypeError, ValueError):
+            return None
+
+        return hash_value, array
+    #--- End: def
+
+    def save(self, store_key, hash_value, array):
+        '''Save an array and its hash value to the persistent store.
+
+    The entry is written when the cache is closed, and replaces any
+    existing entry for the same array, including one stored before
+    the file was last changed. Arrays with an object data type are
+    not saved.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        store_key: `tuple`
+            The key returned by `store_key`.
+
+        hash_value:
+            The hash value of the array.
+
+        array: `numpy.ndarray`
+
+    :Returns:
+
+        `None`
+
+        '''
+        if array.dtype.hasobject:
+            return
+
+        if numpy_ma_isMA(array):
+            data = _array_to_bytes(array.data)
+            mask = _array_to_bytes(numpy_ma_getmaskarray(array))
+        else:
+            data = _array_to_bytes(array)
+            mask = None
+
+        self.store_pending.append(store_key + (hash_value, data, mask))
+    #--- End: def
+
+    def close(self):
+        '''Write any new entries to the persistent store and close it.
+
+    .. versionadded:: 3.0.7
+
+    :Returns:
+
+        `None`
+
+        '''
+        store = self.store
+        if store is None:
+            return
+
+        if self.store_pending:
+            try:
+                with store:
+                    store.executemany(
+                        'INSERT OR REPLACE INTO arrays '
+                        '(filename, pointer, params, stat, hash, data, '
+                        'mask) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        self.store_pending)
+            except sqlite3_Error:
+                pass
+        #--- End: if
+
+        store.close()
+
+        self.store         = None
+        self.store_pending = []
+    #--- End: def
+
+    def add_array(self, hash_value, array):
+        '''Add an array to the cache.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        hash_value:
+            The hash value of the array.
+
+        array: `numpy.ndarray`
+
+    :Returns:
+
+        `None`
+
+        '''
+        index = self.array_index.get(array.shape)
+        if index is None:
+            index = {'size'     : 0,
+                     'firsts'   : [],
+                     'entries'  : [],
+                     'unindexed': []}
+            self.array_index[array.shape] = index
+
+        # The position of the array in the order in which arrays of
+        # this shape were added
+        position = index['size']
+        index['size'] += 1
+
+        values = _index_values(array)
+        if values is None:
+            index['unindexed'].append((position, hash_value))
+        else:
+            first, last = values
+            i = bisect_right(index['firsts'], first)
+            index['firsts'].insert(i, first)
+            index['entries'].insert(i, (first, position, last, hash_value))
+
+        self.hash_to_array[hash_value] = array
+    #--- End: def
+
+    def close_hash_value(self, array, rtol, atol):
+        '''Find a cached array which is numerically close to an array.
+
+    Cached arrays are compared in the order in which they were added,
+    and the hash value of the first one which is equal to *array*
+    within the given tolerances is returned. Only the cached arrays
+    whose first and last values are close to those of *array* are
+    compared, since no others can be close to it.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        array: `numpy.ndarray`
+
+        rtol: `float`
+            See the `cf.aggregate` function for details.
+
+        atol: `float`
+            See the `cf.aggregate` function for details.
+
+    :Returns:
+
+            The hash value of the close array, or `None` if there
+            isn't one.
+
+        '''
+        index = self.array_index.get(array.shape)
+        if index is None:
+            return None
+
+        values = _index_values(array)
+        if values is None:
+            # Compare with every cached array of the same shape
+            candidates = [(position, hash_value)
+                          for first0, position, last0, hash_value in index['entries']]
+            candidates.extend(index['unindexed'])
+        else:
+            # Compare with the cached arrays of the same shape whose
+            # first and last values are close to those of the array,
+            # and with those which are not indexed by their values.
+            first, last = values
+            tolerance = _index_tolerance(first, rtol, atol)
+
+            firsts = index['firsts']
+            start = bisect_left(firsts, first - tolerance)
+            stop  = bisect_right(firsts, first + tolerance)
+
+            candidates = index['unindexed'][:]
+            for first0, position, last0, hash_value in index['entries'][start:stop]:
+                if (_index_close(first0, first, rtol, atol) and
+                    _index_close(last0, last, rtol, atol)):
+                    candidates.append((position, hash_value))
+            #--- End: for
+        #--- End: if
+
+        candidates.sort(key=itemgetter(0))
+
+        statistics = self.statistics
+        hash_to_array = self.hash_to_array
+        for n, (position, hash_value) in enumerate(candidates):
+            if _numpy_allclose(hash_to_array[hash_value], array,
+                               rtol=rtol, atol=atol):
+                # Without the index, every array added before this
+                # one would also have been compared
+                statistics['comparisons'] += n + 1
+                statistics['avoided']     += position - n
+                return hash_value
+        #--- End: for
+
+        statistics['comparisons'] += len(candidates)
+        statistics['avoided']     += index['size'] - len(candidates)
+
+        return None
     #--- End: def
 
     def inspect(self):
@@ -1526,10 +2028,6 @@ def aggregate(fields,
             'cf.aggregate', {'no_overlap': no_overlap},
             "Use keyword 'overlap' instead.") # pragma: no cover
 
-    # Initialise the cache for coordinate and cell measure hashes,
-    # first and last values and first and last cell bounds
-    hfl_cache = _HFLCache()
-
     output_fields = FieldList()
 
     output_fields_append = output_fields.append
@@ -1595,275 +2093,274 @@ def aggregate(fields,
     unaggregatable = False
     status = 0
 
-    # ================================================================
-    # 1. Group together fields with the same structural signature
-    # ================================================================
-    signatures = {}
-    for f in flat(fields):
-#        print (repr(f))
-        # ------------------------------------------------------------
-        # Create the metadata summary, including the structural
-        # signature
-        # ------------------------------------------------------------
-        meta = _Meta(f,
-                     info=info, rtol=rtol, atol=atol,
-                     relaxed_units=relaxed_units, 
-                     allow_no_identity=allow_no_identity,
-                     equal_all=equal_all,
-                     exist_all=exist_all,
-                     equal=equal,
-                     exist=exist,
-                     ignore=ignore,
-                     dimension=dimension,
-                     relaxed_identities=relaxed_identities,
-                     ncvar_identities=ncvar_identities,
-                     respect_valid=respect_valid)
-
-        if not meta:
-            unaggregatable = True
-            status = 1
-
-            if info:
-                print("Unaggregatable {0!r} has{1} been output: {2}".format(
-                    f, exclude, meta.message))
-
-            if not exclude:
-                # This field does not have a structural signature, so
-                # it can't be aggregated. Put it straight into the
-                # output list and move on to the next input field.
-                if not copy:
-                    output_fields_append(f)
-                else:
-                    output_fields_append(f.copy())
-            #--- End: if
-
-            continue
-        #--- End: if
+    # Initialise the cache for coordinate and cell measure hashes,
+    # first and last values and first and last cell bounds
+    hfl_cache = _HFLCache()
 
-        # ------------------------------------------------------------
-        # This field has a structural signature, so append it to the
-        # list of fields with the same structural signature.
-        # ------------------------------------------------------------
-        signatures.setdefault(meta.signature, []).append(meta)
-    #--- End: for    
-
-    # ================================================================
-    # 2. Within each group of fields with the same structural
-    #    signature, aggregate as many fields as possible. Sort the
-    #    signatures so that independent aggregations of the same set
-    #    of input fields return fields in the same order.
-    # ================================================================
-
-#    x = []
-#    for signature in signatures:
-#        x.append(signature)
-#
-#    if len(x) == 2:
-#        print (hash(x[0]))
-#        print (hash(x[1]))
-#        for key, value in x[0]._asdict().items():            
-#            if hash(value) != hash(getattr(x[1], key)):
-#                print (key, ' no equal!')
-#            if key == 'Coordinate_references' and value:
-#                for q1, q2 in zip(value, x[1].Coordinate_references):
-#                    for w1, w2 in zip(q1, q2):
-#                        print (w1)
-#                        print (w2)
-#                        print (hash(w1))
-#                        print (hash(w2))
-#    print ('DCH', 'done')
-
-    for signature in signatures: #sorted(signatures):
-        meta = signatures[signature]
+    try:
+        # ================================================================
+        # 1. Group together fields with the same structural signature
+        # ================================================================
+        signatures = {}
+        for f in flat(fields):
+    #        print (repr(f))
+            # ------------------------------------------------------------
+            # Create the metadata summary, including the structural
+            # signature
+            # ------------------------------------------------------------
+            meta = _Meta(f,
+                         info=info, rtol=rtol, atol=atol,
+                         relaxed_units=relaxed_units, 
+                         allow_no_identity=allow_no_identity,
+                         equal_all=equal_all,
+                         exist_all=exist_all,
+                         equal=equal,
+                         exist=exist,
+                         ignore=ignore,
+                         dimension=dimension,
+                         relaxed_identities=relaxed_identities,
+                         ncvar_identities=ncvar_identities,
+                         respect_valid=respect_valid)
+
+            if not meta:
+                unaggregatable = True
+                status = 1
 
-        if info >= 2:
-            # Print useful information
-            meta[0].print_info(info)
-            print('')
+                if info:
+                    print("Unaggregatable {0!r} has{1} been output: {2}".format(
+                        f, exclude, meta.message))
+
+                if not exclude:
+                    # This field does not have a structural signature, so
+                    # it can't be aggregated. Put it straight into the
+                    # output list and move on to the next input field.
+                    if not copy:
+                        output_fields_append(f)
+                    else:
+                        output_fields_append(f.copy())
+                #--- End: if
 
-        if len(meta) == 1:
-            # --------------------------------------------------------
-            # There's only one field with this signature, so we can
-            # add it straight to the output list and move on to the
-            # next signature.
-            # --------------------------------------------------------
-            if not copy:       
-                output_fields_append(meta[0].field) 
-            else:
-                output_fields_append(meta[0].field.copy()) 
+                continue
+            #--- End: if
 
-            continue
+            # ------------------------------------------------------------
+            # This field has a structural signature, so append it to the
+            # list of fields with the same structural signature.
+            # ------------------------------------------------------------
+            signatures.setdefault(meta.signature, []).append(meta)
+        #--- End: for    
+
+        # ================================================================
+        # 2. Within each group of fields with the same structural
+        #    signature, aggregate as many fields as possible. Sort the
+        #    signatures so that independent aggregations of the same set
+        #    of input fields return fields in the same order.
+        # ================================================================
+
+    #    x = []
+    #    for signature in signatures:
+    #        x.append(signature)
+    #
+    #    if len(x) == 2:
+    #        print (hash(x[0]))
+    #        print (hash(x[1]))
+    #        for key, value in x[0]._asdict().items():            
+    #            if hash(value) != hash(getattr(x[1], key)):
+    #                print (key, ' no equal!')
+    #            if key == 'Coordinate_references' and value:
+    #                for q1, q2 in zip(value, x[1].Coordinate_references):
+    #                    for w1, w2 in zip(q1, q2):
+    #                        print (w1)
+    #                        print (w2)
+    #                        print (hash(w1))
+    #                        print (hash(w2))
+    #    print ('DCH', 'done')
+
+        for signature in signatures: #sorted(signatures):
+            meta = signatures[signature]
+
+            if info >= 2:
+                # Print useful information
+                meta[0].print_info(info)
+                print('')
+
+            if len(meta) == 1:
+                # --------------------------------------------------------
+                # There's only one field with this signature, so we can
+                # add it straight to the output list and move on to the
+                # next signature.
+                # --------------------------------------------------------
+                if not copy:       
+                    output_fields_append(meta[0].field) 
+                else:
+                    output_fields_append(meta[0].field.copy()) 
 
-        # ------------------------------------------------------------
-        # Still here? Then there are 2 or more fields with this
-        # signature which may be aggregatable. These fields need to be
-        # passed through until no more aggregations are possible. With
-        # each pass, the number of fields in the group will reduce by
-        # one for each aggregation that occurs. Each pass represents
-        # an aggregation in another axis.
-        # ------------------------------------------------------------
+                continue
 
-        # ------------------------------------------------------------
-        # For each axis's 1-d coordinates, create the canonical hash
-        # value and the first and last cell values.
-        # ------------------------------------------------------------
-        if axes is None:
-            # Aggregation will be over as many axes as possible
-            aggregating_axes = meta[0].axis_ids
-            _create_hash_and_first_values(meta, None, False, hfl_cache, rtol, atol)
-
-        else:    
-            # Specific aggregation axes have been selected
-            aggregating_axes = []
-            axis_items = meta[0].axis.items()
-            for axis in axes:
-                coords = meta[0].field.coordinates.filter_by_identity('exact', axis)
-                coord = coords.value(default=None)
-                if coord is None:
-                    continue
+            # ------------------------------------------------------------
+            # Still here? Then there are 2 or more fields with this
+            # signature which may be aggregatable. These fields need to be
+            # passed through until no more aggregations are possible. With
+            # each pass, the number of fields in the group will reduce by
+            # one for each aggregation that occurs. Each pass represents
+            # an aggregation in another axis.
+            # ------------------------------------------------------------
+
+            # ------------------------------------------------------------
+            # For each axis's 1-d coordinates, create the canonical hash
+            # value and the first and last cell values.
+            # ------------------------------------------------------------
+            if axes is None:
+                # Aggregation will be over as many axes as possible
+                aggregating_axes = meta[0].axis_ids
+                _create_hash_and_first_values(meta, None, False, hfl_cache, rtol, atol)
+
+            else:    
+                # Specific aggregation axes have been selected
+                aggregating_axes = []
+                axis_items = meta[0].axis.items()
+                for axis in axes:
+                    coords = meta[0].field.coordinates.filter_by_identity('exact', axis)
+                    coord = coords.value(default=None)
+                    if coord is None:
+                        continue
                 
-                coord_identity = coord.identity(strict=strict_identities,
-                                                relaxed=relaxed_identities,
-                                                nc_only=ncvar_identities)
-                for identity, value in axis_items:
-                    if (identity not in aggregating_axes and 
-                        coord_identity in value['ids']):
-                        aggregating_axes.append(identity)
-                        break
-            #--- End: for
+                    coord_identity = coord.identity(strict=strict_identities,
+                                                    relaxed=relaxed_identities,
+                                                    nc_only=ncvar_identities)
+                    for identity, value in axis_items:
+                        if (identity not in aggregating_axes and 
+                            coord_identity in value['ids']):
+                            aggregating_axes.append(identity)
+                            break
+                #--- End: for
 
-            _create_hash_and_first_values(meta, aggregating_axes, 
-                                          donotchecknonaggregatingaxes,
-                                          hfl_cache, rtol, atol)
+                _create_hash_and_first_values(meta, aggregating_axes, 
+                                              donotchecknonaggregatingaxes,
+                                              hfl_cache, rtol, atol)
 
-        if info >= 2:
-            # Print useful information
-            for m in meta:
-                m.print_info(info, signature=False)
+            if info >= 2:
+                # Print useful information
+                for m in meta:
+                    m.print_info(info, signature=False)
                 
-            print('')
+                print('')
 
-        # Take a shallow copy in case we abandon and want to output
-        # the original, unaggregated fields.
-        meta0 = meta[:]
+            # Take a shallow copy in case we abandon and want to output
+            # the original, unaggregated fields.
+            meta0 = meta[:]
 
-        unaggregatable = False
+            unaggregatable = False
 
-        for axis in aggregating_axes:
+            for axis in aggregating_axes:
 
-            number_of_fields = len(meta)
-            if number_of_fields == 1:
-                break
-
-            # --------------------------------------------------------
-            # Separate the fields with the same structural signature
-            # into groups such that either within each group the
-            # fields' domains differ only long the axis or each group
-            # contains only one field.
-            #
-            # Note that the 'a_identity' attribute, that gives the
-            # identity of the aggregating axis, is set in
-            # _group_fields().
-            # --------------------------------------------------------
-            grouped_meta = _group_fields(meta, axis)
-
-            if not grouped_meta:                
-                if info:
-                    print("Unaggregatable {0!r} fields have{1} been output: {2}".format( 
-                        meta[0].field.identity(), exclude, meta[0].message))
-
-                unaggregatable = True
-                break
-
-            if len(grouped_meta) == number_of_fields:
-                if info >= 3:
-                    print("{0!r} fields can't be aggregated along their {1!r} axis".format(
-                        meta[0].field.identity(), axis))
-                continue
-
-            # --------------------------------------------------------
-            # Within each group, aggregate as many fields as possible.
-            # --------------------------------------------------------
-            for m in grouped_meta:
-
-                if len(m) == 1:
-                    continue
-                
-                # ----------------------------------------------------
-                # Still here? The sort the fields in place by the
-                # canonical first values of their 1-d coordinates for
-                # the aggregating axis.
-                # ----------------------------------------------------
-                _sorted_by_first_values(m, axis)
+                number_of_fields = len(meta)
+                if number_of_fields == 1:
+                    break
 
-                # ----------------------------------------------------
-                # Check that the aggregating axis's 1-d coordinates
-                # don't overlap, and don't aggregate anything in this
-                # group if any do.
-                # ----------------------------------------------------
-                if not _ok_coordinate_arrays(m, axis, overlap, contiguous,
-                                             info):
+                # --------------------------------------------------------
+                # Separate the fields with the same structural signature
+                # into groups such that either within each group the
+                # fields' domains differ only long the axis or each group
+                # contains only one field.
+                #
+                # Note that the 'a_identity' attribute, that gives the
+                # identity of the aggregating axis, is set in
+                # _group_fields().
+                # --------------------------------------------------------
+                grouped_meta = _group_fields(meta, axis)
+
+                if not grouped_meta:                
                     if info:
-                        print("Unaggregatable {!r} fields have{} been output: {}".format( 
-                            m[0].field.identity(), exclude, m[0].message))
+                        print("Unaggregatable {0!r} fields have{1} been output: {2}".format( 
+                            meta[0].field.identity(), exclude, meta[0].message))
 
                     unaggregatable = True
                     break
 
-                # ----------------------------------------------------
-                # Still here? Then pass through the fields
-                # ----------------------------------------------------
-                m0 = m[0].copy()
-
-                for m1 in m[1:]:
-                    m0 = _aggregate_2_fields(m0, m1,
-                                             rtol=rtol, atol=atol,
-                                             info=info,
-                                             concatenate=concatenate,
-                                             copy=(copy or not exclude),
-                                             )
-                                                                 
-                    if not m0:
-                        # Couldn't aggregate these two fields, so
-                        # abandon all aggregations on the fields with
-                        # this structural signature, including those
-                        # already done.
+                if len(grouped_meta) == number_of_fields:
+                    if info >= 3:
+                        print("{0!r} fields can't be aggregated along their {1!r} axis".format(
+                            meta[0].field.identity(), axis))
+                    continue
+
+                # --------------------------------------------------------
+                # Within each group, aggregate as many fields as possible.
+                # --------------------------------------------------------
+                for m in grouped_meta:
+
+                    if len(m) == 1:
+                        continue
+                
+                    # ----------------------------------------------------
+                    # Still here? The sort the fields in place by the
+                    # canonical first values of their 1-d coordinates for
+                    # the aggregating axis.
+                    # ----------------------------------------------------
+                    _sorted_by_first_values(m, axis)
+
+                    # ----------------------------------------------------
+                    # Check that the aggregating axis's 1-d coordinates
+                    # don't overlap, and don't aggregate anything in this
+                    # group if any do.
+                    # ----------------------------------------------------
+                    if not _ok_coordinate_arrays(m, axis, overlap, contiguous,
+                                                 info):
                         if info:
                             print("Unaggregatable {!r} fields have{} been output: {}".format( 
-                                m1.field.identity(), exclude, m1.message))
+                                m[0].field.identity(), exclude, m[0].message))
 
                         unaggregatable = True
                         break
-                #--- End: while
 
-                m[:] = [m0]
+                    # ----------------------------------------------------
+                    # Still here? Then pass through the fields
+                    # ----------------------------------------------------
+                    m0 = _aggregate_fields([m[0].copy()] + m[1:],
+                                           rtol=rtol, atol=atol,
+                                           info=info,
+                                           concatenate=concatenate,
+                                           copy=(copy or not exclude),
+                                           )
+
+                    m[:] = [m0]
+                #--- End: for
+
+                if unaggregatable:
+                    break
+
+                # --------------------------------------------------------
+                # Still here? Then the aggregation along this axis was
+                # completely successful for each sub-group, so reassemble
+                # the aggregated fields as a single list ready for
+                # aggregation along the next axis.
+                # --------------------------------------------------------
+                meta = [m for gm in grouped_meta for m in gm]
             #--- End: for
 
+            # Add fields to the output list
             if unaggregatable:
-                break
-
-            # --------------------------------------------------------
-            # Still here? Then the aggregation along this axis was
-            # completely successful for each sub-group, so reassemble
-            # the aggregated fields as a single list ready for
-            # aggregation along the next axis.
-            # --------------------------------------------------------
-            meta = [m for gm in grouped_meta for m in gm]
+                status = 1
+                if not exclude:
+                    if copy:       
+                        output_fields.extend((m.field.copy() for m in meta0)) 
+                    else:
+                        output_fields.extend((m.field for m in meta0)) 
+            else:
+                output_fields.extend((m.field for m in meta)) 
         #--- End: for
-
-        # Add fields to the output list
-        if unaggregatable:
-            status = 1
-            if not exclude:
-                if copy:       
-                    output_fields.extend((m.field.copy() for m in meta0)) 
-                else:
-                    output_fields.extend((m.field for m in meta0)) 
-        else:
-            output_fields.extend((m.field for m in meta)) 
-    #--- End: for
+    finally:
+        # Write any new entries to the persistent cache, even if the
+        # aggregation failed
+        hfl_cache.close()
+    #--- End: try
 
     aggregate.status = status
+    aggregate.hash_statistics = hfl_cache.statistics
+
+    if info >= 2:
+        print('Numerically tolerant coordinate comparisons: {0[comparisons]} made, {0[avoided]} avoided'.format(
+            hfl_cache.statistics))
 
     if status and info > 0:
         print('')
@@ -1872,9 +2369,11 @@ def aggregate(fields,
 
 
 # --------------------------------------------------------------------
-# Initialise the status
+# Initialise the status and the numbers of numerically tolerant
+# coordinate comparisons made and avoided
 # --------------------------------------------------------------------
 aggregate.status = 0
+aggregate.hash_statistics = {'comparisons': 0, 'avoided': 0}
 
 def _create_hash_and_first_values(meta, axes, donotchecknonaggregatingaxes,
                                   hfl_cache, rtol, atol):
@@ -2238,13 +2737,14 @@ def _get_hfl(v, canonical_units, sort_indices, null_sort,
     create_fl   = first_and_last_values
     create_flb  = first_and_last_bounds
 
-    key = None
+    key       = None
+    store_key = None
 
     d = v.get_data()
 
     if d._pmsize == 1:
         partition = d.partitions.matrix.item()
-        if not partition.part:
+        if not partition.part and not partition._operations:
             key = getattr(partition.subarray, 'file_pointer', None)
             if key is not None:
                 hash_value = hfl_cache.hash.get(key, None)
@@ -2257,51 +2757,62 @@ def _get_hfl(v, canonical_units, sort_indices, null_sort,
                 if first_and_last_bounds:
                     first, last = hfl_cache.flb.get(key, (None, None))
                     create_flb = first is None
+
+                if create_hash or create_fl or create_flb:
+                    store_key = hfl_cache.store_key(
+                        key,
+                        (type(partition.subarray).__name__,
+                         partition.axes, partition.flip,
+                         repr(partition.Units),
+                         d._axes, d._flip(), d.dtype.str, d.shape,
+                         repr(d.Units), repr(canonical_units),
+                         None if null_sort else _sort_indices_to_list(sort_indices)))
     #--- End: if
 
     if create_hash or create_fl or create_flb:
-        # Change the data type if required
-        if d.dtype.char not in ('d', 'S', 'U'):
-            d = d.copy()
-            d.dtype = _dtype_float
-        
-        # Change the units to the canonical ones
-        units = d.Units
-        d.Units = canonical_units
-        
-        # Get the data array
-        if null_sort:
-            array = d.array
+        stored = None
+        if store_key is not None:
+            stored = hfl_cache.load(store_key)
+
+        if stored is not None:
+            # Use the array from the persistent store
+            exact_hash_value, array = stored
         else:
-            array = d.array[sort_indices]
+            # Change the data type if required
+            if d.dtype.char not in ('d', 'S', 'U'):
+                d = d.copy()
+                d.dtype = _dtype_float
             
-        # Reinstate the original units
-        d.Units = units
+            # Change the units to the canonical ones
+            units = d.Units
+            d.Units = canonical_units
+            
+            # Get the data array
+            if null_sort:
+                array = d.array
+            else:
+                array = d.array[sort_indices]
+                
+            # Reinstate the original units
+            d.Units = units
+
+            if create_hash or store_key is not None:
+                exact_hash_value = hash_array(array)
+
+            if store_key is not None:
+                hfl_cache.save(store_key, exact_hash_value, array)
+        #--- End: if
 
         if create_hash:
-            hash_value = hash_array(array)
+            hash_value = exact_hash_value
 
             if hash_value not in hfl_cache.hash_to_array:
                 # Compare arrays, overriding hash value
-                found_close = False
-                for hash_value0, array0 in hfl_cache.hash_to_array.items():
-
-                    if array0.shape != array.shape:
-                        continue
-
-                    if array0.shape != array.shape:
-                        continue
-
-                    if _numpy_allclose(array0, array, rtol=rtol, atol=atol):
-                        hash_value = hash_value0
-                        found_close = True
-                        break
-                #--- End: for
-
-                if not found_close:
-                    hfl_cache.hash_to_array[hash_value] = array
-            else:
-                pass
+                hash_value0 = hfl_cache.close_hash_value(array, rtol, atol)
+                if hash_value0 is not None:
+                    hash_value = hash_value0
+                else:
+                    hfl_cache.add_array(hash_value, array)
 
             hfl_cache.hash[key] = hash_value                    
         #--- End: if
@@ -2637,19 +3148,46 @@ by the canonical first values of their 1-d coordinates.
     return True
 #--- End: def
 
-def _aggregate_2_fields(m0, m1,
-                        rtol=None, atol=None,
-                        info=0,    
-                        concatenate=True,
-                        copy=True,
+def _concatenate_hash_values(hash_values):
+    '''Concatenate a sequence of tuples, or lists, of hash values.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        hash_values: sequence of `tuple` or `list`
+
+    :Returns:
+
+        `tuple` or `list`
+            The concatenated hash values, of the same type as the
+            first element of *hash_values*.
+
+    '''
+    return type(hash_values[0])(chain.from_iterable(hash_values))
+
+
+def _aggregate_fields(m,
+                      rtol=None, atol=None,
+                      info=0,
+                      concatenate=True,
+                      copy=True,
 ):
-    '''TODO
+    '''Aggregate a group of fields along their aggregating axis.
+
+    All of the fields are combined at once, so that each construct
+    which spans the aggregating axis, and the field's data, is created
+    with a single concatenation.
+
+    .. versionadded:: 3.0.7
 
     :Parameters:
     
-        m0: `_Meta`
-    
-        m1: `_Meta`
+        m: sequence of `_Meta`
+            The fields to be aggregated, sorted by the canonical first
+            values of their 1-d coordinates for the aggregating
+            axis. The field of the first element is modified in place
+            to become the aggregated field.
     
         rtol: `float`, optional
             See the `cf.aggregate` function for details.
@@ -2660,296 +3198,276 @@ def _aggregate_2_fields(m0, m1,
         info: `int`, optional
             See the `cf.aggregate` function for details.
        
+        concatenate: `bool`, optional
+            See the `cf.aggregate` function for details.
+       
+        copy: `bool`, optional
+            If False then the fields of all but the first element of
+            *m* may be changed in place.
+       
     :Returns:
     
-        out: `_Meta` or `bool`
+        `_Meta`
+            The first element of *m*, containing the aggregated
+            field.
 
     ''' 
-#    if copy and not m0.aggregated_field:
-#        m0.field = m0.field.copy()
-
+    m0 = m[0]
+    m  = m[1:]
+    
     a_identity = m0.a_identity
     
-    # Still here?
     field0 = m0.field
-    field1 = m1.field
-    if copy:
-        field1 = field1.copy()
-
-    # ----------------------------------------------------------------
-    # Map the axes of field1 to those of field0
-    # ----------------------------------------------------------------
-    dim1_name_map = {}
-    for identity in m0.axis_ids:
-        dim1_name_map[m1.id_to_axis[identity]] = m0.id_to_axis[identity]
-        
-    dim0_name_map = {}
-    for axis1, axis0 in dim1_name_map.items():
-        dim0_name_map[axis0] = axis1        
 
     # ----------------------------------------------------------------
-    # In each field, find the identifier of the aggregating axis.
+    # In field0, find the identifier of the aggregating axis.
     # ----------------------------------------------------------------
     adim0 = m0.id_to_axis[a_identity]
-    adim1 = m1.id_to_axis[a_identity]
 
-    # ----------------------------------------------------------------
-    # Make sure that, along the aggregating axis, field1 runs in the
-    # same direction as field0
-    # ----------------------------------------------------------------
     direction0 = field0.direction(adim0)
-    if field1.direction(adim1) != direction0:
-        field1.flip(adim1, inplace=True)
+
+    fields1        = []
+    dim0_name_maps = []
+    dim1_name_maps = []
+    for m1 in m:
+        field1 = m1.field
+        if copy:
+            field1 = field1.copy()
+
+        # ------------------------------------------------------------
+        # Map the axes of field1 to those of field0
+        # ------------------------------------------------------------
+        dim1_name_map = {}
+        for identity in m0.axis_ids:
+            dim1_name_map[m1.id_to_axis[identity]] = m0.id_to_axis[identity]
+        
+        dim0_name_map = {}
+        for axis1, axis0 in dim1_name_map.items():
+            dim0_name_map[axis0] = axis1        
+
+        # ------------------------------------------------------------
+        # Make sure that, along the aggregating axis, field1 runs in
+        # the same direction as field0
+        # ------------------------------------------------------------
+        adim1 = m1.id_to_axis[a_identity]
+        if field1.direction(adim1) != direction0:
+            field1.flip(adim1, inplace=True)
+
+        fields1.append(field1)
+        dim0_name_maps.append(dim0_name_map)
+        dim1_name_maps.append(dim1_name_map)
+    #--- End: for
 
     # ----------------------------------------------------------------
-    # Find matching pairs of coordinates and cell measures which span
-    # the aggregating axis
+    # Find matching coordinates and cell measures which span the
+    # aggregating axis, and concatenate their hash values
     # ----------------------------------------------------------------
     # 1-d coordinates
-    spanning_variables = [(key0, key1, field0.constructs[key0], field1.constructs[key1])
-                          for key0, key1 in zip(m0.axis[a_identity]['keys'],
-                                                m1.axis[a_identity]['keys'])] 
+    spanning_variables = [
+        (key0, [m1.axis[a_identity]['keys'][i] for m1 in m])
+        for i, key0 in enumerate(m0.axis[a_identity]['keys'])]
 
     hash_values0 = m0.hash_values[a_identity]
-    hash_values1 = m1.hash_values[a_identity]
-
-    for i, (hash0, hash1) in enumerate(zip(hash_values0, hash_values1)):
-#        try:
-#            hash_values0[i].append(hash_values1[i])
-#        except AttributeError:
-#            hash_values0[i] = [hash_values0[i], hash_values1[i]]
-        hash_values0[i] = hash_values0[i] + hash_values1[i]
+    for i, hash0 in enumerate(hash_values0):
+        hash_values0[i] = _concatenate_hash_values(
+            [hash0] + [m1.hash_values[a_identity][i] for m1 in m])
 
     # N-d auxiliary coordinates
     for identity in m0.nd_aux:
         aux0 = m0.nd_aux[identity]
-        aux1 = m1.nd_aux[identity]
         if a_identity in aux0['axes']:
-            key0 = aux0['key']
-            key1 = aux1['key']
-            spanning_variables.append((key0, key1,
-                                       field0.constructs[key0],
-                                       field1.constructs[key1]))
-
-            hash_value0 = aux0['hash_value']
-            hash_value1 = aux1['hash_value']
-
-#            try:
-#                hash_value0.append(hash_value1)
-#            except AttributeError:
-            aux0['hash_value'] = hash_value0 + hash_value1
+            spanning_variables.append(
+                (aux0['key'], [m1.nd_aux[identity]['key'] for m1 in m]))
+
+            aux0['hash_value'] = _concatenate_hash_values(
+                [aux0['hash_value']] +
+                [m1.nd_aux[identity]['hash_value'] for m1 in m])
     #--- End: for
     
     # Cell measures                
     for units in m0.msr:
         hash_values0 = m0.msr[units]['hash_values']
-        hash_values1 = m1.msr[units]['hash_values']
-        for i, (axes, key0, key1) in enumerate(zip(m0.msr[units]['axes'],
-                                                    m0.msr[units]['keys'],
-                                                    m1.msr[units]['keys'])):
+        for i, (axes, key0) in enumerate(zip(m0.msr[units]['axes'],
+                                             m0.msr[units]['keys'])):
             if a_identity in axes:
-                spanning_variables.append((key0, key1,
-                                           field0.constructs[key0],
-                                           field1.constructs[key1]))
-
-#                try:
-#                    hash_values0[i].append(hash_values1[i])
-#                except AttributeError:
-                hash_values0[i] = hash_values0[i] + hash_values1[i]
-    #--- End: for
+                spanning_variables.append(
+                    (key0, [m1.msr[units]['keys'][i] for m1 in m]))
 
-    # Field ancillaries
-    for identity in m0.field_anc:
-        anc0 = m0.field_anc[identity]
-        anc1 = m1.field_anc[identity]
-        if a_identity in anc0['axes']:
-            key0 = anc0['key']
-            key1 = anc1['key']
-            spanning_variables.append((key0, key1,
-                                       field0.constructs[key0],
-                                       field1.constructs[key1]))
-
-            hash_value0 = anc0['hash_value']
-            hash_value1 = anc1['hash_value']
-#            try:
-#                hash_value0.append(hash_value1)
-#            except AttributeError:
-            anc0['hash_value'] = hash_value0 + hash_value1
+                hash_values0[i] = _concatenate_hash_values(
+                    [hash_values0[i]] +
+                    [m1.msr[units]['hash_values'][i] for m1 in m])
     #--- End: for
 
-    # Domain ancillaries
-    for identity in m0.domain_anc:
-        anc0 = m0.domain_anc[identity]
-        anc1 = m1.domain_anc[identity]
-        if a_identity in anc0['axes']:
-            key0 = anc0['key']
-            key1 = anc1['key']
-            spanning_variables.append((key0, key1,
-                                       field0.constructs[key0],
-                                       field1.constructs[key1]))
-
-            hash_value0 = anc0['hash_value']
-            hash_value1 = anc1['hash_value']
-#            try:
-#                hash_value0.append(hash_value1)
-#            except AttributeError:
-            anc0['hash_value'] = hash_value0 + hash_value1
+    # Field and domain ancillaries
+    for anc_type in ('field_anc', 'domain_anc'):
+        ancillaries0 = getattr(m0, anc_type)
+        for identity in ancillaries0:
+            anc0 = ancillaries0[identity]
+            if a_identity in anc0['axes']:
+                ancillaries1 = [getattr(m1, anc_type)[identity] for m1 in m]
+                spanning_variables.append(
+                    (anc0['key'], [anc1['key'] for anc1 in ancillaries1]))
+                
+                anc0['hash_value'] = _concatenate_hash_values(
+                    [anc0['hash_value']] +
+                    [anc1['hash_value'] for anc1 in ancillaries1])
+        #--- End: for
     #--- End: for
 
     # ----------------------------------------------------------------
-    # For each matching pair of coordinates, cell measures, field and
-    # domain ancillaries which span the aggregating axis, insert the
-    # one from field1 into the one from field0
+    # For each matching set of coordinates, cell measures, field and
+    # domain ancillaries which span the aggregating axis, concatenate
+    # those from the other fields to the one from field0
     # ----------------------------------------------------------------
-    for key0, key1, construct0, construct1 in spanning_variables:
+    for key0, keys1 in spanning_variables:
+        construct0 = field0.constructs[key0]
         construct_axes0 = field0.get_data_axes(key0)
-        construct_axes1 = field1.get_data_axes(key1)
 
-        # Ensure that the axis orders are the same in both constructs
-        iaxes = [construct_axes1.index(dim0_name_map[axis0]) for axis0 in construct_axes0]
-        construct1.transpose(iaxes, inplace=True)
+        has_bounds = construct0.has_bounds()
 
+        data   = [construct0.get_data()]
+        bounds = [construct0.bounds.get_data()] if has_bounds else None
+        
+        for field1, key1, dim0_name_map in zip(fields1, keys1,
+                                               dim0_name_maps):
+            construct1 = field1.constructs[key1]
+            construct_axes1 = field1.get_data_axes(key1)
+
+            # Ensure that the axis orders are the same in both
+            # constructs
+            iaxes = [construct_axes1.index(dim0_name_map[axis0])
+                     for axis0 in construct_axes0]
+            construct1.transpose(iaxes, inplace=True)
+
+            data.append(construct1.get_data())
+            if has_bounds:
+                bounds.append(construct1.bounds.get_data())
+        #--- End: for
+        
         # Find the position of the concatenating axis
         axis = construct_axes0.index(adim0)
 
         if direction0:
             # The fields are increasing along the aggregating axis
-            data = Data.concatenate((construct0.get_data(), construct1.get_data()), axis,
-                                    _preserve=False)
+            data = Data.concatenate(data, axis, _preserve=False)
             construct0.set_data(data, copy=False)
-            if construct0.has_bounds():            
-                data = Data.concatenate((construct0.bounds.get_data(), construct1.bounds.get_data()),
-                                        axis, _preserve=False)
+            if has_bounds:
+                data = Data.concatenate(bounds, axis, _preserve=False)
                 construct0.bounds.set_data(data, copy=False)
         else:
             # The fields are decreasing along the aggregating axis
-            data = Data.concatenate((construct1.get_data(), construct0.get_data()), axis,
-                                    _preserve=False)
+            data = Data.concatenate(data[::-1], axis, _preserve=False)
             construct0.set_data(data)
-            if construct0.has_bounds():            
-                data = Data.concatenate((construct1.bounds.get_data(), construct0.bounds.get_data()),
-                                        axis, _preserve=False)
+            if has_bounds:
+                data = Data.concatenate(bounds[::-1], axis,
+                                        _preserve=False)
                 construct0.bounds.set_data(data)
     #--- End: for        
         
     # ----------------------------------------------------------------
-    # Insert the data array from field1 into the data array of field0
+    # Concatenate the data arrays from the other fields to the data
+    # array of field0
     # ----------------------------------------------------------------
     if m0.has_data:
         data_axes0 = list(field0.get_data_axes())
-        data_axes1 = list(field1.get_data_axes())
 
-        # Ensure that both data arrays span the same axes, including
+        # Ensure that all data arrays span the same axes, including
         # the aggregating axis.
-        for axis1 in data_axes1:
-            axis0 = dim1_name_map[axis1]
-            if axis0 not in data_axes0:
-                field0.insert_dimension(axis0, position=0, inplace=True)
-                data_axes0.insert(0, axis0)
+        for field1, dim1_name_map in zip(fields1, dim1_name_maps):
+            for axis1 in field1.get_data_axes():
+                axis0 = dim1_name_map[axis1]
+                if axis0 not in data_axes0:
+                    field0.insert_dimension(axis0, position=0, inplace=True)
+                    data_axes0.insert(0, axis0)
         #--- End: for
         
-        for axis0 in data_axes0:
-            axis1 = dim0_name_map[axis0]
-            if axis1 not in data_axes1:
-                field1.insert_dimension(axis1, position=0, inplace=True)
-        #--- End: for
-                
-        # Find the position of the concatenating axis
         if adim0 not in data_axes0:
             # Insert the aggregating axis at position 0 because is not
-            # already spanned by either data arrays
+            # already spanned by any of the data arrays
             field0.insert_dimension(adim0, position=0, inplace=True)
-            field1.insert_dimension(adim1, position=0, inplace=True)
-            axis = 0
-        else:            
-            axis = data_axes0.index(adim0)
-
-        # Get the data axes again, in case we've inserted new dimensions            
+            
+        # Get the data axes again, in case we've inserted new dimensions
         data_axes0 = field0.get_data_axes()
-        data_axes1 = field1.get_data_axes()
+
+        # Find the position of the concatenating axis
+        axis = data_axes0.index(adim0)
+
+        data = [field0.get_data()]
+        size = 0
+        for field1, m1, dim0_name_map in zip(fields1, m, dim0_name_maps):
+            data_axes1 = field1.get_data_axes()
+            for axis0 in data_axes0:
+                axis1 = dim0_name_map[axis0]
+                if axis1 not in data_axes1:
+                    field1.insert_dimension(axis1, position=0, inplace=True)
+            #--- End: for
+            
+            data_axes1 = field1.get_data_axes()
             
-        # Ensure that the axis orders are the same in both fields
-        transpose_axes1 = [dim0_name_map[axis0] for axis0 in data_axes0]
-        if transpose_axes1 != data_axes1:
-            field1.transpose(transpose_axes1, inplace=True)
+            # Ensure that the axis orders are the same in both fields
+            transpose_axes1 = [dim0_name_map[axis0] for axis0 in data_axes0]
+            if transpose_axes1 != data_axes1:
+                field1.transpose(transpose_axes1, inplace=True)
 
-        if direction0:
-            # The fields are increasing along the aggregating axis
-            data = Data.concatenate((field0.get_data(), field1.get_data()),
-                                    axis, _preserve=False)
-        else:
+            data.append(field1.get_data())
+            size += field1.constructs[m1.id_to_axis[a_identity]].get_size()
+        #--- End: for
+
+        if not direction0:
             # The fields are decreasing along the aggregating axis
-            data = Data.concatenate((field1.get_data(), field0.get_data()), axis,
-                                    _preserve=False)
+            data = data[::-1]
+            
+        data = Data.concatenate(data, axis, _preserve=False)
 
         # Update the size of the aggregating axis in field0
         domain_axis = field0.constructs[adim0]
-        domain_axis += field1.constructs[adim1].get_size()
+        domain_axis += size
 
         # Insert the concatentated data into the field
         field0.set_data(data, set_axes=False, copy=False)
     #--- End: if
 
-    # Make sure that field0 has a standard_name, if possible.
-    if getattr(field0, 'id', None) is not None:
-        standard_name = field1.get_property('standard_name', None)
-        if standard_name is not None:
-            field0.set_property('standard_name', standard_name)
-            del field0.id
-    #--- End: if
-
-    #-----------------------------------------------------------------
-    # Update the properties in field0
-    #-----------------------------------------------------------------
-    for prop in set(field0.properties()).difference(field0._special_properties):
-        value0 = field0.get_property(prop, None)
-        value1 = field1.get_property(prop, None)
-        
-        if prop in ('valid_min', 'valid_max', 'valid_range'):
-            if not m0.respect_valid:
-                field0.del_property(prop, None) 
-
-            continue
-             
-        if prop in ('_FillValue', 'missing_value'):
-            continue
-        
-        # Still here?  
-        if field0._equals(value0, value1):
-            continue
-               
-        if concatenate:
-            if value1 is not None:
+    for field1 in fields1:
+        # Make sure that field0 has a standard_name, if possible.
+        if getattr(field0, 'id', None) is not None:
+            standard_name = field1.get_property('standard_name', None)
+            if standard_name is not None:
+                field0.set_property('standard_name', standard_name)
+                del field0.id
+        #--- End: if
+    
+        #-------------------------------------------------------------
+        # Update the properties in field0
+        #-------------------------------------------------------------
+        for prop in set(field0.properties()).difference(field0._special_properties):
+            value0 = field0.get_property(prop, None)
+            value1 = field1.get_property(prop, None)
+            
+            if prop in ('valid_min', 'valid_max', 'valid_range'):
+                if not m0.respect_valid:
+                    field0.del_property(prop, None) 
+    
+                continue
+                 
+            if prop in ('_FillValue', 'missing_value'):
+                continue
+            
+            # Still here?  
+            if field0._equals(value0, value1):
+                continue
+                   
+            if concatenate:
+                if value1 is not None:
+                    if value0 is not None:
+                        field0.set_property(prop, '%s :AGGREGATED: %s' % (value0, value1))
+                    else:
+                        field0.set_property(prop, ' :AGGREGATED: %s' % value1)
+            else:
                 if value0 is not None:
-                    field0.set_property(prop, '%s :AGGREGATED: %s' % (value0, value1))
-                else:
-                    field0.set_property(prop, ' :AGGREGATED: %s' % value1)
-        else:
-            if value0 is not None:
-                field0.del_property(prop)            
+                    field0.del_property(prop)            
+        #--- End: for
     #--- End: for
 
-#    #-----------------------------------------------------------------
-#    # Update the attributes in field0
-#    #-----------------------------------------------------------------
-#    for attr in m0.attributes | m1.attributes: ppp
-#        value0 = getattr(field0, attr, None)
-#        value1 = getattr(field1, attr, None)
-#        if equals(value0, value1):
-#            continue
-#
-#        if concatenate:
-#            if value1 is not None:
-#                if value0 is not None:
-#                    setattr(field0, attr, '%s :AGGREGATED: %s' % (value0, value1))
-#                else:
-#                    setattr(field0, attr, ' :AGGREGATED: %s' % value1)
-#        else:
-#            m0.attributes.discard(attr)
-#            if value0 is not None:
-#                delattr(field0, attr)
-#    #--- End: for
-
     # Note that the field in this _Meta object has already been
     # aggregated
     m0.aggregated_field = True
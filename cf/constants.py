@@ -1,5 +1,6 @@
 import sys
 
+from collections import OrderedDict
 from psutil   import virtual_memory
 from tempfile import gettempdir
 
@@ -94,6 +95,57 @@ _TOTAL_MEMORY = float(virtual_memory().total)
 #           this is 0 to try and automatically determine which mode to
 #           use.
 #
+#        FREE_MEMORY_REFRESH_INTERVAL : float
+#           The maximum time, in seconds, between probes of the
+#           available physical memory when deciding whether or not to
+#           keep partitions in memory.
+#
+#        FREE_MEMORY_REFRESH_NBYTES : float
+#           The number of bytes that may be kept in memory by
+#           partitions before the available physical memory is probed
+#           again.
+#
+#        PARTITION_WORKERS : int
+#           The number of threads used to process independent
+#           partitions concurrently. By default this is 1, i.e. the
+#           partitions are processed serially.
+#
+#        COLLAPSE_PROCESSES : int
+#           The number of processes used to collapse partitions whose
+#           data are on disk. By default this is 1, i.e. no worker
+#           processes are used.
+#
+#        AGGREGATE_CACHE_DIR : str or None
+#           The directory of the persistent cache of coordinate arrays
+#           and their hash values used during aggregation. By default
+#           it is None, i.e. there is no persistent cache.
+#
+#        UM_INDEX_DIR : str or None
+#           The directory of the index files of parsed PP and UM
+#           fields file headers. By default it is None, i.e. headers
+#           are always parsed from the files.
+#
+#        LAZY_OPERATIONS : bool
+#           Whether or not to defer element-wise operations on data
+#           arrays until their partitions are next accessed. By
+#           default operations are applied immediately.
+#
+#        CACHED_ARRAY_MMAP : bool
+#           Whether or not to memory map the temporary files of
+#           partitions that have been cached to disk, so that only the
+#           parts of a file which are indexed are read. By default
+#           memory mapping is enabled.
+#
+#        WEIGHTS_CACHE_SIZE : int
+#           The maximum number of weights components created from the
+#           bounds of dimension coordinate constructs which are kept
+#           for reuse. By default it is 128.
+#
+#        PERCENTILE_ACCURACY : float
+#           The relative accuracy of percentiles, and of the medians
+#           and upper deciles found from them. By default it is 0,
+#           i.e. percentiles are exact.
+#
 # --------------------------------------------------------------------
 CONSTANTS = {'RTOL'                  : sys.float_info.epsilon,
              'ATOL'                  : sys.float_info.epsilon,
@@ -105,6 +157,16 @@ CONSTANTS = {'RTOL'                  : sys.float_info.epsilon,
              'WORKSPACE_FACTOR_2'    : 8.0,
              'REGRID_LOGGING'        : False,
              'COLLAPSE_PARALLEL_MODE': 0,
+             'CACHED_ARRAY_MMAP'     : True,
+             'PARTITION_WORKERS'     : 1,
+             'COLLAPSE_PROCESSES'    : 1,
+             'LAZY_OPERATIONS'       : False,
+             'AGGREGATE_CACHE_DIR'   : None,
+             'UM_INDEX_DIR'          : None,
+             'PERCENTILE_ACCURACY'   : 0.0,
+             'WEIGHTS_CACHE_SIZE'    : 128,
+             'FREE_MEMORY_REFRESH_INTERVAL': 0.1,
+             'FREE_MEMORY_REFRESH_NBYTES'  : 2.0**27,
              'RELAXED_IDENTITIES'    : False,
              'IGNORE_IDENTITIES'     : False,
              }
@@ -122,6 +184,31 @@ repr_suffix = ''
 
 _file_to_fh = {}
 
+# --------------------------------------------------------------------
+# The open files in _file_to_fh in least recently used order, keyed by
+# (file_format, filename) tuples, and the pool's access counters.
+# --------------------------------------------------------------------
+_file_to_fh_lru = OrderedDict()
+
+_file_to_fh_statistics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+# --------------------------------------------------------------------
+# The number of parallel collapses and, for each rank, the total time
+# spent processing partitions and the total estimated cost of the
+# partitions processed.
+# --------------------------------------------------------------------
+_collapse_statistics = {'collapses': 0, 'time': [], 'cost': []}
+
+# --------------------------------------------------------------------
+# Weights components created from the bounds of dimension coordinate
+# constructs in least recently used order, keyed by the hashes of the
+# bounds and the parameters used to create them, and the cache's
+# access counters.
+# --------------------------------------------------------------------
+_weights_cache = OrderedDict()
+
+_weights_cache_statistics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
 _stash2standard_name = {}
 
 #---------------------------------------------------------------------
@@ -1,13 +1,17 @@
 from os       import close
+from os.path  import splitext
 from tempfile import mkstemp
 from tempfile import mkdtemp
 
+from numpy import array   as numpy_array
 from numpy import load    as numpy_load
+from numpy import memmap  as numpy_memmap
 from numpy import ndarray as numpy_ndarray
 from numpy import save    as numpy_save
 
-from numpy.ma import array      as numpy_ma_array
-from numpy.ma import is_masked  as numpy_ma_is_masked
+from numpy.ma import array        as numpy_ma_array
+from numpy.ma import getmaskarray as numpy_ma_getmaskarray
+from numpy.ma import is_masked    as numpy_ma_is_masked
 
 import cfdm
 
@@ -17,6 +21,32 @@ from ..functions import parse_indices, get_subspace
 from ..constants import CONSTANTS
 
 
+def _mask_file(partition_file):
+    '''The name of the temporary file which stores the mask of a cached
+    array.
+
+    :Parameters:
+
+        partition_file: `str`
+            The name of the temporary file storing the cached array's
+            data.
+
+    :Returns:
+
+        `str`
+            The name of the temporary file storing the cached array's
+            mask. The file only exists if the array has masked
+            elements.
+
+    **Examples:**
+
+    >>> _mask_file('/tmp/cf_cachedarray_x8h/cf_cachedarray_GJ1n.npy')
+    '/tmp/cf_cachedarray_x8h/cf_cachedarray_GJ1n_mask.npy'
+
+    '''
+    return splitext(partition_file)[0] + '_mask.npy'
+
+
 class CachedArray(abstract.FileArray):
     '''A indexable N-dimensional array supporting masked values.
 
@@ -24,6 +54,10 @@ class CachedArray(abstract.FileArray):
     accessed. The directory containing the temporary file may be found
     and set with the `cf.TEMPDIR` function.
 
+    A masked array is stored as two temporary files, one for the data
+    and one for the boolean mask, so that both may be memory mapped
+    when read (see `cf.CACHED_ARRAY_MMAP`).
+
     '''
     def __init__(self, array):
         '''**Initialization**
@@ -67,13 +101,15 @@ class CachedArray(abstract.FileArray):
         self._set_component('ndim', array.ndim)
 
         if numpy_ma_is_masked(array):
-            # Array is a masked array. Save it as record array with
-            # 'data' and 'mask' elements because this seems much
-            # faster than using numpy.ma.dump.
-            self._set_component('_masked_as_record', True)
-            numpy_save(_partition_file, array.toflex())
+            # Array is a masked array. Save its data and mask to
+            # separate files, rather than as a single record array,
+            # so that each one may be memory mapped when read.
+            self._set_component('_masked', True)
+            numpy_save(_partition_file, array.view(numpy_ndarray))
+            numpy_save(_mask_file(_partition_file),
+                       numpy_ma_getmaskarray(array))
         else:
-            self._set_component('_masked_as_record', False)
+            self._set_component('_masked', False)
             if hasattr(array, 'mask'):
                 # Array is a masked array with no masked elements
                 numpy_save(_partition_file, array.view(numpy_ndarray))
@@ -86,18 +122,23 @@ class CachedArray(abstract.FileArray):
         '''x.__getitem__(indices) <==> x[indices]
 
     Returns a numpy array.
+
+    If `cf.CACHED_ARRAY_MMAP` is True then the temporary files are
+    memory mapped, so that only the parts of them spanned by the
+    indices are read from disk.
         
         '''
-        array = numpy_load(self._partition_file)
+        array = self._load(self._partition_file)
 
         indices = parse_indices(array.shape, indices)
 
-        array = get_subspace(array, indices)
+        array = self._subspace(array, indices)
 
-        if self._get_component('_masked_as_record'):
-            # Convert a record array to a masked array
-            array = numpy_ma_array(array['_data'], mask=array['_mask'],
-                                   copy=False)
+        if self._get_component('_masked'):
+            # Combine the data with the mask stored in its own file
+            mask = self._load(_mask_file(self._partition_file))
+            mask = self._subspace(mask, indices)
+            array = numpy_ma_array(array, mask=mask, copy=False)
             array.shrink_mask()
 
         # Return the numpy array
@@ -130,4 +171,59 @@ class CachedArray(abstract.FileArray):
         return self._get_component('_partition_file')
 
 
+    # ----------------------------------------------------------------
+    # Private methods
+    # ----------------------------------------------------------------
+    def _load(self, filename):
+        '''Load an array from a temporary file.
+
+    The array is memory mapped if `cf.CACHED_ARRAY_MMAP` is True and
+    the array is non-empty and does not contain Python objects, which
+    can not be memory mapped.
+
+    :Parameters:
+
+        filename: `str`
+            The temporary file.
+
+    :Returns:
+
+        `numpy.ndarray` or `numpy.memmap`
+
+        '''
+        if (CONSTANTS['CACHED_ARRAY_MMAP'] and self.size and
+            not self.dtype.hasobject):
+            return numpy_load(filename, mmap_mode='r')
+
+        return numpy_load(filename)
+
+
+    @staticmethod
+    def _subspace(array, indices):
+        '''Subspace a loaded array, reading only the indexed elements
+    from a memory mapped file.
+
+    :Parameters:
+
+        array: `numpy.ndarray` or `numpy.memmap`
+
+        indices: `list`
+
+    :Returns:
+
+        `numpy.ndarray`
+            The subspace, which is independent of any memory map.
+
+        '''
+        array = get_subspace(array, indices)
+
+        if isinstance(array, numpy_memmap):
+            # Copy just the indexed elements out of the memory map so
+            # that the result is writeable and the temporary file may
+            # be safely removed
+            array = numpy_array(array)
+
+        return array
+
+
 #--- End: class
@@ -9,8 +9,10 @@ from numpy import array       as numpy_array
 from numpy import asanyarray  as numpy_asanyarray
 from numpy import average     as numpy_average
 from numpy import bool_       as numpy_bool_
+from numpy import broadcast_to as numpy_broadcast_to
 from numpy import copy        as numpy_copy
 from numpy import empty       as numpy_empty
+from numpy import errstate    as numpy_errstate
 from numpy import expand_dims as numpy_expand_dims
 from numpy import integer     as numpy_integer
 from numpy import maximum     as numpy_maximum
@@ -24,6 +26,8 @@ import numpy
 from numpy.ma import array        as numpy_ma_array
 from numpy.ma import average      as numpy_ma_average
 from numpy.ma import expand_dims  as numpy_ma_expand_dims
+from numpy.ma import filled       as numpy_ma_filled
+from numpy.ma import getmaskarray as numpy_ma_getmaskarray
 from numpy.ma import isMA         as numpy_ma_isMA
 from numpy.ma import masked       as numpy_ma_masked
 from numpy.ma import masked_less  as numpy_ma_masked_less
@@ -844,7 +848,11 @@ def sum_f(a, axis=None, weights=None, masked=False):
         weights = double_precision(weights)
 
         if weights.ndim < a.ndim:
-            weights = broadcast_array(weights, a.shape)
+            if numpy_ma_isMA(weights):
+                weights = broadcast_array(weights, a.shape)
+            else:
+                # A read-only view which is never written to
+                weights = numpy_broadcast_to(weights, a.shape)
 
         a = a * weights
         
@@ -926,7 +934,11 @@ def sw_f(a, axis=None, masked=False, weights=None, N=None,
         weights = double_precision(weights)
 
         if weights.ndim < a.ndim:
-            weights = broadcast_array(weights, a.shape)
+            if numpy_ma_isMA(weights):
+                weights = broadcast_array(weights, a.shape)
+            else:
+                # A read-only view which is never written to
+                weights = numpy_broadcast_to(weights, a.shape)
 
         if masked:
             weights = numpy_ma_array(weights, mask=a.mask, copy=False)
@@ -960,14 +972,20 @@ sw2_ffinalise = sum_ffinalise
 # Variance
 #---------------------------------------------------------------------
 def var_f(a, axis=None, weights=None, masked=False, ddof=0):
-    '''TODO
+    '''Return the partial statistics from which the variance of an
+    array, or the variances along an axis, may be found.
+
+    The sum of the squared deviations from the mean is found with the
+    corrected two-pass algorithm, accumulating in double precision
+    without first converting the whole array to double precision. The
+    statistics of different partitions are combined by `var_fpartial`.
 
     ========  ============================================================
     Variable  Description
     ========  ============================================================
     N         Sample size
     
-    var       Sample variance (ddof=0)
+    M2        Weighted sum of squared deviations from the mean
     
     avg       Weighted mean
     
@@ -979,180 +997,217 @@ def var_f(a, axis=None, weights=None, masked=False, ddof=0):
     
     weighted  Whether or not the sample is weighted
     ========  ============================================================
+
+    :Parameters:
+    
+        a: array-like
+            Input array. Not all missing data.
+    
+        axis: `int`, optional
+            Axis along which to operate. By default, flattened input
+            is used.
+    
+        weights: array-like, optional
+    
+        masked: `bool`, optional
+    
+        ddof: number, optional
     
     :Returns:
 
-        out: `tuple`
+        out: 7-`tuple`
+            ``(N, M2, avg, V1, V2, ddof, weighted)``. Where there are
+            no non-missing values, *M2*, *avg*, *V1* and *V2* are
+            masked.
     
     '''
-    # Make sure that a is double precision
-    a = double_precision(a)
-    
     weighted = weights is not None
 
-    # ----------------------------------------------------------------
-    # Methods:
-    #
-    # http://en.wikipedia.org/wiki/Standard_deviation#Population-based_statistics
-    # https://en.wikipedia.org/wiki/Weighted_arithmetic_mean#Weighted_sample_variance
-    # ----------------------------------------------------------------
-
-    # Calculate N   = number of data points
-    # Calculate avg = mean of data
-    # Calculate V1  = sum of weights
-    N, avg, V1 = mean_f(a, weights=weights, axis=axis, masked=masked)
+    N, = sample_size_f(a, axis=axis, masked=masked)
 
-    # Calculate V2 = sum of squares of weights
-    if weighted and ddof == 1:
-        N, V2 = sw2_f(a, axis=axis, masked=masked, weights=weights, N=N)
-    else:
-        V2 = None
-
-    if axis is not None and avg.size > 1:
-        # We collapsed over a single axis and the array has 2 or more
-        # axes, so add an extra size 1 axis to the mean so that
-        # broadcasting works when we calculate the variance.
-        reshape_avg = True
+    valid = None
+    if numpy_ma_isMA(a):
         if masked:
-            expand_dims = numpy_ma_expand_dims
+            valid = ~numpy_ma_getmaskarray(a)
+            # Zero the missing values, which may be NaN or infinite
+            # underneath the mask and so can't be removed by
+            # multiplying them by zero
+            a = numpy_where(valid, a.data, 0)
         else:
-            expand_dims = numpy_expand_dims
+            a = a.data
+    #--- End: if
+        
+    if weighted:
+        if numpy_ma_isMA(weights):
+            # Missing weights have already been applied to the array
+            weights = weights.filled(0)
+            
+        if valid is not None:
+            weights = numpy_where(valid, weights, 0)
+        elif weights.shape != a.shape:
+            weights = numpy_broadcast_to(weights, a.shape)
 
-        avg = expand_dims(avg, axis)
+        V1 = weights.sum(axis=axis, dtype=float)
+        avg = (weights * a).sum(axis=axis, dtype=float)
     else:
-        reshape_avg = False
+        V1 = N.copy()
+        avg = a.sum(axis=axis, dtype=float)
+    #--- End: if
 
-    var  = a - avg
-    var *= var
+    (V1, avg) = asanyarray(V1, avg)
 
-    if masked:
-        average = numpy_ma_average
-    else:
-        average = numpy_average
+    with numpy_errstate(divide='ignore', invalid='ignore'):
+        avg /= V1
 
-    var = average(var, axis=axis, weights=weights)
+        # ------------------------------------------------------------
+        # M2 = SUM(w*d**2) - SUM(w*d)**2/V1, where d = a - avg. The
+        # second term is zero in exact arithmetic, and corrects for
+        # the rounding errors in avg.
+        # ------------------------------------------------------------
+        if axis is not None:
+            d = a - numpy_expand_dims(avg, axis)
+        else:
+            d = a - avg
 
-    if reshape_avg:
-        shape = avg.shape        
-        avg = avg.reshape(shape[:axis] + shape[axis+1:])
+        if valid is not None:
+            d = numpy_where(valid, d, 0)
 
-    (N, var, avg, V1, V2) = asanyarray(N, var, avg, V1, V2)
+        if weighted:
+            wd = d * weights
+        else:
+            wd = d
 
-    return (N, var, avg, V1, V2, ddof, weighted)
+        c = wd.sum(axis=axis)
+        wd *= d
+        M2 = wd.sum(axis=axis)
+        M2 -= c * c / V1
 
+    M2 = numpy_maximum(M2, 0)
+        
+    # Calculate V2 = sum of squares of weights
+    if weighted and ddof == 1:
+        weights = weights * weights
+        V2 = weights.sum(axis=axis, dtype=float)
+    else:
+        V2 = None
 
-def var_fpartial(out, out1=None, group=False):
-    '''Return:
+    (N, M2, avg, V1, V2) = asanyarray(N, M2, avg, V1, V2)
 
-* The partial sum sample sizes
+    if valid is not None:
+        empty = (N == 0)
+        if empty.any():
+            M2  = numpy_ma_masked_where(empty, M2, copy=False)
+            avg = numpy_ma_masked_where(empty, avg, copy=False)
+            V1  = numpy_ma_masked_where(empty, V1, copy=False)
+            if V2 is not None:
+                V2 = numpy_ma_masked_where(empty, V2, copy=False)
+    #--- End: if
 
-* Partial sum of V1*(variance + mean^2)
+    return (N, M2, avg, V1, V2, ddof, weighted)
 
-* Unweighted partial sum
 
-========  ============================================================
-Variable  Description
-========  ============================================================
-N         Partial sample size
+def var_fpartial(out, out1=None, group=False):
+    '''Combine the partial statistics of two samples, from which the
+    variance may be found.
 
-var       Partial sum of V1*(variance + mean^2)
+    The statistics are combined with the pairwise update of Chan,
+    Golub and LeVeque. The partial statistics of a single sample, as
+    returned by `var_f`, and of a combination of samples have the same
+    form, so the *group* parameter is ignored.
 
-avg       Unweighted partial sum
+    https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Parallel_algorithm
 
-V1        Partial sum of weights
+    :Parameters:
 
-V2        Partial sum of squares of weights
+        out: 7-`tuple`
+            An output from `var_f` or `var_fpartial`. *Might be
+            updated in place*.
 
-ddof      Delta degrees of freedom
+        out1: 7-`tuple`, optional
+            An output from `var_f` or `var_fpartial`.
 
-weighted  Whether or not the population is weighted
-========  ============================================================
+        group: `bool`, optional
+            Ignored.
 
+    :Returns:
 
-https://en.wikipedia.org/wiki/Pooled_variance#Population-based_statistics
+        out: 7-`tuple`
+            ``(N, M2, avg, V1, V2, ddof, weighted)``, as described by
+            `var_f`.
 
-:Parameters:
+    '''
+    (N, M2, avg, V1, V2, ddof, weighted) = out
 
-    out: 7-`tuple`
+    if out1 is None:
+        return out
 
-    out1: 7-`tuple`, optional
+    (Nb, M2b, avgb, V1b, V2b, ddof, weighted) = out1
 
-:Returns:
+    # Where one sample has no values, its statistics are masked and
+    # the statistics of the other sample are used
+    if numpy_ma_isMA(avg) or numpy_ma_isMA(avgb):
+        mask = numpy_ma_getmaskarray(avg) & numpy_ma_getmaskarray(avgb)
+        (M2, avg, V1, M2b, avgb, V1b) = [
+            numpy_ma_filled(x, 0) for x in (M2, avg, V1, M2b, avgb, V1b)]
+    else:
+        mask = None
 
-    '''
-    (N, var, avg, V1, V2, ddof, weighted) = out
+    V = V1 + V1b
+    delta = avgb - avg
 
-    if out1 is None and not group:
-        # ------------------------------------------------------------
-        # var = V1(var+avg**2)
-        # avg = V1*avg = unweighted partial sum
-        # ------------------------------------------------------------
-        var += avg*avg
-        var *= V1
-        avg *= V1
-    else:       
-        # ------------------------------------------------------------
-        # var = var + V1b(varb+avgb**2)
-        # avg = avg + V1b*avgb
-        # V1  = V1 + V1b
-        # V2  = V2 + V2b
-        # ------------------------------------------------------------
-        (Nb, varb, avgb, V1b, V2b, ddof, weighted) = out1
+    with numpy_errstate(divide='ignore', invalid='ignore'):
+        f = V1b / V
+        M2 = M2 + M2b
+        M2 += delta * delta * V1 * f
+        avg = avg + delta * f
 
-        N = psum(N, Nb)
-        
-        if not group:
-            varb += avgb*avgb
-            varb *= V1b
-            avgb *= V1b
+    V1 = V
+    N = psum(N, Nb)
 
-        var = psum(var, varb)
-        avg = psum(avg, avgb)
-        V1  = psum(V1 , V1b)
+    if weighted and ddof == 1:
+        V2 = psum(V2, V2b)
 
-        if weighted and ddof == 1:
-            V2 = psum(V2, V2b)
-    #--- End: if
+    if mask is not None and mask.any():
+        M2  = numpy_ma_masked_where(mask, M2, copy=False)
+        avg = numpy_ma_masked_where(mask, avg, copy=False)
+        V1  = numpy_ma_masked_where(mask, V1, copy=False)
 
-    (N, var, avg, V1, V2) = asanyarray(N, var, avg, V1, V2)
+    (N, M2, avg, V1, V2) = asanyarray(N, M2, avg, V1, V2)
 
-    return (N, var, avg, V1, V2, ddof, weighted)
+    return (N, M2, avg, V1, V2, ddof, weighted)
 
 
 def var_ffinalise(out, sub_samples=None):
-    '''https://en.wikipedia.org/wiki/Pooled_variance#Population-based_statistics
+    '''Return the variance from the combined partial statistics.
+
+    Also mask out any values derived from a too-small sample size.
+    
+    :Parameters:
+    
+        out: 7-`tuple`
+            An output from `var_f` or `var_fpartial`.
+    
+        sub_samples: optional
+            Ignored.
+    
+    :Returns:
+    
+        out: 2-`tuple` of `numpy.ndarray`
+            The sample size and the variance.
 
     '''
-    (N, var, avg, V1, V2, ddof, weighted) = out
+    (N, M2, avg, V1, V2, ddof, weighted) = out
 
-    N, var = mask_where_too_few_values(max(2, ddof+1), N, var)
-    N, V1  = mask_where_too_few_values(max(2, ddof+1), N, V1)
+    N, M2 = mask_where_too_few_values(max(2, ddof+1), N, M2)
+    N, V1 = mask_where_too_few_values(max(2, ddof+1), N, V1)
     if V2 is not None:
         N, V2 = mask_where_too_few_values(max(2, ddof+1), N, V2)
 
-    if sub_samples:
-        # ----------------------------------------------------------------
-        # The global biased variance = {[SUM(pV1(pv+pm**2)]/V1} - m**2        
-        # 
-        #   where pV1 = partial sum of weights
-        #         pv  = partial biased variance 
-        #         pm  = partial mean            
-        #         V1  = global sum of weights
-        #         m   = global mean             
-        #
-        # Currently: var = SUM(pV1(pv+pm**2)
-        #            avg = V1*m
-        #
-        # http://en.wikipedia.org/wiki/Standard_deviation#Population-based_statistics
-        # ----------------------------------------------------------------
-        avg /= V1
-        avg *= avg
-        var /= V1
-        var -= avg
-
     # ----------------------------------------------------------------
-    # var is now the biased global variance
+    # The biased variance
     # ----------------------------------------------------------------
+    var = M2 / V1
+
     if not weighted:
         if ddof:
             # The unweighted variance with N-ddof degrees of freedom is
@@ -1,24 +1,43 @@
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
 from functools   import reduce
+from heapq       import heapify, heapreplace
 from operator    import itemgetter
+from time        import monotonic as _time_monotonic
 
 import numpy
+from numpy import abs               as numpy_abs
+from numpy import arange            as numpy_arange
+from numpy import argsort           as numpy_argsort
 from numpy import array             as numpy_array
 from numpy import asanyarray        as numpy_asanyarray
+from numpy import ascontiguousarray as numpy_ascontiguousarray
+from numpy import bincount          as numpy_bincount
+from numpy import broadcast_to      as numpy_broadcast_to
 from numpy import ceil              as numpy_ceil
+from numpy import concatenate       as numpy_concatenate
 from numpy import cos               as numpy_cos
 from numpy import cumsum            as numpy_cumsum
+from numpy import diff              as numpy_diff
 from numpy import digitize          as numpy_digitize
 from numpy import dtype             as numpy_dtype
 from numpy import e                 as numpy_e
+from numpy import errstate          as numpy_errstate
 from numpy import empty             as numpy_empty
 from numpy import exp               as numpy_exp
+from numpy import flatnonzero       as numpy_flatnonzero
 from numpy import floor             as numpy_floor
+from numpy import full              as numpy_full
 from numpy import finfo             as numpy_finfo
+from numpy import isfinite          as numpy_isfinite
 from numpy import isnan             as numpy_isnan
+from numpy import ix_               as numpy_ix_
 from numpy import linspace          as numpy_linspace
 from numpy import log               as numpy_log
 from numpy import log10             as numpy_log10
 from numpy import log2              as numpy_log2
+from numpy import maximum           as numpy_maximum
+from numpy import minimum           as numpy_minimum
 from numpy import nan               as numpy_nan
 from numpy import nanpercentile     as numpy_nanpercentile
 from numpy import ndarray           as numpy_ndarray
@@ -30,14 +49,19 @@ from numpy import ones              as numpy_ones
 from numpy import prod              as numpy_prod
 from numpy import percentile        as numpy_percentile
 from numpy import ravel_multi_index as numpy_ravel_multi_index
+from numpy import repeat            as numpy_repeat
 from numpy import reshape           as numpy_reshape
 from numpy import result_type       as numpy_result_type
 from numpy import rint              as numpy_rint
 from numpy import round             as numpy_round
+from numpy import searchsorted      as numpy_searchsorted
 from numpy import seterr            as numpy_seterr
 from numpy import shape             as numpy_shape
 from numpy import sin               as numpy_sin
 from numpy import size              as numpy_size
+from numpy import sort              as numpy_sort
+from numpy import sqrt              as numpy_sqrt
+from numpy import take_along_axis   as numpy_take_along_axis
 from numpy import tan               as numpy_tan
 from numpy import tile              as numpy_tile
 from numpy import trunc             as numpy_trunc
@@ -45,6 +69,8 @@ from numpy import unique            as numpy_unique
 from numpy import unravel_index     as numpy_unravel_index
 from numpy import where             as numpy_where
 from numpy import vectorize         as numpy_vectorize
+from numpy import ufunc             as numpy_ufunc
+from numpy import uint8             as numpy_uint8
 from numpy import zeros             as numpy_zeros
 from numpy import floating          as numpy_floating
 from numpy import bool_             as numpy_bool_
@@ -54,6 +80,8 @@ from numpy.ma import array          as numpy_ma_array
 from numpy.ma import count          as numpy_ma_count
 from numpy.ma import empty          as numpy_ma_empty
 from numpy.ma import filled         as numpy_ma_filled
+from numpy.ma import getdata        as numpy_ma_getdata
+from numpy.ma import getmaskarray   as numpy_ma_getmaskarray
 from numpy.ma import is_masked      as numpy_ma_is_masked
 from numpy.ma import isMA           as numpy_ma_isMA
 from numpy.ma import masked         as numpy_ma_masked
@@ -76,6 +104,7 @@ from json import dumps as json_dumps
 from json import loads as json_loads
 
 from operator  import mul as operator_mul
+from threading import RLock
 from math      import ceil as math_ceil
 from itertools import product as itertools_product
 
@@ -83,8 +112,13 @@ from ..cfdatetime import dt2rt, rt2dt, st2rt
 from ..cfdatetime import dt as cf_dt
 from ..units      import Units
 from ..constants  import masked as cf_masked
+from ..constants  import (_file_to_fh, _file_to_fh_lru,
+                          _collapse_statistics)
 from ..functions import (CHUNKSIZE, FM_THRESHOLD, RTOL, ATOL,
                          FREE_MEMORY, COLLAPSE_PARALLEL_MODE,
+                         COLLAPSE_PROCESSES, LAZY_OPERATIONS,
+                         PERCENTILE_ACCURACY,
+                         _free_memory_estimate,
                          parse_indices, _numpy_allclose,
                          _numpy_isclose, pathjoin, hash_array,
                          broadcast_array, default_netCDF_fillvals)
@@ -99,9 +133,11 @@ from ..functions import _section
 from .abstract           import (Array,
                                  CompressedArray)
 from .filledarray        import FilledArray
-from .partition          import Partition
+from .partition          import Partition, _temporary_files
 from .partitionmatrix    import PartitionMatrix
 from .collapse_functions import *
+from .functions          import _map_partitions
+from .umarray            import _read_ahead_partitions
 
 from . import (NetCDFArray,
                UMArray,
@@ -111,9 +147,9 @@ from . import (NetCDFArray,
                RaggedIndexedContiguousSubarray)
 
 from .. import mpi_on
+from .. import mpi_size
 if mpi_on:
     from .. import mpi_comm
-    from .. import mpi_size
     from .. import mpi_rank
     from mpi4py.MPI import SUM as mpi_sum
 #--- End: if
@@ -201,6 +237,107 @@ _mask_fpe = [False]
 
 _xxx = numpy_empty((), dtype=object)
 
+# --------------------------------------------------------------------
+# Pools of worker processes for collapsing partitions, keyed by their
+# number of processes
+# --------------------------------------------------------------------
+_collapse_process_pools = {}
+
+# --------------------------------------------------------------------
+# The byte alignment of each subarray component in the buffers shared
+# between ranks by Data._share_partitions
+# --------------------------------------------------------------------
+_share_partitions_alignment = 16
+
+# --------------------------------------------------------------------
+# The largest number of bytes that may be received by a single
+# Allgatherv in Data._share_partitions, whose counts and displacements
+# are C ints
+# --------------------------------------------------------------------
+_share_partitions_max_bytes = 2**31 - 1
+
+# --------------------------------------------------------------------
+# Lock that serialises changes to the data arrays which share each
+# partition matrix
+# --------------------------------------------------------------------
+_partitions_lock = RLock()
+
+# --------------------------------------------------------------------
+# The fewest bits of the keys selected at each pass through the
+# partitions by Data._percentile_partitions. Fewer bits would need
+# smaller histograms, but too many passes.
+# --------------------------------------------------------------------
+_percentile_min_digit_bits = 4
+
+# --------------------------------------------------------------------
+# Relative costs per element of processing a partition, according to
+# where its subarray is stored, used to schedule partitions across
+# ranks. See _partition_cost.
+# --------------------------------------------------------------------
+_partition_cost_factors = {'memory': 1.0,
+                           'cached': 2.0,
+                           'netCDF': 4.0,
+                           'UM'    : 4.0,
+                           'other' : 4.0,
+                           'packed': 4.0,
+                           'masked': 1.5}
+
+# --------------------------------------------------------------------
+# The collapse functions, keyed by Data method name, of the collapses
+# which may be applied to many groups of elements in one pass through
+# the partitions. See Data._collapse_grouped.
+# --------------------------------------------------------------------
+_collapse_grouped_functions = {
+    'max'                   : (max_f, max_fpartial, max_ffinalise),
+    'min'                   : (min_f, min_fpartial, min_ffinalise),
+    'maximum_absolute_value': (max_abs_f, max_abs_fpartial,
+                               max_abs_ffinalise),
+    'minimum_absolute_value': (min_abs_f, min_abs_fpartial,
+                               min_abs_ffinalise),
+    'mean'                  : (mean_f, mean_fpartial, mean_ffinalise),
+    'mean_absolute_value'   : (mean_abs_f, mean_abs_fpartial,
+                               mean_abs_ffinalise),
+    'root_mean_square'      : (root_mean_square_f,
+                               root_mean_square_fpartial,
+                               root_mean_square_ffinalise),
+    'mid_range'             : (mid_range_f, mid_range_fpartial,
+                               mid_range_ffinalise),
+    'range'                 : (range_f, range_fpartial, range_ffinalise),
+    'sample_size'           : (sample_size_f, sample_size_fpartial,
+                               sample_size_ffinalise),
+    'sum'                   : (sum_f, sum_fpartial, sum_ffinalise),
+    'sum_of_squares'        : (sum_of_squares_f, sum_of_squares_fpartial,
+                               sum_of_squares_ffinalise),
+    'var'                   : (var_f, var_fpartial, var_ffinalise),
+    'sd'                    : (sd_f, sd_fpartial, sd_ffinalise),
+}
+
+# --------------------------------------------------------------------
+# The Data collapse methods which may be applied to every bin of an
+# N-dimensional binning in one pass through the partitions. See
+# Data._collapse_binned.
+# --------------------------------------------------------------------
+_collapse_binned_methods = set(('max', 'min', 'maximum_absolute_value',
+                                'minimum_absolute_value', 'mid_range',
+                                'range', 'sum', 'sum_of_squares',
+                                'sample_size', 'sum_of_weights',
+                                'sum_of_weights2', 'mean',
+                                'mean_absolute_value', 'var', 'sd',
+                                'root_mean_square', 'integral'))
+
+# --------------------------------------------------------------------
+# The time spent, and the estimated costs of the partitions
+# processed, on each rank during the current parallel collapse
+# --------------------------------------------------------------------
+_collapse_load = {'time': 0.0, 'cost': None}
+
+# --------------------------------------------------------------------
+# Binary arithmetic method names, without underscores or reflection,
+# of operations which may be deferred
+# --------------------------------------------------------------------
+_deferrable_methods = set(('add', 'sub', 'mul', 'div', 'truediv',
+                           'floordiv', 'mod', 'pow'))
+
 _empty_set = set()
 
 _units_None    = Units()
@@ -449,7 +586,17 @@ place.
         if source is not None:        
             partitions = self._custom.get('partitions')
             if partitions is not None:
-                self.partitions = partitions.copy()
+                # Share the source's partition matrix, which is only
+                # copied when either data array next changes it (copy
+                # on write)
+                with _partitions_lock:
+                    owners = partitions._owners
+                    source_custom = getattr(source, '_custom', None)
+                    if (source_custom is not None and
+                        source_custom.get('partitions') is partitions):
+                        owners[id(source)] = source
+
+                    owners[id(self)] = self
 
             auxiliary_mask = self._custom.get('_auxiliary_mask')
             if auxiliary_mask is not None:
@@ -645,7 +792,7 @@ place.
 #            
 #            self.partitions = PartitionMatrix(matrix, empty_list)
 #            
-#            if check_free_memory and FREE_MEMORY() < FM_THRESHOLD():
+#            if check_free_memory and _free_memory_estimate() < FM_THRESHOLD():
 #                self.to_disk()
 #    
 #            if chunk:
@@ -694,7 +841,7 @@ place.
         
         self.partitions = PartitionMatrix(matrix, empty_list)
         
-        if check_free_memory and FREE_MEMORY() < FM_THRESHOLD():
+        if check_free_memory and _free_memory_estimate() < FM_THRESHOLD():
             self.to_disk()
             
         if chunk:
@@ -728,7 +875,7 @@ place.
         `None`
 
         '''
-        if check_free_memory and FREE_MEMORY() < FM_THRESHOLD():
+        if check_free_memory and _free_memory_estimate() < FM_THRESHOLD():
             compressed_array.to_disk()
         
         new = type(self).empty(shape=compressed_array.shape,
@@ -1496,7 +1643,9 @@ place.
 #        new._Units      = d._Units
 #        new._auxiliary_mask = d._auxiliary_mask
 
-        partitions = d.partitions
+        # Read the partition matrix without copying it, since the
+        # overlapping partitions are copied anyway
+        partitions = d._shared_partitions
 
         new_partitions = PartitionMatrix(_overlapping_partitions(partitions, 
                                                                  indices, 
@@ -1857,41 +2006,55 @@ place.
 
             
     def _flag_partitions_for_processing(self, parallelise=True):
-        '''
+        '''Flag which partitions are to be processed on this rank.
+
+    When parallelising, the partitions are scheduled so that each
+    rank has a similar estimated cost, as given by
+    `_partition_cost`. Each partition, in order of decreasing cost,
+    is assigned to the rank with the lowest total cost so far. The
+    schedule is deterministic, so every rank computes the same one
+    without communication.
+
+    The numbers of partitions and the total estimated costs on each
+    rank are stored in the `_max_partitions_per_process` and
+    `_process_costs` attributes.
+
+    :Parameters:
+
+        parallelise: `bool`, optional
+            If False then flag all partitions for processing.
+
+    :Returns:
+
+        `None`
+
         '''
         if mpi_on and parallelise:
             # Add a flag `_process_partition` to each partition defining
             # whether this partition will be processed on this process
-            n_partitions = self.partitions.size
-            x = n_partitions // mpi_size
-            if n_partitions < mpi_size:
-                for i, partition in enumerate(self.partitions.matrix.flat):
-                    if i == mpi_rank:
-                        partition._process_partition = True
-                    else:
-                        partition._process_partition = False
-                    #--- End: if
-                #--- End: for
-                self._max_partitions_per_process = 1
-            elif n_partitions % mpi_size == 0:
-                for i, partition in enumerate(self.partitions.matrix.flat):
-                    if i // x == mpi_rank:
-                        partition._process_partition = True
-                    else:
-                        partition._process_partition = False
-                    #--- End: if
-                #--- End: for
-                self._max_partitions_per_process = x
-            else:
-                for i, partition in enumerate(self.partitions.matrix.flat):
-                    if i // (x + 1) == mpi_rank:
-                        partition._process_partition = True
-                    else:
-                        partition._process_partition = False
-                    #--- End: if
-                #--- End: for
-                self._max_partitions_per_process = x + 1
-            #--- End: if
+            partitions = list(self.partitions.matrix.flat)
+            costs = [_partition_cost(partition) for partition in partitions]
+
+            process_costs = [0.0] * mpi_size
+            process_counts = [0] * mpi_size
+
+            # A heap of the load, number of partitions and rank of
+            # each rank, so that the least loaded rank is found
+            # without searching every rank
+            loads = [(0.0, 0, rank) for rank in range(mpi_size)]
+            heapify(loads)
+            for i in sorted(range(len(partitions)), key=lambda i: -costs[i]):
+                # Assign the partition to the least loaded rank,
+                # preferring lower ranks in the event of a tie
+                cost, count, rank = loads[0]
+                heapreplace(loads, (cost + costs[i], count + 1, rank))
+                process_costs[rank] += costs[i]
+                process_counts[rank] += 1
+                partitions[i]._process_partition = (rank == mpi_rank)
+            #--- End: for
+
+            self._max_partitions_per_process = max(process_counts)
+            self._process_costs = process_costs
         else:
             # Flag all partitions for processing on all processes
             for partition in self.partitions.matrix.flat:
@@ -1900,6 +2063,62 @@ place.
 
     #--- End: def
 
+    def _defer_operation(self, operation, units):
+        '''Defer an element-wise operation on the data array.
+
+    The operation is recorded on each partition, and is applied when
+    the partition's data array is next accessed.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_apply_deferred_operations`, `cf.LAZY_OPERATIONS`
+
+    :Parameters:
+
+        operation: `_DeferredOperation`
+            The operation, which is applied in the current units of
+            the data array.
+
+        units: `Units`
+            The units of the result of the operation.
+
+    :Returns:
+
+        `None`
+
+        '''
+        operation = (operation, self.Units, units)
+        for partition in self.partitions.matrix.flat:
+            partition._operations += (operation,)
+
+        source = self.source(None)
+        if source is not None and source.get_compression_type():
+            self._del_Array(None)
+
+        self._Units = units
+
+
+    def _apply_deferred_operations(self):
+        '''Apply any deferred element-wise operations to the data array.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_defer_operation`, `cf.LAZY_OPERATIONS`
+
+    :Returns:
+
+        `None`
+
+        '''
+        config = self.partition_configuration(readonly=False)
+        for partition in self.partitions.matrix.flat:
+            if partition._operations:
+                partition.open(config)
+                partition.array
+                partition.close()
+        #--- End: for
+
+
     def _share_lock_files(self, parallelise):
         if parallelise:
             # Only gather the lock files if the subarrays have been
@@ -1921,125 +2140,159 @@ place.
         # Share the partitions processed on each rank with every other
         # rank. If parallelise is False then there is nothing to be done
         if parallelise:
-            # List to contain sublists of processed partitions from each
-            # rank
-            partition_list = []
+            # --------------------------------------------------------
+            # Pack the subarrays of this rank's processed partitions
+            # that are supported numpy arrays into one contiguous
+            # buffer of bytes, with a header describing where each
+            # subarray's data and mask are in the buffer. Other
+            # subarrays (e.g. arrays of strings or cached arrays) are
+            # pickled with their partitions in the header.
+            # --------------------------------------------------------
+            header = []
+            subarrays = []
+            buffers = []
+            nbytes = 0
+            for partition in processed_partitions:
+                subarray = partition._subarray
+                if not (isinstance(subarray, numpy_ndarray) and
+                        subarray.dtype.kind in 'biufc'):
+                    subarrays.append(None)
+                    header.append((partition, None))
+                    continue
 
-            for rank in range(mpi_size):
-                # Get the numper of processed partitions on each rank
-                if mpi_rank == rank:
-                    n_partitions = len(processed_partitions)
-                else:
-                    n_partitions = None
-                #--- End: if
-                n_partitions = mpi_comm.bcast(n_partitions, root=rank)
+                # Swap out the subarray so that it is not pickled
+                # with the partition
+                subarrays.append(subarray)
+                partition._subarray = None
+
+                isMA = numpy_ma_isMA(subarray)
+                components = [numpy_ma_getdata(subarray)]
+                if isMA and subarray.mask is not numpy_ma_nomask:
+                    components.append(numpy_ma_getmaskarray(subarray))
+
+                offsets = []
+                for x in components:
+                    offsets.append(nbytes)
+                    x = numpy_ascontiguousarray(x).reshape(-1).view(numpy_uint8)
+                    buffers.append(x)
+                    nbytes += x.size
+
+                    # Pad the buffer so that each component starts on
+                    # an aligned byte
+                    padding = -nbytes % _share_partitions_alignment
+                    if padding:
+                        buffers.append(numpy_zeros(padding, dtype=numpy_uint8))
+                        nbytes += padding
+                #--- End: for
 
-                # Share each of the processed partitions on each rank with
-                # all the other ranks using broadcasting
-                if mpi_rank != rank:
-                    shared_partitions = []
-                #--- End: if
+                header.append((partition, (subarray.dtype, subarray.shape,
+                                           isMA, offsets)))
+            #--- End: for
+
+            # Share the headers with a single collective, then swap
+            # the subarrays back into this rank's partitions
+            headers = mpi_comm.allgather((nbytes, header))
+
+            for partition, subarray in zip(processed_partitions, subarrays):
+                if subarray is not None:
+                    partition._subarray = subarray
+            #--- End: for
+
+            # --------------------------------------------------------
+            # Share the buffers with a single collective
+            # --------------------------------------------------------
+            counts = [n for n, _ in headers]
+            displacements = [0]
+            for n in counts[:-1]:
+                displacements.append(displacements[-1] + n)
+
+            if buffers:
+                sendbuf = numpy_concatenate(buffers)
+            else:
+                sendbuf = numpy_empty((0,), dtype=numpy_uint8)
+
+            total = sum(counts)
+            recvbuf = numpy_empty((total,), dtype=numpy_uint8)
+            if total <= _share_partitions_max_bytes:
+                mpi_comm.Allgatherv(sendbuf,
+                                    [recvbuf, (counts, displacements)])
+            else:
+                # The counts or displacements would overflow a C int,
+                # so exchange the buffers in chunks, each of which
+                # receives no more than the maximum number of bytes
+                # in total
+                chunk = _share_partitions_max_bytes // mpi_size
+                for start in range(0, max(counts), chunk):
+                    chunk_counts = [max(0, min(chunk, n - start))
+                                    for n in counts]
+                    chunk_displacements = [0]
+                    for n in chunk_counts[:-1]:
+                        chunk_displacements.append(
+                            chunk_displacements[-1] + n)
+
+                    chunk_recvbuf = numpy_empty((sum(chunk_counts),),
+                                                dtype=numpy_uint8)
+                    mpi_comm.Allgatherv(
+                        sendbuf[start:start + chunk_counts[mpi_rank]],
+                        [chunk_recvbuf, (chunk_counts, chunk_displacements)])
+
+                    for n, i, j in zip(chunk_counts, displacements,
+                                       chunk_displacements):
+                        recvbuf[i + start:i + start + n] = \
+                            chunk_recvbuf[j:j + n]
+                #--- End: for
+            #--- End: if
 
-                for i in range(n_partitions):
-                    if mpi_rank == rank:
-                        partition = processed_partitions[i]
-                        if (isinstance(partition._subarray, numpy_ndarray) and
-                            partition._subarray.dtype.kind in {'b', 'i', 'u', 'f', 'c'}):
-                            # If the subarray is a supported numpy
-                            # array, swap it out before broadcasting
-                            # the partition
-                            subarray = partition._subarray
+            # --------------------------------------------------------
+            # Unpack the partitions of the other ranks. Their
+            # subarrays are views of the receive buffer, rather than
+            # copies.
+            # --------------------------------------------------------
+            partition_list = []
+            for rank, (start, (_, header)) in enumerate(zip(displacements,
+                                                             headers)):
+                if rank == mpi_rank:
+                    for partition, info in header:
+                        if info is None:
+                            # Remove the subarray from the copy of
+                            # this rank's partition so that when it is
+                            # deleted it does not delete the temporary
+                            # file
                             partition._subarray = None
-                            partition._subarray_removed = True
-                            partition._subarray_dtype = subarray.dtype
-                            partition._subarray_shape = subarray.shape
-                            partition._subarray_isMA = numpy_ma_isMA(subarray)
-                            if partition._subarray_isMA:
-                                partition._subarray_is_masked = subarray.mask is not numpy_ma_nomask
+                    #--- End: for
+                    
+                    partition_list.append(processed_partitions)
+                    continue
+                #--- End: if
+
+                shared_partitions = []
+                for partition, info in header:
+                    if info is not None:
+                        dtype, shape, isMA, offsets = info
+
+                        size = reduce(operator_mul, shape, 1)
+                        offset = start + offsets[0]
+                        subarray = recvbuf[offset:offset + size*dtype.itemsize]
+                        subarray = subarray.view(dtype).reshape(shape)
+                        if isMA:
+                            if len(offsets) > 1:
+                                offset = start + offsets[1]
+                                mask = recvbuf[offset:offset + size]
+                                mask = mask.view(numpy_bool_).reshape(shape)
                             else:
-                                partition._subarray_is_masked = False
-                            #--- End: if
-                        else:
-                            # The partition's subarray is either not a
-                            # numpy array or is, for example, an array
-                            # of strings, so it will be pickled and
-                            # broadcast with the partition.
-                            partition._subarray_removed = False
-                        #--- End: if
-                    else:
-                        partition = None
-                    #--- End: if
+                                mask = numpy_ma_nomask
 
-                    # Pickle and broadcast the partition with or
-                    # without the subarray
-                    partition = mpi_comm.bcast(partition, root=rank)
-
-                    if partition._subarray_removed:
-                        # If the subarray is a supported numpy array
-                        # broadcast it without pickling and swap it
-                        # back into the partition
-                        if partition._subarray_isMA:
-                            # If the subarray is a masked array broadcast
-                            # the data and the mask separately
-                            if mpi_rank != rank:
-                                if partition._subarray_is_masked:
-                                    subarray = numpy_ma_masked_all(partition._subarray_shape,
-                                                                   dtype=partition._subarray_dtype)
-                                else:
-                                    subarray = numpy_ma_empty(partition._subarray_shape,
-                                                              dtype=partition._subarray_dtype)
-                                #--- End: if
-                            #--- End: if
-                            mpi_comm.Bcast(subarray.data, root=rank)
-                            if partition._subarray_is_masked:
-                                mpi_comm.Bcast(subarray.mask, root=rank)
-                            #--- End: if
-                        else:
-                            if mpi_rank != rank:
-                                subarray = numpy_empty(partition._subarray_shape,
-                                                       dtype=partition._subarray_dtype)
-                            #--- End: if
-                            mpi_comm.Bcast(subarray, root=rank)
+                            subarray = numpy_ma_array(subarray, mask=mask,
+                                                      copy=False)
                         #--- End: if
 
-                        # Swap the subarray back into the partition
                         partition._subarray = subarray
-                        if mpi_rank == rank:
-                            # The result of broadcasting an object is
-                            # different to the original object even on the
-                            # root PE, so the new partition with the numpy
-                            # subarray must be put back in the list of
-                            # processed partitions
-                            processed_partitions[i] = partition
-                        #--- End: if
-
-                        # Clean up temporary attributes
-                        del partition._subarray_dtype
-                        del partition._subarray_shape
-                        del partition._subarray_isMA
-                        del partition._subarray_is_masked
-                    elif mpi_rank == rank:
-                        # Remove the subarray from partition so that
-                        # when it is deleted it does not delete the
-                        # temporary file
-                        partition._subarray = None
                     #--- End: if
 
-                    # Clean up temporary attribute
-                    del partition._subarray_removed
-
-                    if mpi_rank != rank:
-                        shared_partitions.append(partition)
-                    #--- End: if
+                    shared_partitions.append(partition)
                 #--- End: for
 
-                # Add the sublist of processed partitions from each rank
-                # to a list
-                if mpi_rank == rank:
-                    partition_list.append(processed_partitions)
-                else:
-                    partition_list.append(shared_partitions)
-                #--- End: if
+                partition_list.append(shared_partitions)
             #--- End: for
 
             # Flatten the list of lists of processed partitions
@@ -2367,15 +2620,16 @@ place.
         return out
 
 
-    def median(self, axes=None, squeeze=False, mtol=1, inplace=False,
-               _preserve_partitions=False):
+    def median(self, axes=None, squeeze=False, mtol=1, accuracy=None,
+               inplace=False, _preserve_partitions=False):
         '''TODO
 
         '''
 
         
         return self.percentile(50, axes=axes, squeeze=squeeze,
-                               mtol=mtol, inplace=inplace,
+                               mtol=mtol, accuracy=accuracy,
+                               inplace=inplace,
                                _preserve_partitions=_preserve_partitions)
     
     
@@ -2418,7 +2672,7 @@ place.
 
     
     def percentile(self, ranks, axes=None, interpolation='linear',
-                   squeeze=False, mtol=1, inplace=False,
+                   squeeze=False, mtol=1, accuracy=None, inplace=False,
                    _preserve_partitions=False):
         '''Compute percentiles of the data along the specified axes.
 
@@ -2493,6 +2747,16 @@ place.
               To ensure that an output array element is a missing
               datum if more than 25% of its input array elements are
               missing data: ``mtol=0.25``.
+
+        accuracy: number, optional
+            The relative accuracy of percentiles which are found by
+            passing through the partitions, rather than by sorting the
+            values along the collapse axes in memory, which only
+            happens when these values do not fit in one chunk. If 0
+            then these percentiles are exact. By default the value of
+            `cf.PERCENTILE_ACCURACY` is used.
+
+            .. versionadded:: 3.0.7
     
         inplace: `bool`, optional
             If True then do the operation in-place and return `None`.
@@ -2581,59 +2845,103 @@ place.
         else:
             axes = sorted(self._parse_axes(axes))
 
-        # If the input data array 'fits' in one chunk of memory, then
-        # make sure that it has only one partition
-        if (not mpi_on and not _preserve_partitions and self._pmndim and
-            self.fits_in_one_chunk_in_memory(self.dtype.itemsize)):
-            self.varray
-
-        org_chunksize = CHUNKSIZE(CHUNKSIZE()/n_ranks)
-        sections = self.section(axes, chunks=True)
-        CHUNKSIZE(org_chunksize)
+        if accuracy is None:
+            accuracy = PERCENTILE_ACCURACY()
 
-        for key, data in sections.items():
-            array = data.array
+        # ------------------------------------------------------------
+        # If the values along the collapse axes do not fit in one
+        # chunk then select the percentiles by passing through the
+        # partitions
+        # ------------------------------------------------------------
+        out = None
+        if axes:
+            n_collapse = reduce(operator_mul,
+                                [self._shape[i] for i in axes], 1)
+            if n_collapse * self.dtype.itemsize > CHUNKSIZE()/n_ranks:
+                out = self._percentile_partitions(ranks, axes,
+                                                  interpolation=interpolation,
+                                                  mtol=mtol,
+                                                  accuracy=accuracy)
+
+            if out is not None:
+                # Give the percentiles the data type that they would
+                # have had if they had been found in memory
+                dtype = self.dtype
+                if dtype.kind == 'f':
+                    if out.dtype != dtype:
+                        out.dtype = dtype
+                elif (dtype.kind in 'iu' and
+                      interpolation in ('lower', 'higher', 'nearest')):
+                    # The order statistics of integers are integers,
+                    # although approximate ones might not be
+                    if accuracy:
+                        out.rint(inplace=True)
+
+                    out.dtype = dtype
+        #--- End: if
 
-            masked = numpy_ma_is_masked(array)
-            if masked:
-                if array.dtype != _dtype_float:
-                    # Can't assign NaNs to integer arrays
-                    array = array.astype(float, copy=True)
+        if out is None:
+            # If the input data array 'fits' in one chunk of memory,
+            # then make sure that it has only one partition
+            if (not mpi_on and not _preserve_partitions and
+                self._pmndim and
+                self.fits_in_one_chunk_in_memory(self.dtype.itemsize)):
+                self.varray
+    
+            org_chunksize = CHUNKSIZE(CHUNKSIZE()/n_ranks)
+            sections = self.section(axes, chunks=True)
+            CHUNKSIZE(org_chunksize)
+    
+            for key, data in sections.items():
+                array = data.array
+    
+                masked = numpy_ma_is_masked(array)
+                if masked:
+                    if array.dtype != _dtype_float:
+                        # Can't assign NaNs to integer arrays
+                        array = array.astype(float, copy=True)
+                        
+                    array = numpy_ma_filled(array, numpy_nan)
+                    func = numpy_nanpercentile
                     
-                array = numpy_ma_filled(array, numpy_nan)
-                func = numpy_nanpercentile
-                
-                with numpy_testing_suppress_warnings() as sup:
-                    sup.filter(RuntimeWarning, message='.*All-NaN slice encountered')
+                    with numpy_testing_suppress_warnings() as sup:
+                        sup.filter(RuntimeWarning, message='.*All-NaN slice encountered')
+                        p = func(array, ranks, axis=axes,
+                                 interpolation=interpolation,
+                                 keepdims=True, overwrite_input=False)
+                        
+                    # Replace NaNs with missing data
+                    p = numpy_ma_masked_where(numpy_isnan(p), p,
+                                              copy=False)
+                else:
+                    func = numpy_percentile
                     p = func(array, ranks, axis=axes,
                              interpolation=interpolation, keepdims=True,
                              overwrite_input=False)
                     
-                # Replace NaNs with missing data
-                p = numpy_ma_masked_where(numpy_isnan(p), p, copy=False)      
-            else:
-                func = numpy_percentile
-                p = func(array, ranks, axis=axes,
-                         interpolation=interpolation, keepdims=True,
-                         overwrite_input=False)
-                
-            sections[key] = type(self)(p, units=self.Units,
-                                       fill_value=self.fill_value)
-        #--- End: for
-        
-        # Glue the sections back together again
-        out = self.reconstruct_sectioned_data(sections)
-
-        if mtol < 1:
-            mask = (self.sample_size(axes, mtol=mtol) == 0)
-            mask.filled(True, inplace=True)
-            if out.ndim == self.ndim + 1:
-                mask.insert_dimension(0, inplace=True)
-
-            out.where(mask, cf_masked, inplace=True)
+                sections[key] = type(self)(p, units=self.Units,
+                                           fill_value=self.fill_value)
+            #--- End: for
+            
+            # Glue the sections back together again
+            out = self.reconstruct_sectioned_data(sections)
+    
+            if mtol < 1:
+                mask = (self.sample_size(axes, mtol=mtol) == 0)
+                mask.filled(True, inplace=True)
+                if out.ndim == self.ndim + 1:
+                    mask.insert_dimension(0, inplace=True)
+    
+                out.where(mask, cf_masked, inplace=True)
+        #--- End: if
             
         if squeeze:
-            out.squeeze(axes, inplace=True)
+            if out.ndim == self.ndim + 1:
+                # Allow for the leading percentile ranks axis
+                out.squeeze([i + 1 for i in axes], inplace=True)
+            else:
+                out.squeeze(axes, inplace=True)
+        #--- End: if
 
         if inplace:
             self.__dict__ = out.__dict__
@@ -2642,90 +2950,386 @@ place.
         return out
 
     
-    def loads(self, j, chunk=True):
-        '''TODO
-        '''
-        d = json_loads(j)
+    def _percentile_partitions(self, ranks, axes, interpolation='linear',
+                               mtol=1, accuracy=0):
+        '''Compute percentiles of the data along the specified axes by
+    passing through the partitions.
 
-        # Convert _cyclic to a set
-        if '_cyclic' in d:
-            d['_cyclic'] = set(d['_cyclic'])
+    The order statistics needed for each percentile are selected by
+    radix refinement. The values are mapped to unsigned integer keys
+    which sort in the same order, and at each pass a histogram of the
+    next few bits of the keys which share the bits selected so far is
+    accumulated, partition by partition, for every output element. The
+    histogram bin which contains each order statistic then fixes its
+    next bits. The histograms may be summed across partitions and MPI
+    ranks, so the memory needed depends only on the number of output
+    elements.
 
-        # Convert dtype to numpy.dtype
-        if 'dtype' in d:
-            d['dtype'] = numpy_dtype(d['dtype'])
+    All of the bits are selected when *accuracy* is 0, giving exact
+    order statistics. Otherwise the selection stops once the width of
+    the histogram bins is below the accuracy, relative to the values,
+    and the middle of the final bin is used.
 
-        # Convert units to Units
-        if 'units' in d:
-            d['Units'] = Units(d.pop('units'))
+    Integer data are converted to float64 values.
 
-        # Convert partition location elements to tuples
-        for p in d['Partitions']:
-            p['location'] = [tuple(x) for x in p['location']]
+    .. versionadded:: 3.0.7
 
-            if 'units' in p:
-                p['Units'] = Units(p.pop('units'))
-        #--- End: for
+    .. seealso:: `percentile`
 
-        self.loadd(d, chunk=chunk)
+    :Parameters:
 
+        ranks: array_like
+            The percentile ranks, in increasing order.
 
-    def dumpd(self):
-        '''Return a serialization of the data array.
+        axes: sequence of `int`
+            The positions of the axes to be collapsed, in increasing
+            order.
+
+        interpolation: `str`, optional
+            As for `percentile`.
+
+        mtol: number, optional
+            As for `percentile`.
+
+        accuracy: number, optional
+            The relative accuracy of the percentiles. If 0 then the
+            percentiles are exact.
 
-    The serialization may be used to reconstruct the data array as it
-    was at the time of the serialization creation.
-    
-    .. seealso:: `loadd`
-    
     :Returns:
-    
-        `dict`
-            The serialization.
-    
-    **Examples:**
-    
-    >>> d = cf.Data([[1, 2, 3]], 'm')
-    >>> d.dumpd()
-    {'Partitions': [{'location': [(0, 1), (0, 3)],
-                     'subarray': array([[1, 2, 3]])}],
-     'units': 'm',
-     '_axes': ['dim0', 'dim1'],
-     '_pmshape': (),
-     'dtype': dtype('int64'),
-     'shape': (1, 3)}
-    
-    >>> d.flip(1)
-    >>> d.transpose()
-    >>> d.Units *= 1000
-    >>> d.dumpd()
-    {'Partitions': [{'units': 'm',
-                     'axes': ['dim0', 'dim1'],
-                     'location': [(0, 3), (0, 1)],
-                     'subarray': array([[1, 2, 3]])}],
-    ` 'units': '1000 m',
-     '_axes': ['dim1', 'dim0'],
-     '_flip': ['dim1'],
-     '_pmshape': (),
-     'dtype': dtype('int64'),
-     'shape': (3, 1)}
-    
-    >>> d.dumpd()
-    {'Partitions': [{'units': 'm',
-                     'location': [(0, 1), (0, 3)],
-                     'subarray': array([[1, 2, 3]])}],
-     'units': '10000 m',
-     '_axes': ['dim0', 'dim1'],
-     '_flip': ['dim1'],
-     '_pmshape': (),
-     'dtype': dtype('int64'),
-     'shape': (1, 3)}
-    
-    >>> e = cf.Data(loadd=d.dumpd())
-    >>> e.equals(d)
-    True
+
+        `Data` or `None`
+            The float64 percentiles, with the collapse axes retained
+            with size 1 and, if there is more than one rank, a new
+            leading axis for the ranks. `None` is returned if the
+            histograms would not fit in memory.
+
+    **Examples:**
+
+    >>> d = cf.Data([[1, 2, 3, 4], [5, 6, 7, 8]], 'K')
+    >>> print(d._percentile_partitions(50, [1]).array)
+    [[2.5]
+     [6.5]]
+    >>> print(d._percentile_partitions([0, 100], [0, 1]).array)
+    [[[1.]]
+     [[8.]]]
+
+        '''
+        ranks = numpy_array(ranks, dtype=float).reshape(-1)
+        n_ranks = ranks.size
+
+        if interpolation in ('linear', 'midpoint'):
+            n_targets = 2 * n_ranks
+        elif interpolation in ('lower', 'higher', 'nearest'):
+            n_targets = n_ranks
+        else:
+            raise ValueError(
+                "Can't compute percentiles: Unknown interpolation: {!r}".format(
+                    interpolation))
+
+        ndim  = self._ndim
+        shape = self._shape
+
+        iaxes = [i for i in range(ndim) if i not in axes] + list(axes)
+        n_non_collapse_axes = ndim - len(axes)
+        non_collapse_shape = tuple([shape[i]
+                                    for i in iaxes[:n_non_collapse_axes]])
+        n_elements = reduce(operator_mul, non_collapse_shape, 1)
+        n_collapse = reduce(operator_mul, [shape[i] for i in axes], 1)
+
+        # ------------------------------------------------------------
+        # Find the type of the keys, and the number of bits of the
+        # keys which are selected at each pass, such that the
+        # histograms fit in one chunk if possible
+        # ------------------------------------------------------------
+        dtype = self.dtype
+        if dtype.kind != 'f':
+            dtype = _dtype_float
+
+        nbits = dtype.itemsize * 8
+        key_dtype = numpy_dtype('u{}'.format(dtype.itemsize))
+
+        chunksize = CHUNKSIZE()
+        for digit_bits in (16, 8, _percentile_min_digit_bits):
+            if n_elements * n_targets * 8 << digit_bits <= chunksize:
+                break
+        #--- End: for
+
+        if n_elements * n_targets * 8 << digit_bits > (FREE_MEMORY() -
+                                                      FM_THRESHOLD()):
+            # The histograms would not fit in memory, so the
+            # percentiles must be found by sectioning the data
+            return
+
+        npasses = nbits // digit_bits
+        if accuracy:
+            # The sign bit, the exponent bits, and enough mantissa
+            # bits to give the requested relative accuracy
+            bits = (1 + numpy_finfo(dtype).nexp +
+                    int(numpy_ceil(-numpy_log2(accuracy))))
+            npasses = min(npasses, -(-bits // digit_bits))
+
+        nbins = 1 << digit_bits
+        digit_mask = key_dtype.type(nbins - 1)
+
+        # ------------------------------------------------------------
+        # Move the collapse axes to the end
+        # ------------------------------------------------------------
+        d = self.copy()
+        if iaxes != list(range(ndim)):
+            d.transpose(iaxes, inplace=True)
+
+        d._flag_partitions_for_processing(parallelise=mpi_on)
+
+        partitions = [partition for partition in d.partitions.matrix.flat
+                      if partition._process_partition]
+
+        config = d.partition_configuration(readonly=True)
+
+        # ------------------------------------------------------------
+        # Select the bits of the keys of the order statistics of each
+        # output element, starting with the most significant
+        # ------------------------------------------------------------
+        prefix = numpy_zeros(non_collapse_shape + (n_targets,),
+                             dtype=key_dtype)
+        below = numpy_zeros(non_collapse_shape + (n_targets,), dtype=int)
+
+        for n in range(npasses):
+            shift = nbits - (n + 1) * digit_bits
+
+            # On the first pass there are no selected bits, so one
+            # histogram serves every order statistic
+            n_hist = n_targets if n else 1
+
+            hist = numpy_zeros(non_collapse_shape + (n_hist, nbins),
+                               dtype=int)
+
+            for partition in _read_ahead_partitions(partitions):
+                partition.open(config)
+                array = partition.array
+                partition.close()
+
+                block_shape = array.shape[:n_non_collapse_axes]
+                block = tuple([slice(*r) for r in
+                               partition.location[:n_non_collapse_axes]])
+                n_block = reduce(operator_mul, block_shape, 1)
+
+                keys, valid = _percentile_keys(array, dtype, key_dtype)
+                keys = keys.reshape(n_block, -1)
+                if valid is not None:
+                    valid = valid.reshape(n_block, -1)
+
+                digits = ((keys >> key_dtype.type(shift)) &
+                          digit_mask).astype(int)
+                offsets = numpy_arange(n_block).reshape(n_block, 1)
+                offsets *= n_hist
+
+                if not n:
+                    ids = (offsets * nbins + digits)
+                    if valid is not None:
+                        ids = ids[valid]
+
+                    ids = [ids.ravel()]
+                else:
+                    high = keys >> key_dtype.type(shift + digit_bits)
+                    p_prefix = prefix[block].reshape(n_block, n_targets)
+                    ids = []
+                    for t in range(n_targets):
+                        match = (high == p_prefix[:, t:t+1])
+                        if valid is not None:
+                            match &= valid
+
+                        ids.append(((offsets + t) * nbins + digits)[match])
+                #--- End: if
+
+                counts = numpy_bincount(numpy_concatenate(ids),
+                                        minlength=n_block * n_hist * nbins)
+                hist[block] += counts.reshape(block_shape + (n_hist, nbins))
+            #--- End: for
+
+            if mpi_on:
+                hist = mpi_comm.allreduce(hist, op=mpi_sum)
+
+            if not n:
+                # Find the sample sizes and the positions of the
+                # order statistics
+                N = hist.sum(axis=-1)
+                k, fraction = _percentile_order_statistics(N, ranks,
+                                                           interpolation)
+            #--- End: if
+
+            # Find the histogram bin which contains each order
+            # statistic
+            cumulative = numpy_cumsum(hist, axis=-1)
+            j = (cumulative <= (k - below)[..., numpy_newaxis]).sum(axis=-1)
+            numpy_minimum(j, nbins - 1, out=j)
+
+            i = numpy_maximum(j - 1, 0)[..., numpy_newaxis]
+
+            below += numpy_where(
+                j > 0,
+                numpy_take_along_axis(cumulative, i, axis=-1)[..., 0], 0)
+
+            prefix <<= key_dtype.type(digit_bits)
+            prefix |= j.astype(key_dtype)
+        #--- End: for
+
+        # ------------------------------------------------------------
+        # Convert the selected keys to values
+        # ------------------------------------------------------------
+        remaining_bits = nbits - npasses * digit_bits
+        if remaining_bits:
+            prefix <<= key_dtype.type(remaining_bits)
+            lower = _percentile_values(prefix, dtype, key_dtype)
+            prefix |= key_dtype.type((1 << remaining_bits) - 1)
+            upper = _percentile_values(prefix, dtype, key_dtype)
+            with numpy_errstate(invalid='ignore', over='ignore'):
+                values = lower + (upper - lower) * 0.5
+
+            values = numpy_where(numpy_isfinite(values), values, lower)
+        else:
+            values = _percentile_values(prefix, dtype, key_dtype)
+
+        if interpolation == 'linear':
+            v0 = values[..., :n_ranks]
+            v1 = values[..., n_ranks:]
+            values = v0 + (v1 - v0) * fraction
+        elif interpolation == 'midpoint':
+            values = (values[..., :n_ranks] + values[..., n_ranks:]) * 0.5
+
+        # ------------------------------------------------------------
+        # Mask output elements with too few values
+        # ------------------------------------------------------------
+        N = N[..., 0]
+        mask = (N == 0)
+        if mtol < 1:
+            mask |= (N < (1 - mtol) * n_collapse)
+
+        if mask.any():
+            values[mask] = 0
+            values = numpy_ma_masked_where(
+                numpy_repeat(mask[..., numpy_newaxis], n_ranks, axis=-1),
+                values, copy=False)
+
+        # ------------------------------------------------------------
+        # Put the ranks first, reinstate the collapse axes with size
+        # 1, and restore the original order of the axes
+        # ------------------------------------------------------------
+        values = values.reshape(non_collapse_shape + (1,) * len(axes) +
+                                (n_ranks,))
+        values = values.transpose([ndim] + [iaxes.index(i)
+                                            for i in range(ndim)])
+        if n_ranks == 1:
+            values = values[0]
+
+        # ------------------------------------------------------------
+        # Share the processed partitions between MPI ranks
+        # ------------------------------------------------------------
+        if mpi_on:
+            for pmindex, partition in d.partitions.ndenumerate():
+                partition._pmindex = pmindex
+
+            processed_partitions = d._share_partitions(partitions,
+                                                       parallelise=True)
+            pm = d.partitions.matrix
+            for partition in processed_partitions:
+                pm[partition._pmindex] = partition
+
+            d._share_lock_files(parallelise=True)
+        #--- End: if
+
+        return type(self)(values, units=self.Units,
+                          fill_value=self.get_fill_value(None))
+    #--- End: def
+
+
+    def loads(self, j, chunk=True):
+        '''TODO
+        '''
+        d = json_loads(j)
+
+        # Convert _cyclic to a set
+        if '_cyclic' in d:
+            d['_cyclic'] = set(d['_cyclic'])
+
+        # Convert dtype to numpy.dtype
+        if 'dtype' in d:
+            d['dtype'] = numpy_dtype(d['dtype'])
+
+        # Convert units to Units
+        if 'units' in d:
+            d['Units'] = Units(d.pop('units'))
+
+        # Convert partition location elements to tuples
+        for p in d['Partitions']:
+            p['location'] = [tuple(x) for x in p['location']]
+
+            if 'units' in p:
+                p['Units'] = Units(p.pop('units'))
+        #--- End: for
+
+        self.loadd(d, chunk=chunk)
+
+
+    def dumpd(self):
+        '''Return a serialization of the data array.
+
+    The serialization may be used to reconstruct the data array as it
+    was at the time of the serialization creation.
+    
+    .. seealso:: `loadd`
+    
+    :Returns:
+    
+        `dict`
+            The serialization.
+    
+    **Examples:**
+    
+    >>> d = cf.Data([[1, 2, 3]], 'm')
+    >>> d.dumpd()
+    {'Partitions': [{'location': [(0, 1), (0, 3)],
+                     'subarray': array([[1, 2, 3]])}],
+     'units': 'm',
+     '_axes': ['dim0', 'dim1'],
+     '_pmshape': (),
+     'dtype': dtype('int64'),
+     'shape': (1, 3)}
+    
+    >>> d.flip(1)
+    >>> d.transpose()
+    >>> d.Units *= 1000
+    >>> d.dumpd()
+    {'Partitions': [{'units': 'm',
+                     'axes': ['dim0', 'dim1'],
+                     'location': [(0, 3), (0, 1)],
+                     'subarray': array([[1, 2, 3]])}],
+    ` 'units': '1000 m',
+     '_axes': ['dim1', 'dim0'],
+     '_flip': ['dim1'],
+     '_pmshape': (),
+     'dtype': dtype('int64'),
+     'shape': (3, 1)}
+    
+    >>> d.dumpd()
+    {'Partitions': [{'units': 'm',
+                     'location': [(0, 1), (0, 3)],
+                     'subarray': array([[1, 2, 3]])}],
+     'units': '10000 m',
+     '_axes': ['dim0', 'dim1'],
+     '_flip': ['dim1'],
+     '_pmshape': (),
+     'dtype': dtype('int64'),
+     'shape': (1, 3)}
+    
+    >>> e = cf.Data(loadd=d.dumpd())
+    >>> e.equals(d)
+    True
 
         ''' 
+        # Deferred operations can not be serialised, so apply them
+        # first
+        self._apply_deferred_operations()
+        
         axes  = self._axes
         units = self.Units
         dtype = self.dtype
@@ -4027,6 +4631,43 @@ place.
         # ------------------------------------------------------------
         other.to_memory()
 
+        # ------------------------------------------------------------
+        # Defer an arithmetic operation with a single value, if
+        # requested and possible
+        # ------------------------------------------------------------
+        if LAZY_OPERATIONS():
+            operand = _deferrable_operand(data0, other, method)
+            if 'true' in method:
+                new_dtype = numpy_dtype(float)
+            else:
+                new_dtype = numpy_result_type(data0.dtype, other.dtype)
+
+            if inplace and new_dtype != data0.dtype:
+                # Leave the checking of in-place data type changes to
+                # the operation proper
+                operand = None
+                
+            if operand is not None:
+                if inplace:
+                    # The operation must not change the subarrays in
+                    # place, as they may be shared with other data
+                    # arrays
+                    method = '__' + method[3:]
+                    result = data0
+                else:
+                    result = data0.copy()
+
+                result._defer_operation(_DeferredOperation(method, operand),
+                                        new_Units)
+                result.dtype = new_dtype
+                
+                if inplace:
+                    self.__dict__ = result.__dict__
+                    return self
+
+                return result
+        #--- End: if
+
         # ------------------------------------------------------------
         # Find which dimensions need to be broadcast in one or other
         # of the arrays.
@@ -4253,13 +4894,14 @@ place.
 #            pda_args['update'] = False
 #            pda_args['dtype']  = None
 
-        original_numpy_seterr = numpy_seterr(**_seterr)
-
 # Think about dtype, here.
 
-        for partition_r, partition_s in zip(result.partitions.matrix.flat,
-                                            data0.partitions.matrix.flat):
+        def _binary(partitions):
+            partition_r, partition_s = partitions
 
+            # Set numpy.seterr, which is local to each thread
+            original_numpy_seterr = numpy_seterr(**_seterr)
+            
             partition_s.open(config)
             
             indices = partition_s.indices
@@ -4297,10 +4939,6 @@ place.
                 elif method == '__ne__':
                     array0 = ~_numpy_isclose(array0, array1, rtol=rtol, atol=atol)
                 else:
-#                    print(method)
-#                    print (repr(array0))
-#                    print(repr(array1))
-#                    print()
                     array0 = getattr(array0, method)(array1)
 #            try:
 #                array0 = getattr(array0, method)(array1)
@@ -4323,6 +4961,9 @@ place.
                             numpy_result_type(array0.dtype, array1.dtype).name, array0.dtype.name))
                 else:
                     raise TypeError(error)
+            finally:
+                # Reset numpy.seterr
+                numpy_seterr(**original_numpy_seterr)
             #--- End: try
 
             if array0 is NotImplemented:
@@ -4330,11 +4971,6 @@ place.
             elif not array0.ndim and not isinstance(array0, numpy_ndarray):
                 array0 = numpy_asanyarray(array0)
 
-            if not inplace:
-                p_datatype = array0.dtype
-                if new_dtype != p_datatype:
-                    new_dtype = numpy_result_type(p_datatype, new_dtype)
-
             partition.subarray = array0
             partition.Units    = new_Units
             partition.axes     = new_axes
@@ -4351,10 +4987,18 @@ place.
 
             if not inplace:
                 partition_s.close() 
-        #--- End: for
 
-        # Reset numpy.seterr
-        numpy_seterr(**original_numpy_seterr)
+            return array0.dtype
+        #--- End: def
+
+        p_datatypes = _map_partitions(_binary,
+                                      zip(result.partitions.matrix.flat,
+                                          data0.partitions.matrix.flat))
+        if not inplace:
+            for p_datatype in p_datatypes:
+                if new_dtype != p_datatype:
+                    new_dtype = numpy_result_type(p_datatype, new_dtype)
+        #--- End: if
 
         source = result.source(None)
         if source is not None and source.get_compression_type():
@@ -4693,18 +5337,43 @@ place.
                 raise ValueError(
                     "Can't concatenate: All the input arrays must have equivalent units")
         #--- End: for
-           
-        for i, data1 in enumerate(data):
-            if _preserve:
+
+        # The number of times that each input data array is still to
+        # be concatenated
+        remaining = Counter(map(id, data))
+
+        # Partition matrices which are to be concatenated to that of
+        # data0 along the concatenation axis. These are combined with
+        # data0's partition matrix all at once, rather than one at a
+        # time, to avoid repeatedly copying an ever larger matrix.
+        pending_matrices = []
+        pending = {'pmsize': 0}
+        
+        def _concatenate_pending_matrices():
+            '''Concatenate the pending partition matrices to the
+    partition matrix of data0.
+
+            '''
+            if not pending_matrices:
+                return
+
+            partitions0 = data0.partitions
+            partitions0.matrix = numpy_concatenate(
+                [partitions0.matrix] + pending_matrices, axis=0)
+
+            # Update the location map of the partition matrix of data0
+            partitions0.set_location_map((data0._axes[axis],), (axis,))
+
+            del pending_matrices[:]
+            pending['pmsize'] = 0
+        #--- End: def
+
+        for data1 in data:
+            remaining[id(data1)] -= 1
+            if _preserve or remaining[id(data1)]:
+                # Copy data1 if it is to be preserved or if it appears
+                # again later in the input data arrays
                 data1 = data1.copy()
-            else:
-                # If data1 appears more than once in the input data
-                # arrays then we need to copy it
-                for d in data[i+1:]:
-                    if d is data1:
-                        data1 = data1.copy()
-                        break
-            #--- End: if
 
             # Turn a scalar array into a 1-d array
             if not data1._ndim:
@@ -4716,7 +5385,9 @@ place.
             # 1. Make sure that the internal names of the axes match
             # ------------------------------------------------------------
             axis_map = {}
-            if data1._pmsize < data0._pmsize:
+            if data1._axes == data0._axes:
+                pass
+            elif data1._pmsize < data0._pmsize + pending['pmsize']:
                 for axis1, axis0 in zip(data1._axes, data0._axes):
                     axis_map[axis1] = axis0
                     
@@ -4724,7 +5395,8 @@ place.
             else:
                 for axis1, axis0 in zip(data1._axes, data0._axes):
                     axis_map[axis0] = axis1
-                    
+
+                _concatenate_pending_matrices()
                 data0._change_axis_names(axis_map)
             #--- End: if
 
@@ -4757,11 +5429,18 @@ place.
                     g_pmaxes = g_pmaxes[:]
                     g_pmaxes.remove(Paxis)
                     
+                f_pmaxes = f.partitions.axes
+                new_pmaxes = [pmaxis for pmaxis in g_pmaxes[::-1] + [Paxis]
+                              if pmaxis not in f_pmaxes]
+                if not new_pmaxes:
+                    continue
+
+                if f is data0:
+                    _concatenate_pending_matrices()
+
                 f_partitions = f.partitions
-                f_pmaxes = f_partitions.axes
-                for pmaxis in g_pmaxes[::-1] + [Paxis]:
-                    if pmaxis not in f_pmaxes:
-                        f_partitions.insert_dimension(pmaxis, inplace=True)
+                for pmaxis in new_pmaxes:
+                    f_partitions.insert_dimension(pmaxis, inplace=True)
             
 #                if Paxis not in f_partitions.axes:
 #                    f_partitions.insert_dimension(Paxis, inplace=True)
@@ -4773,6 +5452,7 @@ place.
             # ------------------------------------------------------------
             ipmaxis = data0.partitions.axes.index(Paxis)
             if ipmaxis:
+                _concatenate_pending_matrices()
                 data0.partitions.swapaxes(ipmaxis, 0, inplace=True)
                 
             # ------------------------------------------------------------
@@ -4816,6 +5496,12 @@ place.
                 for f, g, bf, bg in ((data0, data1, bounds0, bounds1), 
                                      (data1, data0, bounds1, bounds0)):
                     extra_bounds = [i for i in bg if i in symmetric_diff]
+                    if not extra_bounds:
+                        continue
+
+                    if f is data0:
+                        _concatenate_pending_matrices()
+
                     f.add_partitions(extra_bounds, dim)
                 #--- End: for
             #--- End: for
@@ -4825,28 +5511,16 @@ place.
             # ------------------------------------------------------------
 #            if data0._flip != data1._flip:
             if data0._flip() != data1._flip():
+                if data0._flip():
+                    _concatenate_pending_matrices()
+                    
                 data0._move_flip_to_partitions()
                 data1._move_flip_to_partitions()
-            
-            matrix0 = data0.partitions.matrix
-            matrix1 = data1.partitions.matrix
-
-            new_pmshape     = list(matrix0.shape)
-            new_pmshape[0] += matrix1.shape[0]
-            
-            # Initialise an empty partition matrix with the new shape
-            new_matrix = numpy_empty(new_pmshape, dtype=object)
-
-            # Insert the data0 partition matrix
-            new_matrix[:matrix0.shape[0]] = matrix0       
 
-            # Insert the data1 partition matrix
-            new_matrix[matrix0.shape[0]:] = matrix1
-
-            data0.partitions.matrix = new_matrix
-            
-            # Update the location map of the partition matrix of data0
-            data0.partitions.set_location_map((Paxis,), (axis,))
+            # Defer the concatenation of the data1 partition matrix
+            # until all of the input data arrays have been processed
+            pending_matrices.append(data1.partitions.matrix)
+            pending['pmsize'] += data1._pmsize
 
             # ------------------------------------------------------------
             # 7. Update the size, shape and dtype of data0
@@ -4921,6 +5595,8 @@ place.
 #                    data0._auxiliary_mask_add_component(mask)
         #--- End: for
 
+        _concatenate_pending_matrices()
+
         # ------------------------------------------------------------
         # Done
         # ------------------------------------------------------------
@@ -5035,18 +5711,28 @@ place.
     [[1 2 3 4 5]]
 
         '''
+        kind = self.dtype.kind
+        if (LAZY_OPERATIONS() and kind in 'biufc' and
+            (operation != '__invert__' or kind in 'biu')):
+            new = self.copy()
+            new._defer_operation(_DeferredOperation(operation), self.Units)
+            return new
+        #--- End: if
+
         self.to_memory()
 
         new = self.copy()
 
         config = new.partition_configuration(readonly=True)
 
-        for partition in new.partitions.matrix.flat:
+        def _unary(partition):
             partition.open(config)
             array = partition.array
             partition.subarray = getattr(operator, operation)(array)
             partition.close()
 
+        _map_partitions(_unary, new.partitions.matrix.flat)
+
         return new
 
 
@@ -5861,8 +6547,16 @@ place.
         # Flag which partitions will be processed on this rank. If
         # _parallelise_collapse is False then all partitions will be
         # flagged for processing.
+        _collapse_load['time'] = 0.0
+        _collapse_load['cost'] = [0.0] * mpi_size
+
         new._flag_partitions_for_processing(_parallelise_collapse)
 
+        if _parallelise_collapse:
+            _add_collapse_costs(new._process_costs)
+            start_time = _time_monotonic()
+        #--- End: if
+
         processed_partitions = []
         for pmindex, partition in numpy_ndenumerate(new.partitions.matrix):
             if partition._process_partition:
@@ -5898,6 +6592,9 @@ place.
             #--- End: if
         #--- End: for
 
+        if _parallelise_collapse:
+            _collapse_load['time'] += _time_monotonic() - start_time
+
         # processed_partitions contains a list of all the partitions
         # that have been processed on this rank. In the serial case
         # this is all of them and this line of code has no
@@ -5922,6 +6619,10 @@ place.
         # now in a temporary file so that __del__ knows which lock
         # files to check if present
         new._share_lock_files(_parallelise_collapse)
+
+        if _parallelise_collapse or _parallelise_collapse_subspace:
+            # Record how the work was balanced across the ranks
+            _update_collapse_statistics()
         
         new._all_axes = None
 #        new._flip     = []
@@ -6044,84 +6745,72 @@ dimensions.
         # will be flagged for processing.
         data._flag_partitions_for_processing(_parallelise_collapse_subspace)
 
-        for i, partition in enumerate(data.partitions.matrix.flat):
-            if partition._process_partition:
-                # Only process a partition if flagged
-                partition.open(config)
-                array = partition.array
+        if _parallelise_collapse_subspace:
+            _add_collapse_costs(data._process_costs)
+            start_time = _time_monotonic()
+        #--- End: if
 
-                p_masked = partition.masked
+        collapse_args = (config, func, indices, master_shape,
+                         weights, n_non_collapse_axes,
+                         n_collapse_axes, reshape, kwargs)
 
-                if p_masked:
-                    masked = True
-                    if array.mask.all():
-                        # The array is all missing data
-                        partition.close()
-                        continue
-    
-                # Still here? Then there are some non-missing sub-array
-                # elements.
-                if weights is not None:
-                    w = self._collapse_create_weights(array, partition.indices,
-                                                      indices,
-                                                      master_shape, weights,
-                                                      n_non_collapse_axes,
-                                                      n_collapse_axes)
-                    wmin = w.min()
-                    if wmin < 0:
-                        raise ValueError("Can't collapse with negative weights")
+        processes = COLLAPSE_PROCESSES()
+        if (processes > 1 and not _parallelise_collapse_subspace and
+            data.partitions.size > 1):
+            # --------------------------------------------------------
+            # Collapse the partitions with a pool of processes. Each
+            # partition whose subarray is on disk is sent to a worker
+            # process, which reads the subarray itself and returns
+            # the partial result. Partitions whose subarrays are in
+            # memory are collapsed in this process.
+            # --------------------------------------------------------
+            pool = _collapse_process_pool(processes)
+            results = []
+            for partition in data.partitions.matrix.flat:
+                if partition.on_disk:
+                    results.append(pool.submit(_collapse_partition,
+                                               partition, *collapse_args))
+                else:
+                    results.append(_collapse_partition(partition,
+                                                       *collapse_args))
+            #--- End: for
 
-                    if wmin == 0:
-                        # Mask the array where the weights are zero
-                        array = numpy_ma_masked_where(w==0, array, copy=True)
-                        if array.mask.all():
-                            # The array is all missing data
-                            partition.close()
-                            continue
-                    #--- End: if
- 
-                    kwargs['weights'] = w
-                #--- End: if
+            results = [(result.result() if isinstance(result, Future)
+                        else result)
+                       for result in results]
+        else:
+            results = (_collapse_partition(partition, *collapse_args)
+                       for partition in _read_ahead_partitions(
+                               partition
+                               for partition in data.partitions.matrix.flat
+                               if partition._process_partition))
+        #--- End: if
 
-                partition.close()
+        for i, (p_masked, p_out) in enumerate(results):
+            if p_masked:
+                masked = True
 
-                if reshape:
-                    # At least two, but not all, axes are to be collapsed
-                    # => we need to reshape the array and the weights.
-                    shape = array.shape
-                    ndim = array.ndim
-                    new_shape  = shape[:n_non_collapse_axes]
-                    new_shape += (reduce(operator_mul, shape[n_non_collapse_axes:]),)
-                    array = numpy_reshape(array.copy(), new_shape)
-
-                    if weights is not None:
-                        w = kwargs['weights']
-                        if w.ndim < ndim:
-                            # The weights span only collapse axes (as
-                            # opposed to spanning all axes)
-                            new_shape = (w.size,)
-
-                        kwargs['weights'] = numpy_reshape(w, new_shape)
-                #--- End: if  
-
-                p_out = func(array, masked=p_masked, **kwargs)
-
-                if out is None:
-                    if not _parallelise_collapse_subspace and data.partitions.size == i + 1:
-                        # There is exactly one partition so we are done
-                        out = p_out
-                        break
-                    #--- End: if
-                    out = fpartial(p_out)
-                else:
-                    out = fpartial(out, p_out)
+            if p_out is None:
+                # The partition is all missing data
+                continue
+            
+            if out is None:
+                if not _parallelise_collapse_subspace and data.partitions.size == i + 1:
+                    # There is exactly one partition so we are done
+                    out = p_out
+                    break
                 #--- End: if
-
-                sub_samples += 1
-
+                out = fpartial(p_out)
+            else:
+                out = fpartial(out, p_out)
             #--- End: if
+
+            sub_samples += 1
         #--- End: for
 
+        if _parallelise_collapse_subspace:
+            _collapse_load['time'] += _time_monotonic() - start_time
+
         if _parallelise_collapse_subspace:
             # Aggregate the outputs of each rank using the group=True
             # keyword on fpartial on rank 0 only
@@ -6286,6 +6975,685 @@ dimensions.
         return out
     #--- End: def
 
+    def _collapse_binned(self, method, bins, shape, weights=None,
+                         mtol=1, ddof=1):
+        '''Collapse the elements that lie in each of a set of
+    N-dimensional bins in one pass through the partitions.
+
+    The bin indices of each element are combined into a single flat
+    bin index, and the sample size, the sums of the (weighted) values
+    and of their squares, the sums of the weights, and the minimum
+    and maximum values of every bin are accumulated partition by
+    partition, from which the collapsed value of each bin is found.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_collapse_grouped`, `digitize`
+
+    :Parameters:
+
+        method: `str`
+            The name of the `Data` collapse method, e.g. ``'mean'``,
+            ``'max'`` or ``'var'``.
+
+        bins: sequence of `Data`
+            The integer bin indices for each dimension of the bins,
+            each of which must be broadcastable to the data. Elements
+            whose bin index is missing data, or not a valid index of
+            that dimension of the bins, do not lie in any bin.
+
+        shape: sequence of `int`
+            The number of bins of each dimension of the bins.
+
+        weights: `dict`, optional
+            Weights for one or more axes, keyed by tuples of axis
+            positions, as accepted by the *weights* parameter of
+            `mean`.
+
+        mtol: number, optional
+            As for `mean`. The maximum number of elements in each bin
+            is the number of elements, including missing data, that
+            lie in it.
+
+        ddof: number, optional
+            The delta degrees of freedom of ``'var'`` and ``'sd'``
+            collapses.
+
+    :Returns:
+
+        `Data` or `None`
+            The collapsed values of the bins, with the given shape,
+            or `None` if the method can not be applied to all bins at
+            once. Bins which contain no non-missing elements are
+            missing data.
+
+    **Examples:**
+
+    >>> d = cf.Data([[1, 2, 3], [4, 5, 6]], 'K')
+    >>> i = cf.Data([[0, 1, 1], [2, 2, 1]])
+    >>> print(d._collapse_binned('max', [i], [3]).array)
+    [3 6 5]
+    >>> print(d._collapse_binned('sample_size', [i], [4]).array)
+    [1.0 3.0 2.0 --]
+
+        '''
+        if method not in _collapse_binned_methods:
+            return
+
+        ndim         = self._ndim
+        master_shape = self._shape
+        nbins        = reduce(operator_mul, shape, 1)
+
+        # ------------------------------------------------------------
+        # Parse the weights
+        # ------------------------------------------------------------
+        if weights:
+            parsed_weights = {}
+            for key, weight in weights.items():
+                if weight is None or numpy_size(weight) == 1:
+                    # Ignore undefined weights and size 1 weights
+                    continue
+
+                key = tuple(self._parse_axes(key))
+                parsed_weights[key] = type(self).asdata(weight)
+            #--- End: for
+
+            weights = parsed_weights
+        #--- End: if
+
+        weighted = bool(weights)
+
+        absolute = method in ('maximum_absolute_value',
+                              'minimum_absolute_value',
+                              'mean_absolute_value')
+        
+        extrema = method in ('max', 'min', 'maximum_absolute_value',
+                             'minimum_absolute_value', 'mid_range',
+                             'range')
+
+        sums = method in ('mean', 'mean_absolute_value', 'sum',
+                          'integral')
+
+        sums_of_squares = method in ('sum_of_squares',
+                                     'root_mean_square')
+
+        # Variances are found from the means and sums of squared
+        # deviations from the mean of each bin, which are combined
+        # across partitions as in `var_fpartial`
+        deviations = method in ('var', 'sd')
+
+        sums_of_weights2 = weighted and (method == 'sum_of_weights2' or
+                                         (method in ('var', 'sd') and
+                                          ddof == 1))
+
+        # ------------------------------------------------------------
+        # Initialise the accumulations for each bin
+        # ------------------------------------------------------------
+        N     = numpy_zeros((nbins,), dtype=float)
+        N_all = numpy_zeros((nbins,), dtype=float)
+        if weighted:
+            V1 = numpy_zeros((nbins,), dtype=float)
+
+        if sums_of_weights2:
+            V2 = numpy_zeros((nbins,), dtype=float)
+
+        if sums:
+            S1 = numpy_zeros((nbins,), dtype=float)
+
+        if sums_of_squares:
+            S2 = numpy_zeros((nbins,), dtype=float)
+
+        if deviations:
+            AVG = numpy_zeros((nbins,), dtype=float)
+            M2  = numpy_zeros((nbins,), dtype=float)
+
+        if extrema:
+            amin = numpy_empty((nbins,), dtype=self.dtype)
+            amax = numpy_empty((nbins,), dtype=self.dtype)
+
+        master_indices = tuple([slice(0, n, 1) for n in master_shape])
+
+        config = self.partition_configuration(readonly=True)
+
+        for partition in _read_ahead_partitions(self.partitions.matrix.flat):
+            partition.open(config)
+            array    = partition.array
+            p_masked = partition.masked
+            indices  = partition.indices
+
+            if weighted:
+                w = self._collapse_create_weights(array, indices,
+                                                  master_indices,
+                                                  master_shape,
+                                                  weights, 0, ndim)
+                w = numpy_ma_getdata(w)
+            #--- End: if
+
+            partition.close()
+
+            # --------------------------------------------------------
+            # Find the flat bin index of each element, and which
+            # elements lie in a bin
+            # --------------------------------------------------------
+            ids    = numpy_zeros(array.shape, dtype=int)
+            in_bin = numpy_ones(array.shape, dtype=bool)
+            for b, n in zip(bins, shape):
+                b_ndim = b.ndim
+                b_indices = tuple([
+                    slice(None) if size == 1 else index
+                    for size, index in zip(b.shape,
+                                           indices[ndim-b_ndim:])])
+                x = b[b_indices].array
+                if numpy_ma_isMA(x):
+                    in_bin &= ~numpy_ma_getmaskarray(x)
+                    x = numpy_ma_getdata(x)
+
+                x = x.astype(int, copy=False)
+
+                in_bin &= (x >= 0)
+                in_bin &= (x < n)
+                ids *= n
+                ids += x
+            #--- End: for
+
+            N_all += numpy_bincount(ids[in_bin], minlength=nbins)
+
+            # Exclude missing data and elements with zero weight
+            if p_masked:
+                in_bin &= ~numpy_ma_getmaskarray(array)
+                array = numpy_ma_getdata(array)
+
+            if weighted:
+                if in_bin.any() and w[in_bin].min() < 0:
+                    raise ValueError("Can't collapse with negative weights")
+
+                in_bin &= (w != 0)
+                w = w[in_bin]
+            #--- End: if
+
+            ids = ids[in_bin]
+            if not ids.size:
+                continue
+
+            x = array[in_bin]
+            if absolute:
+                x = numpy_abs(x)
+
+            # --------------------------------------------------------
+            # Update the minimum and maximum of each bin
+            # --------------------------------------------------------
+            if extrema:
+                order = numpy_argsort(ids, kind='mergesort')
+                ids_sorted = ids[order]
+                x_sorted   = x[order]
+                starts = numpy_flatnonzero(
+                    numpy_concatenate(([True],
+                                       ids_sorted[1:] != ids_sorted[:-1])))
+                p_bins = ids_sorted[starts]
+                p_min = numpy_minimum.reduceat(x_sorted, starts)
+                p_max = numpy_maximum.reduceat(x_sorted, starts)
+
+                new = (N[p_bins] == 0)
+                if new.any():
+                    amin[p_bins[new]] = p_min[new]
+                    amax[p_bins[new]] = p_max[new]
+
+                old = ~new
+                if old.any():
+                    k = p_bins[old]
+                    amin[k] = numpy_minimum(amin[k], p_min[old])
+                    amax[k] = numpy_maximum(amax[k], p_max[old])
+            #--- End: if
+
+            # --------------------------------------------------------
+            # Update the sums of each bin
+            # --------------------------------------------------------
+            p_N = numpy_bincount(ids, minlength=nbins)
+            N += p_N
+
+            if weighted or deviations:
+                if weighted:
+                    p_V1 = numpy_bincount(ids, weights=w, minlength=nbins)
+                else:
+                    p_V1 = p_N
+
+                if deviations:
+                    # Combine the mean and sum of squared deviations
+                    # of each bin in this partition with those of the
+                    # previous partitions
+                    V1_old = V1 if weighted else N - p_V1
+                    with numpy_errstate(divide='ignore', invalid='ignore'):
+                        if weighted:
+                            p_AVG = numpy_bincount(ids, weights=w*x,
+                                                   minlength=nbins)
+                        else:
+                            p_AVG = numpy_bincount(ids, weights=x,
+                                                   minlength=nbins)
+
+                        p_AVG /= p_V1
+                        dx = x - p_AVG[ids]
+                        if weighted:
+                            p_M2 = numpy_bincount(ids, weights=w*dx*dx,
+                                                  minlength=nbins)
+                        else:
+                            p_M2 = numpy_bincount(ids, weights=dx*dx,
+                                                  minlength=nbins)
+
+                        f = p_V1 / (V1_old + p_V1)
+                        delta = p_AVG - AVG
+                        p_M2 += delta * delta * V1_old * f
+                        delta *= f
+
+                    occupied = (p_V1 > 0)
+                    M2[occupied]  += p_M2[occupied]
+                    AVG[occupied] += delta[occupied]
+                #--- End: if
+
+                if weighted:
+                    V1 += p_V1
+                    if sums_of_weights2:
+                        V2 += numpy_bincount(ids, weights=w*w,
+                                             minlength=nbins)
+            #--- End: if
+
+            if weighted and (sums or sums_of_squares):
+                wx = w * x
+            else:
+                wx = x
+
+            if sums:
+                S1 += numpy_bincount(ids, weights=wx, minlength=nbins)
+
+            if sums_of_squares:
+                S2 += numpy_bincount(ids, weights=wx*x, minlength=nbins)
+        #--- End: for
+
+        # ------------------------------------------------------------
+        # Find the collapsed value of each bin
+        # ------------------------------------------------------------
+        if not weighted:
+            V1 = N
+
+        Nmin  = 1
+        units = self.Units
+
+        with numpy_errstate(divide='ignore', invalid='ignore'):
+            if method == 'sample_size':
+                array = N
+                units = _units_1
+            elif method in ('max', 'maximum_absolute_value'):
+                array = amax
+            elif method in ('min', 'minimum_absolute_value'):
+                array = amin
+            elif method == 'mid_range':
+                # Cast to float64 before adding, as mid_range_ffinalise
+                # does, so that integers can't overflow
+                array = amax.astype(float)
+                array += amin
+                array *= 0.5
+            elif method == 'range':
+                # Promote to double precision before subtracting, as
+                # range_ffinalise does, so that integers can't overflow
+                array = double_precision(amax)
+                array -= amin
+            elif method in ('sum', 'integral'):
+                array = S1
+            elif method == 'sum_of_squares':
+                array = S2
+            elif method in ('mean', 'mean_absolute_value'):
+                array = S1 / V1
+            elif method == 'root_mean_square':
+                array = numpy_sqrt(S2 / V1)
+            elif method in ('sum_of_weights', 'sum_of_weights2'):
+                if not weighted:
+                    array = N
+                elif method == 'sum_of_weights':
+                    array = V1
+                else:
+                    array = V2
+            else:
+                # Variance or standard deviation
+                Nmin = max(2, ddof+1)
+
+                array = M2 / V1
+
+                if not weighted:
+                    if ddof:
+                        array *= N / (N - ddof)
+                elif ddof == 1:
+                    V1 *= V1
+                    array *= V1 / (V1 - V2)
+                elif ddof:
+                    raise ValueError(
+                        "Can only calculate a weighted variance with a delta degrees of freedom (ddof) of 0 or 1: Got {}".format(
+                            ddof))
+
+                if method == 'sd':
+                    array = numpy_sqrt(array)
+        #--- End: with
+
+        # ------------------------------------------------------------
+        # Set the units
+        # ------------------------------------------------------------
+        if method in ('var', 'sum_of_squares'):
+            if units:
+                units = units ** 2
+        elif method in ('integral', 'sum_of_weights', 'sum_of_weights2'):
+            if not weighted:
+                if method != 'integral':
+                    units = Units()
+            else:
+                if method == 'integral':
+                    if not units:
+                        units = _units_1
+                else:
+                    units = _units_1
+
+                for w in weights.values():
+                    weights_units = getattr(w, 'Units', None)
+                    if weights_units:
+                        if method == 'sum_of_weights2':
+                            weights_units = weights_units ** 2
+
+                        units = units * weights_units
+        #--- End: if
+
+        # ------------------------------------------------------------
+        # Mask bins with too few values
+        # ------------------------------------------------------------
+        mask = (N < Nmin)
+        if mtol < 1:
+            mask |= (N < (1 - mtol) * N_all)
+
+        if mask.any():
+            array[mask] = 0
+            array = numpy_ma_masked_where(mask, array, copy=False)
+
+        return type(self)(array.reshape(tuple(shape)), units=units,
+                          fill_value=self.get_fill_value(None))
+    #--- End: def
+
+    def _collapse_grouped(self, method, axis, groups, weights=None,
+                          mtol=1, ddof=0):
+        '''Collapse groups of elements along an axis in one pass through
+    the partitions.
+
+    Each partition is read once, its elements along the collapse axis
+    are sorted into contiguous segments by group, and each segment is
+    collapsed with the same functions as the corresponding `Data`
+    method. The partial results of each group are combined across
+    partitions before being finalised.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_collapse`
+
+    :Parameters:
+
+        method: `str`
+            The name of the `Data` collapse method, e.g. ``'mean'``,
+            ``'max'`` or ``'var'``.
+
+        axis: `int`
+            The position of the axis to be collapsed.
+
+        groups: sequence of array-like
+            The positions along the collapse axis of the elements of
+            each group. Each group's positions must be unique and in
+            increasing order, and no position may be in more than one
+            group.
+
+        weights: `dict`, optional
+            Weights for one or more axes, keyed by tuples of axis
+            positions, as accepted by the *weights* parameter of
+            `mean`. Ignored for unweighted methods.
+
+        mtol: number, optional
+            As for `mean`. The maximum number of elements in each
+            group is the size of that group.
+
+        ddof: number, optional
+            The delta degrees of freedom of ``'var'`` and ``'sd'``
+            collapses.
+
+    :Returns:
+
+        `Data` or `None`
+            The collapsed data, which has the size of the collapse
+            axis equal to the number of groups, or `None` if the
+            method can not be applied to all groups at once or the
+            result would not fit in memory.
+
+    **Examples:**
+
+    >>> d = cf.Data([[1, 2, 3, 4, 5, 6]], 'K')
+    >>> print(d._collapse_grouped('max', 1, [[0, 1], [2, 3, 4, 5]]).array)
+    [[2 6]]
+    >>> print(d._collapse_grouped('mean', 1, [[0, 5], [1]]).array)
+    [[3.5 2. ]]
+
+        '''
+        functions = _collapse_grouped_functions.get(method)
+        if functions is None:
+            return
+
+        func, fpartial, ffinalise = functions
+
+        axis = self._parse_axes(axis)[0]
+
+        ndim  = self._ndim
+        shape = self._shape
+        ngroups = len(groups)
+
+        result_shape = shape[:axis] + shape[axis+1:] + (ngroups,)
+        if (reduce(operator_mul, result_shape, 1) * 9 >
+            FREE_MEMORY() - FM_THRESHOLD()):
+            # The result would not fit in memory
+            return
+
+        d = self.copy()
+        self_axes = d._axes
+
+        # ------------------------------------------------------------
+        # Label each element of the collapse axis with the index of
+        # its group, or -1 if it is not in any group
+        # ------------------------------------------------------------
+        group_of = numpy_full((shape[axis],), -1, dtype=int)
+        Nmax = []
+        for g, index in enumerate(groups):
+            group_of[index] = g
+            Nmax.append(numpy_size(index))
+
+        # ------------------------------------------------------------
+        # Parse the weights, keying them by axis names
+        # ------------------------------------------------------------
+        if weights:
+            parsed_weights = {}
+            for key, weight in weights.items():
+                if weight is None or numpy_size(weight) == 1:
+                    # Ignore undefined weights and size 1 weights
+                    continue
+
+                key = d._parse_axes(key)
+                parsed_weights[tuple([self_axes[i] for i in key])] = (
+                    type(self).asdata(weight))
+            #--- End: for
+            
+            if not any(self_axes[axis] in key for key in parsed_weights):
+                # Ignore all of the weights if none of them span the
+                # collapse axis
+                parsed_weights = {}
+
+            weights = parsed_weights
+        #--- End: if
+
+        # ------------------------------------------------------------
+        # Move the collapse axis to the end, and permute the order of
+        # the weight axes to be consistent with the order of the data
+        # axes
+        # ------------------------------------------------------------
+        iaxes = [i for i in range(ndim) if i != axis] + [axis]
+        if axis != ndim - 1:
+            d.transpose(iaxes, inplace=True)
+
+        if weights:
+            self_axes = d._axes
+            for key, w in tuple(weights.items()):
+                key1 = tuple([a for a in self_axes if a in key])
+                if key1 != key:
+                    w = w.transpose([key.index(a) for a in key1])
+
+                del weights[key]
+                weights[tuple([self_axes.index(a) for a in key1])] = w
+        #--- End: if
+
+        n_non_collapse_axes = ndim - 1
+        master_shape   = d._shape
+        master_indices = tuple([slice(0, n, 1) for n in master_shape])
+
+        kwargs = {}
+        if method in ('var', 'sd'):
+            kwargs['ddof'] = ddof
+
+        if n_non_collapse_axes:
+            kwargs['axis'] = n_non_collapse_axes
+
+        config = d.partition_configuration(readonly=True)
+
+        # ------------------------------------------------------------
+        # Collapse every group's segment of each partition, combining
+        # the partial results of each group and each block of
+        # non-collapse axis elements as we go
+        # ------------------------------------------------------------
+        partials    = {}
+        sub_samples = {}
+        masked      = False
+
+
+        for partition in _read_ahead_partitions(d.partitions.matrix.flat):
+            partition.open(config)
+            array    = partition.array
+            p_masked = partition.masked
+
+            if weights:
+                w = self._collapse_create_weights(array,
+                                                  partition.indices,
+                                                  master_indices,
+                                                  master_shape,
+                                                  weights,
+                                                  n_non_collapse_axes, 1)
+            else:
+                w = None
+
+            partition.close()
+
+            location = partition.location
+            block = tuple([tuple(r) for r in location[:-1]])
+            start, stop = location[-1]
+
+            # Sort the elements along the collapse axis into
+            # contiguous segments of the same group
+            p_groups = group_of[start:stop]
+            order = numpy_argsort(p_groups, kind='mergesort')
+            p_groups = p_groups[order]
+            edges = (numpy_flatnonzero(numpy_diff(p_groups)) + 1).tolist()
+
+            for i, j in zip([0] + edges, edges + [p_groups.size]):
+                g = int(p_groups[i])
+                if g < 0:
+                    # These elements are not in any group
+                    continue
+
+                positions = order[i:j]
+                if positions[-1] - positions[0] == j - i - 1:
+                    # The segment is contiguous, so use a view
+                    positions = slice(positions[0], positions[-1] + 1)
+
+                a = array[..., positions]
+
+                a_masked = p_masked and numpy_ma_is_masked(a)
+                if a_masked:
+                    masked = True
+                    if a.mask.all():
+                        # The segment is all missing data
+                        continue
+                elif p_masked:
+                    a = numpy_ma_getdata(a)
+
+                if w is not None:
+                    ws = w[..., positions]
+                    wmin = ws.min()
+                    if wmin < 0:
+                        raise ValueError(
+                            "Can't collapse with negative weights")
+
+                    if wmin == 0:
+                        # Mask the segment where the weights are zero
+                        a = numpy_ma_masked_where(
+                            broadcast_array(ws == 0, a.shape), a,
+                            copy=True)
+                        masked = a_masked = True
+                        if a.mask.all():
+                            # The segment is all missing data
+                            continue
+                    #--- End: if
+
+                    kwargs['weights'] = ws
+                #--- End: if
+
+                p_out = func(a, masked=a_masked, **kwargs)
+
+                key = (block, g)
+                if key in partials:
+                    partials[key] = fpartial(partials[key], p_out)
+                    sub_samples[key] += 1
+                else:
+                    partials[key] = fpartial(p_out)
+                    sub_samples[key] = 1
+            #--- End: for
+        #--- End: for
+
+        # ------------------------------------------------------------
+        # Finalise the collapse of each group and put the results
+        # into the output array
+        # ------------------------------------------------------------
+        results = []
+        for (block, g), value in partials.items():
+            N, result = ffinalise(value, sub_samples[(block, g)])
+            result = self._collapse_mask(result, masked, N, Nmax[g], mtol)
+            results.append((block, g, result))
+
+        datatype = numpy_result_type(d.dtype,
+                                     *[result.dtype
+                                       for _, _, result in results])
+
+        array = numpy_ma_masked_all(result_shape, dtype=datatype)
+        for block, g, result in results:
+            array[tuple([slice(*r) for r in block]) + (g,)] = result
+
+        if not numpy_ma_is_masked(array):
+            array = array.data
+
+        if method in ('var', 'sum_of_squares'):
+            units = self.Units
+            if units:
+                units = units ** 2
+        elif method == 'sample_size':
+            units = _units_1
+        else:
+            units = self.Units
+
+        out = type(self)(array, units=units,
+                         fill_value=self.get_fill_value(None))
+
+        if axis != ndim - 1:
+            # Move the collapsed axis back to its original position
+            out.transpose([iaxes.index(i) for i in range(ndim)],
+                          inplace=True)
+
+        return out
+    #--- End: def
+
     @classmethod
     def _collapse_finalise(cls, ffinalise, out, sub_samples, masked,
                            Nmax, mtol, data, n_non_collapse_axes):
@@ -6435,13 +7803,21 @@ dimensions.
             if weights_out_shape[n_non_collapse_axes:] != array_shape[n_non_collapse_axes:]:
                 # The input weights span some, but not all, of the
                 # collapse axes, so broadcast the weights over all
-                # collapse axes
-                weights_out = broadcast_array(weights_out, array_shape[n_non_collapse_axes:])       
+                # collapse axes. The broadcast weights are a read-only
+                # view of the compact weights, which is never written
+                # to by the collapse functions.
+                weights_out = numpy_broadcast_to(
+                    weights_out, array_shape[n_non_collapse_axes:])
+        elif not masked:
+            if weights_out_shape != array_shape:
+                # The input weights span at least one non-collapse
+                # axis, so broadcast the weights over all axes as a
+                # read-only view
+                weights_out = numpy_broadcast_to(weights_out, array_shape)
         else:
             if weights_out_shape != array_shape:
-                # Either a) The input weights span at least one
-                # non-collapse axis, so broadcast the weights over all
-                # axes or b) The weights contain masked values
+                # The weights contain masked values, so broadcast the
+                # weights and their mask over all axes
                 weights_out = broadcast_array(weights_out, array_shape)
     
             if masked and numpy_ma_isMA(array):
@@ -6577,11 +7953,67 @@ dimensions.
     def _HDF_chunks(self):        del self._custom['_HDF_chunks']
 
     @property
-    def partitions(self):        return self._custom['partitions']
+    def partitions(self):
+        partitions = self._custom['partitions']
+        owners = partitions._owners
+        if len(owners) == 1 and id(self) in owners:
+            return partitions
+
+        with _partitions_lock:
+            partitions = self._custom['partitions']
+            owners = partitions._owners
+            owners.pop(id(self), None)
+            if owners:
+                # The partition matrix is shared with another data
+                # array, so replace it with a private copy before it
+                # is used.
+                partitions = partitions.copy()
+                self._custom['partitions'] = partitions
+
+            partitions._owners[id(self)] = self
+
+        return partitions
     @partitions.setter    
-    def partitions(self, value): self._custom['partitions'] = value
+    def partitions(self, value):
+        with _partitions_lock:
+            self._unshare_partitions()
+            value._owners[id(self)] = self
+            self._custom['partitions'] = value
     @partitions.deleter
-    def partitions(self):        del self._custom['partitions']
+    def partitions(self):
+        with _partitions_lock:
+            self._unshare_partitions()
+            del self._custom['partitions']
+
+    @property
+    def _shared_partitions(self):
+        '''The partition matrix, without copying it if it is shared.
+
+    The partition matrix may be shared with other data arrays, so
+    neither it nor its partitions may be changed.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `partitions`
+
+        '''
+        return self._custom['partitions']
+
+    def _unshare_partitions(self):
+        '''Stop sharing the partition matrix prior to it being replaced.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `partitions`
+
+    :Returns:
+
+        `None`
+
+        '''
+        partitions = self._custom.get('partitions')
+        if partitions is not None:
+            partitions._owners.pop(id(self), None)
 
     @property
     def _ndim(self):        return self._custom['_ndim']
@@ -6959,7 +8391,7 @@ False
         '''TODO
 
         '''
-        return self.partitions.axes
+        return self._shared_partitions.axes
 
 
     @property
@@ -6979,7 +8411,7 @@ False
     0
 
         '''
-        return self.partitions.ndim
+        return self._shared_partitions.ndim
 
 
     @property
@@ -6999,7 +8431,7 @@ False
     1
 
         '''
-        return self.partitions.size
+        return self._shared_partitions.size
 
 
     @property
@@ -7017,7 +8449,7 @@ False
     ()
 
         '''
-        return self.partitions.shape
+        return self._shared_partitions.shape
 
 
     @property
@@ -7171,9 +8603,10 @@ False
         else:
             # --------------------------------------------------------
             # array_out is not a scalar array, so it can safely be
-            # indexed with partition.indices in all cases.
+            # indexed with partition.indices in all cases. Partitions
+            # in PP and UM fields files are read ahead in batches.
             # --------------------------------------------------------
-            for partition in partitions.matrix.flat:
+            for partition in _read_ahead_partitions(partitions.matrix.flat):
                 partition.open(config)
                 p_array = partition.array
 
@@ -7332,7 +8765,7 @@ False
 
         config['readonly'] = True
         
-        for partition in self.partitions.matrix.flat:
+        for partition in _read_ahead_partitions(self.partitions.matrix.flat):
             partition.open(config)
             p_array = partition.array
 
@@ -9191,11 +10624,14 @@ False
 
         config = new.partition_configuration(readonly=False, func=_func, dtype=None)
 
-        for partition in new.partitions.matrix.flat:
+        def _YMDhms_partition(partition):
             partition.open(config)
             array = partition.array
-            new_dtype = array.dtype
             partition.close()
+            return array.dtype
+
+        new_dtype = _map_partitions(_YMDhms_partition,
+                                    new.partitions.matrix.flat)[-1]
 
         new._dtype = new_dtype
 
@@ -10327,7 +11763,8 @@ False
                 # Only move the partition to memory if it is flagged
                 # for processing
                 partition.open(config)
-                if partition.on_disk and partition.nbytes <= FREE_MEMORY() - fm_threshold:
+                if (partition.on_disk and
+                    partition.nbytes <= _free_memory_estimate() - fm_threshold):
                     partition.array
                     
                 partition.close()
@@ -10363,7 +11800,7 @@ False
     **Examples:**
 
         '''            
-        return self.partitions.partition_boundaries(self._axes)
+        return self._shared_partitions.partition_boundaries(self._axes)
 
 
     def partition_configuration(self, readonly, **kwargs):
@@ -12476,11 +13913,28 @@ False
         else:
             d = self.copy()
 
+        if (LAZY_OPERATIONS() and isinstance(f, numpy_ufunc) and
+            not out and not kwargs and d.dtype.kind in 'biufc'):
+            # Find the data type of the result from a single element
+            with numpy_errstate(all='ignore'):
+                datatype = f(numpy_ones((1,), dtype=d.dtype)).dtype
+
+            if units is None:
+                units = d.Units
+
+            d._defer_operation(_DeferredOperation(f), units)
+            d.dtype = numpy_result_type(datatype, d.dtype)
+
+            if inplace:
+                d = None
+            return d
+        #--- End: if
+
         config = d.partition_configuration(readonly=False)
             
         datatype = d.dtype
 
-        for partition in d.partitions.matrix.flat:
+        def _func(partition):
             partition.open(config)
             array = partition.array
 
@@ -12489,16 +13943,18 @@ False
             else:
                 array = f(array, **kwargs)
 
-            p_datatype = array.dtype
-            if datatype != p_datatype:
-                datatype = numpy_result_type(p_datatype, datatype)
-                
             partition.subarray = array
 
             if units is not None:
                 partition.Units = units
                 
             partition.close()
+            return array.dtype
+
+        for p_datatype in _map_partitions(_func, d.partitions.matrix.flat):
+            if datatype != p_datatype:
+                datatype = numpy_result_type(p_datatype, datatype)
+        #--- End: for
             
         d.dtype = datatype
 
@@ -13173,6 +14629,261 @@ False
 #--- End: class
 
 
+def _partition_cost(partition):
+    '''Estimate the relative cost of processing a partition.
+
+    The cost is the number of elements in the partition, weighted
+    according to where its subarray is stored: in memory, in a
+    temporary file, in a netCDF file or in a UM file, which is more
+    expensive still if its data are packed. Masked subarrays cost
+    more than unmasked ones.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `Data._flag_partitions_for_processing`
+
+    :Parameters:
+
+        partition: `Partition`
+
+    :Returns:
+
+        `float`
+            The estimated cost.
+
+    '''
+    subarray = partition._subarray
+    if partition.in_memory:
+        cost = _partition_cost_factors['memory']
+    elif partition.in_cached_file:
+        cost = _partition_cost_factors['cached']
+    elif isinstance(subarray, UMArray):
+        cost = _partition_cost_factors['UM']
+        disk_length = subarray.disk_length
+        word_size = subarray.word_size
+        if (disk_length and word_size and
+            disk_length * word_size < subarray.size * subarray.dtype.itemsize):
+            # The data are packed on disk
+            cost *= _partition_cost_factors['packed']
+    elif isinstance(subarray, NetCDFArray):
+        cost = _partition_cost_factors['netCDF']
+    else:
+        cost = _partition_cost_factors['other']
+
+    if getattr(partition, 'masked', True):
+        cost *= _partition_cost_factors['masked']
+
+    return cost * partition.size
+
+
+def _add_collapse_costs(process_costs):
+    '''Add the estimated costs of each rank's partitions to the load of
+    the current parallel collapse.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        process_costs: sequence of `float`
+            The estimated cost of the partitions on each rank.
+
+    :Returns:
+
+        `None`
+
+    '''
+    costs = _collapse_load['cost']
+    for rank, cost in enumerate(process_costs):
+        costs[rank] += cost
+
+
+def _update_collapse_statistics():
+    '''Add the load of the current parallel collapse on every rank to
+    the collapse statistics.
+
+    This is a collective operation, so must be called on every rank.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.collapse_statistics`
+
+    :Returns:
+
+        `None`
+
+    '''
+    times = mpi_comm.allgather(_collapse_load['time'])
+
+    if not _collapse_statistics['time']:
+        _collapse_statistics['time'] = [0.0] * mpi_size
+        _collapse_statistics['cost'] = [0.0] * mpi_size
+
+    _collapse_statistics['collapses'] += 1
+    for rank in range(mpi_size):
+        _collapse_statistics['time'][rank] += times[rank]
+        _collapse_statistics['cost'][rank] += _collapse_load['cost'][rank]
+
+
+def _collapse_partition(partition, config, func, indices,
+                        master_shape, weights, n_non_collapse_axes,
+                        n_collapse_axes, reshape, kwargs):
+    '''Collapse the data array of a partition.
+
+    This is a module level function, rather than a method, so that
+    it may be sent to worker processes.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `Data._collapse_subspace`
+
+    :Parameters:
+
+        partition: `Partition`
+            The partition to be collapsed.
+
+        config: `dict`
+            The configuration for opening the partition.
+
+        func: function
+            The collapse function, e.g. `mean_f`.
+
+        indices: `tuple`
+            The indices of the master array which create the subspace
+            being collapsed.
+
+        master_shape: `tuple`
+            The shape of the master array.
+
+        weights: `dict` or `None`
+            The weights for the master array.
+
+        n_non_collapse_axes: `int`
+            The number of data array axes which are not being
+            collapsed.
+
+        n_collapse_axes: `int`
+            The number of data array axes which are being collapsed.
+
+        reshape: `bool`
+            True if at least two, but not all, axes are to be
+            collapsed.
+
+        kwargs: `dict`
+            Keyword arguments to *func*.
+
+    :Returns:
+
+        `tuple`
+            Whether or not the partition is masked, and the output of
+            *func*, which is `None` if the partition is all missing
+            data.
+
+    '''
+    kwargs = kwargs.copy()
+    
+    partition.open(config)
+    array = partition.array
+
+    p_masked = partition.masked
+
+    if p_masked:
+        if array.mask.all():
+            # The array is all missing data
+            partition.close()
+            return p_masked, None
+
+    # Still here? Then there are some non-missing sub-array
+    # elements.
+    if weights is not None:
+        w = Data._collapse_create_weights(array, partition.indices,
+                                          indices, master_shape,
+                                          weights,
+                                          n_non_collapse_axes,
+                                          n_collapse_axes)
+        wmin = w.min()
+        if wmin < 0:
+            raise ValueError("Can't collapse with negative weights")
+
+        if wmin == 0:
+            # Mask the array where the weights are zero
+            array = numpy_ma_masked_where(w==0, array, copy=True)
+            if array.mask.all():
+                # The array is all missing data
+                partition.close()
+                return p_masked, None
+        #--- End: if
+ 
+        kwargs['weights'] = w
+    #--- End: if
+
+    partition.close()
+
+    if reshape:
+        # At least two, but not all, axes are to be collapsed
+        # => we need to reshape the array and the weights.
+        shape = array.shape
+        ndim = array.ndim
+        new_shape  = shape[:n_non_collapse_axes]
+        new_shape += (reduce(operator_mul, shape[n_non_collapse_axes:]),)
+        array = numpy_reshape(array.copy(), new_shape)
+
+        if weights is not None:
+            w = kwargs['weights']
+            if w.ndim < ndim:
+                # The weights span only collapse axes (as
+                # opposed to spanning all axes)
+                new_shape = (w.size,)
+
+            kwargs['weights'] = numpy_reshape(w, new_shape)
+    #--- End: if  
+
+    return p_masked, func(array, masked=p_masked, **kwargs)
+
+
+def _collapse_process_initializer():
+    '''Initialise a worker process for collapsing partitions.
+
+    A forked worker process inherits the parent's open files and
+    temporary files, which must neither be shared with nor removed
+    from under the parent, so they are forgotten.
+
+    .. versionadded:: 3.0.7
+
+    :Returns:
+
+        `None`
+
+    '''
+    _temporary_files.clear()
+    _file_to_fh_lru.clear()
+    for files in _file_to_fh.values():
+        files.clear()
+
+
+def _collapse_process_pool(processes):
+    '''Return a pool of worker processes for collapsing partitions.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        processes: `int`
+            The number of worker processes.
+
+    :Returns:
+
+        `concurrent.futures.ProcessPoolExecutor`
+
+    '''
+    pool = _collapse_process_pools.get(processes)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=processes,
+                                   initializer=_collapse_process_initializer)
+        _collapse_process_pools[processes] = pool
+
+    return pool
+
+
 def _size_of_index(index, size=None):
     '''Return the number of elements resulting in applying an index to a
     sequence.
@@ -13211,6 +14922,78 @@ def _size_of_index(index, size=None):
         return len(index)
 
 
+def _overlapping_partition_positions(partitions, indices,
+                                     axis_to_position):
+    '''Find the partitions which overlap the given indices to the master
+    array, with vectorised tests along each partition matrix
+    dimension.
+
+    The partition matrix is hyperrectangular, so the locations along
+    any one partition matrix dimension are the same for every
+    partition in a row of the matrix along that dimension. The overlap
+    tests are therefore done on the partitions' boundaries along each
+    dimension, rather than on every partition.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_overlapping_partitions`
+
+    :Parameters:
+    
+        partitions: `PartitionMatrix`
+    
+        indices: `tuple`
+            Strictly monotonically increasing indices, one per master
+            array dimension, each of which is either a `slice` or a
+            `list`.
+    
+        axis_to_position: `dict`
+            The position in the master array of each axis.
+    
+    :Returns:
+    
+        `list` or `None`
+            For each partition matrix dimension, the positions along
+            it of partitions which overlap the indices. `None` is
+            returned if the positions can not be found.
+
+    '''
+    if not partitions.axes or len(partitions.axes) != partitions.ndim:
+        return None
+
+    positions = []
+    for dim, axis in enumerate(partitions.axes):
+        position = axis_to_position[axis]
+        index = indices[position]
+
+        # Find the boundaries of the partitions along this dimension,
+        # without creating any partitions from a partition table
+        r0, r1 = partitions.location_boundaries(dim, position)
+        
+        if isinstance(index, slice):
+            start, stop, step = index.start, index.stop, index.step
+            if step is None or step < 1:
+                return None
+            
+            # Find, for each partition, the first index that is not
+            # before its start, and test if that index is before the
+            # partition's end.
+            lower = numpy_maximum(r0, start)
+            upper = numpy_minimum(r1, stop)
+            first_index = start + ((lower - start + step - 1) // step) * step
+            overlap = first_index < upper
+        else:
+            index = numpy_sort(numpy_array(index, dtype=int))
+            overlap = (numpy_searchsorted(index, r1) >
+                       numpy_searchsorted(index, r0))
+        #--- End: if
+
+        positions.append(numpy_flatnonzero(overlap))
+    #--- End: for
+
+    return positions
+
+
 def _overlapping_partitions(partitions, indices, axes, master_flip):
     '''Return the nested list of (modified) partitions which overlap the
     given indices to the master array.
@@ -13246,6 +15029,16 @@ def _overlapping_partitions(partitions, indices, axes, master_flip):
     for i, axis in enumerate(axes):
         axis_to_position[axis] = i
 
+    if partitions.size > 1:
+        # Only consider the partitions which could overlap the
+        # indices, as found without inspecting every partition
+        positions = _overlapping_partition_positions(partitions,
+                                                     indices,
+                                                     axis_to_position)
+        if positions is not None:
+            partitions = partitions.subspace(numpy_ix_(*positions))
+    #--- End: if
+    
     if partitions.size == 1:
         partition = partitions.matrix.item()
 
@@ -13315,6 +15108,163 @@ def _overlapping_partitions(partitions, indices, axes, master_flip):
 # --------------------------------------------------------------------
 #
 # --------------------------------------------------------------------
+def _percentile_keys(array, dtype, key_dtype):
+    '''Map the values of an array to unsigned integer keys which sort in
+    the same order as the values.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_percentile_values`
+
+    :Parameters:
+
+        array: `numpy.ndarray`
+            The values. Missing values are ignored.
+
+        dtype: `numpy.dtype`
+            The floating point data type to which the values are
+            converted.
+
+        key_dtype: `numpy.dtype`
+            The unsigned integer data type of the keys, which must
+            have the same size as *dtype*.
+
+    :Returns:
+
+        2-`tuple`
+            The keys, and a boolean array which is True where the
+            values are not missing, or `None` if there are no missing
+            values.
+
+    **Examples:**
+
+    >>> k, v = _percentile_keys(numpy.array([-1.0, 0.0, 2.0]),
+    ...                         numpy.dtype('f4'), numpy.dtype('u4'))
+    >>> (numpy.diff(k) > 0).all()
+    True
+    >>> print(v)
+    None
+
+    '''
+    valid = None
+    if numpy_ma_isMA(array):
+        if array.mask is not numpy_ma_nomask:
+            valid = ~numpy_ma_getmaskarray(array)
+
+        array = numpy_ma_getdata(array)
+
+    keys = numpy_ascontiguousarray(array, dtype=dtype).view(key_dtype)
+
+    # Flip every bit of negative values, and the sign bit of
+    # non-negative values
+    sign = key_dtype.type(1 << (key_dtype.itemsize * 8 - 1))
+    keys = numpy_where(keys >= sign, ~keys, keys | sign)
+
+    return keys, valid
+
+
+def _percentile_values(keys, dtype, key_dtype):
+    '''Map unsigned integer keys created by `_percentile_keys` back to
+    float64 values.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_percentile_keys`
+
+    :Parameters:
+
+        keys: `numpy.ndarray`
+            The keys.
+
+        dtype: `numpy.dtype`
+            The floating point data type of the values from which the
+            keys were created.
+
+        key_dtype: `numpy.dtype`
+            The unsigned integer data type of the keys.
+
+    :Returns:
+
+        `numpy.ndarray`
+            The values.
+
+    **Examples:**
+
+    >>> k, _ = _percentile_keys(numpy.array([-1.0, 2.0]),
+    ...                         numpy.dtype('f8'), numpy.dtype('u8'))
+    >>> print(_percentile_values(k, numpy.dtype('f8'), numpy.dtype('u8')))
+    [-1.  2.]
+
+    '''
+    sign = key_dtype.type(1 << (key_dtype.itemsize * 8 - 1))
+    keys = numpy_where(keys >= sign, keys ^ sign, ~keys)
+    return keys.astype(key_dtype, copy=False).view(dtype).astype(float)
+
+
+def _percentile_order_statistics(N, ranks, interpolation):
+    '''Find the positions of the order statistics needed for
+    percentiles.
+
+    The positions are those used by `numpy.percentile`.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        N: `numpy.ndarray`
+            The number of non-missing values of each output element,
+            with a trailing size 1 dimension.
+
+        ranks: `numpy.ndarray`
+            The 1-d array of percentile ranks.
+
+        interpolation: `str`
+            As for `Data.percentile`.
+
+    :Returns:
+
+        2-`tuple`
+            The zero-based positions in the sorted values of the order
+            statistics of each output element and percentile rank,
+            and the fractions of the way from the first to the second
+            order statistic of each rank for ``'linear'``
+            interpolation. For ``'linear'`` and ``'midpoint'``
+            interpolation the positions of the first order statistics
+            of all ranks are followed by those of the second.
+
+    **Examples:**
+
+    >>> k, f = _percentile_order_statistics(numpy.array([[5]]),
+    ...                                     numpy.array([10., 50.]),
+    ...                                     'linear')
+    >>> print(k)
+    [[0 2 1 3]]
+    >>> print(f)
+    [[0.4 0. ]]
+
+    '''
+    index = ranks / 100.0 * (N - 1)
+    last = numpy_maximum(N - 1, 0)
+
+    lower = numpy_floor(index)
+    fraction = index - lower
+
+    if interpolation == 'linear':
+        k = numpy_concatenate((lower, lower + 1), axis=-1)
+    elif interpolation == 'midpoint':
+        k = numpy_concatenate((lower, numpy_ceil(index)), axis=-1)
+    elif interpolation == 'lower':
+        k = lower
+    elif interpolation == 'higher':
+        k = numpy_ceil(index)
+    else:
+        k = numpy_round(index)
+
+    k = numpy_minimum(numpy_maximum(k, 0), last).astype(int)
+
+    return k, fraction
+
+
 def _getattr(x, attr):
     if not x:
         return False
@@ -13356,6 +15306,128 @@ def _broadcast(a, shape):
     return numpy_tile(a, tile)
 
 
+def _deferrable_operand(data0, data1, method):
+    '''Return the operand of a binary operation that may be deferred.
+
+    An operation may be deferred if it is arithmetic with a single,
+    non-missing value which does not change the shape of the result.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `Data._binary_operation`, `_DeferredOperation`
+
+    :Parameters:
+
+        data0: `Data`
+            The left hand side of the operation.
+
+        data1: `Data`
+            The right hand side of the operation.
+
+        method: `str`
+            The binary arithmetic method name (such as ``'__imul__'``).
+
+    :Returns:
+
+        `numpy.ndarray` or `None`
+            The single value of *data1* as a scalar array, or `None`
+            if the operation can not be deferred.
+
+    '''
+    name = method.strip('_')
+    if name[0] in 'ri' and name[1:] in _deferrable_methods:
+        name = name[1:]
+        
+    if name not in _deferrable_methods:
+        return None
+
+    if (data1._size != 1 or data1._ndim > data0._ndim or
+        data0.dtype.kind not in 'biufc' or data1.dtype.kind not in 'biufc' or
+        data0.Units.isreftime or data1.Units.isreftime):
+        return None
+
+    operand = data1.array
+    if numpy_ma_isMA(operand):
+        if numpy_ma_is_masked(operand):
+            return None
+
+        operand = operand.data
+    #--- End: if
+
+    return operand.reshape(())
+
+
+class _DeferredOperation:
+    '''An element-wise operation on a partition's data array, deferred
+    until the data array is next accessed.
+
+    Instances may be pickled, so that they may be shared with other
+    ranks and processes.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `Data._defer_operation`
+
+    '''
+    def __init__(self, method, operand=None):
+        '''**Initialization**
+
+    :Parameters:
+
+        method: `str` or `numpy.ufunc`
+            Either a function to apply to the array, or the name of a
+            binary arithmetic method of the array (such as
+            ``'__mul__'``) if *operand* is set, or otherwise the name
+            of a unary arithmetic function of the `operator` module
+            (such as ``'__neg__'``).
+
+        operand: `numpy.ndarray`, optional
+            The right hand side of a binary arithmetic method.
+
+        '''
+        self.method  = method
+        self.operand = operand
+
+
+    def __call__(self, array):
+        '''Apply the operation to an array.
+
+    x.__call__(array) <==> x(array)
+
+        '''
+        original_numpy_seterr = numpy_seterr(**_seterr)
+        try:
+            try:
+                return self._operate(array)
+            except FloatingPointError as error:
+                # Floating point point errors have been trapped
+                if not _mask_fpe[0]:
+                    raise FloatingPointError(error)
+
+                # Redo the calculation ignoring the errors and then
+                # set invalid numbers to missing data
+                numpy_seterr(**_seterr_raise_to_ignore)
+                return numpy_ma_masked_invalid(self._operate(array),
+                                               copy=False)
+        finally:
+            # Reset numpy.seterr
+            numpy_seterr(**original_numpy_seterr)
+
+
+    def _operate(self, array):
+        '''Apply the operation to an array without error handling.
+
+        '''
+        method = self.method
+        if not isinstance(method, str):
+            return method(array)
+
+        if self.operand is None:
+            return getattr(operator, method)(array)
+
+        return getattr(array, method)(self.operand)
+    
+    
 class AuxiliaryMask:
     '''TODO
 
@@ -1,18 +1,29 @@
-from os.path import isfile
+from concurrent.futures import ThreadPoolExecutor
+from os.path            import isfile
+from threading          import RLock
 
 from netCDF4 import Dataset as netCDF4_Dataset
 
-from ..constants import _file_to_fh
-from ..functions import open_files_threshold_exceeded, close_one_file
+from ..functions import (_add_file_handle, _get_file_handle,
+                         _remove_file_handle, PARTITION_WORKERS,
+                         UM_INDEX_DIR)
 
 #from ..read_write.umread_lib.umfile import File #, UMFileException
 from ..umread_lib.umfile import File #, UMFileException
 
-#if 'netCDF' not in _file_to_fh:
-#    _file_to_fh['netCDF'] = {}
+# --------------------------------------------------------------------
+# Pools of threads for processing partitions concurrently, keyed by
+# their number of threads
+# --------------------------------------------------------------------
+_thread_pools = {}
 
-_file_to_UM      = _file_to_fh.setdefault('UM', {})
-_file_to_Dataset = _file_to_fh.setdefault('netCDF', {})
+# --------------------------------------------------------------------
+# Lock for accessing data files and for counting the partitions which
+# reference each one. Neither the netCDF library nor the UM file
+# reader may be safely used by partitions that are being processed
+# concurrently.
+# --------------------------------------------------------------------
+_file_lock = RLock()
 
 
 def _open_netcdf_file(filename, mode, fmt='NETCDF4'): #set_auto_mask=True):
@@ -45,18 +56,17 @@ def _open_netcdf_file(filename, mode, fmt='NETCDF4'): #set_auto_mask=True):
     True
 
     '''
-    if filename in _file_to_Dataset and mode == 'r':
-        # File is already open
-        return _file_to_Dataset[filename]
-    elif open_files_threshold_exceeded():
-        # Close a random data file to make way for this one
-        close_one_file()
+    if mode == 'r':
+        nc = _get_file_handle('netCDF', filename)
+        if nc is not None:
+            # File is already open
+            return nc
 
     if mode in ('a', 'r+'):
         if not isfile(filename):
             nc = netCDF4_Dataset(filename, 'w', format=fmt) 
             nc.close()
-        elif filename in _file_to_Dataset:
+        else:
             _close_netcdf_file(filename)
 
     try:        
@@ -65,8 +75,9 @@ def _open_netcdf_file(filename, mode, fmt='NETCDF4'): #set_auto_mask=True):
         raise RuntimeError("{0}: {1}".format(runtime_error, filename))
 
     if mode == 'r':
-        # Update the _file_to_Dataset dictionary
-        _file_to_Dataset[filename] = nc
+        # Add the file to the pool of open files, closing the least
+        # recently used file if the pool is full
+        _add_file_handle('netCDF', filename, nc)
 
     return nc
 
@@ -88,7 +99,7 @@ def _close_netcdf_file(filename):
     **Examples:**
 
     '''
-    nc = _file_to_Dataset.pop(filename, None)
+    nc = _remove_file_handle('netCDF', filename)
     if nc is not None:
         nc.close()
 
@@ -116,26 +127,18 @@ def _open_um_file(filename, aggregate=True, fmt=None, word_size=None,
     '''
 #    filename = abspath(filename)
 
-    f = _file_to_UM.get(filename)
+    f = _get_file_handle('UM', filename)
 
     if f is not None:
         if f.fd is None:
-            if open_files_threshold_exceeded():
-                # Close a random data array file to make way for this
-                # one
-                close_one_file()
-
             f.open_fd()
-        #--- End: if
-        return f
 
-    if open_files_threshold_exceeded():
-        # Close a random data array file to make way for this one
-        close_one_file()
+        return f
 
     try:
         f = File(filename, byte_ordering=byte_ordering,
-                 word_size=word_size, format=fmt)
+                 word_size=word_size, format=fmt,
+                 index_dir=UM_INDEX_DIR())
     except Exception as error:
         try:
             f.close_fd()
@@ -146,8 +149,9 @@ def _open_um_file(filename, aggregate=True, fmt=None, word_size=None,
     # Add a close method to the file object
     f.close = f.close_fd
 
-    # Update the _file_to_UM dictionary
-    _file_to_UM[filename] = f
+    # Add the file to the pool of open files, closing the least
+    # recently used file if the pool is full
+    _add_file_handle('UM', filename, f)
 
     return f
 
@@ -169,8 +173,62 @@ def _close_um_file(filename):
     **Examples:**
 
     '''
-    f = _file_to_UM.pop(filename, None)
+    f = _remove_file_handle('UM', filename)
     if f is not None:
         f.close_fd()
 
 
+
+
+def _map_partitions(func, partitions):
+    '''Apply a function to each of a sequence of partitions.
+
+    If `cf.PARTITION_WORKERS` is greater than 1 then the partitions
+    are processed concurrently by a pool of threads, otherwise they
+    are processed serially in the current thread. In either case the
+    results are returned in the same order as the partitions.
+
+    The function must open, process and close its partition without
+    modifying any other partition.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+    
+        func: function
+            The function to apply. It must take a single argument.
+
+        partitions: iterable
+            The partitions, or any other objects to be passed to
+            *func*.
+
+    :Returns:
+    
+        `list`
+            The result of each call to *func*.
+
+    **Examples:**
+
+    >>> def _func(partition):
+    ...     partition.open(config)
+    ...     array = partition.array
+    ...     partition.close()
+    ...     return array.dtype
+    ...
+    >>> dtypes = _map_partitions(_func, d.partitions.matrix.flat)
+
+    '''
+    workers = PARTITION_WORKERS()
+    if workers <= 1:
+        return [func(partition) for partition in partitions]
+
+    partitions = list(partitions)
+    if len(partitions) <= 1:
+        return [func(partition) for partition in partitions]
+
+    pool = _thread_pools.get(workers)
+    if pool is None:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        _thread_pools[workers] = pool
+
+    return list(pool.map(func, partitions))
@@ -32,11 +32,13 @@ from numpy.ma.core import MaskedConstant as numpy_ma_core_MaskedConstant
 
 from ..units     import Units
 from ..functions import get_subspace, FREE_MEMORY, FM_THRESHOLD
+from ..functions import _keep_in_memory, _release_memory
 from ..functions import inspect as cf_inspect
 from ..constants import CONSTANTS
 
 #from .filearray import  _TempFileArray #, SharedMemoryArray, _shared_memory_array,FileArray
-from .cachedarray import  CachedArray
+from .cachedarray import  CachedArray, _mask_file
+from .functions   import  _file_lock
 
 from .abstract import FileArray
 
@@ -135,6 +137,13 @@ not recommended to be used as a general tidy-up function.
                 # Remove the given temporary file
                 try:
                     remove(filename)
+                except OSError:
+                    pass
+                try:
+                    remove(_mask_file(filename))
+                except OSError:
+                    pass
+                try:
                     rmdir(dirname)
                 except OSError:
                     pass
@@ -149,6 +158,10 @@ not recommended to be used as a general tidy-up function.
             remove(filename)
         except OSError:
             pass
+        try:
+            remove(_mask_file(filename))
+        except OSError:
+            pass
         dirname, _lock_file, _other_lock_files = _temporary_files[filename]
         try:
             remove(_lock_file)
@@ -198,6 +211,12 @@ data array
     # corresponding value is the counter.
     file_counter = {}
 
+    # Element-wise operations which are applied to the subarray when
+    # the partition's data array is next accessed. Each operation is
+    # a tuple of a callable which takes and returns a numpy array, the
+    # units in which it is applied and the units of its result.
+    _operations = ()
+
     def __init__(self, subarray=None, flip=None, location=None,
                  shape=None, Units=None, part=None, axes=None,
                  fill=None):
@@ -319,6 +338,12 @@ by any other partition then the file is closed.
             # disk.
             _remove_temporary_files(_partition_file)
 
+        elif hasattr(subarray, '__array_interface__'):
+            # This partition contains an in-memory array which is not
+            # referenced by any other partition, so its memory is
+            # released
+            _release_memory(subarray.nbytes)
+            
         else:
             try:
                 if (FileArray is not None and isinstance(subarray, FileArray)):
@@ -425,13 +450,14 @@ temporary FileArray.
 #                count = file_counter.get(filename, 0)
 #                file_counter[filename] = count + i
 #                if file_counter[filename] <= 0:
-                count = file_counter.get(filename, 0) + i
-                if count <= 0:
-                    # Remove the file from the dictionary if its count has
-                    # dropped to zero
-                    file_counter.pop(filename, None)
-                else:
-                    file_counter[filename] = count
+                with _file_lock:
+                    count = file_counter.get(filename, 0) + i
+                    if count <= 0:
+                        # Remove the file from the dictionary if its
+                        # count has dropped to zero
+                        file_counter.pop(filename, None)
+                    else:
+                        file_counter[filename] = count
         except:
             # If we're here then it is likely that FileArray has been
             # torn down, so just do nothing.
@@ -714,12 +740,14 @@ Number of elements in the partition's data array (not its subarray).
         self._subarray = value
         self._increment_file_counter()
         self._in_place_changes = False
+        self._operations = ()
     #--- End: def
     @subarray.deleter
     def subarray(self):
         self._decrement_file_counter()
         self._subarray = None
         self._in_place_changes = True
+        self._operations = ()
     #--- End: def
     
 #    # ----------------------------------------------------------------
@@ -869,7 +897,7 @@ values of the partition's `!_original` attribute and on the
                         if _debug:
                             print('    1.1.1.1 revert')
                         self.revert()
-                    elif FREE_MEMORY() <= FM_THRESHOLD():
+                    elif not _keep_in_memory(self.nbytes):
                         # 1.1.1.2 The original subarray was on disk,
                         #         we are happy to keep the current
                         #         subarray in memory, but there is not
@@ -902,7 +930,7 @@ values of the partition's `!_original` attribute and on the
                         if _debug:
                             print('    1.1.2.1 to_disk')
                         self.to_disk(reopen=False)
-                    elif FREE_MEMORY() <= FM_THRESHOLD():
+                    elif not _keep_in_memory(self.nbytes):
                         # 1.1.2.2 Original subarray was in memory and
                         #         unique but there is not enough
                         #         memory to keep the current subarray
@@ -933,7 +961,7 @@ values of the partition's `!_original` attribute and on the
                         if _debug:
                             print('    1.2.1.1 to_disk')
                         self.to_disk(reopen=False)
-                    elif FREE_MEMORY() <= FM_THRESHOLD():
+                    elif not _keep_in_memory(self.nbytes):
                         # 1.2.1.2 Original subarray was on disk but
                         #         there is not enough memory to keep
                         #         it
@@ -961,7 +989,7 @@ values of the partition's `!_original` attribute and on the
                         if _debug:
                             print('    1.2.2.1 to_disk')
                         self.to_disk(reopen=False)
-                    elif FREE_MEMORY() <= FM_THRESHOLD():
+                    elif not _keep_in_memory(self.nbytes):
                         # 1.2.2.2 Original subarray was an in memory
                         #         but there is not enough memory to
                         #         keep it
@@ -1073,7 +1101,11 @@ values of the partition's `!_original` attribute and on the
                 indices = tuple(p_part)
 
             # Read from a file into a numpy array
-            p_data = subarray[indices]
+            if isinstance(subarray, CachedArray):
+                p_data = subarray[indices]
+            else:
+                with _file_lock:
+                    p_data = subarray[indices]
 
             # We've just copied p_data from disk, so in place changes
             # are not possible
@@ -1098,6 +1130,27 @@ values of the partition's `!_original` attribute and on the
             in_place_changes = not copy            
         #--- End: if
 
+        operations = self._operations
+        if operations:
+            # --------------------------------------------------------
+            # Apply deferred element-wise operations, each in its own
+            # units
+            # --------------------------------------------------------
+            for operation, in_units, out_units in operations:
+                if not p_units.equals(in_units) and bool(p_units) is bool(in_units):
+                    p_data = Units.conform(p_data, p_units, in_units,
+                                           inplace=False)
+                    
+                p_data  = operation(p_data)
+                p_units = out_units
+            #--- End: for
+
+            # We've just created p_data, so copying it is not
+            # necessary and in place changes are not possible
+            copy = False
+            in_place_changes = False
+        #--- End: if
+                
         if not p_data.ndim and isinstance(p_data, (numpy_number, numpy_bool_)):
             # --------------------------------------------------------
             # p_data is a numpy number (like numpy.int64) which does
@@ -1823,6 +1876,8 @@ memory, but this is not checked.
 >>> p.to_disk(reopen=False)
 
         '''
+        in_memory = self.in_memory
+        
 #        try:
         tfa = CachedArray(self.array)
 #        except:
@@ -1836,6 +1891,9 @@ memory, but this is not checked.
         _temporary_files[tfa._partition_file] = (tfa._partition_dir,
                                                  _lock_file, set())
 
+        if in_memory:
+            _release_memory(self.nbytes)
+
         if reopen:
             # Re-open the partition
             self.open(self.config)
@@ -1911,6 +1969,10 @@ The updated partition is always dependent of the other partition.
 
         del self._original
 
+        if self.in_memory and not original.in_memory:
+            # The in-memory subarray is discarded
+            _release_memory(self.nbytes)
+            
         self.__dict__ = original.__dict__
         
         if keep_output:
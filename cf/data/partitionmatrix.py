@@ -1,13 +1,18 @@
 import numpy
 
+from numpy import arange      as numpy_arange
 from numpy import array       as numpy_array
 from numpy import asscalar    as numpy_asscalar
 from numpy import ndenumerate as numpy_ndenumerate
 from numpy import empty       as numpy_empty
 from numpy import expand_dims as numpy_expand_dims
+from numpy import flatnonzero as numpy_flatnonzero
+from numpy import not_equal   as numpy_not_equal
 from numpy import squeeze     as numpy_squeeze
 
 from copy      import deepcopy
+from threading import RLock
+from weakref    import WeakValueDictionary
 
 from operator import mul
 
@@ -18,6 +23,137 @@ from ..functions import _DEPRECATION_WARNING_METHOD, _DEPRECATION_ERROR_METHOD
 
 _empty_matrix = numpy_empty((), dtype=object)
 
+# --------------------------------------------------------------------
+# Lock for creating the partitions of a partition matrix from its
+# partition table, so that concurrent threads do not create different
+# partitions for the same element
+# --------------------------------------------------------------------
+_create_partitions_lock = RLock()
+
+
+class PartitionTable:
+    '''A compact table of partitions which have not yet been created.
+
+    The table stores the quantities which differ between partitions in
+    numpy arrays, one row per partition, rather than in `Partition`
+    objects: the location and shape of each partition in the master
+    array, and the per-partition keyword parameters of its subarray
+    (such as file offsets). Quantities which are the same for every
+    partition are stored once. A `Partition` is only created when it
+    is needed (see `PartitionMatrix.from_table`).
+
+    .. versionadded:: 3.0.7
+
+    '''
+    def __init__(self, subarray_class, locations, shapes=None,
+                 columns=None, categories=None, subarray_kwargs=None,
+                 axes=None, flip=None, part=None, Units=None):
+        '''**Initialization**
+
+    :Parameters:
+
+        subarray_class:
+            The class of each partition's subarray, e.g. `UMArray`.
+
+        locations: `numpy.ndarray`
+            The location of each partition in the master array, with
+            shape ``(n, ndim, 2)``, where *n* is the number of
+            partitions and *ndim* is the number of master array
+            dimensions.
+
+        shapes: `numpy.ndarray`, optional
+            The shape of each partition, with shape ``(n, ndim)``. By
+            default the shapes are inferred from the locations.
+
+        columns: `dict`, optional
+            Keyword parameters of the subarrays which differ between
+            partitions, each of which is given by a 1-d numpy array of
+            *n* numbers.
+
+        categories: `dict`, optional
+            Keyword parameters of the subarrays which differ between
+            partitions, but which take few distinct values, each of
+            which is given by a tuple of a 1-d numpy array of *n*
+            integer codes and a sequence of the distinct values.
+
+        subarray_kwargs: `dict`, optional
+            Keyword parameters which are the same for every subarray.
+
+        axes, flip, part, Units: optional
+            The axes, flip, part and units which are the same for
+            every partition. DO NOT UPDATE INPLACE.
+
+    **Examples:**
+
+    >>> t = PartitionTable(UMArray, locations, columns={
+    ...                    'data_offset': data_offsets},
+    ...                    subarray_kwargs={'filename': 'file.pp'},
+    ...                    axes=['dim0', 'dim1', 'dim2'], flip=[],
+    ...                    part=[], Units=cf.Units('K'))
+
+        '''
+        if shapes is None:
+            shapes = locations[..., 1] - locations[..., 0]
+
+        self.subarray_class  = subarray_class
+        self.locations       = locations
+        self.shapes          = shapes
+        self.columns         = columns or {}
+        self.categories      = categories or {}
+        self.subarray_kwargs = subarray_kwargs or {}
+        self.axes            = axes
+        self.flip            = flip
+        self.part            = part
+        self.Units           = Units
+
+
+    def __len__(self):
+        '''x.__len__() <==> len(x)
+
+    The number of partitions in the table.
+
+        '''
+        return self.locations.shape[0]
+
+
+    def partition(self, row):
+        '''Create the partition in a row of the table.
+
+    :Parameters:
+
+        row: `int`
+            The row of the table.
+
+    :Returns:
+
+        `Partition`
+            The new partition.
+
+    **Examples:**
+
+    >>> p = t.partition(3)
+
+        '''
+        kwargs = self.subarray_kwargs.copy()
+        for name, column in self.columns.items():
+            kwargs[name] = column[row].item()
+
+        for name, (codes, values) in self.categories.items():
+            kwargs[name] = values[codes[row]]
+
+        return Partition(subarray=self.subarray_class(**kwargs),
+                         location=[tuple(x)
+                                   for x in self.locations[row].tolist()],
+                         shape=self.shapes[row].tolist(),
+                         axes=self.axes,
+                         flip=self.flip,
+                         part=self.part,
+                         Units=self.Units)
+
+
+#--- End: class
+
+
 class PartitionMatrix:
     '''
 
@@ -26,6 +162,12 @@ A hyperrectangular partition matrix of a master data array.
 Each of elements (called partitions) span all or part of exactly one
 sub-array of the master data array.
 
+A partition matrix created from a `PartitionTable` (see `from_table`)
+only creates each `Partition` object when it is first needed. Copying,
+subspacing and finding the partition boundaries of such a partition
+matrix does not create the partitions that are not involved, but
+accessing the `!matrix` attribute creates all of them.
+
 Normal numpy basic and advanced indexing is supported, but size 1
 dimensions are always removed from the output array, i.e. a partition
 rather than a partition matrix is returned if the output array has
@@ -75,6 +217,35 @@ Attribute   Description
         self.matrix = matrix
         self.axes   = axes
 
+        # The data arrays which share this partition matrix, keyed by
+        # their identities. A shared partition matrix is copied by a
+        # data array before it is changed. The references are weak so
+        # that a data array which is deleted stops sharing.
+        self._owners = WeakValueDictionary()
+
+
+    def __getstate__(self):
+        '''Called when pickling.
+
+    The data arrays which share the partition matrix are not pickled.
+
+    .. versionadded:: 3.0.7
+
+        '''
+        odict = self.__dict__.copy()
+        del odict['_owners']
+        return odict
+
+
+    def __setstate__(self, odict):
+        '''Called when unpickling.
+
+    .. versionadded:: 3.0.7
+
+        '''
+        self.__dict__.update(odict)
+        self._owners = WeakValueDictionary()
+
 
     def __deepcopy__(self, memo):
         '''Used if copy.deepcopy is called on the variable.
@@ -83,6 +254,110 @@ Attribute   Description
         return self.copy()
 
 
+    @classmethod
+    def from_table(cls, table, shape, axes):
+        '''Create a partition matrix whose partitions are created from a
+    partition table when they are needed.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        table: `PartitionTable`
+            The partition table. Its rows are the partitions of the
+            partition matrix in row-major order.
+
+        shape: sequence of `int`
+            The shape of the partition matrix.
+
+        axes: `list`
+            The identities of the partition axes of the partition
+            array. DO NOT UPDATE INPLACE.
+
+    :Returns:
+
+        `PartitionMatrix`
+
+    **Examples:**
+
+    >>> pm = cf.PartitionMatrix.from_table(t, (12, 19), ['dim0', 'dim1'])
+    >>> pm.shape
+    (12, 19)
+
+        '''
+        new = cls(numpy_empty(shape, dtype=object), axes)
+        new._rows  = numpy_arange(len(table)).reshape(shape)
+        new._table = table
+        return new
+
+
+    def _create_partitions(self, indices=Ellipsis):
+        '''Create the partitions which have not yet been created from
+    the partition table.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        indices: optional
+            Only create the partitions selected by these indices of
+            the partition matrix. By default all partitions are
+            created, after which the partition table is discarded.
+
+    :Returns:
+
+        `None`
+
+        '''
+        if self._rows is None:
+            return
+
+        with _create_partitions_lock:
+            rows = self._rows
+            if rows is None:
+                return
+
+            matrix = self._matrix
+            table  = self._table
+
+            if indices is Ellipsis:
+                positions = range(matrix.size)
+            else:
+                positions = numpy_arange(matrix.size).reshape(
+                    matrix.shape)[indices]
+                positions = numpy_array(positions).flat
+
+            flat_matrix = matrix.flat
+            flat_rows   = rows.flat
+            for position in positions:
+                if flat_matrix[position] is None:
+                    flat_matrix[position] = table.partition(
+                        flat_rows[position])
+            #--- End: for
+
+            if indices is Ellipsis:
+                self._rows  = None
+                self._table = None
+        #--- End: with
+
+
+    @property
+    def matrix(self):
+        '''The numpy object array of the partitions.
+
+    Any partitions which have not yet been created from the partition
+    table are created.
+
+        '''
+        self._create_partitions()
+        return self._matrix
+    @matrix.setter
+    def matrix(self, value):
+        self._matrix = value
+        self._rows   = None
+        self._table  = None
+
+
     def __getitem__(self, indices):
         '''x.__getitem__(indices) <==> x[indices]
 
@@ -114,13 +389,14 @@ Attribute   Description
     <cf.data.partition.Partition at 0x1934c80>
 
         '''
-        out = self.matrix[indices]
+        self._create_partitions(indices)
+        out = self._matrix[indices]
 
         if isinstance(out, Partition):
             return out
 
         if out.size == 1:
-            return self.matrix.item()
+            return out.item()
         
         axes = [axis for axis, n in zip(self.axes, out.shape) if n != 1]
         
@@ -255,7 +531,7 @@ Attribute   Description
     0
 
         '''       
-        return self.matrix.ndim
+        return self._matrix.ndim
 
 
     @property
@@ -280,7 +556,7 @@ Attribute   Description
     ()
 
         '''
-        return self.matrix.shape
+        return self._matrix.shape
 
 
     @property
@@ -303,7 +579,7 @@ Attribute   Description
     1
 
         '''
-        return self.matrix.size
+        return self._matrix.size
 
 
     def add_partitions(self, adimensions, master_flip, extra_boundaries, axis):
@@ -503,6 +779,24 @@ Attribute   Description
         #       bug (feature?) in numpy <= v1.7 (at least):
         #       http://numpy-discussion.10968.n7.nabble.com/bug-in-deepcopy-of-rank-zero-arrays-td33705.html
         # ------------------------------------------------------------
+        if self._rows is not None:
+            # Only copy the partitions which have been created. The
+            # others are created from the shared partition table when
+            # they are needed.
+            matrix = self._matrix
+            new_matrix = numpy_empty(matrix.shape, dtype=object)
+            flat_matrix = matrix.flat
+            new_flat_matrix = new_matrix.flat
+            for position in numpy_flatnonzero(numpy_not_equal(matrix,
+                                                              None)):
+                new_flat_matrix[position] = flat_matrix[position].copy()
+
+            new = type(self)(new_matrix, self.axes)
+            new._rows  = self._rows
+            new._table = self._table
+            return new
+        #--- End: if
+        
         matrix = self.matrix
 
         if not matrix.ndim:
@@ -557,6 +851,61 @@ Attribute   Description
         return p
 
 
+    def location_boundaries(self, dim, position):
+        '''Return the locations of the partitions along a partition
+    matrix dimension.
+
+    The locations are found from the first partition of each row of
+    the dimension. Partitions which have not been created are not
+    created.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        dim: `int`
+            The position of the partition matrix dimension.
+
+        position: `int`
+            The position of the partition matrix dimension in the
+            master array.
+
+    :Returns:
+
+        `numpy.ndarray`, `numpy.ndarray`
+            The start and stop indices of the partitions in the
+            master array.
+
+    **Examples:**
+
+    >>> pm.shape
+    (3, 2)
+    >>> pm.location_boundaries(0, 1)
+    (array([0, 1, 2]), array([1, 2, 3]))
+
+        '''
+        indices = [0] * self.ndim
+        indices[dim] = slice(None)
+        indices = tuple(indices)
+
+        matrix = self._matrix[indices]
+        if self._rows is None:
+            r0, r1 = zip(*[partition.location[position]
+                           for partition in matrix])
+            return numpy_array(r0), numpy_array(r1)
+
+        rows = self._rows[indices]
+        locations = self._table.locations[rows, position]
+        r0 = locations[:, 0].copy()
+        r1 = locations[:, 1].copy()
+
+        # Partitions which have been created may have changed
+        for i in numpy_flatnonzero(numpy_not_equal(matrix, None)):
+            r0[i], r1[i] = matrix[i].location[position]
+
+        return r0, r1
+
+
     def ndenumerate(self):
         '''Return an iterator yielding pairs of array indices and values.
 
@@ -598,30 +947,49 @@ Attribute   Description
         '''            
         boundaries = {}
         
-        matrix = self.matrix
-        indices = [0] * self.ndim
-
         for i, axis in enumerate(self.axes):
-            indices[i] = slice(None)
-            j = data_axes.index(axis)
-
-            sub_matrix = matrix[tuple(indices)]
-            
-            b = [partition.location[j][0] for partition in sub_matrix.flat]
-
-            # Python3: can't access variables from within previous
-            # list comprehension
-            last_partition = sub_matrix.flat[-1]
-            
-            b.append(last_partition.location[j][1])
+            r0, r1 = self.location_boundaries(i, data_axes.index(axis))
+            b = r0.tolist()
+            b.append(r1[-1].item())
             boundaries[axis] = b
-
-            indices[i] = 0
         #--- End: for
 
         return boundaries
 
 
+    def subspace(self, indices):
+        '''Return a subspace of the partition matrix.
+
+    Unlike indexing, size 1 dimensions are not removed. Only the
+    partitions in the subspace are created from the partition table.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        indices: 
+            Indices of the partition matrix which select a subspace
+            with the same number of dimensions, e.g. as created by
+            `numpy.ix_`.
+
+    :Returns:
+
+        `PartitionMatrix`
+            The subspace, which contains the same partitions as the
+            original partition matrix.
+
+    **Examples:**
+
+    >>> pm.shape
+    (12, 19)
+    >>> pm.subspace(numpy.ix_([3, 4], [0])).shape
+    (2, 1)
+
+        '''
+        self._create_partitions(indices)
+        return type(self)(self._matrix[indices], self.axes)
+
+
     # 0
     def swapaxes(self, axis0, axis1, inplace=False):
         '''Swap the positions of two axes.
@@ -2,13 +2,19 @@ import numpy
 
 from ..constants import _file_to_fh
 from ..functions import (parse_indices,
-                         get_subspace)
-from .functions import _open_um_file, _close_um_file
-
-from ..umread_lib.umfile import Rec
+                         get_subspace,
+                         CHUNKSIZE,
+                         PARTITION_WORKERS)
+from .functions import _open_um_file, _close_um_file, _file_lock
 
 from . import abstract
 
+# --------------------------------------------------------------------
+# The unpacked data arrays, and headers, of records which have been
+# read ahead of their UM arrays being indexed, keyed by file pointer
+# --------------------------------------------------------------------
+_read_ahead = {}
+
 
 class UMArray(abstract.FileArray):
     '''A sub-array stored in a PP or UM fields file.
@@ -84,17 +90,22 @@ class UMArray(abstract.FileArray):
     Returns a numpy array.
 
         ''' 
-        f = self.open()
+        read_ahead = _read_ahead.pop(self.file_pointer, None)
+        if read_ahead is not None:
+            array, int_hdr, real_hdr = read_ahead
+        else:
+            f = self.open()
 
-        rec = Rec.from_file_and_offsets(f,
-                                        self.header_offset,
-                                        self.data_offset,
-                                        self.disk_length)
+            rec = f.get_rec(self.header_offset, self.data_offset,
+                            self.disk_length)
 
-        int_hdr  = rec.int_hdr
-        real_hdr = rec.real_hdr
+            int_hdr  = rec.int_hdr
+            real_hdr = rec.real_hdr
 
-        array = rec.get_data().reshape(int_hdr.item(17,), int_hdr.item(18,))
+            array = f.get_records_data([rec], threads=PARTITION_WORKERS())[0]
+        #--- End: if
+        
+        array = array.reshape(int_hdr.item(17,), int_hdr.item(18,))
 
         if indices is not Ellipsis:
             indices = parse_indices(array.shape, indices)               
@@ -248,3 +259,129 @@ class UMArray(abstract.FileArray):
 
 
 #--- End: class
+
+
+def _read_ahead_arrays(arrays):
+    '''Read the data of UM arrays ahead of them being indexed.
+
+    The records of the arrays in each file are read together with
+    `umfile.File.get_records_data`, which coalesces the records into
+    large sequential reads and unpacks them with up to
+    `cf.PARTITION_WORKERS` native threads, and their unpacked data are
+    stored until each array is next indexed.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        arrays: sequence of `UMArray`
+            The UM arrays.
+
+    :Returns:
+
+        `list`
+            The file pointers of the arrays whose data have been read
+            ahead.
+
+    '''
+    files = {}
+    for array in arrays:
+        files.setdefault(array.filename, []).append(array)
+
+    keys = []
+    for arrays in files.values():
+        if len(arrays) < 2:
+            continue
+
+        array0 = arrays[0]
+        f = _open_um_file(array0.filename, fmt=array0.fmt,
+                          word_size=array0.word_size,
+                          byte_ordering=array0.byte_ordering)
+
+        recs = [f.get_rec(array.header_offset, array.data_offset,
+                          array.disk_length)
+                for array in arrays]
+
+        data = f.get_records_data(recs, threads=PARTITION_WORKERS())
+        for array, rec, data in zip(arrays, recs, data):
+            key = array.file_pointer
+            _read_ahead[key] = (data, rec.int_hdr, rec.real_hdr)
+            keys.append(key)
+    #--- End: for
+
+    return keys
+
+
+def _read_ahead_partitions(partitions):
+    '''Iterate over partitions, reading ahead the data of those whose
+    subarrays are in PP or UM fields files.
+
+    The partitions are read ahead in consecutive windows whose UM
+    arrays together have about `cf.CHUNKSIZE` bytes, with
+    `_read_ahead_arrays`. Data that have been read ahead but not used
+    by the time that the iteration moves past their window are
+    discarded.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        partitions: iterable of `Partition`
+            The partitions.
+
+    :Returns:
+
+        generator
+            The partitions, in their original order.
+
+    **Examples:**
+
+    >>> for partition in _read_ahead_partitions(d.partitions.matrix.flat):
+    ...     partition.open(config)
+    ...     array = partition.array
+    ...     partition.close()
+
+    '''
+    chunksize = CHUNKSIZE()
+    window = []
+    arrays = []
+    nbytes = 0
+    for partition in partitions:
+        window.append(partition)
+        subarray = partition.subarray
+        if isinstance(subarray, UMArray):
+            arrays.append(subarray)
+            nbytes += subarray.size * subarray.dtype.itemsize
+            if nbytes >= chunksize:
+                yield from _read_ahead_window(window, arrays)
+                window = []
+                arrays = []
+                nbytes = 0
+        #--- End: if
+    #--- End: for
+
+    yield from _read_ahead_window(window, arrays)
+
+
+def _read_ahead_window(partitions, arrays):
+    '''Read ahead the UM arrays of a window of partitions and yield the
+    partitions.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_read_ahead_partitions`
+
+    '''
+    if len(arrays) < 2:
+        yield from partitions
+        return
+
+    with _file_lock:
+        keys = _read_ahead_arrays(arrays)
+
+    try:
+        yield from partitions
+    finally:
+        for key in keys:
+            _read_ahead.pop(key, None)
+
@@ -13,10 +13,12 @@ except ImportError:
 
 from numpy import arange      as numpy_arange
 from numpy import argmax      as numpy_argmax
+from numpy import argsort     as numpy_argsort
 from numpy import array       as numpy_array
 from numpy import array_equal as numpy_array_equal
 from numpy import asanyarray  as numpy_asanyarray
 from numpy import can_cast    as numpy_can_cast
+from numpy import concatenate as numpy_concatenate
 from numpy import diff        as numpy_diff
 from numpy import empty       as numpy_empty
 from numpy import errstate    as numpy_errstate
@@ -24,8 +26,11 @@ from numpy import finfo       as numpy_finfo
 from numpy import isnan       as numpy_isnan
 from numpy import nan         as numpy_nan
 from numpy import ndarray     as numpy_ndarray
+from numpy import ones        as numpy_ones
 from numpy import prod        as numpy_prod
+from numpy import repeat      as numpy_repeat
 from numpy import reshape     as numpy_reshape
+from numpy import searchsorted as numpy_searchsorted
 from numpy import shape       as numpy_shape
 from numpy import size        as numpy_size
 from numpy import squeeze     as numpy_squeeze
@@ -62,7 +67,9 @@ from . import List
 from .constants import masked as cf_masked
 
 from .functions import (parse_indices, CHUNKSIZE, equals,
-                        RELAXED_IDENTITIES, _section)
+                        RELAXED_IDENTITIES, RTOL, ATOL, _section,
+                        _numpy_isclose, hash_array, WEIGHTS_CACHE_SIZE,
+                        _weights_cache_get, _weights_cache_set)
 from .query           import Query, ge, gt, le, lt, eq
 from .regrid          import Regrid
 from .timeduration    import TimeDuration
@@ -4878,10 +4885,16 @@ class Field(mixin.PropertiesData,
     for returning the components individually).
     
     By default null, equal weights are returned.
+
+    Weights components created from the bounds of dimension
+    coordinate constructs are cached, so that fields which share
+    coordinates do not recalculate them (see
+    `cf.WEIGHTS_CACHE_SIZE`).
     
     .. versionadded:: 1.0
     
-    .. seealso:: `bin`, `cell_area`, `collapse`, `radius`
+    .. seealso:: `bin`, `cell_area`, `collapse`, `radius`,
+                 `cf.WEIGHTS_CACHE_SIZE`
     
     :Parameters:
     
@@ -5092,6 +5105,87 @@ class Field(mixin.PropertiesData,
             return w
         #--- End: def
 
+        def _weights_cache_key(coord, kind, radius=None):
+            '''Return the key of coordinate weights in the weights cache.
+
+        :Parameters:
+        
+            coord: `DimensionCoordinate`
+                The dimension coordinate construct from whose bounds
+                the weights are created.
+
+            kind: `str`
+                The type of the weights, e.g. ``'linear'``.
+
+            radius: `Data`, optional
+                The radius used to create the weights.
+
+        :Returns:
+
+            `tuple` or `None`
+                The key, or `None` if the weights are not to be
+                cached.
+
+            '''
+            if methods or not WEIGHTS_CACHE_SIZE():
+                return None
+
+            bounds = coord.get_bounds(None)
+            if bounds is None:
+                return None
+            
+            units = coord.Units
+            if measure and radius is not None:
+                radius = (radius.datum(), radius.Units.units)
+            else:
+                radius = None
+                
+            if scale is not None:
+                scale_key = Data.asdata(scale).datum()
+            else:
+                scale_key = None
+                
+            return (kind, hash_array(bounds.array), units.units,
+                    getattr(units, 'calendar', None), measure, radius,
+                    scale_key)
+        #--- End: def
+        
+        def _cached_weights(key, comp, comp_key):
+            '''Retrieve coordinate weights from the weights cache.
+
+        :Parameters:
+        
+            key: `tuple` or `None`
+                The key of the weights in the weights cache.
+
+            comp: `dict`
+                The weights components.
+
+            comp_key: `tuple`
+                The domain axes of the weights component.
+        
+        :Returns:
+
+            `bool`
+                True if the weights component was retrieved from the
+                cache, otherwise False in which case the weights
+                component will be cached once it has been created.
+
+            '''
+            if key is None:
+                return False
+
+            w = _weights_cache_get(key)
+            if w is None:
+                cache_keys[comp_key] = key
+                return False
+
+            comp[comp_key] = w.copy()
+            cached.add(comp_key)
+            cache_keys.pop(comp_key, None)
+            return True
+        #--- End: def
+        
         def _measure_weights(self, measure, comp, weights_axes, auto=False):
             '''Cell measure weights
 
@@ -5197,7 +5291,8 @@ class Field(mixin.PropertiesData,
                 # Bounds exist
                 if methods:
                     comp[(da_key,)] = 'linear '+self.constructs.domain_axis_identity(da_key)
-                else: 
+                elif not _cached_weights(_weights_cache_key(dim, 'linear'),
+                                         comp, (da_key,)):
                     comp[(da_key,)] = dim.cellsize
             #--- End: if
 
@@ -5280,7 +5375,9 @@ class Field(mixin.PropertiesData,
 
                 if methods:
                     comp[(xaxis,)] = 'linear ' + xcoord.identity()
-                else:
+                elif not _cached_weights(
+                        _weights_cache_key(xcoord, 'area X', radius),
+                        comp, (xaxis,)):
                     cells = xcoord.cellsize
                     if xcoord.Units.equivalent(Units('radians')):
                         cells.Units = _units_radians                        
@@ -5304,7 +5401,11 @@ class Field(mixin.PropertiesData,
                         "Can't create area weights: No bounds for {!r} axis".format(
                             ycoord.identity()))
 
-                if ycoord.Units.equivalent(Units('radians')):
+                if _cached_weights(
+                        _weights_cache_key(ycoord, 'area Y', radius),
+                        comp, (yaxis,)):
+                    pass
+                elif ycoord.Units.equivalent(Units('radians')):
                     ycoord = ycoord.clip(-90, 90, units=Units('degrees'))
                     ycoord.sin(inplace=True)
     
@@ -5500,6 +5601,11 @@ class Field(mixin.PropertiesData,
         comp         = {}
         data_axes    = self.get_data_axes()
 
+        # The weights cache keys of components which are to be cached,
+        # and the components which were retrieved from the cache
+        cache_keys = {}
+        cached     = set()
+
         # All axes which have weights
         weights_axes = set()
 
@@ -5631,8 +5737,12 @@ class Field(mixin.PropertiesData,
             xaxis = self.domain_axis('X', key=True, default=None)
             yaxis = self.domain_axis('Y', key=True, default=None)
             if (xaxis,) in comp and (yaxis,) in comp:
-                del comp[(xaxis,)]
-                del comp[(yaxis,)]
+                for axis in (xaxis, yaxis):
+                    del comp[(axis,)]
+                    cache_keys.pop((axis,), None)
+                    cached.discard((axis,))
+                #--- End: for
+                
                 weights_axes.discard(xaxis)
                 weights_axes.discard(yaxis)
                 if not _measure_weights(self, 'area', comp, weights_axes):
@@ -5645,15 +5755,28 @@ class Field(mixin.PropertiesData,
             # Scale the weights so that they are <= scale
             # --------------------------------------------------------
             for key, w in comp.items(): 
-                comp[key] = _scale(w, scale)
+                if key not in cached:
+                    comp[key] = _scale(w, scale)
         #--- End: if
 
-        for w in comp.values():
+        for key, w in comp.items():
+            if key in cached:
+                # Cached weights have already been checked
+                continue
+            
             mn = w.min()
             if mn <= 0:
                 raise ValueError(
                     "All weights must be positive. Got a weight of {}".format(mn))
         #--- End: for                
+
+        for key, cache_key in cache_keys.items():
+            # Cache copies of newly created coordinate weights, so
+            # that changes to the returned weights can't affect them
+            w = comp.get(key)
+            if w is not None:
+                _weights_cache_set(cache_key, w.copy())
+        #--- End: for
         
         if components:
             # --------------------------------------------------------
@@ -6596,21 +6719,11 @@ class Field(mixin.PropertiesData,
             dims.append(dim)
             names.append(dim.identity())
 
-        # ------------------------------------------------------------
-        # Initialize the ouput data as a totally masked array
-        # ------------------------------------------------------------
         if method == 'sample_size':
             dtype = int
         else:
             dtype = self.dtype
             
-        data = Data.masked_all(shape=tuple(shape), dtype=dtype,
-                               units=None)
-        out.set_data(data, axes=axes, copy=False)
-        out.hardmask = False
-
-        c = self.copy()
-
         # ------------------------------------------------------------
         # Parse the weights
         # ------------------------------------------------------------
@@ -6622,50 +6735,80 @@ class Field(mixin.PropertiesData,
                                    scale=scale, measure=measure,
                                    radius=radius)
 
+        if verbose:
+            print('    Weights:', repr(weights)) # pragma: no cover
+
         # ------------------------------------------------------------
-        # Find the unique multi-dimensionsal bin indices (TODO: can I
-        # LAMA this?)
+        # Collapse the values in every bin in one pass through the
+        # data, if the method allows it
         # ------------------------------------------------------------
-        y = numpy_empty((len(bin_indices), bin_indices[0].size), dtype=int)
-        for i, f in enumerate(bin_indices):
-            y[i, :] = f.array.flatten()
-
-        unique_indices = numpy_unique(y, axis=1)
-        del f
-        del y
+        data_method = _collapse_methods.get(method, method)
+        if data_method in _collapse_weighted_methods:
+            d_weights = weights
+        else:
+            d_weights = None
         
-        if verbose:
-            print('    Weights:', repr(weights)) # pragma: no cover
-            print('    Number of indexed ({}) bins: {}'.format(
-                ', '.join(names), unique_indices.shape[1])) # pragma: no cover
-            print('    ({}) bin indices:'.format(', '.join(names)),
-                  end=" ") # pragma: no cover
+        data = self.data._collapse_binned(data_method, bin_indices,
+                                          shape, weights=d_weights,
+                                          mtol=mtol, ddof=ddof)
+        if data is not None:
+            data.dtype = dtype
+            out.set_data(data, axes=axes, copy=False)
+        else:
+            # --------------------------------------------------------
+            # Initialize the ouput data as a totally masked array
+            # --------------------------------------------------------
+            data = Data.masked_all(shape=tuple(shape), dtype=dtype,
+                                   units=None)
+            out.set_data(data, axes=axes, copy=False)
+            out.hardmask = False
+    
+            c = self.copy()
+    
+            # --------------------------------------------------------
+            # Find the unique multi-dimensionsal bin indices
+            # --------------------------------------------------------
+            y = numpy_empty((len(bin_indices), bin_indices[0].size),
+                            dtype=int)
+            for i, f in enumerate(bin_indices):
+                y[i, :] = f.array.flatten()
+    
+            unique_indices = numpy_unique(y, axis=1)
+            del f
+            del y
             
-        # Loop round unique collections of bin indices        
-        for i in zip(*unique_indices):
             if verbose:
-                print(i, end=" ")
-            
-            b = (bin_indices[0] == i[0])
-            for a, n in zip(bin_indices[1:], i[1:]):
-                b &= (a == n)
-
-            b.filled(False, inplace=True)
-#            b.hardmask = False
-#            b.where(b.mask, False, inplace=True)
+                print('    Number of indexed ({}) bins: {}'.format(
+                    ', '.join(names), unique_indices.shape[1])) # pragma: no cover
+                print('    ({}) bin indices:'.format(', '.join(names)),
+                      end=" ") # pragma: no cover
                 
-            c.set_data(self.data.where(b, None, cf_masked),
-                       set_axes=False, copy=False)
-
-            result = c.collapse(method=method, weights=weights, verbose=False).data
-            out.data[i] = result.datum()
+            # Loop round unique collections of bin indices        
+            for i in zip(*unique_indices):
+                if verbose:
+                    print(i, end=" ")
+                
+                b = (bin_indices[0] == i[0])
+                for a, n in zip(bin_indices[1:], i[1:]):
+                    b &= (a == n)
+    
+                b.filled(False, inplace=True)
+                    
+                c.set_data(self.data.where(b, None, cf_masked),
+                           set_axes=False, copy=False)
+    
+                result = c.collapse(method=method, weights=weights,
+                                    verbose=False).data
+                out.data[i] = result.datum()
+    
+            if verbose:
+                print()
+            
+            # Set correct units (note: takes them from the last
+            # processed "result" variable in the above loop)
+            out.override_units(result.Units, inplace=True)
+        #--- End: if
 
-        if verbose:
-            print()
-        
-        # Set correct units (note: takes them from the last processed
-        # "result" variable in the above loop)
-        out.override_units(result.Units, inplace=True)
         out.hardmask = True
 
         # ------------------------------------------------------------
@@ -7134,8 +7277,8 @@ class Field(mixin.PropertiesData,
                  group_span=None, group_contiguous=None,
                  measure=False, scale=None, radius='earth',
                  verbose=False, _create_zero_size_cell_bounds=False,
-                 _update_cell_methods=True, i=False, _debug=False,
-                 **kwargs):
+                 _update_cell_methods=True, _group_data=None, i=False,
+                 _debug=False, **kwargs):
         '''Collapse axes of the field.
     
     Collapsing one or more dimensions reduces their size and replaces
@@ -8705,8 +8848,10 @@ class Field(mixin.PropertiesData,
                 print('    f.shape = ', f.shape) # pragma: no cover
                 print('    f.dtype = ', f.dtype) # pragma: no cover
 
-            getattr(f.data, method)(axes=iaxes, squeeze=squeeze, mtol=mtol,
-                                    inplace=True, **d_kwargs)
+            if _group_data is None:
+                getattr(f.data, method)(axes=iaxes, squeeze=squeeze,
+                                        mtol=mtol, inplace=True,
+                                        **d_kwargs)
 
             if squeeze:
                 # ----------------------------------------------------
@@ -8820,6 +8965,14 @@ class Field(mixin.PropertiesData,
                 dim.set_bounds(bounds, copy=False)
             #--- End: for
 
+            if _group_data is not None:
+                # ----------------------------------------------------
+                # Set the data of a group which has already been
+                # collapsed with all of the other groups (see
+                # `_collapse_grouped`)
+                # ----------------------------------------------------
+                f.set_data(_group_data, axes=data_axes, copy=False)
+
             # --------------------------------------------------------
             # Update the cell methods
             # --------------------------------------------------------
@@ -9279,6 +9432,130 @@ class Field(mixin.PropertiesData,
             return weights
 
         
+        def _group_span_valid(indices, group_span):
+            '''Find which groups span the given range of coordinate
+        values.
+
+            :Parameters:
+        
+                indices: `list` of `numpy.ndarray`
+                    The positions of each group's elements along the
+                    collapse axis, in increasing order.
+
+                group_span: `Data` or `TimeDuration`
+        
+            :Returns:
+        
+                (`numpy.ndarray`, coordinate)
+                    Whether or not each group spans *group_span*, and
+                    the coordinate construct whose bounds define the
+                    spans.
+
+            '''
+            coord = self.coordinates.filter_by_axis('exact', axis).value(None)
+            if coord is None:
+                raise ValueError(
+                    "Can't collapse: Need unambiguous 1-d coordinates when group_span={!r}".format(
+                        group_span))
+
+            bounds = coord.get_bounds(None)
+            if bounds is None:
+                raise ValueError(
+                    "Can't collapse: Need unambiguous 1-d coordinate bounds when group_span={!r}".format(
+                        group_span))
+
+            first = [index[0]  for index in indices]
+            last  = [index[-1] for index in indices]
+
+            b = bounds.get_data()
+            if coord.T:
+                b = b.datetime_array
+            else:
+                b = b.array
+
+            lb = b[first, 0]
+            ub = b[last, 1]
+            if not coord.increasing:
+                lb, ub = ub, lb
+
+            if coord.T:
+                valid = numpy_array([not (group_span + l != u)
+                                     for l, u in zip(lb, ub)], dtype=bool)
+            else:
+                if isinstance(group_span, TimeDuration):
+                    group_span = group_span.duration
+
+                units = bounds.Units
+                valid = (group_span + Data(lb, units=units) ==
+                         Data(ub, units=units)).array
+
+            return valid, coord
+
+        
+        def _group_contiguous_valid(indices, coord, overlap):
+            '''Find which groups have contiguous coordinate cells.
+
+            :Parameters:
+        
+                indices: `list` of `numpy.ndarray`
+                    The positions of each group's elements along the
+                    collapse axis, in increasing order.
+
+                coord: coordinate construct
+
+                overlap: `bool`
+                    If True then cells are also contiguous if they
+                    overlap. See `Bounds.contiguous`.
+        
+            :Returns:
+        
+                `numpy.ndarray`
+                    Whether or not each group is contiguous.
+
+            '''
+            bounds = None
+            if coord is not None:
+                bounds = coord.get_bounds(None)
+
+            if bounds is None:
+                raise ValueError(
+                    "Can't collapse: Need unambiguous 1-d coordinate bounds when group_contiguous={!r}".format(
+                        group_contiguous))
+
+            b = bounds.array
+            if b.ndim != 2 or b.shape[1] != 2:
+                raise ValueError(
+                    "Can't tell if multidimensional bounds are contiguous")
+
+            # Pair up the adjacent cells of every group
+            sizes     = numpy_array([index.size for index in indices])
+            positions = numpy_concatenate(indices)
+            labels    = numpy_repeat(numpy_arange(len(indices)), sizes)
+
+            same   = (labels[1:] == labels[:-1])
+            lower  = b[positions[1:][same] , 0]
+            upper  = b[positions[:-1][same], 1]
+            labels = labels[1:][same]
+
+            if not overlap:
+                contiguous = _numpy_isclose(lower, upper,
+                                            rtol=RTOL(), atol=ATOL())
+            else:
+                # The direction of each group is given by its first
+                # cell
+                first = b[[index[0] for index in indices]]
+                increasing = (first[:, 0] < first[:, 1])[labels]
+                contiguous = numpy_where(increasing,
+                                         lower <= upper,
+                                         lower >= upper)
+            #--- End: if
+            
+            valid = numpy_ones((len(indices),), dtype=bool)
+            valid[labels[~contiguous]] = False
+
+            return valid
+
+        
         # START OF MAIN CODE        
 
         if verbose:
@@ -9307,6 +9584,7 @@ class Field(mixin.PropertiesData,
         # raising an exception for 'can't match', I suppose.
 
         classification = None
+        coord          = None
 
         if group is not None:
             if within is not None or over is not None:
@@ -9810,73 +10088,80 @@ class Field(mixin.PropertiesData,
             unique = unique[numpy_where(unique >= 0)[0]]
             unique.sort()
 
+            # Find the positions of the elements of every group with
+            # a single stable sort of the classification array
+            order  = numpy_argsort(classification, kind='mergesort')
+            sorted_classification = classification[order]
+            starts = numpy_searchsorted(sorted_classification, unique,
+                                        side='left')
+            ends   = numpy_searchsorted(sorted_classification, unique,
+                                        side='right')
+            indices = [order[i:j] for i, j in zip(starts, ends)]
+
+            # --------------------------------------------------------
+            # Ignore groups that don't meet the specified criteria
+            # --------------------------------------------------------
+            valid = numpy_ones((unique.size,), dtype=bool)
+            if over is None and unique.size:
+                span_coord = coord
+                if group_span is not None:
+                    if isinstance(group_span, int):
+                        valid &= (ends - starts == group_span)
+                    else:
+                        span_valid, span_coord = _group_span_valid(
+                            indices, group_span)
+                        valid &= span_valid
+                #--- End: if
+
+                if group_contiguous:
+                    overlap = (group_contiguous == 2)
+                    valid &= _group_contiguous_valid(indices,
+                                                     span_coord,
+                                                     overlap)
+            #--- End: if
+
             ignore_n = -1
+            for index in [index for index, ok in zip(indices, valid)
+                          if not ok]:
+                classification[index] = ignore_n
+                ignore_n -= 1
 
-            for u in unique:
-                index = numpy_where(classification==u)[0].tolist()
+            if regroup:
+                # Return the numpy array
+                return classification
 
-                pc = self.subspace(**{axis: index})
+            indices = [index for index, ok in zip(indices, valid) if ok]
+            unique  = unique[valid]
 
-                # ----------------------------------------------------
-                # Ignore groups that don't meet the specified criteria
-                # ----------------------------------------------------
-                if over is None:
-                    if group_span is not None:
-                        if isinstance(group_span, int):
-#                            if pc.axis_size(axis) != group_span:
-                            if pc.domain_axes[axis].get_size() != group_span:
-                                classification[index] = ignore_n
-                                ignore_n -= 1
-                                continue
-                        else:
-                            coord = pc.coordinates.filter_by_axis('exact', axis).value(None)
-                            if coord is None:
-                                raise ValueError(
-                                    "Can't collapse: Need unambiguous 1-d coordinates when group_span={!r}".format(
-                                        group_span))
-
-                            bounds = coord.get_bounds(None)
-                            if bounds is None:
-                                raise ValueError(
-                                    "Can't collapse: Need unambiguous 1-d coordinate bounds when group_span={!r}".format(
-                                        group_span))
-
-                            lb = bounds[ 0, 0].get_data()
-                            ub = bounds[-1, 1].get_data()
-                            if coord.T:
-                                lb = lb.datetime_array.item()
-                                ub = ub.datetime_array.item()
-                            
-                            if not coord.increasing:
-                                lb, ub = ub, lb
-
-                            if group_span + lb != ub:
-                                # The span of this group is not the
-                                # same as group_span, so don't
-                                # collapse it.
-                                classification[index] = ignore_n
-                                ignore_n -= 1
-                                continue
-                        #--- End: if
-                    #--- End: if
-            
-                    if group_contiguous:
-                        overlap = (group_contiguous == 2)
-                        if not coord.bounds.contiguous(overlap=overlap):
-                            # This group is not contiguous, so don't
-                            # collapse it.
-                            classification[index] = ignore_n
-                            ignore_n -= 1
-                            continue                        
-                #--- End: if
+            # --------------------------------------------------------
+            # Still here? Then collapse the data of all of the groups
+            # in one pass through the data array, if possible
+            # --------------------------------------------------------
+            group_data = None
+            if indices:
+                group_data = self.data._collapse_grouped(method, iaxis,
+                                                         indices,
+                                                         weights=weights,
+                                                         mtol=mtol,
+                                                         ddof=ddof)
+
+            for n, (u, index) in enumerate(zip(unique, indices)):
+                if index[-1] - index[0] == index.size - 1:
+                    # The group is contiguous, so subspace with a slice
+                    index = slice(int(index[0]), int(index[-1]) + 1)
+                else:
+                    index = index.tolist()
 
-                if regroup:
-                    continue
+                pc = self.subspace(**{axis: index})
+
+                if group_data is None:
+                    w = _group_weights(weights, iaxis, index)
+                    g_data = None
+                else:
+                    w = None
+                    g_data = group_data[(slice(None),)*iaxis +
+                                        (slice(n, n+1),)]
 
-                # ----------------------------------------------------
-                # Still here? Then collapse the group
-                # ----------------------------------------------------
-                w = _group_weights(weights, iaxis, index)
                 if verbose:
                     print('        Collapsing group', u, ':', repr(pc)) # pragma: no cover
 
@@ -9885,12 +10170,9 @@ class Field(mixin.PropertiesData,
                                       coordinate=coordinate,
                                       squeeze=False, inplace=True,
                                       _create_zero_size_cell_bounds=True,
-                                      _update_cell_methods=False))
+                                      _update_cell_methods=False,
+                                      _group_data=g_data))
             #--- End: for
-            
-            if regroup:
-                # return the numpy array
-                return classification
 
         elif regroup:
             raise ValueError("Can't return classification 2453456 ")
@@ -14430,7 +14712,7 @@ class Field(mixin.PropertiesData,
 
 
     def percentile(self, ranks, axes=None, interpolation='linear',
-                   squeeze=False, mtol=1):
+                   squeeze=False, mtol=1, accuracy=None):
         '''Compute percentiles of the data along the specified axes.
 
     The default is to compute the percentiles along a flattened
@@ -14510,6 +14792,15 @@ class Field(mixin.PropertiesData,
               To ensure that an output array element is a missing
               datum if more than 25% of its input array elements are
               missing data: ``mtol=0.25``.
+
+        accuracy: number, optional
+            The relative accuracy of percentiles which are found by
+            passing through the partitions of the data, rather than
+            by sorting the values along the collapse axes in
+            memory. If 0 then these percentiles are exact. By default
+            the value of `cf.PERCENTILE_ACCURACY` is used.
+
+            .. versionadded:: 3.0.7
     
     :Returns:
 
@@ -14624,7 +14915,8 @@ class Field(mixin.PropertiesData,
 
         data = self.data.percentile(ranks, axes=iaxes,
                                     interpolation=interpolation,
-                                    squeeze=False, mtol=mtol)
+                                    squeeze=False, mtol=mtol,
+                                    accuracy=accuracy)
 
         # ------------------------------------------------------------
         # Initialize the output field with the percentile data
@@ -38,22 +38,27 @@ from collections import Iterable
 from hashlib     import md5 as hashlib_md5
 from marshal     import dumps as marshal_dumps
 from math        import ceil as math_ceil
-from os          import getpid, listdir, mkdir
+from os          import mkdir
 from os.path     import abspath      as _os_path_abspath
 from os.path     import expanduser   as _os_path_expanduser
 from os.path     import expandvars   as _os_path_expandvars
 from os.path     import dirname      as _os_path_dirname
 from os.path     import join         as _os_path_join
 from os.path     import relpath      as _os_path_relpath 
-from psutil      import virtual_memory, Process
+from psutil      import virtual_memory
 from sys         import executable as _sys_executable
+from threading   import RLock
+from time        import monotonic as _time_monotonic
 import urllib.parse
 
 import cfdm
 import cfunits
 
 from .          import __version__, __file__
-from .constants import CONSTANTS, _file_to_fh, _stash2standard_name
+from .constants import (CONSTANTS, _file_to_fh, _file_to_fh_lru,
+                        _file_to_fh_statistics, _stash2standard_name,
+                        _collapse_statistics, _weights_cache,
+                        _weights_cache_statistics)
 
 from . import mpi_on
 from . import mpi_size
@@ -169,6 +174,159 @@ def FREE_MEMORY():
     return _free_memory()
 
 
+# --------------------------------------------------------------------
+# The most recent probe of the available physical memory, the time at
+# which it was made, and the net number of bytes that partitions have
+# kept in memory, less those that they have released, since then
+# --------------------------------------------------------------------
+_free_memory_probe = {'free': None, 'time': 0.0, 'resident': 0.0}
+
+
+def _free_memory_estimate():
+    '''An estimate of the available physical memory.
+
+    The available physical memory is only probed if the time since the
+    last probe exceeds `cf.FREE_MEMORY_REFRESH` interval, or if
+    partitions have kept or released more than the
+    `cf.FREE_MEMORY_REFRESH` number of bytes in memory since
+    then. Otherwise the estimate is the previously probed value less
+    the net bytes kept in memory since.
+
+    .. seealso:: `_keep_in_memory`, `_release_memory`,
+                 `cf.FREE_MEMORY`
+
+    :Returns:
+    
+        `float`
+            The estimated amount of free memory in bytes.
+
+    '''
+    probe = _free_memory_probe
+    now = _time_monotonic()
+    if (probe['free'] is None or
+        now - probe['time'] >= CONSTANTS['FREE_MEMORY_REFRESH_INTERVAL'] or
+        abs(probe['resident']) >= CONSTANTS['FREE_MEMORY_REFRESH_NBYTES']):
+        probe['free']     = _free_memory()
+        probe['time']     = now
+        probe['resident'] = 0.0
+
+    return probe['free'] - probe['resident']
+
+
+def _keep_in_memory(nbytes=0):
+    '''Whether or not there is enough free memory for a partition to
+    keep its data array in memory.
+
+    If there is, then the data array's size is recorded as resident
+    in memory for subsequent estimates of the free memory.
+
+    .. seealso:: `_free_memory_estimate`, `cf.FM_THRESHOLD`
+
+    :Parameters:
+    
+        nbytes: number, optional
+            The size in bytes of the data array.
+
+    :Returns:
+    
+        `bool`
+            True if the data array may be kept in memory.
+
+    '''
+    if _free_memory_estimate() <= CONSTANTS['FM_THRESHOLD']:
+        return False
+
+    if nbytes:
+        _free_memory_probe['resident'] += nbytes
+
+    return True
+
+
+def _release_memory(nbytes):
+    '''Record that a partition has released a data array from memory.
+
+    The data array's size is no longer counted as resident in memory
+    for subsequent estimates of the free memory.
+
+    .. seealso:: `_free_memory_estimate`, `_keep_in_memory`
+
+    :Parameters:
+    
+        nbytes: number
+            The size in bytes of the data array.
+
+    :Returns:
+    
+        `None`
+
+    '''
+    _free_memory_probe['resident'] -= nbytes
+
+
+def FREE_MEMORY_REFRESH(interval=None, nbytes=None):
+    '''Set how often the available physical memory is probed when
+    deciding whether or not to keep partitions in memory.
+
+    Probing the available memory is relatively slow, so between
+    probes the amount of free memory is estimated by subtracting the
+    sizes of the partitions that have since been kept in memory from
+    the last probed value. The memory is probed again when either the
+    time since the last probe or the bytes kept in memory since the
+    last probe reach the given limits.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.FREE_MEMORY`, `cf.FM_THRESHOLD`
+
+    :Parameters:
+    
+        interval: `float`, optional
+            The maximum time in seconds between probes. By default
+            the interval is not changed.
+
+        nbytes: `float`, optional
+            The maximum number of bytes that may be kept in memory
+            between probes. By default the number of bytes is not
+            changed.
+    
+    :Returns:
+    
+        `tuple`
+            The previous interval and number of bytes.
+
+    **Examples:**
+
+    >>> cf.FREE_MEMORY_REFRESH()
+    (0.1, 134217728.0)
+    >>> cf.FREE_MEMORY_REFRESH(interval=0.5, nbytes=2**30)
+    (0.1, 134217728.0)
+    >>> cf.FREE_MEMORY_REFRESH()
+    (0.5, 1073741824.0)
+
+    '''
+    old = (CONSTANTS['FREE_MEMORY_REFRESH_INTERVAL'],
+           CONSTANTS['FREE_MEMORY_REFRESH_NBYTES'])
+
+    if interval is not None:
+        interval = float(interval)
+        if interval < 0:
+            raise ValueError('Free memory refresh interval must be non-negative')
+
+        CONSTANTS['FREE_MEMORY_REFRESH_INTERVAL'] = interval
+
+    if nbytes is not None:
+        nbytes = float(nbytes)
+        if nbytes < 0:
+            raise ValueError('Free memory refresh bytes must be non-negative')
+
+        CONSTANTS['FREE_MEMORY_REFRESH_NBYTES'] = nbytes
+
+    # Force a new probe of the available memory
+    _free_memory_probe['free'] = None
+
+    return old
+
+
 def _WORKSPACE_FACTOR_1():
     '''The value of workspace factor 1 used in calculating the upper limit
     to the chunksize given the free memory factor.
@@ -400,6 +558,137 @@ def TEMPDIR(*arg):
     return old
 
 
+def AGGREGATE_CACHE_DIR(*arg):
+    '''The directory for the persistent aggregation cache.
+
+    When set, the coordinate arrays that are read from files during
+    aggregation, and their hash values, are stored in a database in
+    this directory and reused by later aggregations, including those
+    in other sessions, so that unchanged files do not have their
+    coordinates read and hashed again. Each stored array is
+    identified by its file's name, size and modification time, so
+    entries for files which have since changed are never used.
+
+    When setting the directory, it is created if the specified path
+    does not exist.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.aggregate`, `cf.read`
+
+    :Parameters:
+    
+        arg: `str` or `None`, optional
+            The new directory for the persistent aggregation cache,
+            or `None` to not use a persistent cache. Tilde expansion
+            and environment variable expansion are applied to the new
+            directory name, as for `cf.TEMPDIR`.
+    
+            The default is to not change the directory.
+    
+    :Returns:
+    
+        `str` or `None`
+            The directory prior to the change, or the current
+            directory if no new value was specified.
+    
+    **Examples:**
+    
+    >>> print(cf.AGGREGATE_CACHE_DIR())
+    None
+    >>> old = cf.AGGREGATE_CACHE_DIR('~/.cf_cache')
+    >>> cf.AGGREGATE_CACHE_DIR()
+    '/home/me/.cf_cache'
+    >>> cf.AGGREGATE_CACHE_DIR(old)
+    '/home/me/.cf_cache'
+    >>> print(cf.AGGREGATE_CACHE_DIR())
+    None
+
+    '''
+    old = CONSTANTS['AGGREGATE_CACHE_DIR']
+    if arg:
+        cache_dir = arg[0]
+        if cache_dir is not None:
+            cache_dir = _os_path_expanduser(_os_path_expandvars(cache_dir))
+
+            # Create the directory if it does not exist.
+            try:
+                mkdir(cache_dir)
+            except OSError:
+                pass
+        #--- End: if
+        
+        CONSTANTS['AGGREGATE_CACHE_DIR'] = cache_dir
+
+    return old
+
+
+def UM_INDEX_DIR(*arg):
+    '''The directory for index files of PP and UM fields files.
+
+    When set, the headers, data offsets and variable grouping of the
+    records of a PP or UM fields file are stored in a compact index
+    file in this directory the first time that the file is parsed, and
+    are then loaded from the index file in one read, rather than by
+    parsing the file again, whenever the file is subsequently opened,
+    including in other sessions. An index file is only used if it was
+    written for its file at the file's current size and modification
+    time.
+
+    When setting the directory, it is created if the specified path
+    does not exist.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.AGGREGATE_CACHE_DIR`, `cf.read`
+
+    :Parameters:
+    
+        arg: `str` or `None`, optional
+            The new directory for index files, or `None` to not use
+            index files. Tilde expansion and environment variable
+            expansion are applied to the new directory name, as for
+            `cf.TEMPDIR`.
+    
+            The default is to not change the directory.
+    
+    :Returns:
+    
+        `str` or `None`
+            The directory prior to the change, or the current
+            directory if no new value was specified.
+    
+    **Examples:**
+    
+    >>> print(cf.UM_INDEX_DIR())
+    None
+    >>> old = cf.UM_INDEX_DIR('~/.cf_um_index')
+    >>> cf.UM_INDEX_DIR()
+    '/home/me/.cf_um_index'
+    >>> cf.UM_INDEX_DIR(old)
+    '/home/me/.cf_um_index'
+    >>> print(cf.UM_INDEX_DIR())
+    None
+
+    '''
+    old = CONSTANTS['UM_INDEX_DIR']
+    if arg:
+        index_dir = arg[0]
+        if index_dir is not None:
+            index_dir = _os_path_expanduser(_os_path_expandvars(index_dir))
+
+            # Create the directory if it does not exist.
+            try:
+                mkdir(index_dir)
+            except OSError:
+                pass
+        #--- End: if
+        
+        CONSTANTS['UM_INDEX_DIR'] = index_dir
+
+    return old
+
+
 def OF_FRACTION(*arg):
     '''The amount of concurrently open files above which files containing
     data arrays may be automatically closed.
@@ -538,6 +827,316 @@ def COLLAPSE_PARALLEL_MODE(*arg):
     return old
 
 
+def CACHED_ARRAY_MMAP(*arg):
+    '''Whether or not to memory map partitions cached in temporary files.
+
+    Partitions which do not fit in memory are stored in temporary
+    files in the `cf.TEMPDIR` directory. If memory mapping is enabled
+    then accessing a subspace of such a partition only reads from disk
+    the parts of the temporary file which are spanned by the
+    subspace, rather than the whole file.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.TEMPDIR`
+
+    :Parameters:
+    
+        arg: `bool`, optional
+            The new value (either True to enable memory mapping or
+            False to disable it). The default is to not change the
+            current behaviour.
+    
+    :Returns:
+    
+        `bool`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.CACHED_ARRAY_MMAP()
+    True
+    >>> cf.CACHED_ARRAY_MMAP(False)
+    True
+    >>> cf.CACHED_ARRAY_MMAP()
+    False
+
+    '''
+    old = CONSTANTS['CACHED_ARRAY_MMAP']
+    if arg:
+        CONSTANTS['CACHED_ARRAY_MMAP'] = bool(arg[0])
+    
+    return old
+
+
+def LAZY_OPERATIONS(*arg):
+    '''Whether or not to defer element-wise operations on data arrays.
+
+    When enabled, element-wise arithmetic with a single value (such as
+    ``d * 2`` or ``d -= 273.15``), unary arithmetic (such as
+    ``abs(d)``) and `cf.Data.func` with a `numpy.ufunc` do not process
+    the data immediately. Instead, the operations are recorded on each
+    partition and applied together the next time that the partition's
+    data are accessed, for example by `cf.Data.array`, a collapse or
+    `cf.write`. This avoids creating, and possibly writing to
+    temporary files, the intermediate results of a sequence of
+    operations.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.CHUNKSIZE`
+
+    :Parameters:
+    
+        arg: `bool`, optional
+            The new value (either True to defer operations or False to
+            apply them immediately). The default is to not change the
+            current behaviour.
+    
+    :Returns:
+    
+        `bool`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.LAZY_OPERATIONS()
+    False
+    >>> cf.LAZY_OPERATIONS(True)
+    False
+    >>> cf.LAZY_OPERATIONS()
+    True
+
+    '''
+    old = CONSTANTS['LAZY_OPERATIONS']
+    if arg:
+        CONSTANTS['LAZY_OPERATIONS'] = bool(arg[0])
+    
+    return old
+
+
+def COLLAPSE_PROCESSES(*arg):
+    '''The number of processes used to collapse the partitions of a data
+    array.
+
+    When greater than 1, and MPI is not being used, each partition
+    whose data is on disk is collapsed by a worker process of a
+    `concurrent.futures` process pool. The worker reads the
+    partition's data from its file and returns a partial result,
+    which is combined with those of the other partitions in the
+    usual way. Partitions whose data are in memory are collapsed in
+    the calling process.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.COLLAPSE_PARALLEL_MODE`, `cf.PARTITION_WORKERS`
+
+    :Parameters:
+    
+        arg: `int`, optional
+            The new number of processes. If 1 then no worker processes
+            are used. The default is to not change the current value.
+    
+    :Returns:
+    
+        `int`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.COLLAPSE_PROCESSES()
+    1
+    >>> cf.COLLAPSE_PROCESSES(4)
+    1
+    >>> cf.COLLAPSE_PROCESSES()
+    4
+
+    '''
+    old = CONSTANTS['COLLAPSE_PROCESSES']
+    if arg:
+        processes = int(arg[0])
+        if processes < 1:
+            raise ValueError(
+                "Number of collapse processes must be at least 1. Got {}".format(
+                    arg[0]))
+
+        CONSTANTS['COLLAPSE_PROCESSES'] = processes
+
+    return old
+
+
+def PERCENTILE_ACCURACY(*arg):
+    '''The relative accuracy of percentiles.
+
+    When the percentiles of a data array are found by passing through
+    its partitions, rather than by sorting the values along the
+    collapse axes in memory, the order statistics are selected by
+    refining a histogram of the leading bits of the values at each
+    pass. If the accuracy is greater than 0 then the refinement stops
+    once the remaining bits are below the accuracy, and each order
+    statistic is estimated from the middle of its histogram bin. This
+    reduces the number of passes, and always uses bounded memory, at
+    the expense of the percentiles being approximate. If the accuracy
+    is 0 then the percentiles are exact.
+
+    The accuracy also applies to the ``'median'`` and
+    ``'mean_of_upper_decile'`` collapse methods.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.CHUNKSIZE`, `cf.Data.percentile`,
+                 `cf.Field.percentile`
+
+    :Parameters:
+    
+        arg: number, optional
+            The new relative accuracy, which must be in the range
+            [0, 1). The default is to not change the current value.
+    
+    :Returns:
+    
+        `float`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.PERCENTILE_ACCURACY()
+    0.0
+    >>> cf.PERCENTILE_ACCURACY(0.001)
+    0.0
+    >>> cf.PERCENTILE_ACCURACY()
+    0.001
+
+    '''
+    old = CONSTANTS['PERCENTILE_ACCURACY']
+    if arg:
+        accuracy = float(arg[0])
+        if not 0 <= accuracy < 1:
+            raise ValueError(
+                "Percentile accuracy must be in the range [0, 1). Got {}".format(
+                    arg[0]))
+
+        CONSTANTS['PERCENTILE_ACCURACY'] = accuracy
+
+    return old
+
+
+def PARTITION_WORKERS(*arg):
+    '''The number of threads used to process independent partitions of a
+    data array concurrently.
+
+    Operations which process each partition independently (such as
+    arithmetic, `cf.Data.func` and date-time component extraction)
+    distribute the partitions across a pool of threads. Most of the
+    work on each partition is done in numpy, netCDF and the UM file
+    reader, which release Python's global interpreter lock, so the
+    partitions may be processed in parallel on a single machine
+    without MPI. Reading from a data file is serialised, but the
+    records of PP and UM fields files which are read together, or the
+    rows of a single WGDOS packed record, are unpacked by up to this
+    many native threads.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.CHUNKSIZE`
+
+    :Parameters:
+    
+        arg: `int`, optional
+            The new number of threads. If 1 then the partitions are
+            processed serially. The default is to not change the
+            current value.
+    
+    :Returns:
+    
+        `int`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.PARTITION_WORKERS()
+    1
+    >>> cf.PARTITION_WORKERS(8)
+    1
+    >>> cf.PARTITION_WORKERS()
+    8
+
+    '''
+    old = CONSTANTS['PARTITION_WORKERS']
+    if arg:
+        workers = int(arg[0])
+        if workers < 1:
+            raise ValueError(
+                "Number of partition workers must be at least 1. Got {}".format(
+                    arg[0]))
+
+        CONSTANTS['PARTITION_WORKERS'] = workers
+
+    return old
+
+
+def WEIGHTS_CACHE_SIZE(*arg):
+    '''The maximum number of cached weights components.
+
+    Weights components created by `cf.Field.weights` from the bounds
+    of dimension coordinate constructs (such as the cell sizes of a
+    time axis, or the longitude and sine latitude components of cell
+    areas) are kept in a cache, keyed by hashes of the bounds, the
+    units, and the *measure*, *radius* and *scale* parameters. Fields
+    which share coordinates then reuse the weights, rather than
+    recalculating them, and the least recently used weights are
+    discarded when the cache is full.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.weights_cache_statistics`, `cf.Field.weights`
+
+    :Parameters:
+    
+        arg: `int`, optional
+            The new maximum number of weights components. If 0 then
+            no weights are cached, and the cache is cleared. The
+            default is to not change the current value.
+    
+    :Returns:
+    
+        `int`
+            The value prior to the change, or the current value if no
+            new value was specified.
+    
+    **Examples:**
+    
+    >>> cf.WEIGHTS_CACHE_SIZE()
+    128
+    >>> cf.WEIGHTS_CACHE_SIZE(0)
+    128
+    >>> cf.WEIGHTS_CACHE_SIZE()
+    0
+
+    '''
+    old = CONSTANTS['WEIGHTS_CACHE_SIZE']
+    if arg:
+        size = int(arg[0])
+        if size < 0:
+            raise ValueError(
+                "Weights cache size must be non-negative. Got {}".format(
+                    arg[0]))
+
+        CONSTANTS['WEIGHTS_CACHE_SIZE'] = size
+
+        while len(_weights_cache) > size:
+            _weights_cache.popitem(last=False)
+            _weights_cache_statistics['evictions'] += 1
+    #--- End: if
+
+    return old
+
+
 def RELAXED_IDENTITIES(*arg):
     '''Use 'relaxed' mode when getting a construct identity.
 
@@ -654,70 +1253,140 @@ def dump(x, **kwargs):
 
 _max_number_of_open_files = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
 
-if _linux:
-    # ----------------------------------------------------------------
-    # GNU/LINUX
-    # ----------------------------------------------------------------
+# Lock for the pool of open files, which may be accessed by
+# concurrently processed partitions
+_file_to_fh_lock = RLock()
 
-    # Directory containing a symbolic link for each file opened by the
-    # current python session
-    _fd_dir = '/proc/'+str(getpid())+'/fd'
 
-    def open_files_threshold_exceeded():
-        '''Return True if the total number of open files is greater than the
-    current threshold. GNU/LINUX.
+def _open_files_limit():
+    '''The maximum number of files containing sub-arrays of data arrays
+    which may be concurrently open.
 
-    The threshold is defined as a fraction of the maximum possible number
-    of concurrently open files (an operating system dependent amount). The
-    fraction is retrieved and set with the `OF_FRACTION` function.
+    The limit is the fraction, given by `cf.OF_FRACTION`, of the
+    maximum possible number of concurrently open files.
+
+    :Returns:
     
-    .. seealso:: `cf.close_files`, `cf.close_one_file`,
-                 `cf.open_files`
+        `int`
+
+    '''
+    return int(_max_number_of_open_files * OF_FRACTION())
+
+
+def _get_file_handle(file_format, filename):
+    '''Return an open file from the pool of files containing sub-arrays
+    of data arrays.
+
+    The file is marked as the most recently used file, and the pool's
+    hit and miss counters are updated.
+
+    .. seealso:: `_add_file_handle`, `_remove_file_handle`
+
+    :Parameters:
     
+        file_format: `str`
+            The format of the file, either ``'netCDF'`` or ``'UM'``.
+
+        filename: `str`
+            The name of the file.
+
     :Returns:
     
-        `bool`
-            Whether or not the number of open files exceeds the
-            threshold.
+            The open file object, or `None` if the file is not in the
+            pool.
+
+    '''
+    key = (file_format, filename)
+    with _file_to_fh_lock:
+        if key in _file_to_fh_lru:
+            _file_to_fh_lru.move_to_end(key)
+            _file_to_fh_statistics['hits'] += 1
+            return _file_to_fh[file_format][filename]
+
+        _file_to_fh_statistics['misses'] += 1
+        return None
+
+
+def _add_file_handle(file_format, filename, fh):
+    '''Add an open file to the pool of files containing sub-arrays of
+    data arrays.
+
+    If the pool is full then least recently used files are closed to
+    make way for the new one.
+
+    .. seealso:: `_get_file_handle`, `_remove_file_handle`
+
+    :Parameters:
     
-    **Examples:**
+        file_format: `str`
+            The format of the file, either ``'netCDF'`` or ``'UM'``.
+
+        filename: `str`
+            The name of the file.
+
+        fh:
+            The open file object, which must have a `!close` method.
+
+    :Returns:
     
-    In this example, the number of open files is 75% of the maximum
-    possible number of concurrently open files:
+        `None`
+
+    '''
+    key = (file_format, filename)
+    with _file_to_fh_lock:
+        if key not in _file_to_fh_lru:
+            while _file_to_fh_lru and open_files_threshold_exceeded():
+                close_one_file()
+        #--- End: if
+
+        _file_to_fh.setdefault(file_format, {})[filename] = fh
+        _file_to_fh_lru[key] = None
+        _file_to_fh_lru.move_to_end(key)
+
+
+def _remove_file_handle(file_format, filename):
+    '''Remove a file from the pool of files containing sub-arrays of data
+    arrays, without closing it.
+
+    .. seealso:: `_add_file_handle`, `_get_file_handle`
+
+    :Parameters:
     
-    >>> cf.OF_FRACTION()
-    0.5
-    >>> cf.open_files_threshold_exceeded()
-    True
-    >>> cf.OF_FRACTION(0.9)
-    >>> cf.open_files_threshold_exceeded()
-    False
+        file_format: `str`
+            The format of the file, either ``'netCDF'`` or ``'UM'``.
 
-        '''
-        return len(listdir(_fd_dir)) > _max_number_of_open_files * OF_FRACTION()
+        filename: `str`
+            The name of the file.
 
+    :Returns:
     
-else:
-    # ----------------------------------------------------------------
-    # NOT GNU/LINUX
-    # ---------------------------------------------------------------- 
-    _process = Process(getpid())
+            The removed file object, or `None` if the file was not in
+            the pool.
+
+    '''
+    with _file_to_fh_lock:
+        _file_to_fh_lru.pop((file_format, filename), None)
+        return _file_to_fh.get(file_format, {}).pop(filename, None)
 
-    def open_files_threshold_exceeded():
-        '''Return True if the total number of open files is greater than the
-    current threshold.
+
+def open_files_threshold_exceeded():
+    '''Return True if the number of open files containing sub-arrays of
+    data arrays has reached the current threshold.
 
     The threshold is defined as a fraction of the maximum possible number
     of concurrently open files (an operating system dependent amount). The
     fraction is retrieved and set with the `OF_FRACTION` function.
+
+    The open files are counted from the pool of files maintained by
+    cf, rather than by querying the operating system.
     
     .. seealso:: `cf.close_files`, `cf.close_one_file`,
-                 `cf.open_files`
+                 `cf.open_files`, `cf.open_files_statistics`
     
     :Returns:
     
         `bool`
-            Whether or not the number of open files exceeds the
+            Whether or not the number of open files has reached the
             threshold.
     
     **Examples:**
@@ -733,11 +1402,9 @@ else:
     >>> cf.open_files_threshold_exceeded()
     False
 
-        '''
-        return len(_process.open_files()) > _max_number_of_open_files * OF_FRACTION()
+    '''
+    return len(_file_to_fh_lru) >= _open_files_limit()
 
-    
-#---End: if
 
 def close_files(file_format=None):
     '''Close open files containing sub-arrays of data arrays.
@@ -757,7 +1424,7 @@ def close_files(file_format=None):
     
         file_format: `str`, optional
             Only close files of the given format. Recognised formats
-            are ``'netCDF'`` and ``'PP'``. By default files of any
+            are ``'netCDF'`` and ``'UM'``. By default files of any
             format are closed.
     
     :Returns:
@@ -768,30 +1435,26 @@ def close_files(file_format=None):
     
     >>> cf.close_files()
     >>> cf.close_files('netCDF')
-    >>> cf.close_files('PP')
+    >>> cf.close_files('UM')
 
     '''
     if file_format is not None:
-        if file_format in _file_to_fh:
-            for fh in _file_to_fh[file_format].itervalues():
-                fh.close()
-        
-            _file_to_fh[file_format].clear()
+        file_formats = (file_format,)
     else:
-        for file_format, value in _file_to_fh.iteritems():
-            for fh in value.itervalues():
-                fh.close()
+        file_formats = tuple(_file_to_fh)
         
-            _file_to_fh[file_format].clear()
-    #--- End: if
+    for file_format in file_formats:
+        for filename in tuple(_file_to_fh.get(file_format, ())):
+            _remove_file_handle(file_format, filename).close()
+    #--- End: for
 
     
 def close_one_file(file_format=None):
-    '''Close an arbitrary open file containing a sub-array of a data
-    array.
+    '''Close the least recently used open file containing a sub-array of
+    a data array.
     
-    By default a file of arbitrary format is closed, but the choice
-    may be restricted to files of a particular format.
+    By default a file of any format may be closed, but the choice may
+    be restricted to files of a particular format.
     
     Note that the closed file will be automatically reopened if
     subsequently needed by a variable to access the sub-array.
@@ -799,13 +1462,14 @@ def close_one_file(file_format=None):
     If there are no appropriate open files then no action is taken.
     
     .. seealso:: `cf.close_files`, `cf.open_files`,
+                 `cf.open_files_statistics`,
                  `cf.open_files_threshold_exceeded`
     
     :Parameters:
     
         file_format: `str`, optional
             Only close a file of the given format. Recognised formats
-            are ``'netCDF'`` and ``'PP'``. By default a file of any
+            are ``'netCDF'`` and ``'UM'``. By default a file of any
             format is closed.
     
     :Returns:
@@ -816,7 +1480,7 @@ def close_one_file(file_format=None):
     
     >>> cf.close_one_file()
     >>> cf.close_one_file('netCDF')
-    >>> cf.close_one_file('PP')
+    >>> cf.close_one_file('UM')
     
     >>> cf.open_files()
     {'netCDF': {'file1.nc': <netCDF4.Dataset at 0x181bcd0>,
@@ -824,23 +1488,20 @@ def close_one_file(file_format=None):
                 'file3.nc': <netCDF4.Dataset at 0x1d185e9>}}
     >>> cf.close_one_file()
     >>> cf.open_files()
-    {'netCDF': {'file1.nc': <netCDF4.Dataset at 0x181bcd0>,
+    {'netCDF': {'file2.nc': <netCDF4.Dataset at 0x1e42350>,
                 'file3.nc': <netCDF4.Dataset at 0x1d185e9>}}
 
     '''
-    if file_format is not None:
-        if file_format in _file_to_fh and _file_to_fh[file_format]:
-            filename, fh = next(_file_to_fh[file_format].iteritems())
-            fh.close()
-            del _file_to_fh[file_format][filename]
-    else:    
-        for values in _file_to_fh.itervalues():
-            if not values:
-                continue
-        
-            filename, fh = next(values.iteritems())
-            fh.close()
-            del values[filename]
+    with _file_to_fh_lock:
+        for key in _file_to_fh_lru:
+            if file_format is None or key[0] == file_format:
+                break
+        else:
+            # No appropriate open files
+            return
+
+        _remove_file_handle(*key).close()
+        _file_to_fh_statistics['evictions'] += 1
 
 
 def open_files(file_format=None):
@@ -850,13 +1511,14 @@ def open_files(file_format=None):
     restricted to files of a particular format.
     
     .. seealso:: `cf.close_files`, `cf.close_one_file`,
+                 `cf.open_files_statistics`,
                  `cf.open_files_threshold_exceeded`
     
     :Parameters:
     
         file_format: `str`, optional
             Only return files of the given format. Recognised formats
-            are ``'netCDF'`` and ``'PP'``. By default all files are
+            are ``'netCDF'`` and ``'UM'``. By default all files are
             returned.
     
     :Returns:
@@ -875,7 +1537,7 @@ def open_files(file_format=None):
     {'netCDF': {'file1.nc': <netCDF4.Dataset at 0x187b6d0>}}
     >>> cf.open_files('netCDF')
     {'file1.nc': <netCDF4.Dataset at 0x187b6d0>}
-    >>> cf.open_files('PP')
+    >>> cf.open_files('UM')
     {}
 
     '''  
@@ -886,12 +1548,238 @@ def open_files(file_format=None):
             return {}
     else:   
         out = {}
-        for file_format, values in _file_to_fh.iteritems():
+        for file_format, values in _file_to_fh.items():
             out[file_format] = values.copy()
             
         return out
 
 
+def open_files_statistics(reset=False):
+    '''Return the usage statistics of the pool of open files containing
+    sub-arrays of data arrays.
+
+    A hit is counted when a requested file is already open, a miss
+    when it has to be opened, and an eviction when the least recently
+    used file is closed to make way for another one.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.close_one_file`, `cf.OF_FRACTION`,
+                 `cf.open_files`
+
+    :Parameters:
+    
+        reset: `bool`, optional
+            If True then reset the hit, miss and eviction counters to
+            zero after they have been returned.
+
+    :Returns:
+    
+        `dict`
+            The numbers of hits, misses and evictions; the number of
+            currently open files; and the maximum number of files that
+            may be concurrently open.
+    
+    **Examples:**
+    
+    >>> cf.open_files_statistics()
+    {'hits': 1792, 'misses': 1028, 'evictions': 516, 'open': 512, 'limit': 512}
+    >>> cf.open_files_statistics(reset=True)
+    {'hits': 1792, 'misses': 1028, 'evictions': 516, 'open': 512, 'limit': 512}
+    >>> cf.open_files_statistics()
+    {'hits': 0, 'misses': 0, 'evictions': 0, 'open': 512, 'limit': 512}
+
+    '''
+    out = _file_to_fh_statistics.copy()
+    out['open'] = len(_file_to_fh_lru)
+    out['limit'] = _open_files_limit()
+
+    if reset:
+        for key in _file_to_fh_statistics:
+            _file_to_fh_statistics[key] = 0
+    #--- End: if
+
+    return out
+
+
+def weights_cache_statistics(reset=False):
+    '''Return the usage statistics of the cache of weights components.
+
+    A hit is counted when requested weights are found in the cache, a
+    miss when they have to be created, and an eviction when the least
+    recently used weights are discarded to make way for others.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.WEIGHTS_CACHE_SIZE`, `cf.Field.weights`
+
+    :Parameters:
+    
+        reset: `bool`, optional
+            If True then reset the hit, miss and eviction counters to
+            zero after they have been returned.
+
+    :Returns:
+    
+        `dict`
+            The numbers of hits, misses and evictions; the number of
+            cached weights components; and the maximum number of
+            weights components that may be cached.
+    
+    **Examples:**
+    
+    >>> cf.weights_cache_statistics()
+    {'hits': 297, 'misses': 3, 'evictions': 0, 'size': 3, 'limit': 128}
+    >>> cf.weights_cache_statistics(reset=True)
+    {'hits': 297, 'misses': 3, 'evictions': 0, 'size': 3, 'limit': 128}
+    >>> cf.weights_cache_statistics()
+    {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 3, 'limit': 128}
+
+    '''
+    out = _weights_cache_statistics.copy()
+    out['size'] = len(_weights_cache)
+    out['limit'] = WEIGHTS_CACHE_SIZE()
+
+    if reset:
+        for key in _weights_cache_statistics:
+            _weights_cache_statistics[key] = 0
+    #--- End: if
+
+    return out
+
+
+def _weights_cache_get(key):
+    '''Return weights from the cache of weights components.
+
+    If the weights are in the cache then they are marked as the most
+    recently used. The cache's hit and miss counters are updated.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_weights_cache_set`
+
+    :Parameters:
+    
+        key: `tuple`
+            The key of the weights.
+
+    :Returns:
+    
+            The cached weights, which must not be changed in-place, or
+            `None` if they are not in the cache.
+
+    '''
+    w = _weights_cache.get(key)
+    if w is None:
+        _weights_cache_statistics['misses'] += 1
+        return None
+
+    _weights_cache.move_to_end(key)
+    _weights_cache_statistics['hits'] += 1
+    return w
+
+
+def _weights_cache_set(key, w):
+    '''Add weights to the cache of weights components.
+
+    If the cache is full then the least recently used weights are
+    discarded to make way for the new ones.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `_weights_cache_get`
+
+    :Parameters:
+    
+        key: `tuple`
+            The key of the weights.
+
+        w:
+            The weights, which must not be changed in-place after
+            being cached.
+
+    :Returns:
+    
+        `None`
+
+    '''
+    size = WEIGHTS_CACHE_SIZE()
+    if not size:
+        return
+    
+    _weights_cache[key] = w
+    _weights_cache.move_to_end(key)
+    while len(_weights_cache) > size:
+        _weights_cache.popitem(last=False)
+        _weights_cache_statistics['evictions'] += 1
+
+
+def collapse_statistics(reset=False):
+    '''Return the load balance statistics of collapses parallelised
+    with MPI.
+
+    The partitions of a collapse are scheduled across the ranks so
+    that each rank has a similar estimated cost, which depends on the
+    partition sizes, whether the partitions are in memory or in
+    files, whether file data are packed and whether the data are
+    masked. The statistics show how well the estimated costs and the
+    actual processing times were balanced.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.COLLAPSE_PARALLEL_MODE`
+
+    :Parameters:
+    
+        reset: `bool`, optional
+            If True then reset the statistics after they have been
+            returned.
+
+    :Returns:
+    
+        `dict`
+            The number of parallel collapses; for each rank, the total
+            time in seconds spent processing partitions and the total
+            estimated cost of those partitions; and the imbalance,
+            defined as the ratio of the largest time to the mean time,
+            or `None` if no time has been recorded. The lists of times
+            and costs are empty if there have been no parallel
+            collapses.
+    
+    **Examples:**
+    
+    >>> cf.collapse_statistics()
+    {'collapses': 0, 'time': [], 'cost': [], 'imbalance': None}
+
+    In a four rank MPI job:
+
+    >>> cf.collapse_statistics()
+    {'collapses': 2,
+     'time': [1.52, 1.47, 1.61, 1.49],
+     'cost': [2.4e7, 2.4e7, 2.3e7, 2.4e7],
+     'imbalance': 1.055}
+
+    '''
+    times = list(_collapse_statistics['time'])
+
+    out = {'collapses': _collapse_statistics['collapses'],
+           'time'     : times,
+           'cost'     : list(_collapse_statistics['cost']),
+           'imbalance': None}
+
+    total = sum(times)
+    if total > 0:
+        out['imbalance'] = max(times) * len(times) / total
+
+    if reset:
+        _collapse_statistics['collapses'] = 0
+        _collapse_statistics['time'] = []
+        _collapse_statistics['cost'] = []
+    #--- End: if
+
+    return out
+
+
 def ufunc(name, x, *args, **kwargs):
     '''The variable must have a `!copy` method and a method called
     *name*. Any optional positional and keyword arguments are passed
@@ -917,6 +1805,90 @@ def ufunc(name, x, *args, **kwargs):
     return x
 
 
+def _select_may_match(select, properties, ncvar=None, identity=None,
+                      determined=('standard_name', 'long_name')):
+    '''Whether or not a field that is yet to be created could match any
+    of the given identities.
+
+    This allows file readers to avoid creating fields which would be
+    discarded by the *select* parameter of `cf.read`. An identity is
+    only considered not to match if that can be determined from the
+    given properties, netCDF variable name and ``id`` attribute of the
+    field to be created, so that no field which would match is ever
+    excluded.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.Field.match_by_identity`
+
+    :Parameters:
+
+        select: sequence
+            The identities, as accepted by `cf.read`.
+
+        properties: `dict`
+            The properties that the field will have. Only those named
+            by *determined* are taken into account.
+
+        ncvar: `str`, optional
+            The netCDF variable name that the field will have. By
+            default it is unknown.
+
+        identity: `str`, optional
+            The ``id`` attribute that the field will have. By default
+            it is unknown.
+
+        determined: sequence of `str`, optional
+            The names of the properties whose values in *properties*
+            are exactly those that the field will have, including
+            their absence.
+
+    :Returns:
+
+        `bool`
+            False if the field can not match any of the identities,
+            otherwise True.
+
+    **Examples:**
+
+    >>> cf.functions._select_may_match(
+    ...     ['air_temperature'], {'standard_name': 'air_pressure'})
+    False
+    >>> cf.functions._select_may_match(
+    ...     ['air_temperature', 'units=K'], {'standard_name': 'air_pressure'})
+    True
+    >>> cf.functions._select_may_match(['ncvar%ta'], {}, ncvar='ta')
+    True
+
+    '''
+    for value in select:
+        if not isinstance(value, str):
+            # A regular expression or query may match anything
+            return True
+
+        if '=' in value:
+            prop = value.split('=', 1)[0]
+            if prop not in determined:
+                return True
+                
+            if (prop in properties and
+                '{0}={1}'.format(prop, properties[prop]) == value):
+                return True
+        elif value.startswith('ncvar%'):
+            if ncvar is None or value[6:] == ncvar:
+                return True
+        elif value.startswith('id%'):
+            if identity is None or value[3:] == identity:
+                return True
+        elif '%' in value or 'standard_name' not in determined:
+            return True
+        elif value == properties.get('standard_name'):
+            return True
+    #--- End: for
+
+    return False
+
+
 def _numpy_allclose(a, b, rtol=None, atol=None):
     '''Returns True if two broadcastable arrays have equal values to
     within numerical tolerance, False otherwise.
@@ -1891,8 +2863,10 @@ def hash_array(array):
     independent of the fill value and of data array values underlying
     any masked elements.
     
-    The hash value is not guaranteed to be portable across versions of
-    Python, numpy and cf.
+    The hash value is taken from the array's MD5 digest, so unlike the
+    built-in `hash` of a `bytes` object it is the same in every Python
+    session, and may be stored. It is not guaranteed to be portable
+    across versions of numpy and cf.
     
     :Parameters:
     
@@ -1909,27 +2883,27 @@ def hash_array(array):
     >>> print(array)
     [[0 1 2 3]]
     >>> cf.hash_array(array)
-    -8125230271916303273
+    -8699290979211459048
     >>> array[1, 0] = numpy.ma.masked
     >>> print(array)
     [[0 -- 2 3]]
     >>> cf.hash_array(array)
-    791917586613573563
+    -5845319128151778444
     >>> array.hardmask = False
     >>> array[0, 1] = 999
     >>> array[0, 1] = numpy.ma.masked
     >>> cf.hash_array(array)
-    791917586613573563
+    -5845319128151778444
     >>> array.squeeze()
     >>> print(array)
     [0 -- 2 3]
     >>> cf.hash_array(array)
-    -7007538450787927902
+    2404616553245529208
     >>> array.dtype = float
     >>> print(array)
     [0.0 -- 2.0 3.0]
     >>> cf.hash_array(array)
-    -4816859207969696442
+    -2720699852423746739
 
     '''
     h = hashlib_md5()
@@ -1959,7 +2933,7 @@ def hash_array(array):
         
     h_update(array)
 
-    return hash(h.digest())
+    return int.from_bytes(h.digest()[:8], 'little', signed=True)
 
 
 def inspect(self):
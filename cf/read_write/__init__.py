@@ -1,5 +1,5 @@
 from .cfimplementation import (CFImplementation,
                                _implementation,
                                implementation)
-from .read             import read
+from .read             import read, iread
 from .write            import write
@@ -4,7 +4,7 @@ from ast import literal_eval as ast_literal_eval
 
 import cfdm
 
-from ...constants import _file_to_fh
+from ...functions import _remove_file_handle, _select_may_match
 
 
 class NetCDFRead(cfdm.read_write.netcdf.NetCDFRead):
@@ -275,6 +275,26 @@ class NetCDFRead(cfdm.read_write.netcdf.NetCDFRead):
                 if g['variable_attributes'][ncvar].get('cf_role', None) == 'cfa_private':
                     g['do_not_create_field'].add(ncvar)                
 
+        # ------------------------------------------------------------
+        # Do not create fields which can't match any of the selection
+        # identities, so that the variables that only they need are
+        # not processed.
+        # ------------------------------------------------------------
+        select = g.get('select')
+        if select:
+            do_not_create_field = g['do_not_create_field']
+            for ncvar in g['variables']:
+                if ncvar in do_not_create_field:
+                    continue
+                
+                # A field's properties are the global attributes
+                # combined with its variable's attributes
+                properties = g['global_attributes'].copy()
+                properties.update(g['variable_attributes'][ncvar])
+                if not _select_may_match(select, properties, ncvar=ncvar):
+                    do_not_create_field.add(ncvar)
+        #--- End: if
+
     
     def file_open(self, filename):
         '''Open the netCDf file for reading.
@@ -291,7 +311,7 @@ class NetCDFRead(cfdm.read_write.netcdf.NetCDFRead):
 
         '''
         out = super().file_open(filename)
-        _file_to_fh['netCDF'].pop(filename, None)
+        _remove_file_handle('netCDF', filename)
         return out
 
 #--- End: class
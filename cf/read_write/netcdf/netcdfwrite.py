@@ -9,6 +9,8 @@ import cfdm
 
 from ... import DomainAncillary, Coordinate, Bounds
 
+from ...data.functions import _file_lock, _map_partitions
+
 
 class NetCDFWrite(cfdm.read_write.netcdf.NetCDFWrite):
     '''TODO
@@ -95,7 +97,7 @@ class NetCDFWrite(cfdm.read_write.netcdf.NetCDFWrite):
         
         config = data.partition_configuration(readonly=True)
         
-        for partition in data.partitions.flat:
+        def _write_partition(partition):
             partition.open(config)
             array = partition.array
 
@@ -117,10 +119,16 @@ class NetCDFWrite(cfdm.read_write.netcdf.NetCDFWrite):
                         "ERROR: Can't write field when array has _FillValue or missing_value at unmasked point: {!r}".format(ncvar))
             #--- End: if
     
-            # Copy the array into the netCDF variable
-            g['nc'][ncvar][partition.indices] = array        
+            # Copy the array into the netCDF variable. The netCDF
+            # library is not thread-safe, so only one partition may
+            # write at a time.
+            with _file_lock:
+                g['nc'][ncvar][partition.indices] = array        
     
             partition.close()
+        #--- End: def
+
+        _map_partitions(_write_partition, data.partitions.flat)
 
 
     def _write_dimension_coordinate(self, f, key, coord):
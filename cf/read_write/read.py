@@ -1,12 +1,15 @@
 import os
 
-from glob    import glob
-from os.path import isdir
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing    import get_context as multiprocessing_get_context
+from glob               import glob
+from os.path            import isdir
 
 from . import implementation
 
-from ..fieldlist import FieldList
-from ..functions import flat
+from ..constants      import CONSTANTS
+from ..fieldlist      import FieldList
+from ..functions      import flat
 
 from ..aggregate import aggregate as cf_aggregate
 
@@ -29,7 +32,7 @@ def read(files, external=None, verbose=False, warnings=False,
          squeeze=False, unsqueeze=False, fmt=None, select=None,
          extra=None, recursive=False, followlinks=False, um=None,
          chunk=True, field=None, height_at_top_of_model=None,
-         select_options=None, follow_symlinks=False):
+         select_options=None, follow_symlinks=False, workers=1):
     '''Read field constructs from netCDF, CDL, PP or UM fields files.
 
     NetCDF files may be on disk or on an OPeNDAP server.
@@ -355,6 +358,19 @@ def read(files, external=None, verbose=False, warnings=False,
     
             .. versionadded:: 1.5
     
+        workers: `int`, optional
+            The number of worker processes used to read netCDF, PP
+            and UM fields files concurrently. The field constructs are
+            returned in the same order as when the files are read one
+            after another, which is the default. CDL files are always
+            read by the calling process.
+
+            The worker processes are started afresh rather than
+            forked, so a script which sets *workers* must protect its
+            main code with ``if __name__ == '__main__':``.
+    
+            .. versionadded:: 3.0.7
+    
         umversion: deprecated at version 3.0.0
             Use the *um* parameter instead.
     
@@ -467,68 +483,84 @@ def read(files, external=None, verbose=False, warnings=False,
     field_counter = -1
     file_counter  = 0
 
-    for file_glob in flat(files):
-
-        # Expand variables
-        file_glob = os.path.expanduser(os.path.expandvars(file_glob))
+    # ----------------------------------------------------------------
+    # Find the names of the files to be read, in order
+    # ----------------------------------------------------------------
+    all_files = _expand_files(files, ignore_read_error=ignore_read_error,
+                              recursive=recursive, followlinks=followlinks)
+
+    read_kwargs = {'external'              : external,
+                   'ignore_read_error'     : ignore_read_error,
+                   'verbose'               : verbose,
+                   'warnings'              : warnings,
+                   'aggregate'             : aggregate,
+                   'aggregate_options'     : aggregate_options,
+                   'selected_fmt'          : fmt,
+                   'um'                    : um,
+                   'extra'                 : extra,
+                   'height_at_top_of_model': height_at_top_of_model,
+                   'chunk'                 : chunk,
+                   'select'                : select}
 
-        if file_glob.startswith('http://'):
-            # Do not glob a URL
-            files2 = (file_glob,)
-        else:
-            # Glob files on disk
-            files2 = glob(file_glob)
-            
-            if not files2 and not ignore_read_error:
-                open(file_glob, 'rb')
-                
-            files3 = []
-            for x in files2:
-                if isdir(x):
-                    # Walk through directories, possibly recursively
-                    for path, subdirs, filenames in os.walk(x, followlinks=followlinks):
-                        files3.extend(os.path.join(path, f) for f in filenames)
-                        if not recursive:                            
-                            break
-                else:
-                    files3.append(x)
-            #--- End: for
-            
-            files2 = files3
+    # ----------------------------------------------------------------
+    # Start reading files in worker processes, if requested. The
+    # results are collected below in the original file order.
+    # ----------------------------------------------------------------
+    futures = {}
+    pool    = None
+    if workers > 1 and len(all_files) > 1:
+        # Start the worker processes afresh, since a forked process
+        # would inherit the parent's open files, temporary files and
+        # threads (such as those of a partition thread pool), any of
+        # which could be in an inconsistent state
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing_get_context('spawn'),
+            initializer=_read_process_initializer,
+            initargs=(CONSTANTS.copy(),))
+        for i, filename in enumerate(all_files):
+            if _read_in_process(filename, um):
+                futures[i] = pool.submit(_read_a_file_in_process,
+                                         filename, select, read_kwargs)
+    #--- End: if
 
-        for filename in files2:
+    try:
+        for i, filename in enumerate(all_files):
             if verbose:
                 print('File: {0}'.format(filename)) # pragma: no cover
-                
-            # --------------------------------------------------------
-            # Read the file into fields
-            # --------------------------------------------------------
-            fields = _read_a_file(filename, external=external,
-                                  ignore_read_error=ignore_read_error,
-                                  verbose=verbose, warnings=warnings,
-                                  aggregate=aggregate,
-                                  aggregate_options=aggregate_options,
-                                  selected_fmt=fmt, um=um,
-                                  extra=extra,
-                                  height_at_top_of_model=height_at_top_of_model,
-                                  chunk=chunk)
-            
+
             # --------------------------------------------------------
-            # Select matching fields
+            # Read the file into fields and select matching fields
             # --------------------------------------------------------
-            if select:
-                fields = fields.select(*select)
+            future = futures.get(i)
+            if future is not None:
+                fields, options = future.result()
+
+                # Reading the file may have changed the aggregation
+                # options
+                aggregate_options.update(options)
+            else:
+                fields = _read_a_file(filename, **read_kwargs)
+                if select:
+                    fields = fields.select(*select)
+            #--- End: if
 
             # --------------------------------------------------------
             # Add this file's fields to those already read from other
             # files
             # --------------------------------------------------------
             field_list.extend(fields)
-   
+       
             field_counter = len(field_list)
             file_counter += 1
-        #--- End: for            
-    #--- End: for     
+        #--- End: for
+    finally:
+        if pool is not None:
+            for future in futures.values():
+                future.cancel()
+
+            pool.shutdown()
+    #--- End: try
 
     # Print some informative messages
     if verbose:
@@ -595,6 +627,286 @@ def read(files, external=None, verbose=False, warnings=False,
     return field_list
 
 
+def _read_in_process(filename, um):
+    '''Whether or not a file may be read by a worker process.
+
+    CDL files are not read by worker processes, because they are
+    converted to temporary netCDF files which are deleted when the
+    worker process exits. Files whose type can't be determined are
+    left for the calling process to report.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+    
+        filename: `str`
+            The file name.
+    
+        um: `dict` or `None`
+            See `cf.read` for details.
+    
+    :Returns:
+    
+        `bool`
+
+    '''
+    if um:
+        return True
+
+    try:
+        return file_type(filename) != 'CDL'
+    except Exception:
+        return False
+
+
+def _read_process_initializer(constants):
+    '''Initialise a worker process for reading files.
+
+    A worker process is started afresh, so it is given the parent's
+    settings, such as those of `cf.CHUNKSIZE` and `cf.TEMPDIR`.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        constants: `dict`
+            The parent's settings.
+
+    :Returns:
+
+        `None`
+
+    '''
+    CONSTANTS.update(constants)
+
+
+def _read_a_file_in_process(filename, select, kwargs):
+    '''Read a file into fields in a worker process.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+    
+        filename: `str`
+            The file name.
+
+        select: sequence or `None`
+            See `cf.read` for details.
+
+        kwargs: `dict`
+            Keyword parameters to `_read_a_file`.
+
+    :Returns:
+    
+        `tuple`
+            The selected fields in the file, and the aggregation
+            options as changed by reading the file.
+
+    '''
+    fields = _read_a_file(filename, **kwargs)
+    if select:
+        fields = fields.select(*select)
+
+    return fields, kwargs['aggregate_options']
+
+
+def iread(files, window=1, ignore_read_error=False, recursive=False,
+          followlinks=False, **kwargs):
+    '''Iterate over the field constructs read from netCDF, CDL, PP or UM
+    fields files.
+
+    The files are read in consecutive windows of a given number of
+    files. The field constructs from each window are aggregated and
+    then returned one at a time, before the next window of files is
+    read. Therefore the field constructs from a large number of files
+    may be processed without all of them being in memory at once, and
+    the first field constructs are available as soon as the first
+    window has been read.
+
+    Field constructs are only aggregated with others from the same
+    window, so the output is the same as that of `cf.read` when the
+    window contains all of the files, or when there is nothing to
+    aggregate across windows.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.aggregate`, `cf.read`
+
+    :Parameters:
+
+        files: (arbitrarily nested sequence of) `str`
+            The files to be read, as for `cf.read`.
+
+        window: `int`, optional
+            The number of files from which field constructs are read
+            and aggregated together. By default each file is read and
+            aggregated on its own.
+
+        ignore_read_error: `bool`, optional
+            See `cf.read` for details.
+
+        recursive: `bool`, optional
+            See `cf.read` for details.
+
+        followlinks: `bool`, optional
+            See `cf.read` for details.
+
+        kwargs: optional
+            Any other keyword parameters of `cf.read`, apart from
+            *nfields*, which are applied to each window of files. For
+            example, setting ``aggregate=False`` returns the field
+            constructs without aggregation.
+
+    :Returns:
+
+        generator
+            The field constructs.
+
+    **Examples:**
+
+    >>> for f in cf.iread('file*.nc'):
+    ...     print(f.identity())
+
+    >>> for f in cf.iread('data/', window=12, select='air_temperature'):
+    ...     cf.write(f, f.nc_get_variable() + '.nc')
+
+    '''
+    if 'nfields' in kwargs:
+        raise ValueError(
+            "Can't iterate over files: 'nfields' is not a valid parameter")
+
+    window = int(window)
+    if window < 1:
+        raise ValueError(
+            "Can't iterate over files: 'window' must be a positive integer. Got {!r}".format(
+                window))
+
+    # Return the generator only after the parameters have been
+    # checked, so that bad parameters are reported by this call rather
+    # than by the first iteration
+    return _iread(files, window, ignore_read_error, recursive,
+                  followlinks, kwargs)
+
+
+def _iread(files, window, ignore_read_error, recursive, followlinks,
+           kwargs):
+    '''Iterate over the field constructs read from files.
+
+    .. versionadded:: 3.0.7
+
+    .. seealso:: `cf.iread`
+
+    :Parameters:
+
+        files, window, ignore_read_error, recursive, followlinks:
+            See `cf.iread` for details.
+
+        kwargs: `dict`
+            See `cf.iread` for details.
+
+    :Returns:
+
+        generator
+            The field constructs.
+
+    '''
+    all_files = _expand_files(files, ignore_read_error=ignore_read_error,
+                              recursive=recursive, followlinks=followlinks)
+
+    for i in range(0, len(all_files), window):
+        # Mark the file names, which have already been expanded, so
+        # that cf.read uses them as they are
+        window_files = [_ExpandedFile(filename)
+                        for filename in all_files[i:i+window]]
+
+        for f in read(window_files, ignore_read_error=ignore_read_error,
+                      **kwargs):
+            yield f
+    #--- End: for
+
+
+class _ExpandedFile(str):
+    '''A file name which has already been expanded.
+
+    `_expand_files` returns such a file name unchanged, without
+    expanding variables, a user's home directory, glob patterns or
+    directories, since any of these could change a name which has
+    already been expanded.
+
+    .. versionadded:: 3.0.7
+
+    '''
+    __slots__ = ()
+
+
+def _expand_files(files, ignore_read_error=False, recursive=False,
+                  followlinks=False):
+    '''Expand file names, directories and globs into file names.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        files: (arbitrarily nested sequence of) `str`
+            See `cf.read` for details.
+
+        ignore_read_error: `bool`, optional
+            If False, the default, then an exception is raised if a
+            file name or glob doesn't match any files.
+
+        recursive: `bool`, optional
+            See `cf.read` for details.
+
+        followlinks: `bool`, optional
+            See `cf.read` for details.
+
+    :Returns:
+
+        `list` of `str`
+            The file names, in order.
+
+    '''
+    all_files = []
+    for file_glob in flat(files):
+        if isinstance(file_glob, _ExpandedFile):
+            # Do not expand a file name which has already been
+            # expanded
+            all_files.append(str(file_glob))
+            continue
+
+        # Expand variables
+        file_glob = os.path.expanduser(os.path.expandvars(file_glob))
+
+        if file_glob.startswith('http://'):
+            # Do not glob a URL
+            files2 = (file_glob,)
+        else:
+            # Glob files on disk
+            files2 = glob(file_glob)
+            
+            if not files2 and not ignore_read_error:
+                open(file_glob, 'rb')
+                
+            files3 = []
+            for x in files2:
+                if isdir(x):
+                    # Walk through directories, possibly recursively
+                    for path, subdirs, filenames in os.walk(x, followlinks=followlinks):
+                        files3.extend(os.path.join(path, f) for f in filenames)
+                        if not recursive:                            
+                            break
+                else:
+                    files3.append(x)
+            #--- End: for
+            
+            files2 = files3
+
+        all_files.extend(files2)
+    #--- End: for     
+
+    return all_files
+
+
 def _plural(n): # pragma: no cover
     '''Return a suffix which reflects a word's plural.
 
@@ -606,7 +918,7 @@ def _read_a_file(filename, aggregate=True, aggregate_options=None,
                  ignore_read_error=False, verbose=False,
                  warnings=False, external=None, selected_fmt=None,
                  um=None, extra=None, height_at_top_of_model=None,
-                 chunk=True):
+                 chunk=True, select=None):
     '''Read the contents of a single file into a field list.
 
     :Parameters:
@@ -628,6 +940,14 @@ def _read_a_file(filename, aggregate=True, aggregate_options=None,
         verbose: `bool`, optional
             If True then print information to stdout.
         
+        select: sequence, optional
+            If set then fields which can be determined, before they
+            are created, not to match any of these identities are not
+            created. The fields which are created are not themselves
+            checked. See `cf.read` for details.
+
+            .. versionadded:: 3.0.7
+        
     :Returns:
     
         `FieldList`
@@ -679,6 +999,7 @@ def _read_a_file(filename, aggregate=True, aggregate_options=None,
                        'fmt'              : selected_fmt,
                        'ignore_read_error': ignore_read_error,
                        'cfa'              : False,
+                       'select'           : select,
     }
     
     # ----------------------------------------------------------------
@@ -714,7 +1035,7 @@ def _read_a_file(filename, aggregate=True, aggregate_options=None,
                          verbose=verbose, set_standard_name=True,
                          height_at_top_of_model=height_at_top_of_model,
                          fmt=fmt, word_size=word_size, endian=endian,
-                         chunk=chunk)
+                         chunk=chunk, select=select)
 
         # PP fields are aggregated intrafile prior to interfile
         # aggregation
@@ -10,12 +10,16 @@ from numpy import arange       as numpy_arange
 from numpy import arccos       as numpy_arccos
 from numpy import arcsin       as numpy_arcsin
 from numpy import array        as numpy_array
+from numpy import broadcast_to as numpy_broadcast_to
 from numpy import clip         as numpy_clip
 from numpy import column_stack as numpy_column_stack
+from numpy import concatenate  as numpy_concatenate
 from numpy import cos          as numpy_cos
 from numpy import deg2rad      as numpy_deg2rad
+from numpy import diff         as numpy_diff
 from numpy import dtype        as numpy_dtype
 from numpy import empty        as numpy_empty
+from numpy import flatnonzero  as numpy_flatnonzero
 from numpy import mean         as numpy_mean
 from numpy import pi           as numpy_pi
 from numpy import rad2deg      as numpy_rad2deg
@@ -23,6 +27,7 @@ from numpy import resize       as numpy_resize
 from numpy import result_type  as numpy_result_type
 from numpy import sin          as numpy_sin
 from numpy import transpose    as numpy_transpose
+from numpy import unique       as numpy_unique
 from numpy import where        as numpy_where
 
 from netCDF4 import date2num as netCDF4_date2num
@@ -35,9 +40,11 @@ from ...functions          import RTOL, ATOL, equals
 from ...units              import Units
 from ...functions          import (open_files_threshold_exceeded,
                                    close_one_file, abspath,
-                                   load_stash2standard_name)
+                                   load_stash2standard_name,
+                                   _select_may_match)
 
 from ...data.data import Data, Partition, PartitionMatrix
+from ...data.partitionmatrix import PartitionTable
 
 from ...data              import UMArray
 from ...data.functions    import _open_um_file, _close_um_file
@@ -167,6 +174,13 @@ _coord_standard_name = {
 # --------------------------------------------------------------------
 _coord_long_name = {}
 
+# --------------------------------------------------------------------
+# The field properties which are known before a variable's fields are
+# created, and so may be used to decide whether or not to create them
+# --------------------------------------------------------------------
+_select_determined = ('standard_name', 'long_name', 'um_stash_source',
+                      'stash_code', 'submodel', 'lbproc', 'lbtim')
+
 # --------------------------------------------------------------------
 # Map PP axis codes to UDUNITS strings
 # --------------------------------------------------------------------
@@ -334,13 +348,60 @@ _rotated_latitude_longitude_lbcodes = set((101, 102, 111))
 
 _axis = {'area': None}
 
+# --------------------------------------------------------------------
+# Positions of the validity and data times ([LBYR, LBMON, LBDAT, LBHR,
+# LBMIN, LBYRD, LBMOND, LBDATD, LBHRD, LBMIND]), and of the level
+# items ([LBLEV, LBUSER5] and [BLEV, BRLEV, BHLEV, BHRLEV, BULEV,
+# BHULEV]), in the PP headers
+# --------------------------------------------------------------------
+_time_columns = list(range(lbyr, lbmin+1)) + list(range(lbyrd, lbmind+1))
+_lz_columns   = [lblev, lbuser5]
+_bz_columns   = list(range(blev, bhrlev+1)) + list(range(brsvd1, brsvd2+1))
+
+
+def _date2num(LBTIME, units, calendar):
+    '''Convert a PP header date-time to a reference time value.
+
+    Converted values are cached, so each date-time is converted only
+    once for given units and calendar.
+
+    :Parameters:
+
+        LBTIME: `tuple`
+            The date-time as (year, month, day, hour, minute).
+
+        units: `str`
+            The reference time units.
+
+        calendar: `str`
+            The calendar.
+
+    :Returns:
+
+        `float`
+
+    '''
+    key = (LBTIME, units, calendar)
+    time = _cached_date2num.get(key, None)
+    if time is None:
+        if calendar == 'gregorian':
+            time = netCDF4_date2num(datetime(*LBTIME), units, calendar)
+        else:
+            time = netCDF4_date2num(cftime.datetime(*LBTIME),
+                                    units, calendar)
+
+        _cached_date2num[key] = time
+
+    return time
+
+
 class UMField:
     '''
 
 '''
     def __init__(self, var, fmt, byte_ordering, word_size, um_version,
                  set_standard_name, height_at_top_of_model, verbose,
-                 implementation=None, **kwargs):
+                 implementation=None, select=None, **kwargs):
         '''**Initialization**
 
     :Parameters:
@@ -399,14 +460,20 @@ class UMField:
             # There is one group of records
             groups_nz = [var.nz]
             groups_nt = [var.nt]
+            groups_int_hdrs  = [var.int_hdrs]
+            groups_real_hdrs = [var.real_hdrs]
         elif n_groups > 1:
             # There are multiple groups of records, distinguished by
             # different extra data.
             groups_nz = []
             groups_nt = []
+            groups_int_hdrs  = []
+            groups_real_hdrs = []
             groups2 = []
             for group in groups:
                 group_size = len(group)
+                int_hdrs  = numpy_array([rec.int_hdr for rec in group])
+                real_hdrs = numpy_array([rec.real_hdr for rec in group])
                 if group_size == 1:
                     # There is only one record in this group
                     split_group= False
@@ -414,21 +481,21 @@ class UMField:
                 elif group_size > 1:
                     # There are multiple records in this group
                     # Find the lengths of runs of identical times
-                    times   = [(self.header_vtime(rec), self.header_dtime(rec))
-                               for rec in group]
-                    lengths = [len(tuple(g)) for k, g in itertools.groupby(times)]
-                    if len(set(lengths)) == 1: 
+                    times = int_hdrs[:, _time_columns]
+                    starts = numpy_flatnonzero(
+                        (times[1:] != times[:-1]).any(axis=1)) + 1
+                    lengths = set(numpy_diff(
+                        numpy_concatenate(([0], starts, [group_size]))).tolist())
+                    if len(lengths) == 1: 
                         # Each run of identical times has the same
                         # length, so it is possible that this group
                         # forms a variable of nz x nt records. 
-                        split_group = False
                         nz = lengths.pop()
-                        z0 = [self.z for rec in group[:nz]]
-                        for i in range(nz, group_size, nz):
-                            z1 = [self.header_z(rec) for rec in group[i:i+nz]]
-                            if z1 != z0:
-                                split_group = True
-                                break
+                        z = numpy_column_stack(
+                            (int_hdrs[:, _lz_columns],
+                             real_hdrs[:, _bz_columns])).reshape(
+                                 group_size//nz, nz, -1)
+                        split_group = not (z == z[:1]).all()
                     else:  
                         # Different runs of identical times have
                         # different lengths, so it is not possible for
@@ -444,13 +511,19 @@ class UMField:
                     groups2.extend([[rec] for rec in group])
                     groups_nz.extend([1] * group_size)
                     groups_nt.extend([1] * group_size)
+                    groups_int_hdrs.extend(int_hdrs[i:i+1]
+                                           for i in range(group_size))
+                    groups_real_hdrs.extend(real_hdrs[i:i+1]
+                                            for i in range(group_size))
                 else:
                     # This group forms a complete nz x nt matrix, so
                     # it may be considered as a variable in its own
                     # right and doesn't need to be split up.
                     groups2.append(group)
                     groups_nz.append(nz)
-                    groups_nt.append(group_size/nz)
+                    groups_nt.append(group_size//nz)
+                    groups_int_hdrs.append(int_hdrs)
+                    groups_real_hdrs.append(real_hdrs)
             #--- End: for
             groups = groups2
         #--- End: if
@@ -638,13 +711,39 @@ class UMField:
             
         if long_name is None:
             cf_properties['long_name'] = identity
+
+        if select:
+            # Don't create any fields if none of them could match the
+            # selection identities
+            properties = cf_properties.copy()
+            properties.update({'stash_code': str(stash),
+                               'submodel'  : str(submodel),
+                               'lbproc'    : str(LBPROC),
+                               'lbtim'     : str(LBTIM)})
+            if not _select_may_match(select, properties,
+                                     ncvar=identity, identity=identity,
+                                     determined=_select_determined):
+                return
+        #--- End: if
                 
-        for recs, nz, nt in zip(groups, groups_nz, groups_nt):
+        for recs, nz, nt, int_hdrs, real_hdrs in zip(groups,
+                                                     groups_nz,
+                                                     groups_nt,
+                                                     groups_int_hdrs,
+                                                     groups_real_hdrs):
             self.recs = recs
             self.nz = nz
             self.nt = nt
             self.z_recs = recs[:nz]
             self.t_recs = recs[::nz]
+
+            # The headers of the records as 2-d arrays, with one row
+            # per record
+            self.int_hdrs    = int_hdrs
+            self.real_hdrs   = real_hdrs
+            self.z_int_hdrs  = int_hdrs[:nz]
+            self.z_real_hdrs = real_hdrs[:nz]
+            self.t_int_hdrs  = int_hdrs[::nz]
                
             LBUSER5 = recs[0].int_hdr.item(lbuser5,)
 
@@ -932,12 +1031,9 @@ class UMField:
         field = self.field
 
         # "a" domain ancillary
-        array = numpy_array([rec.real_hdr[blev] for rec in self.z_recs],  # Zsea
-                            dtype=float)
-        bounds0 = numpy_array([rec.real_hdr[brlev] for rec in self.z_recs], #Zsea lower
-                              dtype=float)
-        bounds1 = numpy_array([rec.real_hdr[brsvd1] for rec in self.z_recs], #Zsea upper
-                              dtype=float)
+        array = self.z_real_hdrs[:, blev].astype(float)  # Zsea
+        bounds0 = self.z_real_hdrs[:, brlev].astype(float)  #Zsea lower
+        bounds1 = self.z_real_hdrs[:, brsvd1].astype(float)  #Zsea upper
         bounds = numpy_column_stack((bounds0, bounds1))
 
         # Insert new Z axis
@@ -968,12 +1064,9 @@ class UMField:
             self.implementation.set_dimension_coordinate(field, dc, axes=[_axis['z']], copy=False)
 
         # "b" domain ancillary
-        array = numpy_array([rec.real_hdr[bhlev] for rec in self.z_recs],
-                            dtype=float)
-        bounds0 = numpy_array([rec.real_hdr[bhrlev] for rec in self.z_recs],
-                              dtype=float)
-        bounds1 = numpy_array([rec.real_hdr[brsvd2] for rec in self.z_recs],
-                              dtype=float)
+        array = self.z_real_hdrs[:, bhlev].astype(float)
+        bounds0 = self.z_real_hdrs[:, bhrlev].astype(float)
+        bounds1 = self.z_real_hdrs[:, brsvd2].astype(float)
         bounds = numpy_column_stack((bounds0, bounds1))
 
         ac = self.implementation.initialise_DomainAncillary()
@@ -1011,12 +1104,9 @@ class UMField:
 
         field = self.field
 
-        array = numpy_array([rec.real_hdr[blev] for rec in self.z_recs],
-                            dtype=float)
-        bounds0 = numpy_array([rec.real_hdr[brlev] for rec in self.z_recs],
-                              dtype=float)
-        bounds1 = numpy_array([rec.real_hdr[brsvd1] for rec in self.z_recs],
-                              dtype=float)
+        array = self.z_real_hdrs[:, blev].astype(float)
+        bounds0 = self.z_real_hdrs[:, brlev].astype(float)
+        bounds1 = self.z_real_hdrs[:, brsvd1].astype(float)
         bounds = numpy_column_stack((bounds0, bounds1))
 
         # Create Z domain axis construct
@@ -1033,12 +1123,9 @@ class UMField:
         self.implementation.set_auxiliary_coordinate(self.field, ac,
                                                      axes=[_axis['z']], copy=False)        
 
-        array = numpy_array([rec.real_hdr[bhlev] for rec in self.z_recs],
-                            dtype=float)
-        bounds0 = numpy_array([rec.real_hdr[bhrlev] for rec in self.z_recs],
-                              dtype=float)
-        bounds1 = numpy_array([rec.real_hdr[brsvd2] for rec in self.z_recs],
-                              dtype=float)
+        array = self.z_real_hdrs[:, bhlev].astype(float)
+        bounds0 = self.z_real_hdrs[:, bhrlev].astype(float)
+        bounds1 = self.z_real_hdrs[:, brsvd2].astype(float)
         bounds = numpy_column_stack((bounds0, bounds1))
 
         #ac = AuxiliaryCoordinate()
@@ -1080,31 +1167,21 @@ class UMField:
         `DimensionCoordinate`
 
         '''
-        array     = []
-        bounds    = []
-        ak_array  = []
-        ak_bounds = []
-        bk_array  = []
-        bk_bounds = []
-
-        for rec in self.z_recs:
-            BLEV, BRLEV, BHLEV, BHRLEV, BULEV, BHULEV = self.header_bz(rec)
-
-            array.append(BLEV + BHLEV/_pstar)
-            bounds.append([BRLEV + BHRLEV/_pstar, BULEV + BHULEV/_pstar])
-            
-            ak_array.append(BHLEV)
-            ak_bounds.append((BHRLEV, BHULEV))
-            
-            bk_array.append(BLEV)
-            bk_bounds.append((BRLEV , BULEV))
-   
-        array     = numpy_array(array    , dtype=float)
-        bounds    = numpy_array(bounds   , dtype=float)
-        ak_array  = numpy_array(ak_array , dtype=float)
-        ak_bounds = numpy_array(ak_bounds, dtype=float)
-        bk_array  = numpy_array(bk_array , dtype=float)
-        bk_bounds = numpy_array(bk_bounds, dtype=float)
+        z_real_hdrs = self.z_real_hdrs.astype(float)
+        BLEV   = z_real_hdrs[:, blev]
+        BRLEV  = z_real_hdrs[:, brlev]
+        BHLEV  = z_real_hdrs[:, bhlev]
+        BHRLEV = z_real_hdrs[:, bhrlev]
+        BULEV  = z_real_hdrs[:, brsvd1]
+        BHULEV = z_real_hdrs[:, brsvd2]
+
+        array     = BLEV + BHLEV/_pstar
+        bounds    = numpy_column_stack((BRLEV + BHRLEV/_pstar,
+                                        BULEV + BHULEV/_pstar))
+        ak_array  = BHLEV
+        ak_bounds = numpy_column_stack((BHRLEV, BHULEV))
+        bk_array  = BLEV
+        bk_bounds = numpy_column_stack((BRLEV, BULEV))
         
         # Insert new Z axis
         da = self.implementation.initialise_DomainAxis(size=array.size)
@@ -1450,7 +1527,7 @@ class UMField:
     >>> u.header_z(rec)
 
         '''
-        return self.header_lz + self.header_bz
+        return self.header_lz(rec) + self.header_bz(rec)
 
 
     def create_data(self):
@@ -1476,12 +1553,16 @@ class UMField:
 
         units = self.um_Units
 
-        data_type_in_file = self.data_type_in_file
-
-        filename = self.filename
+        filename      = self.filename
+        fmt           = self.fmt
+        word_size     = self.word_size
+        byte_ordering = self.byte_ordering
 
         data_axes = [_axis['y'], _axis['x']]
 
+        # Find the data types of the arrays in the file
+        file_data_types = self.data_types_in_file()
+
         if len(recs) == 1:
             # --------------------------------------------------------
             # 0-d partition matrix
@@ -1491,13 +1572,13 @@ class UMField:
                                 ndim=2,
                                 shape=yx_shape,
                                 size=yx_size,
-                                dtype=data_type_in_file(rec),
+                                dtype=file_data_types[0],
                                 header_offset=rec.hdr_offset,
                                 data_offset=rec.data_offset,
                                 disk_length=rec.disk_length,
-                                fmt=self.fmt,
-                                word_size=self.word_size,
-                                byte_ordering=self.byte_ordering),
+                                fmt=fmt,
+                                word_size=word_size,
+                                byte_ordering=byte_ordering),
                         units=units,
                         fill_value=rec.real_hdr[bmdi])
 
@@ -1507,19 +1588,14 @@ class UMField:
             # --------------------------------------------------------
             # 1-d or 2-d partition matrix
             # --------------------------------------------------------
-            file_data_types = set()
-            word_sizes = set()
-
             # Find the partition matrix shape
             pmshape = [n for n in (nt, nz) if n > 1]
             pmndim  = len(pmshape)
                       
-            partitions = []
             empty_list = []
-            partitions_append = partitions.append
 
-            zero_to_LBROW = (0, LBROW)
-            zero_to_LBNPT = (0, LBNPT)
+            nrecs = len(recs)
+            index = numpy_arange(nrecs)
 
             if pmndim == 1:
                 # ----------------------------------------------------
@@ -1537,40 +1613,8 @@ class UMField:
 
                 partition_shape = [1, LBROW, LBNPT]
 
-                for i, rec  in enumerate(recs):
-                    # Find the data type of the array in the file
-                    file_data_type = data_type_in_file(rec)
-                    file_data_types.add(file_data_type)
-
-                    subarray = UMArray(filename=filename, 
-                                       ndim=2,
-                                       shape=yx_shape,
-                                       size=yx_size,
-                                       dtype=file_data_type,
-                                       header_offset=rec.hdr_offset,
-                                       data_offset=rec.data_offset,
-                                       disk_length=rec.disk_length,
-                                       fmt=self.fmt,
-                                       word_size=self.word_size,
-                                       byte_ordering=self.byte_ordering)
-
-                    location = [(i, i+1), zero_to_LBROW, zero_to_LBNPT]
-
-                    partitions_append(Partition(
-                        subarray = subarray,
-                        location = location,
-                        shape    = partition_shape,
-                        axes     = data_axes,
-                        flip     = empty_list,
-                        part     = empty_list,
-                        Units    = units)) 
-
-                    if self.verbose:
-                        print('    header_offset =', rec.hdr_offset, 'location =',location,'subarray[...].max() =', subarray[...].max()) # pragma: no cover
-                #--- End: for
-
-                # Populate the 1-d partition matrix
-                matrix = numpy_array(partitions, dtype=object)
+                locations = numpy_empty((nrecs, data_ndim, 2), dtype=int)
+                locations[:, 0, 0] = index
             else:
                 # ----------------------------------------------------
                 # 2-d partition matrix
@@ -1582,45 +1626,56 @@ class UMField:
 
                 partition_shape = [1, 1, LBROW, LBNPT]
 
-                for i, rec  in enumerate(recs):
-                    # Find T and Z axis indices
-                    t, z = divmod(i, nz)
-                 
-                    # Find the data type of the array in the file
-                    file_data_type = data_type_in_file(rec)
-                    file_data_types.add(file_data_type)
-
-                    subarray = UMArray(filename=filename,  
-                                       ndim=2,
-                                       shape=yx_shape,
-                                       size=yx_size,
-                                       dtype=file_data_type,
-                                       header_offset=rec.hdr_offset,
-                                       data_offset=rec.data_offset,
-                                       disk_length=rec.disk_length,
-                                       fmt=self.fmt,
-                                       word_size=self.word_size,
-                                       byte_ordering=self.byte_ordering)
-
-                    location = [(t, t+1), (z, z+1), zero_to_LBROW, zero_to_LBNPT]
-
-                    partitions_append(Partition(
-                        subarray=subarray,
-                        location=location,
-                        shape=partition_shape,
-                        axes=data_axes,
-                        flip=empty_list,
-                        part=empty_list,
-                        Units=units))
-
-                    if self.verbose:
-                        print('    location =',location,'subarray[...].max() =', subarray[...].max()) # pragma: no cover
-                #--- End: for
-
-                # Populate the 2-d partition matrix
-                matrix = numpy_array(partitions, dtype=object)
-                matrix.resize(pmshape)                
+                # The T and Z axis indices of each record
+                locations = numpy_empty((nrecs, data_ndim, 2), dtype=int)
+                locations[:, 0, 0] = index // nz
+                locations[:, 1, 0] = index % nz
             #--- End: if
+
+            locations[:, :-2, 1] = locations[:, :-2, 0] + 1
+            locations[:, -2] = (0, LBROW)
+            locations[:, -1] = (0, LBNPT)
+
+            # The data types of the records, as codes into the
+            # distinct data types
+            dtype_codes = {}
+            codes = [dtype_codes.setdefault(file_data_type, len(dtype_codes))
+                     for file_data_type in file_data_types]
+
+            # Store the per-record quantities in a partition table,
+            # from which each partition is only created when it is
+            # needed
+            table = PartitionTable(
+                UMArray,
+                locations,
+                shapes=numpy_broadcast_to(partition_shape,
+                                          (nrecs, data_ndim)),
+                columns={
+                    'header_offset': numpy_array(
+                        [rec.hdr_offset for rec in recs]),
+                    'data_offset': numpy_array(
+                        [rec.data_offset for rec in recs]),
+                    'disk_length': numpy_array(
+                        [rec.disk_length for rec in recs])},
+                categories={'dtype': (numpy_array(codes),
+                                      list(dtype_codes))},
+                subarray_kwargs={'filename': filename,
+                                 'ndim': 2,
+                                 'shape': yx_shape,
+                                 'size': yx_size,
+                                 'fmt': fmt,
+                                 'word_size': word_size,
+                                 'byte_ordering': byte_ordering},
+                axes=data_axes,
+                flip=empty_list,
+                part=empty_list,
+                Units=units)
+
+            partitions = PartitionMatrix.from_table(table, pmshape, pmaxes)
+
+            if self.verbose:
+                for rec, partition in zip(recs, partitions.flat): # pragma: no cover
+                    print('    header_offset =', rec.hdr_offset, 'location =', partition.location, 'subarray[...].max() =', partition.subarray[...].max()) # pragma: no cover
                        
             data_axes = pmaxes + data_axes
 
@@ -1631,8 +1686,8 @@ class UMField:
             data._shape     = data_shape 
             data._ndim      = data_ndim
             data._size      = data_size
-            data.partitions = PartitionMatrix(matrix, pmaxes)
-            data.dtype      = numpy_result_type(*file_data_types)
+            data.partitions = partitions
+            data.dtype      = numpy_result_type(*set(file_data_types))
         #--- End: if
 
         self.data      = data
@@ -1641,6 +1696,44 @@ class UMField:
         return data
 
 
+    def date2num(self, times):
+        '''Convert the date-times of many records to reference time values.
+
+    Each distinct date-time is converted only once.
+
+    .. versionadded:: 3.0.7
+
+    :Parameters:
+
+        times: `numpy.ndarray`
+            The date-times as a 2-d array with one row of [year,
+            month, day, hour, minute] per record, e.g. columns LBYR to
+            LBMIN of the integer headers.
+
+    :Returns:
+
+        `numpy.ndarray`
+            The 1-d array of reference time values.
+
+    **Examples:**
+
+    >>> u.date2num(u.t_int_hdrs[:, lbyr:lbmin+1])
+    array([  0., 360., 720.])
+
+        '''
+        units    = self.refunits
+        calendar = self.calendar
+
+        unique_times, inverse = numpy_unique(times, axis=0,
+                                             return_inverse=True)
+
+        values = numpy_array([_date2num(tuple(LBTIME), units, calendar)
+                              for LBTIME in unique_times.tolist()],
+                             dtype=float)
+
+        return values[inverse.reshape(-1)]
+
+
     def decode_lbexp(self):
         '''Decode the integer value of LBEXP in the PP header into a runid.
     
@@ -1700,26 +1793,9 @@ class UMField:
         '''TODO
 
         '''
-        reftime = self.refUnits
-        units    = self.refunits
-        calendar = self.calendar
-
-        LBDTIME = tuple(self.header_dtime(rec))
-
-        key = (LBDTIME, units, calendar)
-        time = _cached_date2num.get(key, None)
-        if time is None:
-            # It is important to use the same time_units as vtime
-            if self.calendar == 'gregorian':
-                time = netCDF4_date2num(
-                    datetime(*LBDTIME), units, calendar)
-            else:
-                time = netCDF4_date2num(
-                    cftime.datetime(*LBDTIME), units, calendar)
-                
-            _cached_date2num[key] = time
-
-        return time
+        # It is important to use the same time_units as vtime
+        return _date2num(tuple(self.header_dtime(rec).tolist()),
+                         self.refunits, self.calendar)
 
 
     def fdr(self):
@@ -1861,7 +1937,7 @@ class UMField:
         out : `AuxiliaryCoordinate` or `DimensionCoordinate` or `None`
     
     ''' 
-        array = tuple([rec.int_hdr.item(lblev,) for rec in self.z_recs])
+        array = tuple(self.z_int_hdrs[:, lblev].tolist())
 
         key = array
         c = _cached_model_level_number_coordinate.get(key, None)
@@ -1908,6 +1984,32 @@ class UMField:
         return c
 
 
+    def data_types_in_file(self):
+        '''Return the data types of the data arrays of all of the records.
+
+    The data type is found once for each distinct combination of the
+    header items which determine it.
+
+    .. versionadded:: 3.0.7
+
+    :Returns:
+    
+        `list` of `numpy.dtype`
+            The data type of each record, in the same order as the
+            records.
+
+        '''
+        recs = self.recs
+
+        _, index, inverse = numpy_unique(self.int_hdrs[:, [lbuser1, lbuser2]],
+                                         axis=0, return_index=True,
+                                         return_inverse=True)
+
+        data_types = [self.data_type_in_file(recs[i]) for i in index.tolist()]
+
+        return [data_types[i] for i in inverse.reshape(-1).tolist()]
+
+
     def data_type_in_file(self, rec):
         '''Return the data type of the data array.
 
@@ -1962,9 +2064,7 @@ class UMField:
             array = numpy_array((LBUSER5,), dtype=self.int_hdr_dtype)
         else:
             # 'Z' aggregation has been done along the pseudolevel axis
-            array = numpy_array([rec.int_hdr.item(lbuser5,)
-                                 for rec in self.z_recs],
-                                dtype=self.int_hdr_dtype)
+            array = self.z_int_hdrs[:, lbuser5].astype(self.int_hdr_dtype)
             self.z_axis = 'p'
         
         axiscode = 40
@@ -2179,9 +2279,9 @@ class UMField:
         `DimensionCoordinate`
 
         '''
-        recs = self.t_recs
-        vtimes = numpy_array([self.vtime(rec) for rec in recs], dtype=float)
-        dtimes = numpy_array([self.dtime(rec) for rec in recs], dtype=float)
+        t_int_hdrs = self.t_int_hdrs
+        vtimes = self.date2num(t_int_hdrs[:, lbyr:lbmin+1])
+        dtimes = self.date2num(t_int_hdrs[:, lbyrd:lbmind+1])
         
         IB = self.lbtim_ib
 
@@ -2192,7 +2292,7 @@ class UMField:
         elif IB == 3:
             # The field is a time mean from T1 to T2 for each year
             # from LBYR to LBYRD
-            ctimes = numpy_array([self.ctime(rec) for rec in recs])
+            ctimes = numpy_array([self.ctime(rec) for rec in self.t_recs])
             array  = 0.5*(vtimes + ctimes)
             bounds = numpy_column_stack((vtimes, dtimes))
             climatology = True                    
@@ -2284,26 +2384,9 @@ class UMField:
         out: `float`
 
         '''
-        reftime  = self.refUnits
-        units    = self.refunits
-        calendar = self.calendar
-
-        LBVTIME = tuple(self.header_vtime(rec))
-
-        key = (LBVTIME, units, calendar)
-        time = _cached_date2num.get(key, None)
-        if time is None:
-            # It is important to use the same time_units as dtime
-            if self.calendar == 'gregorian':
-                time = netCDF4_date2num(
-                    datetime(*LBVTIME), units, calendar)
-            else:                
-                time = netCDF4_date2num(cftime.datetime(*LBVTIME),
-                                        units, calendar)
-                
-            _cached_date2num[key] = time
-
-        return time
+        # It is important to use the same time_units as dtime
+        return _date2num(tuple(self.header_vtime(rec).tolist()),
+                         self.refunits, self.calendar)
 
 
     def dddd(self):
@@ -2545,10 +2628,10 @@ class UMField:
         if self.verbose:
             print('Creating Z coordinates and bounds from BLEV, BRLEV and BRSVD1:') # pragma: no cover
 
-        z_recs = self.z_recs
-        array   = tuple([rec.real_hdr.item(blev,) for rec in z_recs])        
-        bounds0 = tuple([rec.real_hdr[brlev]      for rec in z_recs]) # lower level boundary
-        bounds1 = tuple([rec.real_hdr[brsvd1]     for rec in z_recs]) # bulev
+        z_real_hdrs = self.z_real_hdrs
+        array   = z_real_hdrs[:, blev]
+        bounds0 = z_real_hdrs[:, brlev]  # lower level boundary
+        bounds1 = z_real_hdrs[:, brsvd1] # bulev
         if _coord_positive.get(axiscode, None) == 'down':
             bounds0, bounds1 = bounds1, bounds0
         
@@ -2597,8 +2680,7 @@ class UMField:
         if self.verbose:
             print('Creating Z reference coordinates from BRLEV') # pragma: no cover
 
-        array = numpy_array([rec.real_hdr.item(brlev,) for rec in self.z_recs],
-                            dtype=float)
+        array = self.z_real_hdrs[:, brlev].astype(float)
 
         LBVC = self.lbvc
 
@@ -2792,7 +2874,7 @@ class UMRead(cfdm.read_write.IORead):
     def read(self, filename, um_version=405, 
              aggregate=True, endian=None, word_size=None,
              set_standard_name=True, height_at_top_of_model=None,
-             fmt=None, chunk=True, verbose=False):    
+             fmt=None, chunk=True, verbose=False, select=None):    
         '''Read fields from a PP file or UM fields file.
  
        
@@ -2819,6 +2901,14 @@ The file may be big or little endian, 32 or 64 bit
 
     set_standard_name: `bool`, optional
 
+    select: sequence, optional
+        Only create fields from variables which could match at least
+        one of the given identities, as accepted by the *select*
+        parameter of `cf.read`. The fields created are not themselves
+        checked.
+
+        .. versionadded:: 3.0.7
+
 :Returns:
 
     `list`
@@ -2853,7 +2943,8 @@ The file may be big or little endian, 32 or 64 bit
                       um_version, set_standard_name, history=history,
                       height_at_top_of_model=height_at_top_of_model,
                       verbose=verbose,
-                      implementation=self.implementation)
+                      implementation=self.implementation,
+                      select=select)
               for var in f.vars]
 
         return [field for x in um for field in x.fields if field]
@@ -310,6 +310,78 @@ class DataTest(unittest.TestCase):
         cf.CHUNKSIZE(self.original_chunksize)
 
         
+    def test_Data_copy(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)
+            a = numpy.arange(3000).reshape(50, 60)
+            d = cf.Data(a, 'm')
+
+            # Changing a copy does not change the original
+            e = d.copy()
+            f = d.copy()
+            e[0, 0] = -1
+            self.assertTrue(e[0, 0].array == -1)
+            self.assertTrue((d.array == a).all())
+            self.assertTrue((f.array == a).all())
+
+            # Changing the original does not change a copy
+            e = d.copy()
+            d[1, 1] = -2
+            self.assertTrue(d[1, 1].array == -2)
+            self.assertTrue((e.array == a).all())
+            self.assertTrue((f.array == a).all())
+
+            # Reading the partition matrix of a copy does not copy it
+            d = cf.Data(a, 'm')
+            partitions = d.partitions
+            e = d.copy()
+            e._pmshape
+            self.assertTrue(e._shared_partitions is partitions)
+
+            # Deleting a copy stops it sharing the partition matrix
+            del e
+            self.assertTrue(d.partitions is partitions)
+        #--- End: for
+        
+        cf.CHUNKSIZE(self.original_chunksize)
+        
+        
+    def test_Data_concatenate(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)
+            a = numpy.arange(3000).reshape(50, 60)
+            b = numpy.ma.masked_less(a, 100)
+
+            # Many data arrays along each axis, including repeated and
+            # flipped inputs
+            for axis in (0, 1, -1):
+                d = cf.Data(a, 'm')
+                e = cf.Data(b, 'km')
+                f = d.flip(axis)
+                data = [d, e, f, d, e, d]
+                x = cf.Data.concatenate(data, axis=axis)
+
+                arrays = [a, b * 1000, numpy.flip(a, axis), a, b * 1000, a]
+                y = numpy.ma.concatenate(arrays, axis=axis)
+                self.assertTrue(x.shape == y.shape)
+                self.assertTrue((x.array == y).all())
+                self.assertTrue((x.mask.array == numpy.ma.getmaskarray(y)).all())
+
+                # The inputs are preserved
+                self.assertTrue((d.array == a).all())
+                self.assertTrue((e.array == b).all())
+            #--- End: for
+        #--- End: for
+        
+        cf.CHUNKSIZE(self.original_chunksize)
+        
+        
     def test_Data_CachedArray(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
@@ -340,11 +412,120 @@ class DataTest(unittest.TestCase):
             for partition in d.partitions.flat:
                 self.assertTrue(partition.in_cached_file)
         #--- End: for
+
+        # Masked arrays, with and without memory mapping
+        for mmap in (True, False):
+            original_mmap = cf.CACHED_ARRAY_MMAP(mmap)
+            for chunksize in self.chunk_sizes:   
+                cf.CHUNKSIZE(chunksize)
+
+                cf.FREE_MEMORY_FACTOR(1 - factor)
+                d = cf.Data(self.ma)
+                cf.FREE_MEMORY_FACTOR(factor)
+
+                self.assertTrue((d.array == self.ma).all())
+                self.assertTrue((d.mask.array == self.ma.mask).all())
+                self.assertTrue(
+                    (d[1:2, ::2, 3].array == self.ma[1:2, ::2, 3:4]).all())
+                self.assertTrue(
+                    (d[1:2, ::2, 3].mask.array == self.ma.mask[1:2, ::2, 3:4]).all())
+            #--- End: for
+            cf.CACHED_ARRAY_MMAP(original_mmap)
+        #--- End: for
         
         cf.CHUNKSIZE(self.original_chunksize)
         cf.FREE_MEMORY_FACTOR(original_FMF)
 
     
+    def test_Data_PARTITION_WORKERS(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        original = cf.PARTITION_WORKERS()
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)
+            results = []
+            for workers in (1, 4):
+                cf.PARTITION_WORKERS(workers)
+                d = cf.Data(self.ma, 'K')
+                e = cf.Data(self.a, 'K')
+                f = (d - e[0]) * 2
+                f += d
+                f = abs(-f)
+                f = f.func(numpy.sqrt)
+                results.append(f)
+            #--- End: for
+            
+            self.assertTrue(results[0].equals(results[1], verbose=True))
+        #--- End: for
+
+        with self.assertRaises(ValueError):
+            cf.PARTITION_WORKERS(0)
+            
+        cf.PARTITION_WORKERS(original)
+        cf.CHUNKSIZE(self.original_chunksize)
+        
+        
+    def test_Data_LAZY_OPERATIONS(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        original = cf.LAZY_OPERATIONS()
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)
+            results = []
+            for lazy in (False, True):
+                cf.LAZY_OPERATIONS(lazy)
+                d = cf.Data(self.ma, 'degC')
+                e = (d - 273.15) * 2
+                e = abs(-e)
+                e.Units = 'K'
+                e += 1
+                e = 3 / e
+                e = e.func(numpy.sqrt)
+                results.append((d.copy(), e, e.max()))
+            #--- End: for
+
+            for x, y in zip(*results):
+                self.assertTrue(x.equals(y, verbose=True))
+        #--- End: for
+
+        cf.LAZY_OPERATIONS(original)
+        cf.CHUNKSIZE(self.original_chunksize)
+        
+        
+    def test_Data_COLLAPSE_PROCESSES(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        original = cf.COLLAPSE_PROCESSES()
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)
+            results = []
+            for processes in (1, 2):
+                cf.COLLAPSE_PROCESSES(processes)
+                d = cf.Data(self.ma, 'K')
+                d.to_disk()
+                results.append([d.sum(axes=[1, 3]),
+                                d.max(axes=0),
+                                d.mean(),
+                                d.var(axes=[0, 2])])
+            #--- End: for
+
+            for x, y in zip(*results):
+                self.assertTrue(x.equals(y, verbose=True))
+        #--- End: for
+
+        with self.assertRaises(ValueError):
+            cf.COLLAPSE_PROCESSES(0)
+            
+        cf.COLLAPSE_PROCESSES(original)
+        cf.CHUNKSIZE(self.original_chunksize)
+        
+        
     def test_Data_AUXILIARY_MASK(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
@@ -551,8 +732,84 @@ class DataTest(unittest.TestCase):
     def test_Data___getitem__(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
+
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize) 
+            a = numpy.arange(3000).reshape(50, 60)
+            d = cf.Data(a, 'm')
+            for indices in ((34, 23),
+                            (slice(40, 50), slice(58, 60)),
+                            (slice(3, 47, 7), slice(None)),
+                            ([1, 2, 25, 49], slice(59, 0, -4)),
+                            (slice(None), [0, 31, 59])):
+                e = d[indices]
+                self.assertTrue((e.array == a[indices]).all(),
+                                'chunksize={}, indices={}'.format(
+                                    chunksize, indices))
+        #--- End: for
         
-    def test_Data___setitem__(self):        
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
+    def test_Data_partition_table(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        n = 40
+        a = numpy.repeat(numpy.arange(n, dtype=float).reshape(n, 1), 5,
+                         axis=1)
+
+        locations = numpy.empty((n, 2, 2), dtype=int)
+        locations[:, 0, 0] = numpy.arange(n)
+        locations[:, 0, 1] = numpy.arange(1, n + 1)
+        locations[:, 1] = (0, 5)
+
+        def _data():
+            table = cf.data.partitionmatrix.PartitionTable(
+                numpy.full, locations,
+                columns={'fill_value': numpy.arange(n, dtype=float)},
+                subarray_kwargs={'shape': (5,)},
+                axes=['dim1'], flip=[], part=[], Units=cf.Units('m'))
+
+            d = cf.Data(units='m')
+            d._axes  = ['dim0', 'dim1']
+            d._shape = (n, 5)
+            d._ndim  = 2
+            d._size  = n * 5
+            d.partitions = cf.data.partitionmatrix.PartitionMatrix.from_table(
+                table, (n,), ['dim0'])
+            d.dtype = float
+            return d
+        #--- End: def
+
+        d = _data()
+        partitions = d.partitions
+        self.assertEqual(partitions.shape, (n,))
+
+        # Subspacing only creates the selected partitions
+        e = d[3:5]
+        self.assertTrue((e.array == a[3:5]).all())
+        self.assertEqual(sum(p is not None for p in partitions._matrix), 2)
+
+        # Copying doesn't create any partitions
+        e = d.copy()
+        self.assertEqual(sum(p is not None for p in partitions._matrix), 2)
+        self.assertTrue((e.array == a).all())
+        self.assertTrue((d.array == a).all())
+        self.assertTrue(all(p is not None for p in partitions.matrix.flat))
+
+        for chunksize in self.chunk_sizes:
+            cf.CHUNKSIZE(chunksize)
+            d = _data()
+            self.assertTrue((d[[0, 7, 39], 1:3].array ==
+                             a[[0, 7, 39], 1:3]).all())
+            self.assertTrue((d.sum(axes=0).array == a.sum(axis=0)).all())
+        #--- End: for
+
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
+    def test_Data___setitem__(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
 
@@ -1775,6 +2032,69 @@ class DataTest(unittest.TestCase):
         cf.CHUNKSIZE(self.original_chunksize)
 
 
+    def test_Data_percentile_accuracy(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        ranks = [0, 10, 33.3, 50, 90, 100]
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)          
+
+            d = cf.Data(self.ma)
+            for axes in self.axes_combinations:
+                b = reshape_array(self.ma, axes)
+                b = numpy.ma.filled(b, numpy.nan)
+                for interpolation in ('linear', 'lower', 'higher',
+                                      'nearest', 'midpoint'):
+                    with numpy.testing.suppress_warnings() as sup:
+                        sup.filter(RuntimeWarning, message='.*All-NaN slice encountered')
+                        p = numpy.nanpercentile(b, ranks, axis=-1,
+                                                interpolation=interpolation)
+
+                    p = numpy.ma.masked_where(numpy.isnan(p), p, copy=False)
+
+                    for accuracy, rtol in ((0, 1e-12), (0.001, 0.001)):
+                        e = d.percentile(ranks, axes=axes, squeeze=True,
+                                         interpolation=interpolation,
+                                         accuracy=accuracy)
+                        self.assertTrue(
+                            (e.mask.array == numpy.ma.getmaskarray(p)).all())
+                        self.assertTrue(
+                            e.allclose(p, rtol=rtol, atol=rtol),
+                            "percentile, axis={}, {}, accuracy={} \ne={}, \np={}".format(
+                                axes, interpolation, accuracy, e.array, p))
+        #--- End: for
+
+        # The percentiles have the data type that they would have had
+        # if they had been found in memory
+        a = numpy.arange(120).reshape(4, 30)
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize)          
+            d = cf.Data(a)
+            for interpolation in ('linear', 'lower'):
+                p = numpy.percentile(a, 50, axis=1,
+                                     interpolation=interpolation)
+                e = d.percentile(50, axes=1, squeeze=True,
+                                 interpolation=interpolation,
+                                 accuracy=0.001)
+                self.assertTrue(e.dtype == p.dtype)
+                self.assertTrue(e.allclose(p, rtol=0.001, atol=0.001))
+        #--- End: for
+
+        cf.CHUNKSIZE(self.original_chunksize)
+
+        original = cf.PERCENTILE_ACCURACY()
+        self.assertTrue(cf.PERCENTILE_ACCURACY(0.01) == original)
+        self.assertTrue(cf.PERCENTILE_ACCURACY() == 0.01)
+        self.assertTrue(cf.Data(self.a).median().allclose(
+            numpy.median(self.a), rtol=0.01))
+        with self.assertRaises(ValueError):
+            cf.PERCENTILE_ACCURACY(1)
+
+        cf.PERCENTILE_ACCURACY(original)
+
+
     def test_Data_mean_of_upper_decile(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
@@ -2367,6 +2687,122 @@ class DataTest(unittest.TestCase):
         cf.CHUNKSIZE(self.original_chunksize)
 
 
+    def test_Data_sd_var_large_mean(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        # Values whose mean is much larger than their spread, for
+        # which combining partitions via sums of squares loses all
+        # precision
+        a = numpy.arange(-100, 200., dtype=float).reshape(3, 4, 5, 5)
+        a = a % 7 + 1e8
+
+        # Weights, and a mask with NaNs underneath it
+        w = numpy.arange(300., dtype=float).reshape(a.shape) % 5 + 1
+        mask = (numpy.arange(300).reshape(a.shape) % 11 == 0)
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize) 
+            for dtype in ('f8', 'f4'):
+                b = a.astype(dtype)
+                bm = numpy.ma.masked_invalid(numpy.where(mask, numpy.nan, b))
+                for x, weights, case in (
+                        (b , None, 'unweighted, unmasked'),
+                        (b , w   , 'weighted, unmasked'),
+                        (bm, None, 'unweighted, masked'),
+                        (bm, w   , 'weighted, masked')):
+                    d = cf.Data(x, units='K')
+                    if weights is not None:
+                        y = cf.Data(weights)
+                    else:
+                        y = None
+                        weights = numpy.ones(a.shape)
+
+                    weights = numpy.ma.array(weights, mask=numpy.ma.getmask(x))
+                    x = numpy.ma.asanyarray(x).astype(float)
+                    for axes in self.axes_combinations:
+                        xx = reshape_array(x, axes)
+                        ww = reshape_array(weights, axes)
+                        V1 = ww.sum(axis=-1)
+                        V2 = (ww*ww).sum(axis=-1)
+                        xx = xx - (ww*xx).sum(axis=-1, keepdims=True) / V1[..., numpy.newaxis]
+                        M2 = (ww*xx*xx).sum(axis=-1)
+                        for ddof in (0, 1):
+                            if ddof and y is not None:
+                                v = M2 / (V1 - V2/V1)
+                            else:
+                                v = M2 / (V1 - ddof)
+                                
+                            e = d.var(axes=axes, squeeze=True, weights=y,
+                                      ddof=ddof)
+                            self.assertTrue(
+                                e.allclose(v, rtol=1e-6, atol=0),
+                                "var, axis={}, dtype={}, ddof={}, {} \ne={}, \nv={}".format(
+                                    axes, dtype, ddof, case, e.array, v))
+        #--- End: for
+        
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
+    def test_Data_var_nan_under_mask(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        # Missing values which are NaN underneath the mask, as for a
+        # netCDF variable whose _FillValue is NaN
+        a = numpy.ma.masked_invalid([[1, numpy.nan, 3, 4],
+                                     [2, 5, 6, 7]])
+        w = numpy.array([[1, 2, 1, 1],
+                         [1, 1, 2, 1]], dtype=float)
+
+        # Expected values
+        expected = {}
+        for weighted in (False, True):
+            weights = numpy.ma.array(w if weighted else numpy.ones(a.shape),
+                                     mask=a.mask)
+            V1 = weights.sum(axis=1)
+            x = a - (weights*a).sum(axis=1, keepdims=True) / V1[:, numpy.newaxis]
+            M2 = (weights*x*x).sum(axis=1)
+            expected[weighted, 0] = M2 / V1
+            if weighted:
+                expected[weighted, 1] = M2 / (V1 - (weights*weights).sum(axis=1)/V1)
+            else:
+                expected[weighted, 1] = M2 / (V1 - 1)
+        #--- End: for
+
+        var_f = cf.data.collapse_functions.var_f
+        var_ffinalise = cf.data.collapse_functions.var_ffinalise
+        for weighted in (False, True):
+            weights = w if weighted else None
+            for ddof in (0, 1):
+                v = expected[weighted, ddof]
+
+                out = var_f(a, axis=1, weights=weights, masked=True,
+                            ddof=ddof)
+                _, e = var_ffinalise(out)
+                self.assertTrue(numpy.allclose(e, v),
+                                'weighted={}, ddof={}: {!r} != {!r}'.format(
+                                    weighted, ddof, e, v))
+        #--- End: for
+        
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize) 
+            d = cf.Data(a, units='K')
+            for weighted in (False, True):
+                weights = cf.Data(w) if weighted else None
+                for ddof in (0, 1):
+                    v = expected[weighted, ddof]
+                    e = d.var(axes=1, squeeze=True, weights=weights,
+                              ddof=ddof)
+                    self.assertTrue(
+                        e.allclose(v),
+                        'weighted={}, ddof={}: {!r} != {!r}'.format(
+                            weighted, ddof, e.array, v))
+        #--- End: for
+        
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
     def test_Data_dumpd_loadd_dumps(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
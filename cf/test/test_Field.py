@@ -212,6 +212,63 @@ class FieldTest(unittest.TestCase):
 
         self.assertTrue((a==b.array).all())
 
+        
+    def test_Field_bin_methods(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        f = self.f.copy()
+
+        d = f.digitize(4)
+        indices = d.array.flatten()
+        x = f.array.flatten()
+
+        for chunksize in self.chunk_sizes:
+            cf.CHUNKSIZE(chunksize)
+            for method, ddof, func in (
+                    ('sample_size'       , 1, lambda y: y.size),
+                    ('sum'               , 1, numpy.sum),
+                    ('maximum'           , 1, numpy.max),
+                    ('minimum'           , 1, numpy.min),
+                    ('range'             , 1, numpy.ptp),
+                    ('mid_range'         , 1, lambda y: (y.min()+y.max())/2.0),
+                    ('mean'              , 1, numpy.mean),
+                    ('root_mean_square'  , 1, lambda y: numpy.sqrt((y*y).mean())),
+                    ('variance'          , 1, lambda y: y.var(ddof=1)),
+                    ('standard_deviation', 0, lambda y: y.std(ddof=0)),
+            ):
+                b = f.bin(method, digitized=d, ddof=ddof)
+
+                a = numpy.ma.masked_all((4,), dtype=float)
+                for i in range(4):
+                    a[i] = func(x[indices == i])
+
+                self.assertTrue(numpy.allclose(a, b.array),
+                                '{}, {}: {!r} != {!r}'.format(
+                                    method, chunksize, a, b.array))
+            #--- End: for
+
+            # Integer data at the limits of its data type
+            g = f.copy()
+            g.dtype = 'int8'
+            y = numpy.where(x > numpy.median(x), 127, -128).astype('int8')
+            g[...] = y.reshape(g.shape)
+            for method, func in (
+                    ('range'    , lambda y: y.max() - y.min()),
+                    ('mid_range', lambda y: (y.min() + y.max())/2.0),
+            ):
+                b = g.bin(method, digitized=d)
+
+                a = numpy.ma.masked_all((4,), dtype=float)
+                for i in range(4):
+                    a[i] = func(y[indices == i].astype(float))
+
+                self.assertTrue(numpy.allclose(a, b.array),
+                                '{}, {}: {!r} != {!r}'.format(
+                                    method, chunksize, a, b.array))
+        #--- End: for
+        cf.CHUNKSIZE(self.original_chunksize)
+
 
     def test_Field_direction(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
@@ -273,7 +330,62 @@ class FieldTest(unittest.TestCase):
                 y = f.weights('grid_longitude', components=components, measure=m)
                 y = f.weights(['grid_longitude'], components=components, measure=m)
     #--- End: for
-            
+
+
+    def test_Field_weights_cache(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        original = cf.WEIGHTS_CACHE_SIZE()
+
+        f = cf.example_field(0)
+        g = f.copy()
+
+        for measure in (False, True):
+            for scale in (None, 1.0):
+                if measure and scale is not None:
+                    continue
+
+                cf.WEIGHTS_CACHE_SIZE(0)
+                x = f.weights('area', components=True, measure=measure,
+                              scale=scale)
+                m = f.collapse('area: mean', weights='area')
+                self.assertEqual(cf.weights_cache_statistics()['size'], 0)
+
+                cf.WEIGHTS_CACHE_SIZE(original)
+                f.weights('area', components=True, measure=measure,
+                          scale=scale)
+                hits = cf.weights_cache_statistics()['hits']
+
+                y = g.weights('area', components=True, measure=measure,
+                              scale=scale)
+                self.assertGreater(cf.weights_cache_statistics()['hits'],
+                                   hits)
+                self.assertEqual(set(x), set(y))
+                for key, value in x.items():
+                    self.assertTrue(value.equals(y[key], verbose=True))
+
+                # Changing returned weights doesn't change cached weights
+                for value in y.values():
+                    value *= 2
+
+                z = g.weights('area', components=True, measure=measure,
+                              scale=scale)
+                for key, value in x.items():
+                    self.assertTrue(value.equals(z[key], verbose=True))
+
+                n = g.collapse('area: mean', weights='area')
+                self.assertTrue(m.equals(n, verbose=True))
+        #--- End: for
+
+        cf.WEIGHTS_CACHE_SIZE(1)
+        self.assertLessEqual(cf.weights_cache_statistics()['size'], 1)
+
+        with self.assertRaises(ValueError):
+            cf.WEIGHTS_CACHE_SIZE(-1)
+
+        cf.WEIGHTS_CACHE_SIZE(original)
+
 
     def test_Field_replace_construct(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
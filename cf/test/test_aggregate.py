@@ -1,5 +1,9 @@
 import datetime
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 
 import cf
@@ -86,6 +90,99 @@ class aggregateTest(unittest.TestCase):
         cf.CHUNKSIZE(self.original_chunksize)
 
 
+    def test_aggregate_hash_statistics(self):
+        for chunksize in self.chunk_sizes:    
+            cf.CHUNKSIZE(chunksize)
+
+            f = cf.read(self.filename, squeeze=True)[0]
+       
+            g = cf.FieldList([f[i] for i in range(f.shape[0])])
+
+            # Perturb the X coordinates of some of the fields by less
+            # than the absolute tolerance
+            for x in g[::3]:
+                x.dimension_coordinate('X').varray[...] += 1e-9
+
+            h = cf.aggregate(g, atol=1e-6)
+            self.assertTrue(len(h) == 1)
+            self.assertTrue(h[0].shape == f.shape)
+
+            statistics = cf.aggregate.hash_statistics
+            self.assertTrue(statistics['comparisons'] >= 1)
+            self.assertTrue(statistics['avoided'] >= 0)
+
+            # Outside of the tolerance no arrays are close
+            h = cf.aggregate(g, atol=0, rtol=0)
+            self.assertTrue(len(h) > 1)
+        #--- End: for
+        
+        cf.CHUNKSIZE(self.original_chunksize)
+
+        
+    def test_aggregate_AGGREGATE_CACHE_DIR(self):
+        cache_dir = tempfile.mkdtemp()
+        original = cf.AGGREGATE_CACHE_DIR(cache_dir)
+        
+        for chunksize in self.chunk_sizes:    
+            cf.CHUNKSIZE(chunksize)
+
+            f = cf.read(self.filename, squeeze=True)[0]
+       
+            # Populate the cache, then use it
+            g = cf.read(self.filename, squeeze=True, aggregate=False)
+            h = cf.read(self.filename, squeeze=True, aggregate=False)
+            g = cf.aggregate(g)
+            h = cf.aggregate(h)
+            self.assertTrue(os.path.isfile(os.path.join(
+                cache_dir, 'cf_aggregate_cache.sqlite')))
+            self.assertTrue(len(h) == len(g))
+            self.assertTrue(h[0].equals(g[0], verbose=True))
+            self.assertTrue(h[0].equals(f, verbose=True))
+        #--- End: for
+        
+        cf.AGGREGATE_CACHE_DIR(original)
+        shutil.rmtree(cache_dir)
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
+    def test_aggregate_AGGREGATE_CACHE_DIR_hash_seed(self):
+        cache_dir = tempfile.mkdtemp()
+
+        # Populate the cache in one Python session ...
+        populate = (
+            "import cf; "
+            "cf.AGGREGATE_CACHE_DIR({!r}); "
+            "cf.aggregate(cf.read({!r}, squeeze=True, aggregate=False))"
+        ).format(cache_dir, self.filename)
+
+        # ... and check in another, with differently salted built-in
+        # hashes, that the stored hash values are those of the stored
+        # arrays
+        check = (
+            "import sqlite3, sys, numpy, cf; "
+            "aggregate = sys.modules['cf.aggregate']; "
+            "store = sqlite3.connect({!r}); "
+            "rows = store.execute('SELECT hash, data, mask FROM arrays').fetchall(); "
+            "arrays = [(h, aggregate._array_from_bytes(d), m) for h, d, m in rows]; "
+            "arrays = [(h, a if m is None else numpy.ma.array(a, mask=aggregate._array_from_bytes(m))) "
+            "          for h, a, m in arrays]; "
+            "print(len(arrays), all(cf.hash_array(a) == h for h, a in arrays))"
+        ).format(os.path.join(cache_dir, 'cf_aggregate_cache.sqlite'))
+
+        for seed, code in (('1', populate), ('2', check)):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            output = subprocess.check_output([sys.executable, '-c', code],
+                                             env=env,
+                                             universal_newlines=True)
+        #--- End: for
+
+        n, ok = output.split()[-2:]
+        self.assertTrue(int(n) > 0)
+        self.assertTrue(ok == 'True')
+
+        shutil.rmtree(cache_dir)
+
+        
 #--- End: class
 
 if __name__ == "__main__":
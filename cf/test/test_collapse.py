@@ -425,6 +425,41 @@ class FieldTest(unittest.TestCase):
 #            g = f.collapse('T: mean', group=cf.M(5, month= 3),
 #                           group_contiguous=2)
     #--- End: def
+
+    def test_COLLAPSE_groups_one_pass(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        f = cf.read(self.filename4)[0]
+        f[..., 0] = cf.masked
+        
+        t = f.domain_axis('T', key=True)
+        iaxis = f.get_data_axes().index(t)
+
+        for chunksize in self.chunk_sizes:
+            cf.CHUNKSIZE(chunksize)
+            for method in ('mean', 'maximum', 'range', 'sum',
+                           'standard_deviation', 'sample_size'):
+                g = f.collapse('T: '+method, group=cf.M(5), mtol=0.5)
+                classification = f.collapse('T: '+method, group=cf.M(5),
+                                            regroup=True)
+                groups = [u for u in numpy.unique(classification) if u >= 0]
+                self.assertTrue(g.domain_axes[t].get_size() == len(groups))
+
+                for n, u in enumerate(groups):
+                    index = numpy.where(classification == u)[0].tolist()
+                    h = f.subspace(**{t: index}).collapse('T: '+method,
+                                                         mtol=0.5)
+                    indices = [slice(None)] * g.ndim
+                    indices[iaxis] = slice(n, n+1)
+                    self.assertTrue(
+                        g[tuple(indices)].data.equals(h.data, verbose=True),
+                        'method={!r}, group={}, chunksize={}'.format(
+                            method, u, chunksize))
+            #--- End: for
+        #--- End: for
+        cf.CHUNKSIZE(self.original_chunksize)
+    #--- End: def
      
 #--- End: class
 
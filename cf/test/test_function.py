@@ -1,5 +1,7 @@
 import atexit
 import datetime
+import os
+import resource
 import unittest
 import inspect
 
@@ -22,7 +24,90 @@ class functionTest(unittest.TestCase):
         with self.assertRaises(Exception):
             _ = cf.example_field(-999)
 
-            
+
+    def test_open_files(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        from cf.data.functions import _open_netcdf_file
+
+        filenames = [os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  filename)
+                     for filename in ('test_file.nc', 'test_file2.nc',
+                                      'file.nc')]
+        a, b, c = filenames
+        
+        cf.close_files()
+        cf.open_files_statistics(reset=True)
+
+        # Allow at most two concurrently open files
+        max_open_files = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        original = cf.OF_FRACTION(2.5/max_open_files)
+
+        nc = _open_netcdf_file(a, 'r')
+        _open_netcdf_file(b, 'r')
+        self.assertTrue(_open_netcdf_file(a, 'r') is nc)
+        _open_netcdf_file(c, 'r')
+
+        # The least recently used file has been closed
+        self.assertTrue(set(cf.open_files('netCDF')) == set((a, c)))
+
+        self.assertTrue(cf.open_files_statistics(reset=True) ==
+                        {'hits': 1, 'misses': 3, 'evictions': 1,
+                         'open': 2, 'limit': 2})
+
+        cf.close_one_file('netCDF')
+        self.assertTrue(set(cf.open_files('netCDF')) == set((c,)))
+
+        cf.close_files()
+        self.assertTrue(cf.open_files_statistics() ==
+                        {'hits': 0, 'misses': 0, 'evictions': 1,
+                         'open': 0, 'limit': 2})
+        
+        cf.OF_FRACTION(original)
+
+
+    def test_collapse_statistics(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        cf.collapse_statistics(reset=True)
+
+        f = cf.example_field(1)
+        f.collapse('mean')
+
+        # Serial collapses are not recorded
+        self.assertTrue(cf.collapse_statistics() ==
+                        {'collapses': 0, 'time': [], 'cost': [],
+                         'imbalance': None})
+
+
+    def test_FREE_MEMORY_REFRESH(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        original = cf.FREE_MEMORY_REFRESH(interval=0.5, nbytes=2**20)
+        self.assertTrue(cf.FREE_MEMORY_REFRESH() == (0.5, 2**20))
+        self.assertTrue(cf.FREE_MEMORY_REFRESH(*original) == (0.5, 2**20))
+        self.assertTrue(cf.FREE_MEMORY_REFRESH() == original)
+
+        with self.assertRaises(ValueError):
+            cf.FREE_MEMORY_REFRESH(interval=-1)
+
+        # Memory released by partitions is no longer counted as
+        # resident
+        original = cf.FREE_MEMORY_REFRESH(interval=3600, nbytes=2**40)
+        cf.functions._free_memory_estimate()
+        probe = cf.functions._free_memory_probe
+        resident = probe['resident']
+        if cf.functions._keep_in_memory(1000):
+            self.assertEqual(probe['resident'], resident + 1000)
+            cf.functions._release_memory(1000)
+            self.assertEqual(probe['resident'], resident)
+
+        cf.FREE_MEMORY_REFRESH(*original)
+
+
 #--- End: class
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 import atexit
 import datetime
+import inspect
 import os
 import tempfile
 import time
@@ -10,7 +11,8 @@ import numpy
 import cf
 
 tmpfile  = tempfile.mktemp('.cf-python_test')
-tmpfiles = [tmpfile]
+tmpfile2 = tempfile.mktemp('.pp')
+tmpfiles = [tmpfile, tmpfile2]
 def _remove_tmpfiles():
     '''
 '''
@@ -95,6 +97,103 @@ class ppTest(unittest.TestCase):
         cf.CHUNKSIZE(self.original_chunksize)
 
 
+    def test_PP_WGDOS_UNPACKING_threads(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        array = cf.read(self.ppfilename)[0].array
+
+        original = cf.PARTITION_WORKERS(4)
+        try:
+            cf.close_files()
+            f = cf.read(self.ppfilename)[0]
+            self.assertTrue((f.array == array).all(),
+                            'Bad threaded unpacking of WGDOS packed data')
+        finally:
+            cf.PARTITION_WORKERS(original)
+
+        
+    def test_PP_read_ahead(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        # Create a file with two records at consecutive times
+        with open(self.ppfilename, 'rb') as fh:
+            record = fh.read()
+
+        int_hdr = numpy.frombuffer(record[4:184], dtype='<i4').copy()
+        int_hdr[[0, 6]] += 1
+        with open(tmpfile2, 'wb') as fh:
+            fh.write(record)
+            fh.write(record[:4] + int_hdr.tobytes() + record[184:])
+
+        array = cf.read(self.ppfilename)[0].array
+
+        for chunksize in self.chunk_sizes:   
+            cf.CHUNKSIZE(chunksize) 
+
+            f = cf.read(tmpfile2)
+            self.assertTrue(len(f) == 1)
+            f = f[0]
+            self.assertTrue(f.data.partitions.size == 2)
+
+            a = f.array
+            self.assertTrue(a.shape == (2,) + array.shape)
+            self.assertTrue((a[0] == array).all())
+            self.assertTrue((a[1] == array).all())
+            self.assertFalse(cf.data.umarray._read_ahead)
+            
+            g = f.collapse('T: mean')
+            self.assertTrue(g.data.allclose(array.reshape(g.shape)))
+            self.assertFalse(cf.data.umarray._read_ahead)
+        #--- End: for
+
+        cf.CHUNKSIZE(self.original_chunksize)
+
+
+    def test_PP_T_Z_coordinates(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        # Create a file with records at two times and three pressure
+        # levels
+        with open(self.ppfilename, 'rb') as fh:
+            record = fh.read()
+
+        int_hdr  = numpy.frombuffer(record[4:184], dtype='<i4')
+        real_hdr = numpy.frombuffer(record[184:260], dtype='<f4')
+
+        levels = [1000.0, 850.0, 500.0]
+        with open(tmpfile2, 'wb') as fh:
+            for t in range(2):
+                for level in levels:
+                    i = int_hdr.copy()
+                    i[[0, 6]] += t # LBYR, LBYRD
+                    i[25] = 8      # LBVC: pressure
+                    r = real_hdr.copy()
+                    r[6] = level   # BLEV
+                    fh.write(record[:4] + i.tobytes() + r.tobytes() +
+                             record[260:])
+        #--- End: with
+
+        array = cf.read(self.ppfilename)[0].array
+
+        f = cf.read(tmpfile2)
+        self.assertTrue(len(f) == 1)
+        f = f[0]
+        self.assertTrue(f.data.partitions.size == 6)
+        self.assertTrue(f.ndim == 4)
+
+        T = f.dimension_coordinate('T')
+        self.assertTrue(T.size == 2)
+        self.assertTrue(T.array[1] - T.array[0] == 360)
+
+        Z = f.dimension_coordinate('Z')
+        self.assertTrue(sorted(Z.array.tolist()) == sorted(levels))
+
+        self.assertTrue((f.array == array.reshape((1, 1) + array.shape)).all())
+
+        
 #--- End: class
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@ import os
 import unittest
 import atexit
 import inspect
+import re
 import subprocess
 
 import numpy
@@ -98,7 +99,152 @@ class read_writeTest(unittest.TestCase):
         g = cf.read(self.filename)
         self.assertTrue(f.equals(g, verbose=True), 'Bad read with select keyword')
 
+        # Fields which can't be selected are not created
+        for select in ('air_temperature', 'long_name=foo', 'ncvar%foo',
+                       'standard_name=foo', ['foo', 'ncvar%bar']):
+            f = cf.read(self.filename, select=select)
+            self.assertTrue(len(f) == 0, select)
+
+        for select in ('eastward_wind', 'ncvar%' + g[0].nc_get_variable(),
+                       re.compile('^east'),
+                       'standard_name=eastward_wind',
+                       ['foo', 'eastward_wind']):
+            f = cf.read(self.filename, select=select)
+            self.assertTrue(f.equals(g, verbose=True), select)
+
+        g = cf.read('wgdos_packed.pp')
+        stash_code = g[0].get_property('stash_code')
+        for select in ('stash_code=' + stash_code,
+                       'um_stash_source=' + g[0].get_property('um_stash_source'),
+                       g[0].identity()):
+            f = cf.read('wgdos_packed.pp', select=select)
+            self.assertTrue(f.equals(g, verbose=True), select)
+
+        for select in ('stash_code=' + stash_code + '0', 'foo'):
+            f = cf.read('wgdos_packed.pp', select=select)
+            self.assertTrue(len(f) == 0, select)
+
+
+    def test_read_workers(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        files = ['test_file2.nc', 'wgdos_packed.pp', 'test_file3.nc',
+                 'test_file4.nc', self.filename]
+
+        f = cf.read(files, aggregate=False)
+        g = cf.read(files, aggregate=False, workers=3)
+        n = len(f)
+        self.assertTrue(len(g) == n)
+        for x, y in zip(f, g):
+            self.assertTrue(x.equals(y, verbose=True))
+
+        f = cf.read(files)
+        g = cf.read(files, workers=3)
+        self.assertTrue(f.equals(g, verbose=True))
+        
+        f = cf.read(files, select='eastward_wind', aggregate=False)
+        g = cf.read(files, select='eastward_wind', aggregate=False,
+                    workers=2)
+        self.assertTrue(f.equals(g, verbose=True))
+
+        g = cf.read(files + ['test_read_write.py'], aggregate=False,
+                    ignore_read_error=True, workers=2)
+        self.assertTrue(len(g) == n)
+        
+        with self.assertRaises(Exception):
+            cf.read(files + ['test_read_write.py'], workers=2)
+
+        
+    def test_iread(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        files = ['test_file2.nc', 'wgdos_packed.pp', 'test_file3.nc',
+                 'test_file4.nc', self.filename]
+
+        # Each file on its own
+        f = cf.FieldList()
+        for filename in files:
+            f.extend(cf.read(filename))
+
+        g = cf.iread(files)
+        self.assertFalse(isinstance(g, cf.FieldList))
+        g = cf.FieldList(g)
+        self.assertTrue(len(g) == len(f))
+        for x, y in zip(f, g):
+            self.assertTrue(x.equals(y, verbose=True))
 
+        # All files in one window
+        f = cf.read(files, select='eastward_wind')
+        g = cf.FieldList(cf.iread(files, window=len(files),
+                                  select='eastward_wind'))
+        self.assertTrue(f.equals(g, verbose=True))
+
+        # Windows of two files without aggregation
+        f = cf.read(files, aggregate=False)
+        g = cf.FieldList(cf.iread(files, window=2, aggregate=False))
+        self.assertTrue(len(g) == len(f))
+
+        # Bad parameters are reported before iterating
+        with self.assertRaises(ValueError):
+            cf.iread(files, window=0)
+
+        with self.assertRaises(ValueError):
+            cf.iread(files, nfields=1)
+
+        # File names found in a directory are not expanded again
+        tmpdir = tempfile.mkdtemp('_cf-python_test')
+        tmpname = os.path.join(tmpdir, '$HOME~[0].nc')
+        with open(self.filename, 'rb') as src, open(tmpname, 'wb') as dst:
+            dst.write(src.read())
+
+        f = cf.read(self.filename)
+        g = cf.FieldList(cf.iread(tmpdir))
+        self.assertTrue(f.equals(g, verbose=True))
+
+        os.remove(tmpname)
+        os.rmdir(tmpdir)
+
+        
+    def test_read_UM_INDEX_DIR(self):
+        if self.test_only and inspect.stack()[0][3] not in self.test_only:
+            return
+
+        f = cf.read('wgdos_packed.pp')
+        
+        index_dir = tempfile.mkdtemp()
+        original = cf.UM_INDEX_DIR(index_dir)
+        try:
+            # Parse the file and write its index
+            cf.close_files()
+            g = cf.read('wgdos_packed.pp')
+            self.assertTrue(f.equals(g, verbose=True))
+            self.assertTrue(len(os.listdir(index_dir)) == 1)
+
+            # Load the file's index
+            cf.close_files()
+            g = cf.read('wgdos_packed.pp')
+            self.assertTrue(f.equals(g, verbose=True))
+            self.assertTrue(g[0].array.shape == f[0].array.shape)
+
+            # An index that is no longer valid is replaced
+            for name in os.listdir(index_dir):
+                with open(os.path.join(index_dir, name), 'wb') as fh:
+                    fh.write(b'not an index')
+
+            cf.close_files()
+            g = cf.read('wgdos_packed.pp')
+            self.assertTrue(f.equals(g, verbose=True))
+        finally:
+            cf.UM_INDEX_DIR(original)
+            cf.close_files()
+            for name in os.listdir(index_dir):
+                os.remove(os.path.join(index_dir, name))
+
+            os.rmdir(index_dir)
+
+        
     def test_read_squeeze(self):
         if self.test_only and inspect.stack()[0][3] not in self.test_only:
             return
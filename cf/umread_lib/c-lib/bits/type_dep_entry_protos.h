@@ -25,6 +25,27 @@ int WITH_LEN(read_record_data_core)(int fd,
 				    size_t nwords, 
 				    void *data_return);
 
+int WITH_LEN(unpack_record_data_core)(void *buffer,
+				      size_t buffer_length,
+				      size_t disk_length,
+				      Byte_ordering byte_ordering, 
+				      const void *int_hdr,
+				      const void *real_hdr,
+				      size_t nwords, 
+				      void *data_return,
+				      int nthreads);
+
+int WITH_LEN(unpack_records_data_core)(int nrec,
+				       void **buffers,
+				       const size_t *buffer_lengths,
+				       const size_t *disk_lengths,
+				       Byte_ordering byte_ordering, 
+				       const void *int_hdrs,
+				       const void *real_hdrs,
+				       const size_t *nwords, 
+				       void **data_returns,
+				       int nthreads);
+
 File *WITH_LEN(file_parse_core)(int fd,
 				File_type file_type);
 
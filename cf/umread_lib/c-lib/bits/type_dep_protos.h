@@ -41,6 +41,15 @@ int get_valid_records_ff(int fd,
 			 Byte_ordering byte_ordering,
 			 size_t hdr_start, size_t hdr_size, int nrec,
 			 int valid[], int *n_valid_rec_return);
+int unpack_data(int pack,
+		void *packed_data,
+		size_t packed_bytes,
+		Byte_ordering byte_ordering,
+		const INTEGER *int_hdr,
+		const REAL *real_hdr,
+		size_t nwords,
+		void *data_return,
+		int nthreads);
 int unpack_run_length_encoded(REAL *datain, INTEGER nin, REAL *dataout, INTEGER nout, REAL mdi);
 
 /* process_vars.c */
@@ -95,6 +104,8 @@ int compare_dates(const Date *a, const Date *b);
 
 /* unwgdos.c */
 int unwgdos(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi);
+int unwgdos_threaded(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi,
+		     int nthreads);
 
 
 /* Debug_dump.c */
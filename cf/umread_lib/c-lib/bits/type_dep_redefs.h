@@ -59,8 +59,12 @@
 #define test_skip_var test_skip_var_sgl
 #define time_diff time_diff_sgl
 #define time_set time_set_sgl
+#define unpack_data unpack_data_sgl
 #define unpack_run_length_encoded unpack_run_length_encoded_sgl
+#define unpack_record_data_core unpack_record_data_core_sgl
+#define unpack_records_data_core unpack_records_data_core_sgl
 #define unwgdos unwgdos_sgl
+#define unwgdos_threaded unwgdos_threaded_sgl
 #define var_has_regular_z_t var_has_regular_z_t_sgl
 #define var_is_missing var_is_missing_sgl
 #define z_axis_add z_axis_add_sgl
@@ -126,8 +130,12 @@
 #define test_skip_var test_skip_var_dbl
 #define time_diff time_diff_dbl
 #define time_set time_set_dbl
+#define unpack_data unpack_data_dbl
 #define unpack_run_length_encoded unpack_run_length_encoded_dbl
+#define unpack_record_data_core unpack_record_data_core_dbl
+#define unpack_records_data_core unpack_records_data_core_dbl
 #define unwgdos unwgdos_dbl
+#define unwgdos_threaded unwgdos_threaded_dbl
 #define var_has_regular_z_t var_has_regular_z_t_dbl
 #define var_is_missing var_is_missing_dbl
 #define z_axis_add z_axis_add_dbl
@@ -1,5 +1,7 @@
 #include <unistd.h>
 #include <stdlib.h>
+#include <string.h>
+#include <pthread.h>
 
 #include "umfileint.h"
 
@@ -339,9 +341,8 @@ int read_record_data_core(int fd,
 			  void *data_return)
 {
   int pack;
-  size_t packed_bytes, ipt, packed_words;
+  size_t packed_bytes;
   void *packed_data;
-  REAL mdi;
 
   packed_data = NULL;
 
@@ -357,15 +358,6 @@ int read_record_data_core(int fd,
     {
       /* PACKING IN USE */
 
-      /* Complain if not REAL data. In cdunifpp, this test was applied only to Cray 32-bit packing,
-       * but in fact also unwgdos assumes real, so apply to both packing types.
-       */
-      if (get_type(int_hdr) != real_type)
-	{
-	  error_mesg("Unpacking supported only for REAL type data");
-	  ERR;
-	}
-      
       /* first allocate array and read in packed data */
 
       /* disk_length includes extra data, so subtract off */
@@ -393,63 +385,275 @@ int read_record_data_core(int fd,
        * see the Python code.)
        */
       CKP(   packed_data = malloc(packed_bytes)  );
-      ERRIF(   read(fd, packed_data, packed_bytes)  != packed_bytes   );
+      ERRIF(   read(fd, packed_data, packed_bytes) != packed_bytes   );
+
+      CKI(   unpack_data(pack, packed_data, packed_bytes, byte_ordering,
+			 int_hdr, real_hdr, nwords, data_return, 1)   );
+
+      free(packed_data);
+    }
+  return 0;
+ err:
+  GRIPE;
+  if (packed_data != NULL)
+    free(packed_data);
+  return -1;
+}
+
+
+/*
+ * as read_record_data_core, but takes the record data from a buffer
+ * that the caller has already read from the file, starting at the
+ * data offset of the record, rather than reading it from the file.
+ * buffer_length is the number of bytes in the buffer.  Packed data
+ * may be unpacked by up to nthreads threads.
+ *
+ * The contents of the buffer may be overwritten.
+ */
+int unpack_record_data_core(void *buffer,
+			    size_t buffer_length,
+			    size_t disk_length,
+			    Byte_ordering byte_ordering,
+			    const void *int_hdr,
+			    const void *real_hdr,
+			    size_t nwords,
+			    void *data_return,
+			    int nthreads)
+{
+  int pack;
+  size_t packed_bytes;
+
+  pack = get_var_packing(int_hdr);
+
+  if (pack == 0)
+    {
+      /* unpacked data -- copy, and byte swap if necessary */
+      ERRIF(   buffer_length < nwords * WORD_SIZE   );
+      memcpy(data_return, buffer, nwords * WORD_SIZE);
+      if (byte_ordering == REVERSE_ORDERING)
+	swap_bytes(data_return, nwords);
+    }
+  else
+    {
+      /* disk_length includes extra data, so subtract off */
+      packed_bytes = disk_length - get_extra_data_length(int_hdr);
+      ERRIF(   buffer_length < packed_bytes   );
+
+      CKI(   unpack_data(pack, buffer, packed_bytes, byte_ordering,
+			 int_hdr, real_hdr, nwords, data_return, nthreads)   );
+    }
+  return 0;
+  ERRBLKI;
+}
+
+
+/* the records to be unpacked by one thread of unpack_records_data_core */
+typedef struct
+{
+  int nrec;
+  void **buffers;
+  const size_t *buffer_lengths;
+  const size_t *disk_lengths;
+  Byte_ordering byte_ordering;
+  const INTEGER *int_hdrs;
+  const REAL *real_hdrs;
+  const size_t *nwords;
+  void **data_returns;
+  int first;   /* the thread unpacks records first, first + step, ... */
+  int step;
+  int status;
+} Unpack_records;
+
+
+static void *unpack_records(void *arg)
+{
+  Unpack_records *job;
+  int i;
+
+  job = arg;
+  job->status = 0;
+  for (i = job->first; i < job->nrec; i += job->step)
+    if (unpack_record_data_core(job->buffers[i],
+				job->buffer_lengths[i],
+				job->disk_lengths[i],
+				job->byte_ordering,
+				job->int_hdrs + (size_t) i * N_INT_HDR,
+				job->real_hdrs + (size_t) i * N_REAL_HDR,
+				job->nwords[i],
+				job->data_returns[i],
+				1) != 0)
+      job->status = -1;
+
+  return NULL;
+}
+
+
+/*
+ * as unpack_record_data_core, but for nrec records whose headers are
+ * consecutive in int_hdrs and real_hdrs, and whose buffers, lengths,
+ * numbers of words and returned data are in the corresponding
+ * arrays.  The records are unpacked by up to nthreads threads, or if
+ * there is only one record then its rows are.
+ */
+int unpack_records_data_core(int nrec,
+			     void **buffers,
+			     const size_t *buffer_lengths,
+			     const size_t *disk_lengths,
+			     Byte_ordering byte_ordering,
+			     const void *int_hdrs,
+			     const void *real_hdrs,
+			     const size_t *nwords,
+			     void **data_returns,
+			     int nthreads)
+{
+  Unpack_records *jobs;
+  pthread_t *threads;
+  int *started;
+  int t, status;
+
+  if (nrec == 1)
+    return unpack_record_data_core(buffers[0], buffer_lengths[0], disk_lengths[0],
+				   byte_ordering, int_hdrs, real_hdrs, nwords[0],
+				   data_returns[0], nthreads);
+
+  if (nthreads > nrec)
+    nthreads = nrec;
+  if (nthreads < 1)
+    nthreads = 1;
+
+  jobs = malloc(nthreads * sizeof(Unpack_records));
+  threads = malloc(nthreads * sizeof(pthread_t));
+  started = malloc(nthreads * sizeof(int));
+  if (jobs == NULL || threads == NULL || started == NULL)
+    {
+      free(jobs);
+      free(threads);
+      free(started);
+      ERR;
+    }
+
+  for (t = 0; t < nthreads; t++)
+    {
+      jobs[t].nrec = nrec;
+      jobs[t].buffers = buffers;
+      jobs[t].buffer_lengths = buffer_lengths;
+      jobs[t].disk_lengths = disk_lengths;
+      jobs[t].byte_ordering = byte_ordering;
+      jobs[t].int_hdrs = int_hdrs;
+      jobs[t].real_hdrs = real_hdrs;
+      jobs[t].nwords = nwords;
+      jobs[t].data_returns = data_returns;
+      jobs[t].first = t;
+      jobs[t].step = nthreads;
+    }
+
+  /* the first job is done by the calling thread, as is any job whose
+   * thread could not be started
+   */
+  for (t = 1; t < nthreads; t++)
+    started[t] = (pthread_create(&threads[t], NULL, unpack_records, &jobs[t]) == 0);
+
+  unpack_records(&jobs[0]);
+
+  status = jobs[0].status;
+  for (t = 1; t < nthreads; t++)
+    {
+      if (started[t])
+	pthread_join(threads[t], NULL);
+      else
+	unpack_records(&jobs[t]);
 
-      /* NOW UNPACK ACCORDING TO PACKING TYPE (including byte swapping where necessary). */
+      if (jobs[t].status != 0)
+	status = -1;
+    }
+
+  free(jobs);
+  free(threads);
+  free(started);
+
+  CKI(  status  );
+  return 0;
+  ERRBLKI;
+}
+
+
+/*
+ * unpacks packed record data, including byte swapping where
+ * necessary, with up to nthreads threads. The packed data may be
+ * overwritten.
+ */
+int unpack_data(int pack,
+		void *packed_data,
+		size_t packed_bytes,
+		Byte_ordering byte_ordering,
+		const INTEGER *int_hdr,
+		const REAL *real_hdr,
+		size_t nwords,
+		void *data_return,
+		int nthreads)
+{
+  size_t ipt, packed_words;
+  REAL mdi;
+
+  /* Complain if not REAL data. In cdunifpp, this test was applied only to Cray 32-bit packing,
+   * but in fact also unwgdos assumes real, so apply to both packing types.
+   */
+  if (get_type(int_hdr) != real_type)
+    {
+      error_mesg("Unpacking supported only for REAL type data");
+      ERR;
+    }
+
+  /* NOW UNPACK ACCORDING TO PACKING TYPE (including byte swapping where necessary). */
       
-      switch(pack)
-	{
-	case 1:
-	  /* WGDOS */
+  switch(pack)
+    {
+    case 1:
+      /* WGDOS */
 	  
-	  /* unwgdos routine wants to know number of native integers in input.
-	   * input type might not be native int, so calculate:
-	   */
-	  mdi = get_var_real_fill_value(real_hdr);
+      /* unwgdos routine wants to know number of native integers in input.
+       * input type might not be native int, so calculate:
+       */
+      mdi = get_var_real_fill_value(real_hdr);
 	  
-	  /* Note - even though we read in raw (unswapped) data from the file, we do not 
-	   * byte swap prior to calling unwgdos, as the packed data contains a mixture
-	   * of types of different lengths, so leave it to unwgdos() that knows about
-	   * this and has appropriate byte swapping code.
-	   */
-	  CKI(   unwgdos(packed_data, packed_bytes, data_return, nwords, mdi)   );
+      /* Note - even though we read in raw (unswapped) data from the file, we do not 
+       * byte swap prior to calling unwgdos, as the packed data contains a mixture
+       * of types of different lengths, so leave it to unwgdos() that knows about
+       * this and has appropriate byte swapping code.
+       */
+      CKI(   unwgdos_threaded(packed_data, packed_bytes, data_return, nwords, mdi,
+			      nthreads)   );
 	  
-	  break;
+      break;
 	  
-	case 2:
-	  if (byte_ordering == REVERSE_ORDERING)
-	    swap_bytes_sgl(packed_data, packed_bytes / 4);
+    case 2:
+      if (byte_ordering == REVERSE_ORDERING)
+	swap_bytes_sgl(packed_data, packed_bytes / 4);
 	  
-	  for (ipt = 0; ipt < nwords ; ipt++)
-	    ((REAL*) data_return)[ipt] = ((float32_t *) packed_data)[ipt];
+      for (ipt = 0; ipt < nwords ; ipt++)
+	((REAL*) data_return)[ipt] = ((float32_t *) packed_data)[ipt];
 	  
-	  break;
+      break;
 	  
-	case 3:
-	  error_mesg("GRIB unpacking not supported");
-	  ERR;
+    case 3:
+      error_mesg("GRIB unpacking not supported");
+      ERR;
 	  
-	  /* break; */
-
-	case 4:
-	  packed_words = packed_bytes / WORD_SIZE;
-	  if (byte_ordering == REVERSE_ORDERING)
-	    swap_bytes(packed_data, packed_words);
-	  mdi = get_var_real_fill_value(real_hdr);
-	  CKI(   unpack_run_length_encoded(packed_data, packed_words, data_return, nwords, mdi)   );
-	  break;
-
-	default:
-	  SWITCH_BUG;
-	}
-      free(packed_data);
+      /* break; */
+
+    case 4:
+      packed_words = packed_bytes / WORD_SIZE;
+      if (byte_ordering == REVERSE_ORDERING)
+	swap_bytes(packed_data, packed_words);
+      mdi = get_var_real_fill_value(real_hdr);
+      CKI(   unpack_run_length_encoded(packed_data, packed_words, data_return, nwords, mdi)   );
+      break;
+
+    default:
+      SWITCH_BUG;
     }
   return 0;
- err:
-  GRIPE;
-  if (packed_data != NULL)
-    free(packed_data);
-  return -1;
+  ERRBLKI;
 }
 
 
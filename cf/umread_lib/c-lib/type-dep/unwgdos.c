@@ -16,6 +16,7 @@
 #include <float.h>
 #include <errno.h>
 #include <stdlib.h>
+#include <pthread.h>
 
 #include "umfileint.h"
 
@@ -30,16 +31,46 @@ static void move_bits(void *, int, int, void *);
 static float32_t get_float32(void *);
 static int16_t get_int16(void *, Byte_ordering);
 static int32_t get_int32(void *, Byte_ordering);
+static void *expand_rows(void *);
+
+
+/* a block of rows of a WGDOS packed field to be expanded by one thread */
+typedef struct
+{
+  char *p;          /* start of the packed data */
+  int *row_starts;  /* offset of each row in the packed data, in 32 bit words */
+  int ix;           /* number of columns */
+  int j0;           /* first row of the block */
+  int j1;           /* one past the last row of the block */
+  REAL prec;
+  REAL mdi;
+  REAL *dataout;    /* start of the unpacked field */
+} Wgdos_rows;
 
 
 int unwgdos(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi)
+{
+  return unwgdos_threaded(datain, nbytes, dataout, nout, mdi, 1);
+}
+
+
+/*
+ * as unwgdos, but the rows of the field are expanded in blocks by up
+ * to nthreads threads
+ */
+int unwgdos_threaded(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi,
+		     int nthreads)
 {
   int /* len, */ isc, ix, iy;
   REAL prec, base;
-  int icx, j;
+  int icx, j, t;
   int ibit, nop;
   int swap;
   char *p, *p1;
+  int *row_starts;
+  pthread_t *threads;
+  Wgdos_rows *blocks;
+  int *started;
 
   /* Determine if data needs byte swapping */
 
@@ -94,11 +125,119 @@ int unwgdos(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi)
   
   prec = pow(2.0, (double) isc);
   icx = 3;
+
+  if (nthreads > iy)
+    nthreads = iy;
+
+  if (nthreads <= 1)
+    {
+      for (j=0; j<iy; j++)
+	{
+	  /* Extract base, number of bits per value, number of 32 bit words used */
+	  p1 = p + icx * 4;
+	  base = get_float32(p1);
+	  ibit = get_int16(p1 + 4, big_endian);
+	  nop = get_int16(p1 + 6, big_endian);
+      
+#if NATIVE_ORDERING == little_endian
+	  swap_bytes_sgl(p1 + 8, nop);
+#endif
+	  xpnd(ix, (int32_t *) (p1 + 8), dataout, prec, ibit, base, nop, mdi);
+      
+	  icx += nop + 2;
+	  dataout += ix;
+	}
   
+      return 0;
+    }
+
+  /* Find the start of each row, which depends on the lengths of all
+   * of the rows before it, and then expand blocks of rows in
+   * parallel
+   */
+  row_starts = malloc(iy * sizeof(int));
+  threads = malloc(nthreads * sizeof(pthread_t));
+  blocks = malloc(nthreads * sizeof(Wgdos_rows));
+  started = malloc(nthreads * sizeof(int));
+  if (row_starts == NULL || threads == NULL || blocks == NULL || started == NULL)
+    {
+      free(row_starts);
+      free(threads);
+      free(blocks);
+      free(started);
+      error_mesg("WGDOS unpacking could not allocate memory");
+      return -1;
+    }
+
   for (j=0; j<iy; j++)
+    {
+      if ((icx + 2) * 4 > nbytes)
+	{
+	  free(row_starts);
+	  free(threads);
+	  free(blocks);
+	  free(started);
+	  error_mesg("WGDOS packed data are shorter than their rows");
+	  return -1;
+	}
+      row_starts[j] = icx;
+      nop = get_int16(p + icx * 4 + 6, big_endian);
+      icx += nop + 2;
+    }
+
+  for (t=0; t<nthreads; t++)
+    {
+      blocks[t].p = p;
+      blocks[t].row_starts = row_starts;
+      blocks[t].ix = ix;
+      blocks[t].j0 = (int) ((long) iy * t / nthreads);
+      blocks[t].j1 = (int) ((long) iy * (t + 1) / nthreads);
+      blocks[t].prec = prec;
+      blocks[t].mdi = mdi;
+      blocks[t].dataout = dataout;
+    }
+
+  /* the first block is expanded by the calling thread, as is any
+   * block whose thread could not be started
+   */
+  for (t=1; t<nthreads; t++)
+    started[t] = (pthread_create(&threads[t], NULL, expand_rows, &blocks[t]) == 0);
+
+  expand_rows(&blocks[0]);
+
+  for (t=1; t<nthreads; t++)
+    {
+      if (started[t])
+	pthread_join(threads[t], NULL);
+      else
+	expand_rows(&blocks[t]);
+    }
+
+  free(row_starts);
+  free(threads);
+  free(blocks);
+  free(started);
+  return 0;
+}
+
+
+/*
+ * expands a block of rows of a WGDOS packed field, as described by
+ * a Wgdos_rows structure
+ */
+static void *expand_rows(void *arg)
+{
+  Wgdos_rows *rows;
+  REAL base;
+  int j, ibit, nop;
+  char *p1;
+
+  rows = arg;
+
+  for (j=rows->j0; j<rows->j1; j++)
     {
       /* Extract base, number of bits per value, number of 32 bit words used */
-      p1 = p + icx * 4;
+      p1 = rows->p + rows->row_starts[j] * 4;
       base = get_float32(p1);
       ibit = get_int16(p1 + 4, big_endian);
       nop = get_int16(p1 + 6, big_endian);
@@ -106,15 +245,14 @@ int unwgdos(void *datain, int nbytes, REAL *dataout, int nout, REAL mdi)
 #if NATIVE_ORDERING == little_endian
       swap_bytes_sgl(p1 + 8, nop);
 #endif
-      xpnd(ix, (int32_t *) (p1 + 8), dataout, prec, ibit, base, nop, mdi);
-      
-      icx += nop + 2;
-      dataout += ix;
+      xpnd(rows->ix, (int32_t *) (p1 + 8), rows->dataout + (size_t) j * rows->ix,
+	   rows->prec, ibit, base, nop, rows->mdi);
     }
-  
-  return 0;
+
+  return NULL;
 }
 
+
 static int xpnd(int ix, int32_t *icomp, REAL *field, REAL prec, 
 		int ibit, REAL base, int nop, REAL mdi)
 {
@@ -163,3 +163,63 @@ int read_record_data(int fd,
   /* invalid word size falls through to error return */
   ERRBLKI;
 }
+
+
+int unpack_record_data(void *buffer,
+		       size_t buffer_length,
+		       size_t disk_length,
+		       Byte_ordering byte_ordering,
+		       int word_size,
+		       const void *int_hdr,
+		       const void *real_hdr,
+		       size_t nwords,
+		       void *data_return)
+{
+  errorhandle_init();
+  
+  switch(word_size) 
+    {
+    case 4:
+      CKI(  unpack_record_data_core_sgl(buffer, buffer_length, disk_length, byte_ordering,
+					int_hdr, real_hdr, nwords, data_return, 1)  );
+      return 0;
+    case 8:
+      CKI(  unpack_record_data_core_dbl(buffer, buffer_length, disk_length, byte_ordering,
+					int_hdr, real_hdr, nwords, data_return, 1)  );
+      return 0;
+    }
+  /* invalid word size falls through to error return */
+  ERRBLKI;
+}
+
+
+int unpack_records_data(int nrec,
+			void **buffers,
+			const size_t *buffer_lengths,
+			const size_t *disk_lengths,
+			Byte_ordering byte_ordering,
+			int word_size,
+			const void *int_hdrs,
+			const void *real_hdrs,
+			const size_t *nwords,
+			void **data_returns,
+			int nthreads)
+{
+  errorhandle_init();
+  
+  switch(word_size) 
+    {
+    case 4:
+      CKI(  unpack_records_data_core_sgl(nrec, buffers, buffer_lengths, disk_lengths,
+					 byte_ordering, int_hdrs, real_hdrs, nwords,
+					 data_returns, nthreads)  );
+      return 0;
+    case 8:
+      CKI(  unpack_records_data_core_dbl(nrec, buffers, buffer_lengths, disk_lengths,
+					 byte_ordering, int_hdrs, real_hdrs, nwords,
+					 data_returns, nthreads)  );
+      return 0;
+    }
+  /* invalid word size falls through to error return */
+  ERRBLKI;
+}
@@ -165,6 +165,52 @@ int read_record_data(int fd,
 */
 /* ------------------------------------------------------------------- */
 
+int unpack_record_data(void *buffer,
+		       size_t buffer_length,
+		       size_t disk_length,
+		       Byte_ordering byte_ordering,
+		       int word_size,
+		       const void *int_hdr,
+		       const void *real_hdr,
+		       size_t nwords,
+		       void *data_return);
+/* 
+   As read_record_data, but the record data are taken from a buffer of
+   buffer_length bytes that the caller has read from the file starting
+   at the data offset of the record, so that the data of several
+   records may be read from the file with one read.  The contents of
+   the buffer may be overwritten.
+
+   Return value is 0 for success, 1 for failure.
+*/
+/* ------------------------------------------------------------------- */
+
+int unpack_records_data(int nrec,
+			void **buffers,
+			const size_t *buffer_lengths,
+			const size_t *disk_lengths,
+			Byte_ordering byte_ordering,
+			int word_size,
+			const void *int_hdrs,
+			const void *real_hdrs,
+			const size_t *nwords,
+			void **data_returns,
+			int nthreads);
+/* 
+   As unpack_record_data, but for nrec records at once.  The PP headers
+   of the records are consecutive in int_hdrs and real_hdrs, and each
+   record's buffer, buffer length, disk length, number of words and
+   storage for returned data are the corresponding elements of the
+   other arrays.
+
+   The records are unpacked in parallel by up to nthreads threads.  If
+   there is only one record then blocks of the rows of a WGDOS packed
+   field are unpacked in parallel instead.
+
+   Return value is 0 for success, 1 for failure.
+*/
+/* ------------------------------------------------------------------- */
+
 
 int get_extra_data_offset_and_length(int word_size, 
 				     const void *int_hdr,
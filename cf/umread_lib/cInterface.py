@@ -14,14 +14,14 @@ class File_type(CT.Structure):
                 ("word_size", CT.c_int)]
 
 
-def _get_ctypes_array(dtype, size=None):
+def _get_ctypes_array(dtype, size=None, ndim=1):
     """
     get ctypes corresponding to a numpy array of a given type;
     the size should not be necessary unless the storage for the array 
     is allocated in the C code
     """
     kwargs = {'dtype': dtype,
-              'ndim': 1,
+              'ndim': ndim,
               'flags': ('C_CONTIGUOUS', 'WRITEABLE')}
     if size:
         kwargs['shape'] = (size,)
@@ -447,6 +447,145 @@ class CInterface:
         
         return data
 
+    def unpack_record_data(self,
+                           buffer,
+                           disk_length, 
+                           byte_ordering, 
+                           word_size,
+                           int_hdr,
+                           real_hdr,
+                           data_type,
+                           nwords,
+                           data=None):
+        """
+        unpacks record data from a buffer that has already been read from
+        the file
+
+        inputs:
+           buffer - writeable numpy uint8 array containing the bytes of the 
+              file starting at the data offset of the record; its contents 
+              may be overwritten
+           disk_length - disk length of data record in bytes
+           byte_ordering - 'little_endian' or 'big_endian'
+           word_size - 4 or 8
+           int_hdr - integer PP headers (numpy array)
+           real_hdr - real PP headers (numpy array)
+           data_type - 'integer' or 'real'
+           nwords - number of words to unpack
+              type and nwords should have been returned by get_type_and_num_words()
+           data - optional contiguous numpy array of nwords words of the
+              data type in which to return the data
+
+        returns: the unpacked data
+        """
+        if data_type == 'integer':
+            if data is None:
+                data = self._get_empty_int_array(nwords)
+            ctypes_data = self._get_ctypes_int_array()
+        elif data_type == 'real':
+            if data is None:
+                data = self._get_empty_real_array(nwords)
+            ctypes_data = self._get_ctypes_real_array()
+        else:
+            raise ValueError("data_type must be 'integer' or 'real'")
+
+        self.lib.unpack_record_data.argtypes = [ _get_ctypes_array(numpy.uint8),
+                                                 CT.c_size_t,
+                                                 CT.c_size_t,
+                                                 CT.c_int,
+                                                 CT.c_int,
+                                                 self._get_ctypes_int_array(),
+                                                 self._get_ctypes_real_array(),
+                                                 CT.c_size_t,
+                                                 ctypes_data ]
+
+        rv = self.lib.unpack_record_data(buffer,
+                                         buffer.size,
+                                         disk_length, 
+                                         enum_byte_ordering.as_index(byte_ordering),
+                                         word_size,
+                                         int_hdr,
+                                         real_hdr,
+                                         nwords,
+                                         data)
+
+        if rv != 0:
+            raise umfile.UMFileException("error unpacking record data")
+        
+        return data
+
+    def unpack_records_data(self,
+                            buffers,
+                            disk_lengths,
+                            byte_ordering, 
+                            word_size,
+                            int_hdrs,
+                            real_hdrs,
+                            nwords,
+                            data,
+                            nthreads=1):
+        """
+        unpacks the data of several records from buffers that have already 
+        been read from the file, with up to nthreads native threads
+
+        inputs:
+           buffers - sequence of writeable numpy uint8 arrays, each containing
+              the bytes of the file starting at the data offset of a record;
+              their contents may be overwritten
+           disk_lengths - sequence of disk lengths of the data records in bytes
+           byte_ordering - 'little_endian' or 'big_endian'
+           word_size - 4 or 8
+           int_hdrs - integer PP headers of the records (2-d numpy array
+              with a row for each record)
+           real_hdrs - real PP headers of the records (2-d numpy array
+              with a row for each record)
+           nwords - sequence of numbers of words to unpack for each record
+           data - sequence of contiguous numpy arrays, each of the number
+              of words and data type of a record as returned by 
+              get_type_and_num_words(), in which to return the data
+           nthreads - the maximum number of threads to use. If there is only
+              one record then its rows may be unpacked in parallel
+
+        returns: None
+        """
+        nrec = len(buffers)
+        int_hdrs = numpy.ascontiguousarray(int_hdrs, dtype=self.file_data_int_type)
+        real_hdrs = numpy.ascontiguousarray(real_hdrs, dtype=self.file_data_real_type)
+        
+        for array in data:
+            if not array.flags.c_contiguous or not array.flags.writeable:
+                raise ValueError("data arrays must be contiguous and writeable")
+
+        pointers = CT.c_void_p * nrec
+        sizes = CT.c_size_t * nrec
+
+        self.lib.unpack_records_data.argtypes = [ CT.c_int,
+                                                  pointers,
+                                                  sizes,
+                                                  sizes,
+                                                  CT.c_int,
+                                                  CT.c_int,
+                                                  _get_ctypes_array(int_hdrs.dtype, None, 2),
+                                                  _get_ctypes_array(real_hdrs.dtype, None, 2),
+                                                  sizes,
+                                                  pointers,
+                                                  CT.c_int ]
+
+        rv = self.lib.unpack_records_data(nrec,
+                                          pointers(*[buffer.ctypes.data for buffer in buffers]),
+                                          sizes(*[buffer.size for buffer in buffers]),
+                                          sizes(*disk_lengths),
+                                          enum_byte_ordering.as_index(byte_ordering),
+                                          word_size,
+                                          int_hdrs,
+                                          real_hdrs,
+                                          sizes(*nwords),
+                                          pointers(*[array.ctypes.data for array in data]),
+                                          nthreads)
+
+        if rv != 0:
+            raise umfile.UMFileException("error unpacking record data")
+
 
 if __name__ == "__main__":
     import sys
@@ -1,3 +1,4 @@
+import hashlib
 import os
 
 from functools import cmp_to_key
@@ -12,13 +13,34 @@ class UMFileException(Exception):
     pass
 
 
+# --------------------------------------------------------------------
+# The version of the layout of the index files written to a UM index
+# directory. Index files with a different version are ignored.
+# --------------------------------------------------------------------
+_index_version = 1
+
+# --------------------------------------------------------------------
+# When reading the data of several records, the largest gap in bytes
+# between records which are read with one read, and the largest
+# number of bytes read with one read.
+# --------------------------------------------------------------------
+_max_read_gap = 2**16
+_max_read_length = 2**26
+
+# --------------------------------------------------------------------
+# The position of LBEXT (the number of words of extra data) in an
+# integer header
+# --------------------------------------------------------------------
+_index_lbext = 19
+
+
 class File:
     '''A class for a UM data file that gives a view of the file including
     sets of PP records combined into variables
 
     '''
     def __init__(self, path, byte_ordering = None, word_size = None,
-                 format = None, parse = True):        
+                 format = None, parse = True, index_dir = None):        
         '''Open and parse a UM file.  The following optional arguments specify
     the file type. If all three are set, then this forces the file
     type; otherwise, the file type is autodetected and any of them
@@ -42,6 +64,13 @@ class File:
     info about the file type to ensure that the get_data method of
     those Rec objects will work.
 
+    If "index_dir" is set to a directory name then, when parsing, the
+    headers, offsets and variable grouping of the records are loaded
+    from an index file in that directory, if it exists and was written
+    for the file at its current size and modification time, rather
+    than being parsed from the file. If no usable index file exists
+    then the file is parsed and a new index file is written.
+
         '''
         c = cInterface.CInterface()
         self._c_interface = c
@@ -58,8 +87,12 @@ class File:
         file_type_obj = c.create_file_type(self.format, self.byte_ordering, self.word_size)
         c.set_word_size(file_type_obj)
         if parse:
-            info = c.parse_file(self.fd, file_type_obj)
-            self.vars = info["vars"]
+            if not (index_dir and self._load_index(index_dir)):
+                info = c.parse_file(self.fd, file_type_obj)
+                self.vars = info["vars"]
+                if index_dir:
+                    self._save_index(index_dir)
+            #--- End: if
             self._add_back_refs()
 
             
@@ -95,6 +128,267 @@ class File:
         self.word_size = d["word_size"]
 
         
+    def _index_path(self, index_dir):
+        '''Return the name of the index file for the file in the given
+    index directory.
+
+    The name is made from the file's base name and a hash of its
+    absolute path, so that files with the same base name in different
+    directories have different index files.
+
+        '''
+        path = os.path.abspath(self.path)
+        key = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(index_dir, '{0}.{1}.npz'.format(
+            os.path.basename(path), key[:16]))
+
+
+    def _file_type_key(self):
+        '''Return the size, modification time and file type which an
+    index file must have been written for.
+
+        '''
+        stat = os.fstat(self.fd)
+        return (stat.st_size, stat.st_mtime_ns,
+                [self.format, self.byte_ordering, str(self.word_size)])
+
+
+    def _load_index(self, index_dir):
+        '''Set the variables and records of the file from its index
+    file.
+
+    :Returns:
+
+        `bool`
+            True if the index file existed and was valid for the file,
+            otherwise False, in which case the file is unchanged.
+
+        '''
+        size, mtime_ns, file_type = self._file_type_key()
+        try:
+            with numpy.load(self._index_path(index_dir),
+                            allow_pickle=False) as index:
+                if (int(index['version']) != _index_version or
+                    int(index['size']) != size or
+                    int(index['mtime_ns']) != mtime_ns or
+                    index['file_type'].tolist() != file_type):
+                    return False
+
+                int_hdrs  = index['int_hdrs']
+                real_hdrs = index['real_hdrs']
+                offsets   = index['offsets'].tolist()
+                variables = index['vars'].tolist()
+        except Exception:
+            # The index file does not exist or can't be read
+            return False
+
+        # Each record's headers are rows of the stored header arrays
+        recs = [Rec(int_hdr, real_hdr, hdr_offset, data_offset, disk_length)
+                for int_hdr, real_hdr, (hdr_offset, data_offset, disk_length)
+                in zip(int_hdrs, real_hdrs, offsets)]
+
+        self.vars = []
+        start = 0
+        for nrecs, nz, nt, svi in variables:
+            if svi < 0:
+                svi = None
+
+            var = Var(recs[start:start+nrecs], nz, nt, svi)
+
+            # The stacked headers of the variable are already known
+            var._int_hdrs  = int_hdrs[start:start+nrecs]
+            var._real_hdrs = real_hdrs[start:start+nrecs]
+
+            self.vars.append(var)
+            start += nrecs
+        #--- End: for
+
+        return True
+
+
+    def _save_index(self, index_dir):
+        '''Write the index file for the parsed variables and records of
+    the file.
+
+    The index file is written atomically, and failure to write it is
+    not an error.
+
+        '''
+        size, mtime_ns, file_type = self._file_type_key()
+
+        recs = [rec for var in self.vars for rec in var.recs]
+
+        index = {
+            'version'  : numpy.array(_index_version),
+            'size'     : numpy.array(size, dtype='int64'),
+            'mtime_ns' : numpy.array(mtime_ns, dtype='int64'),
+            'file_type': numpy.array(file_type),
+            'int_hdrs' : numpy.array([rec.int_hdr for rec in recs]),
+            'real_hdrs': numpy.array([rec.real_hdr for rec in recs]),
+            'offsets'  : numpy.array([(rec.hdr_offset, rec.data_offset,
+                                       rec.disk_length) for rec in recs],
+                                     dtype='int64'),
+            'vars'     : numpy.array([(len(var.recs), var.nz, var.nt,
+                                       -1 if var.supervar_index is None
+                                       else var.supervar_index)
+                                      for var in self.vars],
+                                     dtype='int64'),
+        }
+
+        path = self._index_path(index_dir)
+        tmp = '{0}.{1}.tmp'.format(path, os.getpid())
+        try:
+            with open(tmp, 'wb') as fh:
+                numpy.savez(fh, **index)
+
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+    def get_rec(self, hdr_offset, data_offset, disk_length):
+        '''Return the record with the given header and data offsets.
+
+    The record is taken from the parsed variables of the file if
+    possible, otherwise its headers are read from the file.
+
+        '''
+        recs = getattr(self, '_recs_by_hdr_offset', None)
+        if recs is None:
+            recs = {rec.hdr_offset: rec
+                    for var in getattr(self, 'vars', ()) for rec in var.recs}
+            self._recs_by_hdr_offset = recs
+
+        rec = recs.get(hdr_offset)
+        if (rec is not None and rec.data_offset == data_offset and
+            rec.disk_length == disk_length):
+            return rec
+
+        return Rec.from_file_and_offsets(self, hdr_offset, data_offset,
+                                         disk_length)
+
+
+    def get_records_data(self, recs, out=None, threads=1):
+        '''Get the data arrays of several records of the file.
+
+    The records are read in order of their positions in the file, and
+    records which are adjacent, or nearly so, are read with one read
+    before being unpacked from memory, so that many small records are
+    read with few large sequential reads.
+
+    If "out" is set to a two-dimensional array with a row for each
+    record, then the data of each record are unpacked into its row of
+    "out", which must have the data type and number of words of every
+    record. Otherwise each record's data are unpacked into a new
+    array.
+
+    The records which are read together are unpacked in parallel by up
+    to "threads" native threads, or if only one record is read then
+    the rows of its data may be.
+
+    Returns a list of the records' data arrays, in the same order as
+    the records.
+
+        '''
+        c = self._c_interface
+        word_size = self.word_size
+
+        data = []
+        extents = []
+        for i, rec in enumerate(recs):
+            data_type, nwords = c.get_type_and_num_words(rec.int_hdr)
+            if out is not None:
+                data.append(out[i])
+            elif data_type == 'integer':
+                data.append(numpy.empty(nwords, dtype=c.file_data_int_type))
+            else:
+                data.append(numpy.empty(nwords, dtype=c.file_data_real_type))
+
+            if rec.int_hdr.item(20,) % 10:
+                # Packed data, for which the disk length includes any
+                # extra data
+                nbytes = rec.disk_length
+            else:
+                nbytes = nwords * word_size
+
+            extents.append((rec.data_offset, rec.data_offset + nbytes, i,
+                            data_type, nwords))
+        #--- End: for
+
+        # Group the records into runs which are read with one read
+        extents.sort()
+        runs = []
+        for extent in extents:
+            start, end = extent[:2]
+            if (runs and start - run_end <= _max_read_gap and
+                end - run_start <= _max_read_length):
+                runs[-1].append(extent)
+                run_end = max(run_end, end)
+            else:
+                runs.append([extent])
+                run_start, run_end = start, end
+        #--- End: for
+
+        for run in runs:
+            run_start = run[0][0]
+            buffer = self._read_bytes(run_start,
+                                      max(extent[1] for extent in run) - run_start)
+
+            # Unpacking may overwrite the buffer, so a record which is
+            # requested more than once is only unpacked once, and then
+            # copied
+            unpack = []
+            copies = []
+            for start, end, i, data_type, nwords in run:
+                if unpack and start == unpack[-1][0]:
+                    copies.append((i, unpack[-1][2]))
+                else:
+                    unpack.append((start, end, i, nwords))
+            #--- End: for
+
+            c.unpack_records_data(
+                [buffer[start - run_start:end - run_start]
+                 for start, end, i, nwords in unpack],
+                [recs[i].disk_length for start, end, i, nwords in unpack],
+                self.byte_ordering,
+                word_size,
+                [recs[i].int_hdr for start, end, i, nwords in unpack],
+                [recs[i].real_hdr for start, end, i, nwords in unpack],
+                [nwords for start, end, i, nwords in unpack],
+                [data[i] for start, end, i, nwords in unpack],
+                nthreads=threads)
+
+            for i, j in copies:
+                data[i][...] = data[j]
+        #--- End: for
+
+        return data
+
+
+    def _read_bytes(self, offset, length):
+        '''Read up to "length" bytes from the file, starting at
+    "offset", into a new numpy uint8 array.
+
+        '''
+        buffer = numpy.empty(length, dtype=numpy.uint8)
+        view = memoryview(buffer)
+        os.lseek(self.fd, offset, os.SEEK_SET)
+        n = 0
+        while n < length:
+            nread = os.readv(self.fd, [view[n:]])
+            if not nread:
+                # End of file
+                break
+
+            n += nread
+        #--- End: while
+
+        return buffer[:n]
+
+
     def _add_back_refs(self):
         '''Add file attribute to Var objects, and both file and var
         attributes to Rec objects.  The important one is the file
@@ -121,6 +415,32 @@ class Var:
         self.nz = nz
         self.nt = nt
         self.supervar_index = supervar_index
+        self._int_hdrs = None
+        self._real_hdrs = None
+
+
+    @property
+    def int_hdrs(self):
+        '''The integer headers of the records as a 2-d array, with one row
+    per record in the same order as self.recs
+
+        '''
+        if self._int_hdrs is None:
+            self._int_hdrs = numpy.array([rec.int_hdr for rec in self.recs])
+
+        return self._int_hdrs
+
+
+    @property
+    def real_hdrs(self):
+        '''The real headers of the records as a 2-d array, with one row per
+    record in the same order as self.recs
+
+        '''
+        if self._real_hdrs is None:
+            self._real_hdrs = numpy.array([rec.real_hdr for rec in self.recs])
+
+        return self._real_hdrs
 
         
     @staticmethod
@@ -142,10 +462,6 @@ class Var:
         return self._compare(a.get_extra_data(), b.get_extra_data())
 
     
-    def _compare_recs_by_orig_order(self, a, b):
-        return self._compare(self.recs.index(a), self.recs.index(b))
-
-    
     def group_records_by_extra_data(self):
         '''Returns a list of (sub)lists of records where each records within
     each sublist has matching extra data (if any), so if the whole
@@ -160,6 +476,11 @@ class Var:
         if n == 0:
             # shouldn't have a var without records, but...
             return []
+
+        # optimise the common case - if no record has extra data then
+        # there is no need to read any of it
+        if not (self.int_hdrs[:, _index_lbext] > 0).any():
+            return [recs]
         
 #        recs.sort(compare) #python2
         recs.sort(key=cmp_to_key(compare))
@@ -169,12 +490,16 @@ class Var:
         if not compare(recs[0], recs[-1]):
             return [self.recs[:]]
 
+        # positions of the records in the original order, keyed by
+        # object identity
+        orig_order = {id(rec): i for i, rec in enumerate(self.recs)}
+
         groups = []
         this_grp = []
         for i, rec in enumerate(recs):
             this_grp.append(rec)
             if i == n - 1 or compare(rec, recs[i + 1]):
-                this_grp.sort(key=self._compare_recs_by_orig_order)
+                this_grp.sort(key=lambda rec: orig_order[id(rec)])
                 groups.append(this_grp)
                 this_grp = []
         #--- End: for